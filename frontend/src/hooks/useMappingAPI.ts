@@ -51,8 +51,9 @@ export const useMappingAPI = () => {
   // 📋 기본 CRUD 작업
   // ============================================================================
 
-  const getAllMappings = useCallback(async (skip = 0, limit = 100): Promise<HSCNMappingFullResponse[]> => {
-    const result = await getRequest<HSCNMappingFullResponse[]>(apiEndpoints.cbam.mapping.list, { skip, limit });
+  // 키셋 페이지네이션: after는 이전 응답의 X-Next-Cursor 헤더 값
+  const getAllMappings = useCallback(async (limit = 100, after?: string): Promise<HSCNMappingFullResponse[]> => {
+    const result = await getRequest<HSCNMappingFullResponse[]>(apiEndpoints.cbam.mapping.list, after ? { limit, after } : { limit });
     return result || [];
   }, [getRequest]);
 
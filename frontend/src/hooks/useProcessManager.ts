@@ -111,8 +111,8 @@ export const useProcessManager = () => {
   // 선택된 사업장의 모든 공정 목록 불러오기 (제품 연결 여부와 무관하게 install_id 기준)
   const fetchAllProcessesByInstall = useCallback(async (installId: number) => {
     try {
-      const response = await axiosClient.get(apiEndpoints.cbam.process.list);
-      const all = (response.data || []).filter((process: Process) => (process as any)?.install_id === installId);
+      const response = await axiosClient.get(apiEndpoints.cbam.process.list, { params: { install_id: installId } });
+      const all = response.data || [];
       setAllProcesses(all);
     } catch (error) {
       if (process.env.NODE_ENV === 'development') {
@@ -143,10 +143,8 @@ export const useProcessManager = () => {
   // 선택된 제품의 공정 목록 불러오기
   const fetchProcessesByProduct = useCallback(async (productId: number) => {
     try {
-      const response = await axiosClient.get(apiEndpoints.cbam.process.list);
-      const productProcesses = response.data.filter((process: Process) => 
-        process.products && process.products.some((p: Product) => p.id === productId)
-      );
+      const response = await axiosClient.get(apiEndpoints.cbam.process.list, { params: { product_id: productId } });
+      const productProcesses = response.data || [];
       setProcesses(productProcesses);
     } catch (error) {
       if (process.env.NODE_ENV === 'development') {
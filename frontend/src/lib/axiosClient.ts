@@ -359,7 +359,8 @@ export const apiEndpoints = {
       },
       // Product 배출량 계산 API
       product: {
-        calculate: '/api/v1/cbam/calculation/emission/product/calculate'
+        calculate: '/api/v1/cbam/calculation/emission/product/calculate',
+        calculateBatch: '/api/v1/cbam/calculation/emission/product/calculate/batch'
       },
       // Graph 재계산
       graph: {
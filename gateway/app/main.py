@@ -8,10 +8,11 @@ Gateway API 메인 파일
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import os
 import logging
 import sys
+from typing import AsyncIterator, Dict
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 import httpx
@@ -38,10 +39,59 @@ SERVICE_MAP = {
     "cal_boundary": CAL_BOUNDARY_URL,
 }
 
+# 업스트림 HTTP 클라이언트 설정 (keep-alive 연결 재사용)
+UPSTREAM_TIMEOUT = float(os.getenv("GATEWAY_UPSTREAM_TIMEOUT", "30"))
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("GATEWAY_UPSTREAM_CONNECT_TIMEOUT", "10"))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("GATEWAY_UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("GATEWAY_UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("GATEWAY_UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_HTTP2 = os.getenv("GATEWAY_UPSTREAM_HTTP2", "true").lower() == "true"
+
+# 업스트림(base URL)별 공용 클라이언트 - 같은 URL을 가리키는 서비스 별칭은 클라이언트를 공유
+upstream_clients: Dict[str, httpx.AsyncClient] = {}
+
+def _http2_available() -> bool:
+    """HTTP/2는 h2 패키지(httpx[http2])가 설치된 경우에만 사용"""
+    if not UPSTREAM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("⚠️ h2 패키지가 없어 업스트림 연결에 HTTP/1.1을 사용합니다 (pip install httpx[http2])")
+        return False
+
+def create_upstream_client(base_url: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=base_url.rstrip('/'),
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUT, connect=UPSTREAM_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2_available(),
+        follow_redirects=False,
+    )
+
+def get_upstream_client(base_url: str) -> httpx.AsyncClient:
+    """업스트림 클라이언트 조회 (lifespan 밖에서 호출되면 지연 생성)"""
+    client = upstream_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = create_upstream_client(base_url)
+        upstream_clients[base_url] = client
+    return client
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Gateway API 시작")
+    for base_url in set(SERVICE_MAP.values()):
+        get_upstream_client(base_url)
+    logger.info(f"🔗 업스트림 클라이언트 {len(upstream_clients)}개 생성 (http2={_http2_available()})")
     yield
+    for client in upstream_clients.values():
+        await client.aclose()
+    upstream_clients.clear()
     logger.info("🛑 Gateway API 종료")
 
 app = FastAPI(
@@ -107,6 +157,20 @@ async def handle_options(full_path: str, request: Request):
     logger.info(f"🌐 OPTIONS 응답: 200 origin={cors_origin}")
     return response
 
+# 요청/응답 모두에서 전달하지 않는 hop-by-hop 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length"
+}
+
+async def _stream_upstream(resp: httpx.Response) -> AsyncIterator[bytes]:
+    """업스트림 응답 본문 스트리밍 (정상 종료, 클라이언트 연결 끊김, 예외 모두 연결을 풀에 반환)"""
+    try:
+        async for chunk in resp.aiter_raw():
+            yield chunk
+    finally:
+        await resp.aclose()
+
 # 프록시 유틸리티
 async def proxy_request(service: str, path: str, request: Request) -> Response:
     base_url = SERVICE_MAP.get(service)
@@ -132,63 +196,60 @@ async def proxy_request(service: str, path: str, request: Request) -> Response:
     target_url = f"{base_url.rstrip('/')}/{normalized_path}"
     
     method = request.method
-    headers = dict(request.headers)
-    headers.pop("host", None)
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
     params = dict(request.query_params)
-    body = await request.body()
 
-    timeout = httpx.Timeout(30.0, connect=10.0)
+    # 요청 본문은 버퍼링하지 않고 그대로 스트리밍 (본문이 없는 요청은 chunked 전송 방지)
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    if "content-length" in request.headers:
+        headers["content-length"] = request.headers["content-length"]
     
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=False) as client:
-        try:
-            resp = await client.request(
-                method=method,
-                url=target_url,
-                headers=headers,
-                params=params,
-                content=body,
-            )
-            
-        except httpx.RequestError as e:
-            logger.error(f"❌ Upstream request error: {e}")
-            return JSONResponse(
-                status_code=502, 
-                content={
-                    "detail": "Bad Gateway", 
-                    "error": str(e),
-                    "service": service,
-                    "target_url": target_url
-                }
-            )
-        except httpx.TimeoutException as e:
-            logger.error(f"❌ Upstream timeout: {e}")
-            return JSONResponse(
-                status_code=504, 
-                content={
-                    "detail": "Gateway Timeout", 
-                    "error": str(e),
-                    "target_url": target_url
-                }
-            )
-        except Exception as e:
-            logger.error(f"❌ Unexpected proxy error: {e}")
-            return JSONResponse(
-                status_code=500, 
-                content={
-                    "detail": "Internal Gateway Error", 
-                    "error": str(e),
-                    "target_url": target_url
-                }
-            )
+    client = get_upstream_client(base_url)
+    try:
+        upstream_request = client.build_request(
+            method=method,
+            url=target_url,
+            headers=headers,
+            params=params,
+            content=request.stream() if has_body else None,
+        )
+        resp = await client.send(upstream_request, stream=True)
+        
+    except httpx.TimeoutException as e:
+        logger.error(f"❌ Upstream timeout: {e}")
+        return JSONResponse(
+            status_code=504, 
+            content={
+                "detail": "Gateway Timeout", 
+                "error": str(e),
+                "target_url": target_url
+            }
+        )
+    except httpx.RequestError as e:
+        logger.error(f"❌ Upstream request error: {e}")
+        return JSONResponse(
+            status_code=502, 
+            content={
+                "detail": "Bad Gateway", 
+                "error": str(e),
+                "service": service,
+                "target_url": target_url
+            }
+        )
+    except Exception as e:
+        logger.error(f"❌ Unexpected proxy error: {e}")
+        return JSONResponse(
+            status_code=500, 
+            content={
+                "detail": "Internal Gateway Error", 
+                "error": str(e),
+                "target_url": target_url
+            }
+        )
 
     # 응답 헤더 정리
-    hop_by_hop_headers = {
-        "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
-        "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length"
-    }
-    
     response_headers = {k: v for k, v in resp.headers.items() 
-                       if k.lower() not in hop_by_hop_headers}
+                       if k.lower() not in HOP_BY_HOP_HEADERS}
     
     # HTTP → HTTPS 변환 (CSP 위반 방지)
     for header_name, header_value in response_headers.items():
@@ -211,11 +272,11 @@ async def proxy_request(service: str, path: str, request: Request) -> Response:
         "Access-Control-Max-Age": "86400"
     })
     
-    return Response(
-        content=resp.content, 
-        status_code=resp.status_code, 
-        headers=response_headers, 
-        media_type=resp.headers.get("content-type")
+    # 응답 본문은 업스트림에서 받은 바이트(압축 포함) 그대로 스트리밍하고, 끝나면 연결을 풀에 반환
+    return StreamingResponse(
+        _stream_upstream(resp),
+        status_code=resp.status_code,
+        headers=response_headers,
     )
 
 # 범용 프록시 라우트
@@ -256,7 +317,8 @@ async def health_check_root(request: Request):
         "services": {
             "auth": AUTH_SERVICE_URL,
             "cbam": CAL_BOUNDARY_URL,
-        }
+        },
+        "upstream_clients": len(upstream_clients),
     }
     
     return JSONResponse(content=response_data)
@@ -0,0 +1,237 @@
+# ============================================================================
+# 🏊 공용 asyncpg 연결 풀 관리자
+# ============================================================================
+
+"""
+cbam-service 전체에서 하나의 asyncpg 연결 풀을 공유합니다.
+
+FastAPI lifespan에서 생성/워밍업/종료하고, 모든 Repository는
+get_pool_manager()로 같은 풀을 주입받습니다. 워커당 DB 연결 수는
+DB_POOL_MAX_SIZE로 제한됩니다.
+
+환경변수:
+- DB_POOL_MIN_SIZE (기본 2): 워밍업 시 미리 열어 둘 연결 수
+- DB_POOL_MAX_SIZE (기본 10): 워커당 최대 연결 수
+- DB_STATEMENT_CACHE_SIZE (기본 100): 연결별 prepared statement 캐시 크기 (PgBouncer transaction 모드는 0)
+- DB_COMMAND_TIMEOUT (기본 30): 쿼리 타임아웃(초)
+- DB_POOL_MAX_INACTIVE_LIFETIME (기본 300): 유휴 연결 정리 시간(초)
+- DB_POOL_WARMUP (기본 true): 시작 시 min_size만큼 연결을 미리 열지 여부
+
+풀 생성이 실패하면 1초부터 두 배씩(최대 60초) 늘어나는 간격이 지난 뒤
+다음 get_pool() 호출에서 다시 시도합니다.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# 풀 생성 실패 후 재시도 간격(초)
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 60.0
+
+def _env_int(name: str, default: int) -> int:
+    """정수 환경변수 읽기 (잘못된 값이면 기본값 사용)"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ {name}={value} 값이 올바르지 않아 기본값 {default}을 사용합니다.")
+        return default
+
+def _env_bool(name: str, default: bool) -> bool:
+    """불리언 환경변수 읽기"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+class DatabasePoolManager:
+    """애플리케이션 전역 asyncpg 연결 풀 관리자"""
+
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        statement_cache_size: Optional[int] = None,
+        command_timeout: Optional[float] = None,
+        max_inactive_connection_lifetime: Optional[float] = None,
+        warmup: Optional[bool] = None,
+        application_name: str = 'cbam-service'
+    ):
+        self.database_url = database_url or os.getenv('DATABASE_URL')
+        self.max_size = max(max_size if max_size is not None else _env_int('DB_POOL_MAX_SIZE', 10), 1)
+        self.min_size = min(max(min_size if min_size is not None else _env_int('DB_POOL_MIN_SIZE', 2), 0), self.max_size)
+        self.statement_cache_size = max(
+            statement_cache_size if statement_cache_size is not None else _env_int('DB_STATEMENT_CACHE_SIZE', 100), 0
+        )
+        self.command_timeout = command_timeout if command_timeout is not None else _env_int('DB_COMMAND_TIMEOUT', 30)
+        self.max_inactive_connection_lifetime = (
+            max_inactive_connection_lifetime if max_inactive_connection_lifetime is not None
+            else _env_int('DB_POOL_MAX_INACTIVE_LIFETIME', 300)
+        )
+        self.warmup = warmup if warmup is not None else _env_bool('DB_POOL_WARMUP', True)
+        self.application_name = application_name
+
+        self._pool: Optional[asyncpg.Pool] = None
+        self._initialization_attempted = False
+        self._retry_delay = _RETRY_BASE_DELAY
+        self._next_retry_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._bootstrapped: Set[str] = set()
+
+    @property
+    def pool(self) -> Optional[asyncpg.Pool]:
+        """현재 연결 풀 (초기화 전이면 None)"""
+        return self._pool
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    # ============================================================================
+    # 🔄 생명주기
+    # ============================================================================
+
+    async def initialize(self) -> Optional[asyncpg.Pool]:
+        """연결 풀 생성 및 워밍업 (실패하면 백오프 간격이 지난 뒤 다시 시도)"""
+        async with self._get_lock():
+            if self._pool is not None or self._initialization_attempted:
+                return self._pool
+            if time.monotonic() < self._next_retry_at:
+                return None
+
+            self._initialization_attempted = True
+
+            if not self.database_url:
+                logger.warning("DATABASE_URL이 없어 공용 연결 풀 생성을 건너뜁니다.")
+                return None
+
+            try:
+                self._pool = await asyncpg.create_pool(
+                    self.database_url,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    command_timeout=self.command_timeout,
+                    statement_cache_size=self.statement_cache_size,
+                    max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                    server_settings={
+                        'application_name': self.application_name
+                    }
+                )
+                logger.info(
+                    f"✅ 공용 연결 풀 생성 성공 (min={self.min_size}, max={self.max_size}, "
+                    f"statement_cache={self.statement_cache_size})"
+                )
+                self._retry_delay = _RETRY_BASE_DELAY
+                self._next_retry_at = 0.0
+            except Exception as e:
+                # 일시적인 연결 실패로 워커가 DB 없이 남지 않도록 백오프 후 재시도 허용
+                self._pool = None
+                self._initialization_attempted = False
+                self._next_retry_at = time.monotonic() + self._retry_delay
+                logger.error(f"❌ 공용 연결 풀 생성 실패: {str(e)}")
+                logger.warning(f"데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다. ({self._retry_delay:g}초 후 재시도)")
+                self._retry_delay = min(self._retry_delay * 2, _RETRY_MAX_DELAY)
+                return None
+
+        if self.warmup:
+            await self.warm_up()
+
+        return self._pool
+
+    async def get_pool(self) -> Optional[asyncpg.Pool]:
+        """연결 풀 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+        if self._pool is None and not self._initialization_attempted:
+            await self.initialize()
+        return self._pool
+
+    async def warm_up(self):
+        """min_size 만큼 연결을 동시에 열고 SELECT 1로 확인"""
+        if not self._pool or self.min_size <= 0:
+            return
+
+        async def _ping():
+            async with self._pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+
+        try:
+            await asyncio.gather(*(_ping() for _ in range(self.min_size)))
+            logger.info(f"✅ 공용 연결 풀 워밍업 완료 ({self.min_size}개 연결)")
+        except Exception as e:
+            logger.warning(f"⚠️ 공용 연결 풀 워밍업 실패 (기본 기능은 정상): {e}")
+
+    async def close(self, timeout: float = 10.0):
+        """연결 풀 종료 (진행 중인 쿼리는 timeout까지 대기 후 강제 종료)"""
+        async with self._get_lock():
+            pool = self._pool
+            self._pool = None
+            self._initialization_attempted = False
+            self._retry_delay = _RETRY_BASE_DELAY
+            self._next_retry_at = 0.0
+            self._bootstrapped.clear()
+
+        if pool is None:
+            return
+
+        try:
+            await asyncio.wait_for(pool.close(), timeout=timeout)
+            logger.info("✅ 공용 연결 풀 종료 완료")
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ 공용 연결 풀 종료 시간 초과({timeout}s) - 연결을 강제 종료합니다.")
+            pool.terminate()
+        except Exception as e:
+            logger.error(f"❌ 공용 연결 풀 종료 실패: {str(e)}")
+            pool.terminate()
+
+    # ============================================================================
+    # 🧱 Repository 부트스트랩
+    # ============================================================================
+
+    async def run_once(self, key: str, bootstrap: Callable[[], Awaitable[Any]]):
+        """
+        테이블/트리거 생성처럼 워커당 한 번만 필요한 작업을 실행합니다.
+        Repository가 요청마다 생성되어도 DDL 확인 쿼리는 반복되지 않습니다.
+        bootstrap()이 예외를 던지면 완료로 표시하지 않으므로 다음 호출에서 다시 실행됩니다.
+        """
+        if key in self._bootstrapped:
+            return
+        await bootstrap()
+        self._bootstrapped.add(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """연결 풀 상태 (헬스체크용)"""
+        if not self._pool:
+            return {"initialized": False, "min_size": self.min_size, "max_size": self.max_size}
+        return {
+            "initialized": True,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "statement_cache_size": self.statement_cache_size
+        }
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_pool_manager = DatabasePoolManager()
+
+def get_pool_manager() -> DatabasePoolManager:
+    """애플리케이션 전역 연결 풀 관리자 반환"""
+    return _pool_manager
+
+__all__ = [
+    "DatabasePoolManager",
+    "get_pool_manager"
+]
@@ -0,0 +1,143 @@
+# ============================================================================
+# 🗃️ Master Cache - 워커별 인메모리 마스터 데이터 캐시
+# ============================================================================
+
+"""
+거의 바뀌지 않는 마스터 테이블(material_master, fuel_master)을 워커 메모리에 올려
+이름 기준 dict로 색인합니다. 배출계수 자동 매핑과 마스터 목록 조회는 DB 왕복 없이 응답합니다.
+
+이름 조회 순서: 정확한 이름 → 영문명(대소문자 무시) → 정규화 이름(NFKC, 대소문자/공백/구분기호 무시)
+캐시를 쓰지 못할 때의 DB 조회(name_match_query)도 같은 순서/규칙으로 한 행을 고릅니다.
+
+무효화 규칙:
+- 시작 시(lifespan) 1회 적재하고, MASTER_CACHE_TTL(초)이 지나면 다음 조회 때 재적재
+- 마스터 데이터를 바꾼 쪽은 invalidate()를 호출 (다른 워커는 TTL 안에 반영)
+- 적재에 실패하면 호출자가 DB로 조회
+
+환경변수:
+- MASTER_CACHE_ENABLED (기본 true): false이면 모든 조회를 DB로 처리
+- MASTER_CACHE_TTL (기본 600): 재적재 주기(초)
+"""
+
+import re
+import logging
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.common.memory_index import MemoryIndex
+
+logger = logging.getLogger(__name__)
+
+# 정규화 시 제거하는 공백/구분기호 (Python, PostgreSQL 정규식 공용)
+_SEPARATOR_PATTERN = r"[\s\-_.,·()\[\]/]+"
+_SEPARATORS = re.compile(_SEPARATOR_PATTERN)
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """정규화 이름 (NFKC + 대소문자 무시 + 공백/구분기호 제거)"""
+    if not name:
+        return ''
+    return _SEPARATORS.sub('', unicodedata.normalize('NFKC', name)).lower()
+
+
+def engname_key(name: Optional[str]) -> str:
+    """영문명 비교 키 (앞뒤 공백 제거 + 대소문자 무시)"""
+    return name.strip(' \t\r\n').lower() if name else ''
+
+
+def name_match_args(name: str) -> Tuple[str, str, str]:
+    """name_match_query 인자 ($1 정확한 이름, $2 영문명 키, $3 정규화 이름)"""
+    return name, engname_key(name), normalize_name(name)
+
+
+def name_match_query(table: str, columns: str, name_key: str, engname_key_column: str) -> str:
+    """MasterDataCache.lookup()과 같은 규칙으로 한 행을 고르는 쿼리 (인자: name_match_args())"""
+    def normalized(column: str) -> str:
+        return f"regexp_replace(lower(normalize({column}, NFKC)), '{_SEPARATOR_PATTERN}', '', 'g')"
+
+    engname = f"lower(btrim({engname_key_column}, E' \\t\\r\\n'))"
+    return f"""
+        SELECT {columns}
+        FROM {table}
+        WHERE {name_key} = $1
+           OR ($2 <> '' AND {engname} = $2)
+           OR ($3 <> '' AND ({normalized(name_key)} = $3 OR {normalized(engname_key_column)} = $3))
+        ORDER BY CASE
+            WHEN {name_key} = $1 THEN 0
+            WHEN $2 <> '' AND {engname} = $2 THEN 1
+            WHEN {normalized(name_key)} = $3 THEN 2
+            ELSE 3
+        END, {name_key}
+        LIMIT 1
+    """
+
+
+class MasterDataCache(MemoryIndex):
+    """마스터 테이블 1개의 이름 색인 캐시 (워커당 1개)"""
+
+    def __init__(
+        self,
+        table: str,
+        name_key: str,
+        engname_key: str,
+        ttl: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        super().__init__(f'{table} 캐시', 'MASTER_CACHE_TTL', 600, 'MASTER_CACHE_ENABLED', ttl, enabled)
+        self.table = table
+        self.name_key = name_key
+        self.engname_key = engname_key
+
+        self._rows: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_engname: Dict[str, Dict[str, Any]] = {}
+        self._by_normalized: Dict[str, Dict[str, Any]] = {}
+
+    # ============================================================================
+    # 🔄 색인 구성
+    # ============================================================================
+
+    def _rebuild(self, rows: List[Dict[str, Any]]):
+        self._rows = [dict(row) for row in rows]
+        self._by_name = {}
+        self._by_engname = {}
+        self._by_normalized = {}
+        for row in self._rows:
+            name, engname = row.get(self.name_key), engname_key(row.get(self.engname_key))
+            if name:
+                self._by_name.setdefault(name, row)
+            if engname:
+                self._by_engname.setdefault(engname, row)
+        # 정규화 이름이 겹치면 이름이 정확히 같은 행을 먼저 사용 (이름 → 영문명 순으로 채움)
+        for key in (self.name_key, self.engname_key):
+            for row in self._rows:
+                normalized = normalize_name(row.get(key))
+                if normalized:
+                    self._by_normalized.setdefault(normalized, row)
+
+    def size(self) -> int:
+        return len(self._rows)
+
+    # ============================================================================
+    # 🔍 조회 (ensure_loaded()가 True일 때만 사용)
+    # ============================================================================
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """이름으로 행 조회 (정확한 이름 → 영문명 → 정규화 이름)"""
+        if not name:
+            return None
+        exact, engname, normalized = name_match_args(name)
+        row = (
+            self._by_name.get(exact)
+            or (self._by_engname.get(engname) if engname else None)
+            or (self._by_normalized.get(normalized) if normalized else None)
+        )
+        return dict(row) if row else None
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """전체 행 (적재 시 정렬 순서 유지)"""
+        return [dict(row) for row in self._rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태 (헬스체크용)"""
+        return {**super().stats(), 'row_count': len(self._rows)}
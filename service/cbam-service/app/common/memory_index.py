@@ -0,0 +1,137 @@
+# ============================================================================
+# 🗂️ Memory Index - 워커별 인메모리 색인 공통 (TTL 재적재 / 무효화)
+# ============================================================================
+
+"""
+테이블 전체를 워커 메모리에 올려 색인하는 캐시(원료/연료 마스터, HS-CN 접두사, 엣지 인접)의
+적재/무효화 공통 로직입니다. 하위 클래스는 _rebuild()(색인 구성), size()와 조회 메서드만 구현합니다.
+
+- ensure_loaded(loader): 오래되었거나 무효화된 경우에만 loader로 전체 행을 다시 적재
+  (동시 조회는 잠금으로 한 번만 적재, 적재 도중 변경이 생기면 결과를 버리고 호출자가 DB로 조회)
+- invalidate(): 다음 조회 때 재적재
+- _touch(): 부분 반영(apply_upsert/apply_delete 등) 시 진행 중인 적재 결과를 버리도록 표시
+"""
+
+import os
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def env_flag(name: str, default: bool = True) -> bool:
+    """불리언 환경변수 읽기"""
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class MemoryIndex(ABC):
+    """TTL 재적재 + 무효화를 지원하는 워커 메모리 색인 (하위 클래스 공통 부모)"""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_env: str,
+        default_ttl: float,
+        enabled_env: str,
+        ttl: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.name = name
+        self.ttl = ttl if ttl is not None else float(os.getenv(ttl_env, str(default_ttl)))
+        self.enabled = enabled if enabled is not None else env_flag(enabled_env)
+
+        self._loaded_at: Optional[float] = None
+        # 색인이 바뀌거나 무효화될 때마다 증가 (적재 도중 바뀌면 적재 결과를 버림)
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.reload_count = 0
+        self.invalidation_count = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    # ============================================================================
+    # 🔄 적재 / 무효화
+    # ============================================================================
+
+    @property
+    def is_loaded(self) -> bool:
+        """한 번이라도 적재되었고 무효화되지 않았는지"""
+        return self._loaded_at is not None
+
+    @property
+    def is_fresh(self) -> bool:
+        """메모리 색인으로 바로 응답할 수 있는지"""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> bool:
+        """색인이 오래되었으면 loader로 전체 행을 다시 적재 (메모리로 응답 가능하면 True)"""
+        if not self.enabled:
+            return False
+        if self.is_fresh:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        async with self._get_lock():
+            if self.is_fresh:
+                return True
+
+            generation = self._generation
+            rows = await loader()
+            if generation != self._generation:
+                logger.info(f"ℹ️ {self.name} 적재 중 변경 발생 - 이번 조회는 DB로 처리합니다.")
+                return False
+
+            self._rebuild(rows)
+            self._loaded_at = time.monotonic()
+            self.reload_count += 1
+            logger.info(f"🗂️ {self.name} 적재 완료: {self.size()}개")
+            return True
+
+    def invalidate(self, reason: str = ''):
+        """색인을 무효화 (다음 조회 때 재적재)"""
+        self._generation += 1
+        self._loaded_at = None
+        self.invalidation_count += 1
+        logger.info(f"🗂️ {self.name} 무효화{f': {reason}' if reason else ''}")
+
+    def _touch(self):
+        """색인을 부분 갱신했음을 표시 (진행 중인 적재 결과는 버려짐)"""
+        self._generation += 1
+
+    # ============================================================================
+    # 🧩 하위 클래스 구현
+    # ============================================================================
+
+    @abstractmethod
+    def _rebuild(self, rows: Iterable[Dict[str, Any]]):
+        """전체 행으로 색인 재구성"""
+
+    @abstractmethod
+    def size(self) -> int:
+        """색인된 행 수"""
+
+    def stats(self) -> Dict[str, Any]:
+        """색인 상태 (헬스체크용)"""
+        return {
+            'enabled': self.enabled,
+            'loaded': self.is_loaded,
+            'fresh': self.is_fresh,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'reload_count': self.reload_count,
+            'invalidation_count': self.invalidation_count
+        }
@@ -0,0 +1,169 @@
+# ============================================================================
+# 📄 Pagination - 목록 API 공통 키셋(cursor) 페이지네이션
+# ============================================================================
+
+"""
+목록 API는 OFFSET 대신 정렬 키 기준의 키셋 페이지네이션을 사용합니다.
+
+- 요청: ?limit=N&after=<cursor>  (after는 이전 응답의 X-Next-Cursor 값을 그대로 전달)
+- 응답 본문: 기존과 같은 배열
+- 응답 헤더
+  - X-Next-Cursor: 다음 페이지가 있을 때만
+  - X-Total-Count-Estimate: 첫 페이지에서만. 한 페이지에 모두 들어오면 정확한 개수,
+    아니면 플래너 통계(EXPLAIN 예상 행 수) 기반 추정치 - COUNT(*)를 실행하지 않음
+
+커서는 마지막 행의 정렬 키(id 또는 created_at, id)를 JSON으로 직렬화한 뒤 URL-safe base64로 인코딩한
+불투명 문자열입니다. 컨트롤러는 limit + 1행을 요청하고 paginate()가 다음 페이지 존재 여부를 판단합니다.
+"""
+
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+TOTAL_ESTIMATE_HEADER = 'X-Total-Count-Estimate'
+
+
+# ============================================================================
+# 🔑 커서
+# ============================================================================
+
+def encode_cursor(keys: Sequence[Any]) -> str:
+    """정렬 키 목록을 커서 문자열로 인코딩 (datetime은 ISO 문자열)"""
+    raw = json.dumps(
+        [key.isoformat() if isinstance(key, datetime) else key for key in keys],
+        default=str, separators=(',', ':')
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[type] = (int,)) -> Optional[List[Any]]:
+    """커서 문자열을 정렬 키 목록으로 디코딩 (키 개수/타입이 맞지 않으면 400)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        keys = json.loads(raw)
+        if not isinstance(keys, list) or len(keys) != len(types):
+            raise ValueError(cursor)
+        decoded = []
+        for key, key_type in zip(keys, types):
+            if key_type is datetime and isinstance(key, str):
+                decoded.append(datetime.fromisoformat(key))
+            elif isinstance(key, key_type) and not isinstance(key, bool):
+                decoded.append(key)
+            else:
+                raise ValueError(cursor)
+        return decoded
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+
+
+# ============================================================================
+# 🧱 쿼리 빌더 (저장소용)
+# ============================================================================
+
+class KeysetQuery:
+    """목록 조회용 WHERE 절/바인드 인자 빌더 (필터 + 키셋 조건)"""
+
+    def __init__(self):
+        self.conditions: List[str] = []
+        self.args: List[Any] = []
+
+    def param(self, value: Any) -> str:
+        """바인드 인자를 추가하고 자리표시자($n) 반환"""
+        self.args.append(value)
+        return f"${len(self.args)}"
+
+    def where(self, condition: str, value: Any) -> 'KeysetQuery':
+        """값이 None이 아니면 조건 추가 (조건의 {} 자리에 자리표시자를 채움)"""
+        if value is not None:
+            self.conditions.append(condition.format(self.param(value)))
+        return self
+
+    def after(self, columns: Sequence[str], keys: Optional[Sequence[Any]], descending: bool = False) -> 'KeysetQuery':
+        """정렬 키가 커서 다음인 행만 (행 값 비교 - 같은 방향의 복합 인덱스를 그대로 탐색)"""
+        if keys is not None:
+            placeholders = ', '.join(self.param(key) for key in keys)
+            self.conditions.append(f"({', '.join(columns)}) {'<' if descending else '>'} ({placeholders})")
+        return self
+
+    def copy(self) -> 'KeysetQuery':
+        query = KeysetQuery()
+        query.conditions = list(self.conditions)
+        query.args = list(self.args)
+        return query
+
+    @property
+    def where_sql(self) -> str:
+        return f"WHERE {' AND '.join(self.conditions)}" if self.conditions else ""
+
+    def limit_sql(self, limit: Optional[int]) -> str:
+        return f"LIMIT {self.param(limit)}" if limit is not None else ""
+
+
+async def estimate_count(conn, from_sql: str, query: KeysetQuery) -> Optional[int]:
+    """플래너 통계 기반 예상 행 수 (EXPLAIN만 실행, 실패하면 None)"""
+    try:
+        plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_sql} {query.where_sql}", *query.args)
+        return int(json.loads(plan)[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning(f"⚠️ 예상 행 수 조회 실패: {e}")
+        return None
+
+
+# ============================================================================
+# 📤 응답 (컨트롤러용)
+# ============================================================================
+
+def fetch_limit(limit: Optional[int]) -> Optional[int]:
+    """다음 페이지 존재 여부 판단을 위해 1행 더 조회"""
+    return limit + 1 if limit is not None else None
+
+
+def paginate(rows: List[Any], limit: Optional[int], key: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """limit + 1행 조회 결과를 (현재 페이지, 다음 커서)로 나눔"""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
+
+
+def set_page_headers(response: Response, next_cursor: Optional[str], total_estimate: Optional[int] = None):
+    """다음 페이지 커서/예상 전체 개수를 응답 헤더에 기록"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total_estimate is not None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(total_estimate)
+
+
+async def respond_page(
+    response: Response,
+    rows: List[Any],
+    limit: Optional[int],
+    key: Callable[[Any], Sequence[Any]],
+    first_page: bool,
+    estimate: Optional[Callable[[], Awaitable[Optional[int]]]] = None
+) -> List[Any]:
+    """현재 페이지를 잘라 헤더를 채우고 반환 (예상 개수는 첫 페이지에서만 계산)"""
+    page, next_cursor = paginate(rows, limit, key)
+    total_estimate = None
+    if first_page:
+        if next_cursor is None:
+            total_estimate = len(page)
+        elif estimate is not None:
+            total_estimate = await estimate()
+            if total_estimate is not None:
+                # 통계가 오래되어 실제 조회한 행보다 적게 추정되는 경우 보정
+                total_estimate = max(total_estimate, len(rows))
+    set_page_headers(response, next_cursor, total_estimate)
+    return page
@@ -0,0 +1,121 @@
+# ============================================================================
+# 🔍 Text Search - pg_trgm 기반 자동완성 검색
+# ============================================================================
+
+"""
+원료/연료 마스터와 dummy 검색(자동완성)에서 공통으로 쓰는 검색 조건/순위 빌더입니다.
+
+- 부트스트랩: ensure_trigram_indexes()가 pg_trgm 확장과 컬럼별 GIN(gin_trgm_ops) 인덱스를 생성
+  (확장을 만들 권한이 없거나 설치되지 않은 DB면 인덱스 없이 같은 ILIKE 검색으로 동작 - 결과는 같고 속도만 느림)
+- 기본 모드: 부분 일치(ILIKE '%검색어%') - 트라이그램 인덱스로 탐색
+- 오타 허용 모드(fuzzy): 부분 일치 + 단어 유사도 일치(검색어 <% 컬럼, 기준값 min_similarity)
+- 정렬: 정확히 일치 → 앞부분 일치 → 유사도 높은 순 → 짧은 이름 순
+- 결과 수는 항상 limit으로 제한
+
+한글 트라이그램은 DB의 LC_CTYPE이 C가 아닐 때(ko_KR.UTF-8, en_US.UTF-8 등)만 만들어집니다.
+"""
+
+import logging
+from typing import Any, List, Optional, Sequence
+
+from app.common.pagination import KeysetQuery
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 500
+# 오타 허용 모드의 단어 유사도 기준 (pg_trgm 기본값 0.6은 짧은 한글 이름에서 오타 1글자도 놓침)
+DEFAULT_MIN_SIMILARITY = 0.3
+
+# pg_trgm 사용 가능 여부 (워커당 첫 부트스트랩에서 확인)
+_trigram_available: Optional[bool] = None
+
+
+def trigram_available() -> bool:
+    return bool(_trigram_available)
+
+
+def escape_like(term: str) -> str:
+    """LIKE 패턴 특수문자(\\, %, _) 이스케이프"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+# ============================================================================
+# 🧱 부트스트랩
+# ============================================================================
+
+async def ensure_trigram_indexes(conn, table: str, columns: Sequence[str]) -> bool:
+    """pg_trgm 확장과 컬럼별 트라이그램 GIN 인덱스 생성 (확장을 쓸 수 없으면 False)"""
+    global _trigram_available
+    if _trigram_available is None:
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:
+            # 권한이 없어도 이미 설치되어 있으면 사용 가능
+            logger.warning(f"⚠️ pg_trgm 확장 생성 실패: {e}")
+        _trigram_available = await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+        )
+        if _trigram_available:
+            logger.info("✅ pg_trgm 확장 사용 가능 - 트라이그램 인덱스 검색")
+        else:
+            logger.warning("⚠️ pg_trgm 확장을 사용할 수 없어 인덱스 없는 ILIKE 검색으로 동작합니다.")
+
+    if not _trigram_available:
+        return False
+    for column in columns:
+        await conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops);"
+        )
+    return True
+
+
+# ============================================================================
+# 🔎 검색 쿼리
+# ============================================================================
+
+class TrigramSearch:
+    """검색 조건/정렬 SQL 빌더 (바인드 인자는 KeysetQuery에 추가)"""
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        term: str,
+        fuzzy: bool = False,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY
+    ):
+        self.columns = list(columns)
+        self.term = term.strip()
+        # 유사도 연산자는 pg_trgm이 있어야 사용 가능 (없으면 부분 일치만)
+        self.fuzzy = fuzzy and trigram_available()
+        self.min_similarity = min_similarity
+
+    def apply(self, query: KeysetQuery) -> str:
+        """검색 조건을 query에 추가하고 ORDER BY 절 반환"""
+        term = query.param(self.term)
+        pattern = query.param(f"%{escape_like(self.term)}%")
+        prefix = query.param(f"{escape_like(self.term)}%")
+
+        matches = [f"{column} ILIKE {pattern}" for column in self.columns]
+        if self.fuzzy:
+            matches += [f"{term} <% {column}" for column in self.columns]
+        query.conditions.append(f"({' OR '.join(matches)})")
+
+        exact = ' OR '.join(f"lower({column}) = lower({term})" for column in self.columns)
+        starts = ' OR '.join(f"{column} ILIKE {prefix}" for column in self.columns)
+        order = [f"CASE WHEN {exact} THEN 0 WHEN {starts} THEN 1 ELSE 2 END"]
+        if trigram_available():
+            similarity = ', '.join(f"word_similarity({term}, {column})" for column in self.columns)
+            order.append(f"GREATEST({similarity}) DESC")
+        order += [f"length({self.columns[0]})", self.columns[0]]
+        return f"ORDER BY {', '.join(order)}"
+
+    async def fetch(self, conn, sql: str, query: KeysetQuery) -> List[Any]:
+        """검색 실행 (오타 허용 모드면 트랜잭션 안에서 유사도 기준값 설정)"""
+        if not self.fuzzy:
+            return await conn.fetch(sql, *query.args)
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', $1, true)", str(self.min_similarity)
+            )
+            return await conn.fetch(sql, *query.args)
@@ -3,18 +3,25 @@
 # ============================================================================
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import json
 import logging
-from typing import List
+from typing import List, Optional
 import time
 
 from app.domain.calculation.calculation_service import CalculationService
+from app.domain.calculation.calculation_scheduler import get_recalculation_scheduler
+from app.domain.edge.edge_jobs import get_propagation_jobs
+from app.domain.edge.edge_schema import PropagationJobRequest, PropagationJobResponse
 from app.domain.calculation.calculation_schema import (
     ProcessAttrdirEmissionCreateRequest, ProcessAttrdirEmissionResponse, ProcessAttrdirEmissionUpdateRequest,
+    ProcessAttrdirBulkCalculationRequest, ProcessAttrdirBulkCalculationResponse,
     ProcessEmissionCalculationRequest, ProcessEmissionCalculationResponse,
     ProductEmissionCalculationRequest, ProductEmissionCalculationResponse,
+    ProductEmissionBatchRequest, ProductEmissionBatchResponse,
     EmissionPropagationRequest, EmissionPropagationResponse,
     GraphRecalculationRequest, GraphRecalculationResponse,
-    RecalculateFromProcessResponse
+    RecalculateFromProcessResponse, RecalculationStatusResponse
 )
 
 logger = logging.getLogger(__name__)
@@ -41,6 +48,18 @@ async def calculate_process_emission(request: ProcessEmissionCalculationRequest)
         logger.error(f"❌ 공정별 배출량 계산 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"공정별 배출량 계산 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/emission/product/calculate/batch", response_model=ProductEmissionBatchResponse)
+async def calculate_product_emissions_batch(request: ProductEmissionBatchRequest):
+    """제품별 배출량 일괄 계산 (제품 ID 목록 또는 사업장 기준, 공정별 내역 포함)"""
+    try:
+        logger.info(f"🧮 제품별 배출량 일괄 계산 요청: 제품 {request.product_ids}, 사업장 {request.install_id}")
+        result = await calculation_service.calculate_product_emissions_batch(request)
+        logger.info(f"✅ 제품별 배출량 일괄 계산 성공: {result.total_products}개 제품")
+        return result
+    except Exception as e:
+        logger.error(f"❌ 제품별 배출량 일괄 계산 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"제품별 배출량 일괄 계산 중 오류가 발생했습니다: {str(e)}")
+
 @router.post("/emission/product/calculate", response_model=ProductEmissionCalculationResponse)
 async def calculate_product_emission(request: ProductEmissionCalculationRequest):
     """제품별 배출량 계산"""
@@ -81,6 +100,18 @@ async def get_all_process_attrdir_emissions():
         logger.error(f"❌ 모든 공정별 직접귀속배출량 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"모든 공정별 직접귀속배출량 조회 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/emission/process/attrdir/bulk", response_model=ProcessAttrdirBulkCalculationResponse)
+async def calculate_process_attrdir_emissions_bulk(request: ProcessAttrdirBulkCalculationRequest):
+    """공정별 직접귀속배출량 일괄 계산 (전체/사업장/공정 목록, 집계+저장 한 문장)"""
+    try:
+        logger.info(f"📊 직접귀속배출량 일괄 계산 요청: install_id={request.install_id}, process_ids={request.process_ids}")
+        result = await calculation_service.calculate_process_attrdir_emissions_bulk(request)
+        logger.info(f"✅ 직접귀속배출량 일괄 계산 성공: {result.total_processes}개 중 {len(result.updated_process_ids)}개 변경")
+        return result
+    except Exception as e:
+        logger.error(f"❌ 직접귀속배출량 일괄 계산 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"직접귀속배출량 일괄 계산 중 오류가 발생했습니다: {str(e)}")
+
 @router.post("/emission/process/{process_id}/attrdir", response_model=ProcessAttrdirEmissionResponse)
 async def create_process_attrdir_emission(process_id: int):
     """공정별 직접귀속배출량 계산 및 저장"""
@@ -121,6 +152,13 @@ async def recalculate_entire_graph(request: GraphRecalculationRequest):
         logger.error(f"❌ 전체 그래프 재계산 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"전체 그래프 재계산 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/emission/graph/recalculate/jobs", response_model=PropagationJobResponse, status_code=202)
+async def submit_graph_recalculation_job(request: Optional[PropagationJobRequest] = None):
+    """전체 그래프 재계산을 비동기 작업으로 제출 (진행률/취소: /edge/propagate/jobs/{job_id})"""
+    install_id = request.install_id if request else None
+    job, created = get_propagation_jobs().submit(install_id, trigger='calculation')
+    return PropagationJobResponse(**job.to_dict(), deduplicated=not created)
+
 @router.post("/emission/process/{process_id}/recalculate", response_model=RecalculateFromProcessResponse)
 async def recalculate_from_process(process_id: int):
     """특정 공정에서 시작해 하류까지 재계산하고 제품 누적에 반영"""
@@ -131,6 +169,37 @@ async def recalculate_from_process(process_id: int):
         logger.error(f"❌ 공정 {process_id} 기준 재계산 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"재계산 중 오류: {str(e)}")
 
+# ============================================================================
+# ⏱️ 예약 재계산 상태 엔드포인트
+# ============================================================================
+
+@router.get("/emission/recalculation/status", response_model=RecalculationStatusResponse)
+async def get_recalculation_status():
+    """matdir/fueldir 변경으로 예약된 재계산의 대기/실행/완료 상태"""
+    return get_recalculation_scheduler().status()
+
+@router.get("/emission/recalculation/events")
+async def stream_recalculation_events(heartbeat_seconds: float = 15.0):
+    """재계산 상태 변경을 Server-Sent Events로 전달 (변경 시마다 status 전체를 전송)"""
+    scheduler = get_recalculation_scheduler()
+
+    async def event_stream():
+        version = None
+        while True:
+            if version is not None and not await scheduler.wait_for_update(version, heartbeat_seconds):
+                # 변경이 없으면 연결 유지를 위한 주석 줄만 전송
+                yield ": keep-alive\n\n"
+                continue
+            status = scheduler.status()
+            version = status['version']
+            yield f"event: status\ndata: {json.dumps(status, default=str, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ============================================================================
 # 📦 Router Export
 # ============================================================================
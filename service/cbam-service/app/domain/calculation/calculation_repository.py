@@ -11,25 +11,25 @@ import os
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+
 logger = logging.getLogger(__name__)
 
 class CalculationRepository:
     """CBAM 계산 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            # 데이터베이스 URL이 없어도 서비스는 계속 실행
-            return
         
-        # asyncpg 연결 풀 초기화
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
-        # 초기화는 서비스 시작 시 별도로 호출해야 함
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -41,29 +41,23 @@ class CalculationRepository:
         self._initialization_attempted = True
         
         try:
-            # asyncpg 연결 풀 생성
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,  # 최소 연결 수를 줄임
-                max_size=10,  # 최대 연결 수를 줄임
-                command_timeout=30,  # 타임아웃을 줄임
-                server_settings={
-                    'application_name': 'cbam-service'
-                }
-            )
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
             
-            logger.info("✅ 데이터베이스 연결 풀 생성 성공")
+            logger.info("✅ Calculation 공용 연결 풀 연결 성공")
             
-            # 테이블 및 트리거 생성은 선택적으로 실행
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_tables_async()
-                await self._create_triggers_async()
+                await self.pool_manager.run_once('calculation.tables', self._create_tables_async)
+                await self.pool_manager.run_once('calculation.triggers', self._create_triggers_async)
             except Exception as e:
                 logger.warning(f"⚠️ 테이블/트리거 생성 실패 (기본 기능은 정상): {e}")
             
         except Exception as e:
-            logger.error(f"❌ 데이터베이스 연결 실패: {str(e)}")
-            # 연결 실패해도 서비스는 계속 실행
+            logger.error(f"❌ Calculation 데이터베이스 연결 실패: {str(e)}")
             logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
             self.pool = None
     
@@ -572,6 +566,82 @@ class CalculationRepository:
             logger.error(f"❌ 공정별 직접귀속배출량 계산 실패: {str(e)}")
             raise e
 
+    async def calculate_process_attrdir_emissions_bulk(
+        self,
+        process_ids: Optional[List[int]] = None,
+        install_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """공정별 직접귀속배출량 일괄 계산 및 저장 (집계 + INSERT ... SELECT ... ON CONFLICT 한 문장).
+        process_ids/install_id가 없으면 모든 공정이 대상이며, 값이 바뀐 행만 갱신합니다.
+        """
+        await self._ensure_pool_initialized()
+            
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                    WITH target AS (
+                        SELECT id
+                        FROM process
+                        WHERE ($1::int[] IS NULL OR id = ANY($1::int[]))
+                          AND ($2::int IS NULL OR install_id = $2)
+                    ),
+                    mat AS (
+                        SELECT process_id, SUM(matdir_em) AS total
+                        FROM matdir
+                        WHERE process_id IN (SELECT id FROM target)
+                        GROUP BY process_id
+                    ),
+                    fuel AS (
+                        SELECT process_id, SUM(fueldir_em) AS total
+                        FROM fueldir
+                        WHERE process_id IN (SELECT id FROM target)
+                        GROUP BY process_id
+                    ),
+                    upserted AS (
+                        INSERT INTO process_attrdir_emission
+                        (process_id, total_matdir_emission, total_fueldir_emission, attrdir_em, calculation_date)
+                        SELECT t.id,
+                               COALESCE(m.total, 0),
+                               COALESCE(f.total, 0),
+                               COALESCE(m.total, 0) + COALESCE(f.total, 0),
+                               NOW()
+                        FROM target t
+                        LEFT JOIN mat m ON m.process_id = t.id
+                        LEFT JOIN fuel f ON f.process_id = t.id
+                        ON CONFLICT (process_id)
+                        DO UPDATE SET
+                            total_matdir_emission = EXCLUDED.total_matdir_emission,
+                            total_fueldir_emission = EXCLUDED.total_fueldir_emission,
+                            attrdir_em = EXCLUDED.attrdir_em,
+                            calculation_date = NOW(),
+                            updated_at = NOW()
+                        WHERE (process_attrdir_emission.total_matdir_emission,
+                               process_attrdir_emission.total_fueldir_emission,
+                               process_attrdir_emission.attrdir_em)
+                              IS DISTINCT FROM
+                              (EXCLUDED.total_matdir_emission,
+                               EXCLUDED.total_fueldir_emission,
+                               EXCLUDED.attrdir_em)
+                        RETURNING process_id
+                    )
+                    SELECT (SELECT COUNT(*) FROM target) AS total_processes,
+                           COALESCE((SELECT array_agg(process_id ORDER BY process_id) FROM upserted), '{}') AS updated_process_ids
+                """, process_ids, install_id)
+                
+                result = {
+                    'total_processes': row['total_processes'],
+                    'updated_process_ids': list(row['updated_process_ids'])
+                }
+                logger.info(
+                    f"✅ 직접귀속배출량 일괄 계산: 공정 {result['total_processes']}개 중 "
+                    f"{len(result['updated_process_ids'])}개 변경"
+                )
+                return result
+                
+        except Exception as e:
+            logger.error(f"❌ 직접귀속배출량 일괄 계산 실패: {str(e)}")
+            raise e
+
     async def get_process_attrdir_emission(self, process_id: int) -> Optional[Dict[str, Any]]:
         """공정별 직접귀속배출량 조회"""
         await self._ensure_pool_initialized()
@@ -654,6 +724,72 @@ class CalculationRepository:
             logger.error(f"❌ 제품별 총 배출량 계산 실패: {str(e)}")
             raise e
 
+    async def get_product_emission_breakdowns(
+        self,
+        product_ids: Optional[List[int]] = None,
+        install_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """제품별 연결 공정의 직접귀속배출량을 한 번의 조인 쿼리로 조회 (제품 × 공정 행).
+        process_attrdir_emission 행이 없는 공정은 matdir/fueldir 합계로 즉석 계산합니다(저장하지 않음).
+        연결된 공정이 없는 제품은 process_id가 NULL인 행 하나로 반환됩니다.
+        """
+        await self._ensure_pool_initialized()
+            
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    WITH target AS (
+                        SELECT id, product_name
+                        FROM product
+                        WHERE ($1::int[] IS NULL OR id = ANY($1::int[]))
+                          AND ($2::int IS NULL OR install_id = $2)
+                    ),
+                    links AS (
+                        SELECT pp.product_id, pp.process_id
+                        FROM product_process pp
+                        JOIN target t ON t.id = pp.product_id
+                    ),
+                    missing AS (
+                        SELECT DISTINCT l.process_id
+                        FROM links l
+                        LEFT JOIN process_attrdir_emission pae ON pae.process_id = l.process_id
+                        WHERE pae.process_id IS NULL
+                    ),
+                    mat AS (
+                        SELECT process_id, SUM(matdir_em) AS total
+                        FROM matdir
+                        WHERE process_id IN (SELECT process_id FROM missing)
+                        GROUP BY process_id
+                    ),
+                    fuel AS (
+                        SELECT process_id, SUM(fueldir_em) AS total
+                        FROM fueldir
+                        WHERE process_id IN (SELECT process_id FROM missing)
+                        GROUP BY process_id
+                    )
+                    SELECT t.id AS product_id,
+                           t.product_name,
+                           l.process_id,
+                           pr.process_name,
+                           COALESCE(pae.total_matdir_emission, m.total, 0) AS total_matdir_emission,
+                           COALESCE(pae.total_fueldir_emission, f.total, 0) AS total_fueldir_emission,
+                           COALESCE(pae.attrdir_em, COALESCE(m.total, 0) + COALESCE(f.total, 0)) AS attrdir_em,
+                           (l.process_id IS NOT NULL AND pae.process_id IS NULL) AS computed
+                    FROM target t
+                    LEFT JOIN links l ON l.product_id = t.id
+                    LEFT JOIN process pr ON pr.id = l.process_id
+                    LEFT JOIN process_attrdir_emission pae ON pae.process_id = l.process_id
+                    LEFT JOIN mat m ON m.process_id = l.process_id
+                    LEFT JOIN fuel f ON f.process_id = l.process_id
+                    ORDER BY t.id, l.process_id
+                """, product_ids, install_id)
+                
+                return [dict(row) for row in rows]
+                
+        except Exception as e:
+            logger.error(f"❌ 제품별 배출량 일괄 조회 실패: {str(e)}")
+            raise e
+
     async def get_products_by_process(self, process_id: int) -> List[int]:
         """특정 공정과 연결된 제품 ID 목록 조회 (product_process 기준)"""
         await self._ensure_pool_initialized()
@@ -0,0 +1,268 @@
+# ============================================================================
+# ⏱️ Recalculation Scheduler - 디바운스 재계산 큐
+# ============================================================================
+
+"""
+matdir/fueldir 입력이 바뀐 공정을 "dirty"로 표시만 하고, 재계산은 백그라운드에서 묶어서 실행합니다.
+
+- 마지막 이벤트 후 RECALC_DEBOUNCE_SECONDS 동안 새 이벤트가 없으면 실행
+  (이벤트가 계속 들어와도 첫 이벤트 후 RECALC_MAX_DELAY_SECONDS가 지나면 실행)
+- 한 번에 모인 공정들은 직접귀속배출량 갱신 후 하류 범위(cone)를 합쳐 한 번만 재계산
+- 실행 중에 들어온 이벤트는 다음 묶음으로 넘어감
+- FastAPI lifespan에서 start/stop하며, 실행 중이 아니면(스크립트 등) 즉시 동기 재계산
+
+환경변수:
+- RECALC_DEBOUNCE_SECONDS (기본 1.0)
+- RECALC_MAX_DELAY_SECONDS (기본 10.0)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 상태 조회에 남길 최근 실행 수
+HISTORY_SIZE = 20
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RecalculationScheduler:
+    """dirty 공정을 모아 하류 재계산을 한 번에 실행하는 백그라운드 스케줄러"""
+
+    def __init__(
+        self,
+        calculation_service=None,
+        debounce_seconds: Optional[float] = None,
+        max_delay_seconds: Optional[float] = None
+    ):
+        self._calculation_service = calculation_service
+        self.debounce_seconds = debounce_seconds if debounce_seconds is not None else float(os.getenv('RECALC_DEBOUNCE_SECONDS', '1.0'))
+        self.max_delay_seconds = max(
+            max_delay_seconds if max_delay_seconds is not None else float(os.getenv('RECALC_MAX_DELAY_SECONDS', '10.0')),
+            self.debounce_seconds
+        )
+
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._first_marked_at: Optional[float] = None
+        self._last_marked_at: Optional[float] = None
+        self._in_flight: Optional[Dict[str, Any]] = None
+        self._history: deque = deque(maxlen=HISTORY_SIZE)
+
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._update_event: Optional[asyncio.Event] = None
+        self._version = 0
+        self.events_received = 0
+        self.runs_completed = 0
+
+    @property
+    def calculation_service(self):
+        if self._calculation_service is None:
+            from app.domain.calculation.calculation_service import CalculationService
+            self._calculation_service = CalculationService()
+        return self._calculation_service
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ============================================================================
+    # 🔄 생명주기
+    # ============================================================================
+
+    async def start(self):
+        """백그라운드 루프 시작 (lifespan)"""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._update_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop(), name='recalculation-scheduler')
+        logger.info(f"✅ 재계산 스케줄러 시작 (debounce={self.debounce_seconds}s, max_delay={self.max_delay_seconds}s)")
+
+    async def stop(self, timeout: float = 30.0):
+        """루프 종료 - 실행 중인 재계산은 마치고, 남은 dirty 공정은 대기 없이 한 번 더 재계산"""
+        task = self._task
+        if task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(task, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ 종료 전 재계산 시간 초과({timeout}s) - 남은 공정 {sorted(self._pending)} 재계산이 취소되었습니다.")
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("✅ 재계산 스케줄러 종료")
+
+    # ============================================================================
+    # 📥 이벤트 수신
+    # ============================================================================
+
+    async def request_recalculation(self, process_id: int, reason: str = '') -> Dict[str, Any]:
+        """공정 재계산 요청 - 스케줄러가 돌고 있으면 큐에 넣고, 아니면 즉시 재계산"""
+        if self.running:
+            return self.mark_dirty(process_id, reason)
+        result = await self.calculation_service.recalculate_processes([process_id])
+        return {'process_id': process_id, 'queued': False, 'result': result}
+
+    def mark_dirty(self, process_id: int, reason: str = '') -> Dict[str, Any]:
+        """공정을 dirty로 표시 (같은 공정의 이벤트는 하나로 합쳐짐)"""
+        now = time.monotonic()
+        entry = self._pending.get(process_id)
+        if entry is None:
+            entry = {'process_id': process_id, 'first_marked_at': _now(), 'events': 0, 'reasons': []}
+            self._pending[process_id] = entry
+        entry['events'] += 1
+        entry['last_marked_at'] = _now()
+        if reason and reason not in entry['reasons']:
+            entry['reasons'].append(reason)
+
+        if self._first_marked_at is None:
+            self._first_marked_at = now
+        self._last_marked_at = now
+        self.events_received += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        self._notify_update()
+        return {'process_id': process_id, 'queued': True, 'pending_count': len(self._pending)}
+
+    # ============================================================================
+    # ⚙️ 실행 루프
+    # ============================================================================
+
+    async def _run_loop(self):
+        while True:
+            await self._wakeup.wait()
+            if self._stopping:
+                await self._run_batch()
+                return
+            # 이벤트가 잦아들 때까지(또는 최대 지연까지) 대기
+            while not self._stopping:
+                deadline = min(
+                    self._last_marked_at + self.debounce_seconds,
+                    self._first_marked_at + self.max_delay_seconds
+                )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(remaining)
+            await self._run_batch()
+            if self._stopping:
+                await self._run_batch()
+                return
+
+    async def _run_batch(self):
+        batch = self._pending
+        self._pending = {}
+        self._first_marked_at = None
+        self._last_marked_at = None
+        if self._wakeup is not None:
+            self._wakeup.clear()
+        if not batch:
+            return
+
+        process_ids = sorted(batch)
+        started = time.monotonic()
+        self._in_flight = {
+            'process_ids': process_ids,
+            'events': sum(entry['events'] for entry in batch.values()),
+            'started_at': _now()
+        }
+        self._notify_update()
+
+        record = dict(self._in_flight)
+        try:
+            result = await self.calculation_service.recalculate_processes(process_ids)
+            record.update({
+                'success': True,
+                'updated_process_ids': result.get('updated_process_ids', []),
+                'updated_product_ids': result.get('updated_product_ids', []),
+                'cycle_nodes': result.get('cycle_nodes', []),
+                'error': None
+            })
+        except asyncio.CancelledError:
+            # 종료 시간 초과로 취소: 재계산되지 않은 공정을 대기 목록에 되돌림
+            for process_id, entry in batch.items():
+                self._pending.setdefault(process_id, entry)
+            raise
+        except Exception as e:
+            logger.error(f"❌ 예약된 재계산 실패 (공정 {process_ids}): {e}")
+            record.update({'success': False, 'error': str(e)})
+        finally:
+            self._in_flight = None
+
+        record['finished_at'] = _now()
+        record['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+        self._history.appendleft(record)
+        self.runs_completed += 1
+        logger.info(
+            f"✅ 예약된 재계산 완료: 공정 {len(process_ids)}개 (이벤트 {record['events']}개 병합, {record['duration_ms']}ms)"
+        )
+        self._notify_update()
+
+    # ============================================================================
+    # 📊 상태
+    # ============================================================================
+
+    def _notify_update(self):
+        self._version += 1
+        if self._update_event is not None:
+            self._update_event.set()
+            self._update_event = asyncio.Event()
+
+    async def wait_for_update(self, version: int, timeout: float) -> bool:
+        """상태 버전이 version과 달라질 때까지 대기 (변경되면 True)"""
+        if self._version != version or self._update_event is None:
+            return self._version != version
+        try:
+            await asyncio.wait_for(self._update_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._version != version
+
+    def summary(self) -> Dict[str, Any]:
+        """헬스체크용 요약 (대기 공정 수/누적 카운터)"""
+        return {
+            'running': self.running,
+            'pending': len(self._pending),
+            'in_flight': self._in_flight is not None,
+            'events_received': self.events_received,
+            'runs_completed': self.runs_completed
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """대기/실행 중/최근 완료 재계산 상태"""
+        return {
+            'running': self.running,
+            'version': self._version,
+            'debounce_seconds': self.debounce_seconds,
+            'max_delay_seconds': self.max_delay_seconds,
+            'pending': [dict(entry) for entry in sorted(self._pending.values(), key=lambda entry: entry['process_id'])],
+            'in_flight': dict(self._in_flight) if self._in_flight else None,
+            'last_completed': dict(self._history[0]) if self._history else None,
+            'recent': [dict(record) for record in self._history],
+            'events_received': self.events_received,
+            'runs_completed': self.runs_completed
+        }
+
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_scheduler = RecalculationScheduler()
+
+def get_recalculation_scheduler() -> RecalculationScheduler:
+    """워커 공용 재계산 스케줄러 반환"""
+    return _scheduler
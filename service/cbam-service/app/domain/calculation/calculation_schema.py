@@ -39,6 +39,19 @@ class ProcessAttrdirEmissionUpdateRequest(BaseModel):
     total_fueldir_emission: Optional[float] = Field(None, description="총 연료직접배출량")
     attrdir_em: Optional[float] = Field(None, description="직접귀속배출량")
 
+class ProcessAttrdirBulkCalculationRequest(BaseModel):
+    """공정별 직접귀속배출량 일괄 계산 요청 (process_ids/install_id가 없으면 모든 공정)"""
+    process_ids: Optional[List[int]] = Field(None, description="대상 공정 ID 목록")
+    install_id: Optional[int] = Field(None, description="대상 사업장 ID")
+    propagate: bool = Field(True, description="값이 바뀐 공정의 하류 누적 배출량까지 재계산할지 여부")
+
+class ProcessAttrdirBulkCalculationResponse(BaseModel):
+    """공정별 직접귀속배출량 일괄 계산 응답"""
+    total_processes: int = Field(..., description="계산 대상 공정 수")
+    updated_process_ids: List[int] = Field(..., description="직접귀속배출량이 바뀐(또는 새로 생성된) 공정 ID 목록")
+    propagation: Optional[Dict[str, Any]] = Field(None, description="하류 재계산 결과 (propagate=true이고 바뀐 공정이 있을 때)")
+    calculation_date: datetime = Field(..., description="계산 일시")
+
 # ============================================================================
 # 🔄 공정 간 값 전파 관련 스키마
 # ============================================================================
@@ -112,6 +125,11 @@ class ProductEmissionCalculationRequest(BaseModel):
     """제품별 배출량 계산 요청"""
     product_id: int = Field(..., description="제품 ID")
 
+class ProductEmissionBatchRequest(BaseModel):
+    """제품별 배출량 일괄 계산 요청 (product_ids/install_id가 없으면 모든 제품)"""
+    product_ids: Optional[List[int]] = Field(None, description="제품 ID 목록")
+    install_id: Optional[int] = Field(None, description="사업장 ID")
+
 class ProductEmissionCalculationResponse(BaseModel):
     """제품별 배출량 계산 응답"""
     product_id: int = Field(..., description="제품 ID")
@@ -121,3 +139,47 @@ class ProductEmissionCalculationResponse(BaseModel):
     calculation_formula: str = Field(..., description="계산 공식")
     calculation_date: datetime = Field(..., description="계산 일시")
 
+
+# ============================================================================
+# ⏱️ 재계산 스케줄러 관련 스키마
+# ============================================================================
+
+class RecalculationPendingProcess(BaseModel):
+    """재계산 대기 중인 공정"""
+    process_id: int = Field(..., description="공정 ID")
+    events: int = Field(..., description="병합된 변경 이벤트 수")
+    reasons: List[str] = Field(default_factory=list, description="변경 사유 (matdir_create 등)")
+    first_marked_at: datetime = Field(..., description="첫 변경 시각")
+    last_marked_at: datetime = Field(..., description="마지막 변경 시각")
+
+class RecalculationRun(BaseModel):
+    """예약된 재계산 실행 기록"""
+    process_ids: List[int] = Field(..., description="재계산한 dirty 공정 ID 목록")
+    events: int = Field(..., description="병합된 변경 이벤트 수")
+    started_at: datetime = Field(..., description="시작 시각")
+    finished_at: Optional[datetime] = Field(None, description="완료 시각")
+    duration_ms: Optional[float] = Field(None, description="소요 시간(ms)")
+    success: Optional[bool] = Field(None, description="성공 여부")
+    updated_process_ids: List[int] = Field(default_factory=list, description="갱신된 공정 ID 목록")
+    updated_product_ids: List[int] = Field(default_factory=list, description="갱신된 제품 ID 목록")
+    error: Optional[str] = Field(None, description="오류 메시지")
+
+class RecalculationStatusResponse(BaseModel):
+    """재계산 스케줄러 상태"""
+    running: bool = Field(..., description="백그라운드 스케줄러 동작 여부")
+    version: int = Field(..., description="상태 버전 (변경될 때마다 증가)")
+    debounce_seconds: float = Field(..., description="디바운스 시간(초)")
+    max_delay_seconds: float = Field(..., description="최대 지연 시간(초)")
+    pending: List[RecalculationPendingProcess] = Field(default_factory=list, description="대기 중인 공정")
+    in_flight: Optional[RecalculationRun] = Field(None, description="실행 중인 재계산")
+    last_completed: Optional[RecalculationRun] = Field(None, description="마지막으로 완료된 재계산")
+    recent: List[RecalculationRun] = Field(default_factory=list, description="최근 재계산 기록")
+    events_received: int = Field(..., description="누적 수신 이벤트 수")
+    runs_completed: int = Field(..., description="누적 재계산 실행 수")
+
+class ProductEmissionBatchResponse(BaseModel):
+    """제품별 배출량 일괄 계산 응답"""
+    total_products: int = Field(..., description="제품 수")
+    products: List[ProductEmissionCalculationResponse] = Field(..., description="제품별 배출량 (제품 ID 순)")
+    missing_product_ids: List[int] = Field(default_factory=list, description="요청했지만 존재하지 않는 제품 ID")
+    calculation_date: datetime = Field(..., description="계산 일시")
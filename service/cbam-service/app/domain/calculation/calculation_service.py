@@ -4,12 +4,16 @@
 
 import logging
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from app.domain.calculation.calculation_repository import CalculationRepository
+from app.domain.edge.edge_service import EdgeService, get_edge_service
+from app.domain.edge.edge_graph import PROCESS
 from app.domain.calculation.calculation_schema import (
     ProcessAttrdirEmissionCreateRequest, ProcessAttrdirEmissionResponse, ProcessAttrdirEmissionUpdateRequest,
+    ProcessAttrdirBulkCalculationRequest, ProcessAttrdirBulkCalculationResponse,
     ProcessEmissionCalculationRequest, ProcessEmissionCalculationResponse,
     ProductEmissionCalculationRequest, ProductEmissionCalculationResponse,
+    ProductEmissionBatchRequest, ProductEmissionBatchResponse,
     EmissionPropagationRequest, EmissionPropagationResponse,
     GraphRecalculationRequest, GraphRecalculationResponse,
     CircularReferenceError
@@ -20,8 +24,10 @@ logger = logging.getLogger(__name__)
 class CalculationService:
     """CBAM 계산 비즈니스 로직 클래스"""
     
-    def __init__(self):
+    def __init__(self, edge_service: Optional[EdgeService] = None):
         self.calc_repository = CalculationRepository()
+        # 배출량 전파는 lifespan에서 초기화된 공용 EdgeService 재사용 (요청마다 생성하지 않음)
+        self.edge_service = edge_service or get_edge_service()
         logger.info("✅ Calculation 서비스 초기화 완료")
     
     async def initialize(self):
@@ -64,6 +70,33 @@ class CalculationService:
             logger.error(f"Error calculating process attrdir emission for process {process_id}: {e}")
             raise e
     
+    async def calculate_process_attrdir_emissions_bulk(
+        self, request: ProcessAttrdirBulkCalculationRequest
+    ) -> ProcessAttrdirBulkCalculationResponse:
+        """공정별 직접귀속배출량 일괄 계산 (단일 문장) 후 바뀐 공정의 하류를 한 번에 재계산"""
+        try:
+            result = await self.calc_repository.calculate_process_attrdir_emissions_bulk(
+                request.process_ids, request.install_id
+            )
+            
+            propagation = None
+            if request.propagate and result['updated_process_ids']:
+                propagation = await self.edge_service.recalculate_downstream(
+                    [(PROCESS, process_id) for process_id in result['updated_process_ids']]
+                )
+                if not propagation.get('success'):
+                    raise Exception(propagation.get('error') or '하류 배출량 재계산 실패')
+            
+            return ProcessAttrdirBulkCalculationResponse(
+                total_processes=result['total_processes'],
+                updated_process_ids=result['updated_process_ids'],
+                propagation=propagation,
+                calculation_date=datetime.now(timezone.utc)
+            )
+        except Exception as e:
+            logger.error(f"Error calculating process attrdir emissions in bulk: {e}")
+            raise e
+    
     async def get_process_attrdir_emission(self, process_id: int) -> Optional[ProcessAttrdirEmissionResponse]:
         """공정별 직접귀속배출량 조회"""
         try:
@@ -189,6 +222,62 @@ class CalculationService:
             logger.error(f"Error calculating product emission for product {request.product_id}: {e}")
             raise e
 
+    async def calculate_product_emissions_batch(self, request: ProductEmissionBatchRequest) -> ProductEmissionBatchResponse:
+        """여러 제품의 총 배출량과 공정별 내역을 한 번의 조회로 계산 (대시보드용)"""
+        try:
+            rows = await self.calc_repository.get_product_emission_breakdowns(request.product_ids, request.install_id)
+            calculation_date = datetime.now(timezone.utc)
+            
+            # 1. 제품 × 공정 행을 제품별로 묶기 (쿼리가 제품 ID 순으로 정렬)
+            grouped: Dict[int, Dict[str, Any]] = {}
+            for row in rows:
+                product = grouped.setdefault(row['product_id'], {'product_name': row['product_name'], 'processes': []})
+                if row['process_id'] is None:
+                    continue
+                attrdir_em = float(row['attrdir_em'])
+                formula = f"공정별 직접귀속배출량 = {attrdir_em} tCO2e"
+                if row['computed']:
+                    formula += " (미저장: matdir/fueldir 합계로 계산)"
+                product['processes'].append(ProcessEmissionCalculationResponse(
+                    process_id=row['process_id'],
+                    process_name=row['process_name'],
+                    total_matdir_emission=float(row['total_matdir_emission']),
+                    total_fueldir_emission=float(row['total_fueldir_emission']),
+                    attrdir_em=attrdir_em,
+                    calculation_formula=formula,
+                    calculation_date=calculation_date
+                ))
+            
+            # 2. 제품별 응답 생성 (단건 계산과 같은 공식)
+            products = []
+            for product_id, product in grouped.items():
+                total_emission = sum(pe.attrdir_em for pe in product['processes'])
+                products.append(ProductEmissionCalculationResponse(
+                    product_id=product_id,
+                    product_name=product['product_name'],
+                    total_emission=total_emission,
+                    process_emissions=product['processes'],
+                    calculation_formula=(
+                        f"제품 총 배출량 = Σ(공정별 배출량) = {total_emission} tCO2e "
+                        f"(연결된 공정 수: {len(product['processes'])}개)"
+                    ),
+                    calculation_date=calculation_date
+                ))
+            
+            missing_product_ids = sorted(set(request.product_ids or []) - grouped.keys())
+            logger.info(f"✅ 제품 {len(products)}개 배출량 일괄 계산 완료 (없는 제품: {missing_product_ids})")
+            
+            return ProductEmissionBatchResponse(
+                total_products=len(products),
+                products=products,
+                missing_product_ids=missing_product_ids,
+                calculation_date=calculation_date
+            )
+            
+        except Exception as e:
+            logger.error(f"Error calculating product emissions batch: {e}")
+            raise e
+
     # ============================================================================
     # 🔄 공정 간 값 전파 관련 메서드들 (1단계 핵심 기능)
     # ============================================================================
@@ -198,12 +287,8 @@ class CalculationService:
         try:
             logger.info(f"🔄 배출량 전파 시작: {request.source_process_id} → {request.target_process_id} ({request.edge_kind})")
             
-            # EdgeService로 위임
-            from app.domain.edge.edge_service import EdgeService
-            edge_service = EdgeService(None)
-            await edge_service.initialize()
-            
-            result = await edge_service.propagate_emissions(
+            # 공용 EdgeService로 위임
+            result = await self.edge_service.propagate_emissions(
                 request.source_process_id, 
                 request.target_process_id, 
                 request.edge_kind
@@ -224,18 +309,26 @@ class CalculationService:
         try:
             logger.info(f"🚀 전체 그래프 재계산 시작: trigger_edge_id={request.trigger_edge_id}")
             
-            # EdgeService로 위임
-            from app.domain.edge.edge_service import EdgeService
-            edge_service = EdgeService(None)
-            await edge_service.initialize()
+            # 공용 EdgeService로 위임
+            result = await self.edge_service.propagate_emissions_full_graph()
+            if not result.get('success'):
+                raise Exception(result.get('error', '전체 그래프 재계산에 실패했습니다.'))
             
-            result = await edge_service.propagate_emissions_full_graph()
+            # 순환 참조로 저장값을 사용해 끊은 노드는 검증 오류로 보고
+            validation_errors = [
+                f"순환 참조 감지: {node}에서 저장된 배출량으로 순환을 끊었습니다"
+                for node in result.get('cycle_nodes', [])
+            ] if request.include_validation else []
             
-            if result:
-                logger.info(f"✅ 전체 그래프 재계산 완료: {result['total_processes_calculated']}개 공정 처리")
-                return GraphRecalculationResponse(**result)
-            else:
-                raise Exception("전체 그래프 재계산에 실패했습니다.")
+            logger.info(f"✅ 전체 그래프 재계산 완료: {result['total_processes_calculated']}개 공정 처리")
+            return GraphRecalculationResponse(
+                total_processes_calculated=result['total_processes_calculated'],
+                total_emission_propagated=result['total_emission_propagated'],
+                propagation_chains=[],
+                validation_errors=validation_errors,
+                calculation_date=datetime.utcnow(),
+                status='completed_with_warnings' if validation_errors else 'completed'
+            )
                 
         except Exception as e:
             logger.error(f"❌ 전체 그래프 재계산 실패: {str(e)}")
@@ -245,13 +338,12 @@ class CalculationService:
         """특정 공정에서 시작해 배출량을 재계산하고 하류 공정/제품까지 반영 - EdgeService로 위임"""
         try:
             logger.info(f"🔄 공정 {process_id} 재계산 시작")
-            
-            # EdgeService로 위임
-            from app.domain.edge.edge_service import EdgeService
-            edge_service = EdgeService(None)
-            await edge_service.initialize()
-            
-            result = await edge_service.recalculate_from_process(process_id)
+
+            # 1. 공정 자체의 직접귀속배출량 갱신 (matdir/fueldir 변경 반영)
+            await self.calc_repository.calculate_process_attrdir_emission(process_id)
+
+            # 2. 하류 공정/제품 재계산은 EdgeService로 위임
+            result = await self.edge_service.recalculate_from_process(process_id)
             
             if result:
                 logger.info(f"✅ 공정 {process_id} 재계산 완료: {len(result.get('updated_process_ids', []))}개 공정 업데이트")
@@ -263,6 +355,22 @@ class CalculationService:
             logger.error(f"❌ 공정 {process_id} 재계산 실패: {str(e)}")
             raise e
     
+    async def recalculate_processes(self, process_ids: List[int]) -> Dict[str, Any]:
+        """여러 공정의 직접귀속배출량을 갱신한 뒤 합쳐진 하류 범위를 한 번만 재계산"""
+        process_ids = sorted(set(process_ids))
+        logger.info(f"🔄 공정 {len(process_ids)}개 일괄 재계산 시작: {process_ids}")
+        
+        # 1. 직접귀속배출량 일괄 갱신 (matdir/fueldir 변경 반영, 단일 문장)
+        await self.calc_repository.calculate_process_attrdir_emissions_bulk(process_ids)
+        
+        # 2. 하류 범위(cone)를 합쳐 한 번만 재계산
+        result = await self.edge_service.recalculate_downstream([(PROCESS, process_id) for process_id in process_ids])
+        if not result.get('success'):
+            raise Exception(result.get('error') or '하류 배출량 재계산 실패')
+        
+        logger.info(f"✅ 공정 {len(process_ids)}개 일괄 재계산 완료: {len(result.get('updated_process_ids', []))}개 공정 업데이트")
+        return result
+    
     # ============================================================================
     # 🔍 내부 헬퍼 메서드들
     # ============================================================================
@@ -298,31 +406,11 @@ class CalculationService:
         return propagated, new_target_em, formula
     
     async def _check_circular_reference(self, source_id: int, target_id: int) -> bool:
-        """순환 참조 검증 (DFS 기반)"""
+        """순환 참조 검증 (continue 엣지 기준, 인메모리 인덱스 또는 재귀 CTE 1회)"""
         try:
-            visited = set()
-            path = []
-            
-            async def dfs(current_id: int, target: int) -> bool:
-                if current_id == target:
-                    return True
-                if current_id in visited:
-                    return False
-                
-                visited.add(current_id)
-                path.append(current_id)
-                
-                # 현재 공정에서 나가는 continue 엣지들 찾기
-                outgoing_edges = await self.calc_repository.get_outgoing_continue_edges(current_id)
-                
-                for edge in outgoing_edges:
-                    if await dfs(edge['target_id'], target):
-                        return True
-                
-                path.pop()
-                return False
-            
-            return await dfs(target_id, source_id)
+            return await self.edge_service.check_edge_cycle(
+                'process', source_id, 'process', target_id, edge_kinds=['continue']
+            )
             
         except Exception as e:
             logger.warning(f"⚠️ 순환 참조 검증 중 오류: {str(e)}")
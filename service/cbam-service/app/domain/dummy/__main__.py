@@ -0,0 +1,7 @@
+# ============================================================================
+# 🖥️ Dummy CLI - python -m app.domain.dummy --excel 실적.xlsx
+# ============================================================================
+
+from app.domain.dummy.dummy_ingest import main
+
+raise SystemExit(main())
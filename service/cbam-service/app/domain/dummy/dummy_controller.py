@@ -2,11 +2,19 @@
 # �� Dummy Controller - 핵심 기능만 포함
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+import json
+import asyncio
 import logging
-from typing import List
+from typing import List, Optional
+from datetime import date
 
-from app.domain.dummy.dummy_service import DummyService
+from app.common.pagination import MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
+from app.common.text_search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+from app.domain.dummy.dummy_ingest import INGEST_CHUNK_SIZE, ExcelDummyReader
+from app.domain.dummy.dummy_repository import DUMMY_COLUMNS
+from app.domain.dummy.dummy_service import DummyService, EXPORT_FORMATS
 
 logger = logging.getLogger(__name__)
 
@@ -45,21 +53,111 @@ async def ensure_service_initialized():
 # ============================================================================
 
 @router.get("", response_model=List[dict])
-async def get_all_dummy_data():
-    """Dummy 테이블의 모든 데이터 조회"""
+async def get_all_dummy_data(
+    response: Response,
+    start_date: Optional[date] = Query(None, description="기간 시작 (종료일이 이 날짜 이후인 로트)"),
+    end_date: Optional[date] = Query(None, description="기간 종료 (투입일이 이 날짜 이전인 로트)"),
+    process_name: Optional[str] = Query(None, description="공정"),
+    product_name: Optional[str] = Query(None, description="생산품명"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT, description="페이지 크기 (없으면 전체)"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값")
+):
+    """Dummy 테이블 데이터 조회 (id 역순 키셋 페이지네이션)"""
     try:
-        logger.info("🎭 전체 더미 데이터 조회 요청")
+        logger.info(f"🎭 더미 데이터 조회 요청: limit={limit}, 기간={start_date}~{end_date}")
+        cursor = decode_cursor(after)
         
         dummy_service = await ensure_service_initialized()
-        all_data = await dummy_service.get_all_dummy_data()
+        all_data = await dummy_service.get_all_dummy_data(
+            cursor[0] if cursor else None, fetch_limit(limit), start_date, end_date, process_name, product_name
+        )
+        all_data = await respond_page(
+            response, all_data, limit, lambda d: [d['id']], first_page=cursor is None,
+            estimate=lambda: dummy_service.estimate_dummy_data_count(start_date, end_date, process_name, product_name)
+        )
         
-        logger.info(f"✅ 전체 더미 데이터 조회 성공: {len(all_data)}개")
+        logger.info(f"✅ 더미 데이터 조회 성공: {len(all_data)}개")
         return all_data
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 전체 더미 데이터 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
+@router.get("/search", response_model=List[dict])
+async def search_dummy_data(
+    q: str = Query(..., min_length=1, description="검색어 (로트번호/생산품명/공정/투입물명)"),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, description="최대 결과 수"),
+    fuzzy: bool = Query(False, description="오타 허용 검색 (유사도 기반)")
+):
+    """Dummy 데이터 검색 (관련도 순)"""
+    try:
+        logger.info(f"🔍 더미 데이터 검색 요청: '{q}' (fuzzy={fuzzy})")
+        dummy_service = await ensure_service_initialized()
+        results = await dummy_service.search_dummy_data(q, limit, fuzzy)
+        logger.info(f"✅ 더미 데이터 검색 성공: '{q}' → {len(results)}개")
+        return [result.dict() for result in results]
+    except Exception as e:
+        logger.error(f"❌ 더미 데이터 검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+@router.get("/export")
+async def export_dummy_data(
+    format: str = Query('ndjson', description="내보내기 형식 (ndjson/csv)"),
+    columns: Optional[str] = Query(None, description="쉼표로 구분한 컬럼 목록 (없으면 전체)"),
+    start_date: Optional[date] = Query(None, description="기간 시작 (종료일이 이 날짜 이후인 로트)"),
+    end_date: Optional[date] = Query(None, description="기간 종료 (투입일이 이 날짜 이전인 로트)"),
+    process_name: Optional[str] = Query(None, description="공정"),
+    product_name: Optional[str] = Query(None, description="생산품명")
+):
+    """Dummy 테이블 스트리밍 내보내기 (서버 측 커서, NDJSON/CSV)"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (ndjson/csv)")
+    selected = [column.strip() for column in columns.split(',') if column.strip()] if columns else list(DUMMY_COLUMNS)
+    unknown = [column for column in selected if column not in DUMMY_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 컬럼: {unknown} (사용 가능: {', '.join(DUMMY_COLUMNS)})")
+    
+    logger.info(f"📤 더미 데이터 내보내기 요청: {format}, 컬럼 {len(selected)}개, 기간={start_date}~{end_date}")
+    dummy_service = await ensure_service_initialized()
+    media_type = 'text/csv; charset=utf-8' if format == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(
+        dummy_service.export_dummy_data(format, selected, start_date, end_date, process_name, product_name),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="dummy_export.{format}"'}
+    )
+
+@router.post("/import")
+async def import_dummy_excel(
+    file: UploadFile = File(..., description="ERP 생산 실적 엑셀(.xlsx)"),
+    chunk_size: int = Query(INGEST_CHUNK_SIZE, ge=100, le=50000, description="COPY 청크 크기"),
+    stream: bool = Query(False, description="true면 청크마다 진행 상황을 NDJSON으로 스트리밍")
+):
+    """ERP 엑셀 스트리밍 적재 (read_only 파싱 + 청크 COPY, 행 단위 오류 기록)"""
+    logger.info(f"📥 더미 데이터 엑셀 적재 요청: {file.filename} (chunk_size={chunk_size}, stream={stream})")
+    try:
+        reader = await asyncio.to_thread(ExcelDummyReader, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    dummy_service = await ensure_service_initialized()
+    events = dummy_service.ingest_excel(reader, chunk_size)
+    if stream:
+        async def ndjson():
+            async for event in events:
+                yield json.dumps(event, ensure_ascii=False) + '\n'
+        return StreamingResponse(ndjson(), media_type='application/x-ndjson')
+    
+    try:
+        result = {}
+        async for event in events:
+            result = event
+        return result
+    except Exception as e:
+        logger.error(f"❌ 더미 데이터 엑셀 적재 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
 @router.get("/products/names", response_model=List[str])
 async def get_dummy_product_names():
     """Dummy 테이블에서 고유한 제품명 목록 조회"""
@@ -0,0 +1,275 @@
+# ============================================================================
+# 📥 Dummy Ingest - ERP 엑셀 스트리밍 적재
+# ============================================================================
+
+"""
+ERP 월별 생산 실적 엑셀(.xlsx)을 dummy 테이블로 적재합니다.
+
+- openpyxl read_only 모드로 행을 하나씩 읽어 chunk_size개씩 COPY(copy_records_to_table)로 적재
+  (워크북 전체나 전체 행 목록을 메모리에 올리지 않으므로 행 수와 무관하게 메모리 사용량 일정)
+- 헤더는 HEADER_SYNONYMS로 표준 컬럼명에 맞추고, 필수 헤더가 모두 있는 첫 시트를 사용
+- 값이 잘못된 행은 적재하지 않고 (엑셀 행 번호, 사유)로 기록
+- 청크 단위로 커밋 (중간에 실패해도 앞선 청크는 유지, 진행 상황은 청크마다 보고)
+
+CLI:
+  DATABASE_URL=postgresql://... python -m app.domain.dummy --excel 실적.xlsx [--chunk-size 5000]
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import logging
+from decimal import Decimal, InvalidOperation
+from datetime import datetime, date
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 표준 컬럼명 → 엑셀 헤더 동의어 (앞쪽이 우선)
+HEADER_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    '주문처명': ('주문처명', '주문처', '발주처', '고객사', '거래처'),
+    '오더번호': ('오더번호', '오더 번호', '로트번호', '로트 번호', 'LOT', 'Lot', 'lot', 'Lot No', 'LOT No', 'LotNo', 'Lot Number', 'lot number'),
+    '로트번호': ('로트번호', 'LOT', 'Lot', 'lot', '로트 번호'),
+    '생산품명': ('생산품명', '제품명', '생산품'),
+    '생산수량': ('생산수량', '생산 수량'),
+    '투입일': ('투입일', '시작일', '입력일'),
+    '종료일': ('종료일', '완료일', '출고일'),
+    '공정': ('공정', '프로세스', 'Process'),
+    '투입물명': ('투입물명', '원료/연료명', '원료명', '연료명', '투입물'),
+    '수량': ('수량', '투입량', '투입 수량'),
+    '투입물_단위': ('투입물_단위', '투입물.단위', '투입 단위', '단위'),
+    '단위': ('단위',),
+}
+
+REQUIRED_HEADERS = ('로트번호', '생산품명', '생산수량', '투입일', '종료일', '공정', '투입물명', '수량')
+
+# COPY 컬럼 순서 (build_record()가 만드는 튜플 순서와 동일)
+INGEST_COLUMNS = (
+    '로트번호', '생산품명', '생산수량', '투입일', '종료일', '공정', '투입물명', '수량', '단위',
+    '주문처명', '오더번호', '투입물_단위'
+)
+
+INGEST_CHUNK_SIZE = 5000
+# 헤더 행을 찾는 범위 (시트 앞쪽 행)
+HEADER_SCAN_ROWS = 20
+
+# dummy 테이블 컬럼 제약 (varchar 길이, NUMERIC(10,2), INTEGER)
+_TEXT_LIMITS = {'로트번호': 100, '생산품명': 200, '공정': 100, '투입물명': 200, '단위': 50}
+_NUMERIC_LIMIT = Decimal('100000000')
+_INT_LIMIT = 2 ** 31 - 1
+
+DEFAULT_UNIT = 'ton'
+
+# ============================================================================
+# 🔧 헤더 / 값 정규화
+# ============================================================================
+
+def _header_text(value: Any) -> str:
+    return ' '.join(str(value).split()) if value is not None else ''
+
+
+def normalize_header_map(headers: List[str]) -> Dict[str, int]:
+    """엑셀 헤더 → 표준 컬럼명별 열 위치"""
+    positions = {header: index for index, header in reversed(list(enumerate(headers))) if header}
+    result: Dict[str, int] = {}
+    for canonical, synonyms in HEADER_SYNONYMS.items():
+        for synonym in synonyms:
+            if synonym in positions:
+                result[canonical] = positions[synonym]
+                break
+    return result
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """날짜 셀 변환 (date/datetime, YYYY-MM-DD, YYYY.MM.DD, YYYY/MM/DD, YYYY-MM → 1일) - 형식 오류는 ValueError"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    parts = text.replace('.', '-').replace('/', '-').split('-')
+    if len(parts) == 2:
+        parts.append('1')
+    try:
+        return date(*(int(part) for part in parts))
+    except (TypeError, ValueError):
+        raise ValueError(f"날짜 형식이 아닙니다: {text}")
+
+
+def to_numeric(value: Any) -> Optional[Decimal]:
+    """숫자 셀 변환 (천 단위 쉼표 허용) - 형식 오류는 ValueError"""
+    if value is None:
+        return None
+    text = str(value).strip().replace(',', '')
+    if not text:
+        return None
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"숫자가 아닙니다: {value}")
+    if not number.is_finite() or abs(number) >= _NUMERIC_LIMIT:
+        raise ValueError(f"숫자 범위를 벗어났습니다: {value}")
+    return number
+
+
+def to_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def to_int(value: Any) -> Optional[int]:
+    """정수 셀 변환 (문자열이면 숫자만 추출 - 예: 'LOT-0012' → 12, 없으면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        number = value
+    elif isinstance(value, float) and value.is_integer():
+        number = int(value)
+    else:
+        digits = ''.join(ch for ch in str(value) if ch.isdigit())
+        if not digits:
+            return None
+        number = int(digits)
+    return number if number <= _INT_LIMIT else None
+
+
+def build_record(row: Tuple[Any, ...], header_map: Dict[str, int]) -> tuple:
+    """엑셀 행 → INGEST_COLUMNS 순서 튜플 (잘못된 값은 ValueError)"""
+    def get(key: str) -> Any:
+        index = header_map.get(key)
+        return row[index] if index is not None and index < len(row) else None
+
+    values: Dict[str, Any] = {
+        '로트번호': to_text(get('로트번호')),
+        '생산품명': to_text(get('생산품명')),
+        '생산수량': to_numeric(get('생산수량')),
+        '투입일': parse_date(get('투입일')),
+        '종료일': parse_date(get('종료일')),
+        '공정': to_text(get('공정')),
+        '투입물명': to_text(get('투입물명')),
+        '수량': to_numeric(get('수량')),
+        '단위': to_text(get('투입물_단위')) or to_text(get('단위')) or DEFAULT_UNIT,
+        '주문처명': to_text(get('주문처명')),
+        '오더번호': to_int(get('오더번호')),
+        '투입물_단위': to_text(get('투입물_단위')) or DEFAULT_UNIT,
+    }
+
+    missing = [key for key in ('로트번호', '생산품명', '생산수량', '공정', '투입물명', '수량') if values[key] is None]
+    if missing:
+        raise ValueError(f"필수 값이 비어 있습니다: {', '.join(missing)}")
+    too_long = [key for key, limit in _TEXT_LIMITS.items() if len(values[key]) > limit]
+    if too_long:
+        raise ValueError(f"허용 길이를 넘었습니다: {', '.join(too_long)}")
+    return tuple(values[column] for column in INGEST_COLUMNS)
+
+# ============================================================================
+# 📖 엑셀 스트리밍 리더
+# ============================================================================
+
+class ExcelDummyReader:
+    """read_only 워크북에서 필수 헤더가 있는 첫 시트를 찾아 행 단위로 읽는 리더"""
+
+    def __init__(self, source: Union[str, BinaryIO]):
+        # 서비스 기본 기능에는 필요 없으므로 적재 시에만 import
+        from openpyxl import load_workbook
+
+        try:
+            self.workbook = load_workbook(source, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValueError(f"엑셀(.xlsx) 파일을 열 수 없습니다: {e}")
+
+        self.sheet = None
+        self.header_map: Dict[str, int] = {}
+        self.header_row = 0
+        for sheet in self.workbook.worksheets:
+            for row_no, row in enumerate(sheet.iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True), start=1):
+                if not row or all(cell is None for cell in row):
+                    continue
+                header_map = normalize_header_map([_header_text(cell) for cell in row])
+                if all(key in header_map for key in REQUIRED_HEADERS):
+                    self.sheet, self.header_map, self.header_row = sheet, header_map, row_no
+                break
+            if self.sheet is not None:
+                break
+
+        if self.sheet is None:
+            self.close()
+            raise ValueError(f"필수 헤더가 있는 시트를 찾지 못했습니다 (필수: {', '.join(REQUIRED_HEADERS)})")
+        logger.info(f"📥 엑셀 시트 '{self.sheet.title}' 사용 (헤더 {self.header_row}행)")
+
+    def rows(self) -> Iterator[Tuple[int, Union[tuple, str]]]:
+        """(엑셀 행 번호, 레코드 튜플 또는 오류 메시지) - 빈 행은 건너뜀"""
+        start = self.header_row + 1
+        for row_no, row in enumerate(self.sheet.iter_rows(min_row=start, values_only=True), start=start):
+            if not row or all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in row):
+                continue
+            try:
+                yield row_no, build_record(row, self.header_map)
+            except ValueError as e:
+                yield row_no, str(e)
+
+    def close(self):
+        self.workbook.close()
+
+
+def read_chunk(rows: Iterator[Tuple[int, Union[tuple, str]]], size: int) -> List[Tuple[int, Union[tuple, str]]]:
+    """rows에서 최대 size개를 꺼냄 (스레드에서 실행해 이벤트 루프를 막지 않음)"""
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+# ============================================================================
+# 🖥️ CLI
+# ============================================================================
+
+async def _run_cli(excel_path: str, chunk_size: int) -> int:
+    from app.common.database_pool import get_pool_manager
+    from app.domain.dummy.dummy_service import DummyService
+
+    service = DummyService()
+    try:
+        await service.initialize()
+        reader = await asyncio.to_thread(ExcelDummyReader, excel_path)
+        result: Dict[str, Any] = {}
+        async for event in service.ingest_excel(reader, chunk_size):
+            result = event
+            print(
+                f"{'완료' if event['done'] else '진행'}: 읽음 {event['rows_read']}행, "
+                f"적재 {event['inserted_count']}행, 오류 {event['failed_count']}행 ({event['elapsed_seconds']}초)",
+                flush=True
+            )
+        for error in result.get('errors', []):
+            print(f"  {error['row']}행: {error['error']}", file=sys.stderr)
+        return 0 if result.get('inserted_count') else 3
+    finally:
+        await get_pool_manager().close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='ERP 엑셀을 dummy 테이블로 스트리밍 적재')
+    parser.add_argument('--excel', required=True, help='엑셀(.xlsx) 파일 경로')
+    parser.add_argument('--chunk-size', type=int, default=INGEST_CHUNK_SIZE, help='COPY 청크 크기')
+    args = parser.parse_args(argv)
+
+    if not os.getenv('DATABASE_URL'):
+        print('DATABASE_URL 환경변수가 설정되지 않았습니다.', file=sys.stderr)
+        return 2
+    if not os.path.exists(args.excel):
+        print(f'엑셀 파일이 없습니다: {args.excel}', file=sys.stderr)
+        return 2
+
+    try:
+        return asyncio.run(_run_cli(args.excel, max(1, args.chunk_size)))
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 3
@@ -4,30 +4,44 @@
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime, date
 from decimal import Decimal
 import asyncpg
 import asyncio
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+from app.common.text_search import TrigramSearch, ensure_trigram_indexes
+from app.domain.dummy.dummy_ingest import INGEST_COLUMNS
+from app.domain.dummy.dummy_rollup import ensure_period_rollup, period_months, rollup_available, rollup_names_query
+
 logger = logging.getLogger(__name__)
 
+# 내보내기에서 선택할 수 있는 컬럼 (SQL에 그대로 들어가므로 이 목록 밖의 이름은 허용하지 않음)
+DUMMY_COLUMNS = (
+    'id', '로트번호', '생산품명', '생산수량', '투입일', '종료일', '공정', '투입물명', '수량', '단위',
+    '주문처명', '오더번호', '투입물_단위', 'created_at', 'updated_at'
+)
+
+# 서버 측 커서에서 한 번에 가져오는 행 수
+EXPORT_BATCH_SIZE = 2000
+
+# 검색 대상 컬럼 (관련도 동률이면 첫 컬럼 기준 정렬)
+SEARCH_COLUMNS = ('로트번호', '생산품명', '공정', '투입물명')
+
 class DummyRepository:
     """Dummy 데이터 접근 클래스 (asyncpg 연결 풀)"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
-        # 공유 풀 사용으로 동시 연결 초과 방지
-        if not hasattr(DummyRepository, "_shared_pool"):
-            DummyRepository._shared_pool = None  # type: ignore[attr-defined]
-        if not hasattr(DummyRepository, "_shared_init_attempted"):
-            DummyRepository._shared_init_attempted = False  # type: ignore[attr-defined]
-
-        self.pool: Optional[asyncpg.Pool] = DummyRepository._shared_pool  # type: ignore[attr-defined]
-        self._initialization_attempted = DummyRepository._shared_init_attempted  # type: ignore[attr-defined]
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
+        self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -37,29 +51,19 @@ class DummyRepository:
             return
         
         self._initialization_attempted = True
-        DummyRepository._shared_init_attempted = True  # type: ignore[attr-defined]
         
         try:
-            if DummyRepository._shared_pool is not None:  # type: ignore[attr-defined]
-                self.pool = DummyRepository._shared_pool  # type: ignore[attr-defined]
-                logger.info("♻️ Dummy 공유 커넥션 풀 재사용")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
                 return
-
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-dummy'
-                }
-            )
-            logger.info("✅ Dummy 데이터베이스 연결 풀 생성 성공")
-            DummyRepository._shared_pool = self.pool  # type: ignore[attr-defined]
             
-            # 테이블 생성은 선택적으로 실행
+            logger.info("✅ Dummy 공용 연결 풀 연결 성공")
+            
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_dummy_table_async()
+                await self.pool_manager.run_once('dummy.dummy_table', self._create_dummy_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -128,6 +132,15 @@ class DummyRepository:
                 logger.info("✅ dummy 테이블 생성 완료")
             else:
                 logger.info("✅ dummy 테이블이 이미 존재합니다.")
+            
+            # 기간 필터(투입일/종료일)용 인덱스
+            await self.pool.execute("CREATE INDEX IF NOT EXISTS idx_dummy_투입일 ON dummy(투입일);")
+            await self.pool.execute("CREATE INDEX IF NOT EXISTS idx_dummy_종료일 ON dummy(종료일);")
+            # 로트/생산품/공정/투입물 검색용 트라이그램 인덱스
+            await ensure_trigram_indexes(self.pool, 'dummy', SEARCH_COLUMNS)
+            # 기간별 제품/공정 목록용 (기간월, 생산품명, 공정) 집계 테이블과 유지 트리거
+            async with self.pool.acquire() as conn:
+                await ensure_period_rollup(conn)
                 
         except Exception as e:
             logger.error(f"❌ dummy 테이블 생성 실패: {str(e)}")
@@ -197,52 +210,6 @@ class DummyRepository:
             logger.error(f"❌ Dummy 데이터 조회 실패: {e}")
             return None
 
-    async def get_all_dummy_data(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """모든 Dummy 데이터 조회 (페이징)
-
-        주의: PostgreSQL NUMERIC/DATE 타입은 asyncpg에서 Decimal/date 객체로 반환된다.
-        프론트엔드가 일관되게 사용할 수 있도록 여기서 숫자/날짜를 문자열/float로 안전 변환한다.
-        """
-        if not self.pool:
-            logger.warning("⚠️ 연결 풀이 초기화되지 않았습니다.")
-            return []
-        
-        try:
-            query = "SELECT * FROM dummy ORDER BY id DESC LIMIT $1 OFFSET $2;"
-            rows = await self.pool.fetch(query, limit, offset)
-            
-            # Record들을 딕셔너리로 변환 + 캐스팅
-            data_list: List[Dict[str, Any]] = []
-            for row in rows:
-                item = dict(row)
-                # 숫자 캐스팅: 생산수량, 수량은 float로
-                try:
-                    if '생산수량' in item and item['생산수량'] is not None:
-                        # Decimal -> float
-                        item['생산수량'] = float(item['생산수량'])
-                except Exception:
-                    pass
-                try:
-                    if '수량' in item and item['수량'] is not None:
-                        item['수량'] = float(item['수량'])
-                except Exception:
-                    pass
-                # 날짜 캐스팅: date -> ISO 문자열
-                for date_key in ('투입일', '종료일'):
-                    try:
-                        if date_key in item and item[date_key] is not None:
-                            item[date_key] = item[date_key].isoformat()
-                    except Exception:
-                        pass
-                data_list.append(item)
-            
-            logger.info(f"✅ Dummy 데이터 목록 조회 성공: {len(data_list)}개")
-            return data_list
-            
-        except Exception as e:
-            logger.error(f"❌ Dummy 데이터 목록 조회 실패: {e}")
-            return []
-
     async def update_dummy_data(self, data_id: int, data: Dict[str, Any]) -> bool:
         """Dummy 데이터 수정"""
         if not self.pool:
@@ -310,26 +277,26 @@ class DummyRepository:
             logger.error(f"❌ Dummy 데이터 삭제 실패: {e}")
             return False
 
-    async def search_dummy_data(self, search_term: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Dummy 데이터 검색"""
+    async def search_dummy_data(self, search_term: str, limit: int = 100, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """Dummy 데이터 검색 (로트번호/생산품명/공정/투입물명, fuzzy면 오타 허용 - 관련도 순)"""
         if not self.pool:
             logger.warning("⚠️ 연결 풀이 초기화되지 않았습니다.")
             return []
+        if not search_term.strip():
+            return []
         
         try:
-            # 여러 필드에서 검색
-            query = """
-                SELECT * FROM dummy
-                WHERE 로트번호 ILIKE $1 
-                   OR 생산품명 ILIKE $1 
-                   OR 공정 ILIKE $1 
-                   OR 투입물명 ILIKE $1
-                ORDER BY id DESC
-                LIMIT $2;
-            """
-            
-            search_pattern = f"%{search_term}%"
-            rows = await self.pool.fetch(query, search_pattern, limit)
+            # 여러 필드에서 검색 (동률이면 최신 순)
+            search = TrigramSearch(SEARCH_COLUMNS, search_term, fuzzy)
+            query = KeysetQuery()
+            order_sql = search.apply(query)
+            async with self.pool.acquire() as conn:
+                rows = await search.fetch(conn, f"""
+                    SELECT * FROM dummy
+                    {query.where_sql}
+                    {order_sql}, id DESC
+                    {query.limit_sql(limit)};
+                """, query)
             
             # Record들을 딕셔너리로 변환
             data_list = [dict(row) for row in rows]
@@ -358,57 +325,155 @@ class DummyRepository:
             logger.error(f"❌ Dummy 데이터 개수 조회 실패: {e}")
             return 0
     
-    async def get_all_dummy_data(self) -> List[dict]:
-        """전체 더미 데이터 조회
+    @staticmethod
+    def _to_response_row(row) -> Dict[str, Any]:
+        """프론트 소비를 위한 캐스팅 (NUMERIC -> float, DATE -> ISO 문자열)"""
+        item = dict(row)
+        for number_key in ('생산수량', '수량'):
+            if item.get(number_key) is not None:
+                item[number_key] = float(item[number_key])
+        for date_key in ('투입일', '종료일'):
+            if item.get(date_key) is not None:
+                item[date_key] = item[date_key].isoformat()
+        return item
+
+    def _dummy_filters(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> KeysetQuery:
+        """더미 데이터 필터 조건 (기간과 겹치는 로트: 종료일 >= 시작, 투입일 <= 종료 / 공정·생산품명 일치)"""
+        return (
+            KeysetQuery()
+            .where("종료일 >= {}", start_date)
+            .where("투입일 <= {}", end_date)
+            .where("공정 = {}", process_name)
+            .where("생산품명 = {}", product_name)
+        )
 
-        주의: 프론트 소비를 위해 숫자/날짜 캐스팅을 동일하게 적용한다.
+    async def get_all_dummy_data(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> List[dict]:
+        """더미 데이터 조회 (id 역순 키셋 페이지네이션 - limit이 없으면 전체)
+
+        주의: 프론트 소비를 위해 숫자/날짜 캐스팅을 적용한다.
         """
         if not self.pool:
             logger.warning("⚠️ 연결 풀이 초기화되지 않았습니다.")
             return []
         
         try:
-            query = """
+            query = self._dummy_filters(start_date, end_date, process_name, product_name).after(
+                ['id'], [after_id] if after_id is not None else None, descending=True
+            )
+            rows = await self.pool.fetch(f"""
                 SELECT 
                     id, 로트번호, 생산품명, 생산수량, 
                     투입일, 종료일, 공정, 투입물명, 수량, 단위,
                     주문처명, 오더번호, 투입물_단위,
                     created_at, updated_at
                 FROM dummy 
-                ORDER BY id DESC;
-            """
-            rows = await self.pool.fetch(query)
+                {query.where_sql}
+                ORDER BY id DESC
+                {query.limit_sql(limit)};
+            """, *query.args)
             
-            data_list: List[Dict[str, Any]] = []
-            for row in rows:
-                item = dict(row)
-                # 숫자 캐스팅
-                try:
-                    if '생산수량' in item and item['생산수량'] is not None:
-                        item['생산수량'] = float(item['생산수량'])
-                except Exception:
-                    pass
-                try:
-                    if '수량' in item and item['수량'] is not None:
-                        item['수량'] = float(item['수량'])
-                except Exception:
-                    pass
-                # 날짜 캐스팅
-                for date_key in ('투입일', '종료일'):
-                    try:
-                        if date_key in item and item[date_key] is not None:
-                            item[date_key] = item[date_key].isoformat()
-                    except Exception:
-                        pass
-                data_list.append(item)
+            data_list = [self._to_response_row(row) for row in rows]
             
-            logger.info(f"✅ 전체 더미 데이터 조회 성공: {len(data_list)}개")
+            logger.info(f"✅ 더미 데이터 조회 성공: {len(data_list)}개")
             return data_list
             
         except Exception as e:
-            logger.error(f"❌ 전체 더미 데이터 조회 실패: {e}")
+            logger.error(f"❌ 더미 데이터 조회 실패: {e}")
             return []
 
+    async def estimate_dummy_data_count(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> Optional[int]:
+        """필터에 맞는 더미 데이터 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        if not self.pool:
+            return None
+        async with self.pool.acquire() as conn:
+            return await estimate_count(
+                conn, "FROM dummy", self._dummy_filters(start_date, end_date, process_name, product_name)
+            )
+
+    async def stream_dummy_data(
+        self,
+        columns: Sequence[str] = DUMMY_COLUMNS,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """더미 데이터를 서버 측 커서로 batch_size행씩 조회 (전체를 메모리에 올리지 않음)
+
+        읽기 전용 REPEATABLE READ 트랜잭션 하나에서 읽으므로 내보내는 동안 변경이 있어도 일관된 스냅샷을 반환합니다.
+        내보내기가 끝날(또는 클라이언트가 끊길) 때까지 연결 1개를 점유합니다.
+        """
+        await self._ensure_pool_initialized()
+        unknown = [column for column in columns if column not in DUMMY_COLUMNS]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼: {unknown}")
+        
+        query = self._dummy_filters(start_date, end_date, process_name, product_name)
+        select_list = ', '.join(f'"{column}"' for column in columns)
+        async with self.pool.acquire() as conn:
+            async with conn.transaction(isolation='repeatable_read', readonly=True):
+                cursor = await conn.cursor(
+                    f"SELECT {select_list} FROM dummy {query.where_sql} ORDER BY id", *query.args
+                )
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    async def copy_dummy_rows(self, records: List[Tuple[int, tuple]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """(행 번호, INGEST_COLUMNS 튜플) 청크를 COPY로 적재 (청크 1개 = 트랜잭션 1개)
+
+        COPY가 실패하면(제약 위반 등) 같은 청크를 행마다 SAVEPOINT로 다시 넣어 실패한 행만 골라냅니다.
+        반환: (적재 행 수, [(행 번호, 오류 메시지)])
+        """
+        await self._ensure_pool_initialized()
+        
+        async with self.pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    await conn.copy_records_to_table(
+                        'dummy', records=[record for _, record in records], columns=INGEST_COLUMNS
+                    )
+                return len(records), []
+            except asyncpg.PostgresError as e:
+                logger.warning(f"⚠️ 청크 COPY 실패 - 행 단위로 다시 적재합니다: {e}")
+            
+            inserted = 0
+            errors: List[Tuple[int, str]] = []
+            columns = ', '.join(f'"{column}"' for column in INGEST_COLUMNS)
+            placeholders = ', '.join(f'${i + 1}' for i in range(len(INGEST_COLUMNS)))
+            async with conn.transaction():
+                for row_no, record in records:
+                    try:
+                        async with conn.transaction():
+                            await conn.execute(f"INSERT INTO dummy ({columns}) VALUES ({placeholders})", *record)
+                        inserted += 1
+                    except asyncpg.PostgresError as e:
+                        errors.append((row_no, str(e)))
+            return inserted, errors
+
     async def get_unique_product_names(self) -> List[str]:
         """고유한 제품명 목록 조회"""
         if not self.pool:
@@ -429,6 +494,21 @@ class DummyRepository:
             logger.error(f"❌ 고유 제품명 목록 조회 실패: {e}")
             return []
 
+    async def _fetch_period_rollup_names(
+        self,
+        column: str,
+        start: date,
+        end: date,
+        product_name: Optional[str] = None
+    ) -> List[str]:
+        """기간이 겹치는 로트의 고유 column 값 (dummy_period_rollup 기반, 기존 기간 겹침 조건과 같은 결과)"""
+        full_from, full_to, partial = period_months(start, end)
+        args = [start, end, full_from, full_to, partial]
+        if product_name is not None:
+            args.append(product_name)
+        rows = await self.pool.fetch(rollup_names_query(column, product_name is not None), *args)
+        return [row[column] for row in rows]
+
     async def get_unique_product_names_by_period(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
         """기간별 고유한 제품명 목록 조회"""
         if not self.pool:
@@ -465,6 +545,11 @@ class DummyRepository:
                 )"""
                 params.extend([start_date_obj, end_date_obj])
                 
+                if rollup_available():
+                    product_names = await self._fetch_period_rollup_names('생산품명', start_date_obj, end_date_obj)
+                    logger.info(f"✅ 기간별 제품명 목록 조회 성공 (집계): {start_date} ~ {end_date} - {len(product_names)}개")
+                    return product_names
+                
             elif start_date:
                 try:
                     from datetime import datetime
@@ -562,6 +647,11 @@ class DummyRepository:
                 )"""
                 params.extend([start_period_obj, end_period_obj])
                 
+                if rollup_available():
+                    process_names = await self._fetch_period_rollup_names('공정', start_period_obj, end_period_obj)
+                    logger.info(f"✅ 기간별 공정명 목록 조회 성공 (집계): {start_period} ~ {end_period} - {len(process_names)}개")
+                    return process_names
+                
             elif start_period:
                 try:
                     from datetime import datetime
@@ -641,6 +731,11 @@ class DummyRepository:
                 logger.error(f"❌ 날짜 형식 오류: {start_period} 또는 {end_period} - {e}")
                 return []
 
+            if rollup_available():
+                processes = await self._fetch_period_rollup_names('공정', start_period_obj, end_period_obj, product_name)
+                logger.info(f"✅ 제품 '{product_name}' 기간별 공정 목록 조회 성공 (집계): {len(processes)}개")
+                return processes
+
             query = """
                 SELECT DISTINCT 공정
                 FROM dummy
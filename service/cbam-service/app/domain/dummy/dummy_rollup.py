@@ -0,0 +1,204 @@
+# ============================================================================
+# 📊 Dummy Rollup - (기간월, 생산품명, 공정) 집계 테이블
+# ============================================================================
+
+"""
+경계 설정 화면의 기간별 제품/공정 드롭다운은 dummy 전체를 SELECT DISTINCT 하는 대신
+dummy_period_rollup(기간월, 생산품명, 공정, 건수, 생산수량_합계, 수량_합계)을 읽습니다.
+
+- 각 dummy 행은 투입일~종료일이 걸친 모든 달에 집계 (한쪽 날짜만 있으면 그 달,
+  투입일 > 종료일이면 두 날짜의 달에만 집계 - 기존 기간 겹침 조건과 같은 의미)
+- dummy INSERT(COPY 포함)/UPDATE/DELETE/TRUNCATE 때 문장 단위 트리거가 변경분을 합산해 반영
+- 조회 기간에 완전히 포함되는 달은 집계만으로 응답하고, 걸쳐 있는 앞뒤 달의 후보만
+  dummy의 (생산품명, 공정, 날짜) 인덱스로 실제 겹침을 확인 (결과는 기존 쿼리와 동일)
+
+생산수량_합계는 행(로트 × 투입물) 단위 합계라 같은 로트의 생산수량이 투입물 수만큼 더해집니다.
+dummy의 생산품명/공정/수량은 NULL일 수 있어 집계 키에는 '', 합계에는 0으로 반영하고,
+목록에서는 빈 이름을 제외합니다 (기존 목록도 NULL과 빈 문자열을 제외).
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = 'dummy_period_rollup'
+
+# 집계 테이블 사용 가능 여부 (워커당 첫 부트스트랩에서 확인 - 실패하면 dummy를 직접 조회)
+_rollup_available: Optional[bool] = None
+
+
+def rollup_available() -> bool:
+    return bool(_rollup_available)
+
+
+_ROLLUP_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+        기간월 DATE NOT NULL,
+        생산품명 VARCHAR(200) NOT NULL,
+        공정 VARCHAR(100) NOT NULL,
+        건수 BIGINT NOT NULL DEFAULT 0,
+        생산수량_합계 NUMERIC NOT NULL DEFAULT 0,
+        수량_합계 NUMERIC NOT NULL DEFAULT 0,
+        PRIMARY KEY (기간월, 생산품명, 공정)
+    );
+    CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_product ON {ROLLUP_TABLE} (생산품명, 기간월, 공정);
+    -- 건수가 0이 된 행 정리용
+    CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_empty ON {ROLLUP_TABLE} (기간월) WHERE 건수 <= 0;
+
+    -- 걸쳐 있는 달의 후보 확인용 (생산품명, 공정)별 날짜 인덱스
+    CREATE INDEX IF NOT EXISTS idx_dummy_product_process_투입일 ON dummy (생산품명, 공정, 투입일);
+    CREATE INDEX IF NOT EXISTS idx_dummy_product_process_종료일 ON dummy (생산품명, 공정, 종료일);
+
+    CREATE OR REPLACE FUNCTION dummy_rollup_months(start_date DATE, end_date DATE)
+    RETURNS SETOF DATE LANGUAGE sql IMMUTABLE AS $$
+        SELECT DISTINCT month::date FROM (
+            SELECT generate_series(date_trunc('month', start_date), date_trunc('month', end_date), interval '1 month') AS month
+            WHERE start_date <= end_date
+            UNION ALL
+            SELECT date_trunc('month', start_date) WHERE start_date IS NOT NULL AND (end_date IS NULL OR start_date > end_date)
+            UNION ALL
+            SELECT date_trunc('month', end_date) WHERE end_date IS NOT NULL AND (start_date IS NULL OR start_date > end_date)
+        ) months
+    $$;
+
+    CREATE OR REPLACE FUNCTION dummy_period_rollup_apply() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+    DECLARE
+        changes TEXT;
+    BEGIN
+        changes := CASE TG_OP
+            WHEN 'INSERT' THEN 'SELECT 1 AS sign, * FROM new_rows'
+            WHEN 'DELETE' THEN 'SELECT -1 AS sign, * FROM old_rows'
+            ELSE 'SELECT 1 AS sign, * FROM new_rows UNION ALL SELECT -1 AS sign, * FROM old_rows'
+        END;
+        -- 키 순서로 반영 (동시 적재끼리 잠금 순서를 맞춰 교착 방지)
+        EXECUTE format($sql$
+            INSERT INTO {ROLLUP_TABLE} AS r (기간월, 생산품명, 공정, 건수, 생산수량_합계, 수량_합계)
+            SELECT month, COALESCE(c.생산품명, ''), COALESCE(c.공정, ''),
+                   SUM(c.sign), SUM(c.sign * COALESCE(c.생산수량, 0)), SUM(c.sign * COALESCE(c.수량, 0))
+            FROM (%s) c CROSS JOIN LATERAL dummy_rollup_months(c.투입일, c.종료일) AS month
+            GROUP BY 1, 2, 3
+            HAVING SUM(c.sign) <> 0 OR SUM(c.sign * COALESCE(c.생산수량, 0)) <> 0 OR SUM(c.sign * COALESCE(c.수량, 0)) <> 0
+            ORDER BY 1, 2, 3
+            ON CONFLICT (기간월, 생산품명, 공정) DO UPDATE
+            SET 건수 = r.건수 + EXCLUDED.건수,
+                생산수량_합계 = r.생산수량_합계 + EXCLUDED.생산수량_합계,
+                수량_합계 = r.수량_합계 + EXCLUDED.수량_합계
+        $sql$, changes);
+        IF TG_OP <> 'INSERT' THEN
+            DELETE FROM {ROLLUP_TABLE} WHERE 건수 <= 0;
+        END IF;
+        RETURN NULL;
+    END
+    $$;
+
+    CREATE OR REPLACE FUNCTION dummy_period_rollup_truncate() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+    BEGIN
+        TRUNCATE {ROLLUP_TABLE};
+        RETURN NULL;
+    END
+    $$;
+"""
+
+_ROLLUP_TRIGGERS = {
+    'dummy_period_rollup_insert':
+        "AFTER INSERT ON dummy REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION dummy_period_rollup_apply()",
+    'dummy_period_rollup_update':
+        "AFTER UPDATE ON dummy REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION dummy_period_rollup_apply()",
+    'dummy_period_rollup_delete':
+        "AFTER DELETE ON dummy REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION dummy_period_rollup_apply()",
+    'dummy_period_rollup_truncate':
+        "AFTER TRUNCATE ON dummy FOR EACH STATEMENT EXECUTE FUNCTION dummy_period_rollup_truncate()",
+}
+
+# ============================================================================
+# 🧱 부트스트랩
+# ============================================================================
+
+async def ensure_period_rollup(conn) -> bool:
+    """집계 테이블/함수/트리거 생성 (새로 만들었거나 트리거가 빠져 있었으면 dummy 전체로 다시 집계)"""
+    global _rollup_available
+    try:
+        async with conn.transaction():
+            # 여러 워커가 동시에 시작해도 한 곳에서만 생성/재집계
+            await conn.execute(f"SELECT pg_advisory_xact_lock(hashtext('{ROLLUP_TABLE}'))")
+            created = not await conn.fetchval(f"SELECT to_regclass('{ROLLUP_TABLE}') IS NOT NULL")
+            await conn.execute(_ROLLUP_DDL)
+
+            existing = {
+                row['tgname'] for row in await conn.fetch(
+                    "SELECT tgname FROM pg_trigger WHERE tgrelid = 'dummy'::regclass AND tgname = ANY($1::text[])",
+                    list(_ROLLUP_TRIGGERS)
+                )
+            }
+            missing = [name for name in _ROLLUP_TRIGGERS if name not in existing]
+            if created or missing:
+                # 재집계하는 동안 dummy 변경을 막아 트리거 생성 전후로 빠지는 행이 없게 함
+                await conn.execute("LOCK TABLE dummy IN SHARE ROW EXCLUSIVE MODE")
+                for name in missing:
+                    await conn.execute(f"CREATE TRIGGER {name} {_ROLLUP_TRIGGERS[name]}")
+                await conn.execute(f"TRUNCATE {ROLLUP_TABLE}")
+                await conn.execute(f"""
+                    INSERT INTO {ROLLUP_TABLE} (기간월, 생산품명, 공정, 건수, 생산수량_합계, 수량_합계)
+                    SELECT month, COALESCE(d.생산품명, ''), COALESCE(d.공정, ''),
+                           COUNT(*), COALESCE(SUM(d.생산수량), 0), COALESCE(SUM(d.수량), 0)
+                    FROM dummy d CROSS JOIN LATERAL dummy_rollup_months(d.투입일, d.종료일) AS month
+                    GROUP BY 1, 2, 3
+                """)
+                logger.info(f"📊 {ROLLUP_TABLE} 재집계 완료 (트리거 생성: {missing or '없음'})")
+        _rollup_available = True
+    except Exception as e:
+        _rollup_available = False
+        logger.warning(f"⚠️ {ROLLUP_TABLE} 준비 실패 - 기간별 목록은 dummy를 직접 조회합니다: {e}")
+    return bool(_rollup_available)
+
+# ============================================================================
+# 📅 조회 기간 → 집계 달 구분
+# ============================================================================
+
+def _add_months(day: date, months: int) -> date:
+    """day가 속한 달의 months개월 뒤 1일"""
+    year, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + year, month + 1, 1)
+
+
+def period_months(start: date, end: date) -> Tuple[date, date, List[date]]:
+    """조회 기간을 (완전히 포함되는 첫 달, 마지막 달, 걸쳐 있는 달 목록)으로 구분 (첫 달 > 마지막 달이면 완전한 달 없음)"""
+    end_of_month = _add_months(end, 1) - timedelta(days=1)
+    full_from = start.replace(day=1) if start.day == 1 else _add_months(start, 1)
+    full_to = end.replace(day=1) if end == end_of_month else _add_months(end, -1)
+    partial = sorted({
+        day.replace(day=1) for day, is_partial in ((start, start.day != 1), (end, end != end_of_month)) if is_partial
+    })
+    return full_from, full_to, partial
+
+
+def rollup_names_query(column: str, with_product: bool = False) -> str:
+    """기간(start=$1, end=$2) 안의 고유 column 값 쿼리 (인자: start, end, full_from, full_to, partial[, 생산품명])"""
+    product = " AND r.생산품명 = $6" if with_product else ""
+    # 집계 키 ''는 dummy의 NULL 또는 빈 문자열
+    same_key = " AND ".join(f"(d.{key} = r.{key} OR (r.{key} = '' AND d.{key} IS NULL))" for key in ('생산품명', '공정'))
+    overlap = " OR ".join(
+        f"EXISTS (SELECT 1 FROM dummy d WHERE {same_key} AND {condition})"
+        for condition in ("d.투입일 BETWEEN $1 AND $2", "d.종료일 BETWEEN $1 AND $2", "d.투입일 <= $2 AND d.종료일 >= $1")
+    )
+    # 완전한 달에서 이미 나온 값은 다시 확인하지 않음 (긴 기간이면 대부분 여기서 끝남)
+    return f"""
+        WITH full_values AS MATERIALIZED (
+            SELECT DISTINCT r.{column} FROM {ROLLUP_TABLE} r
+            WHERE r.기간월 BETWEEN $3 AND $4{product} AND r.{column} <> ''
+        ), candidates AS MATERIALIZED (
+            SELECT DISTINCT r.생산품명, r.공정 FROM {ROLLUP_TABLE} r
+            WHERE r.기간월 = ANY($5::date[]){product} AND r.{column} <> ''
+              AND r.{column} NOT IN (SELECT {column} FROM full_values)
+        )
+        SELECT {column} FROM full_values
+        UNION
+        SELECT r.{column} FROM candidates r
+        WHERE {overlap}
+        ORDER BY 1
+    """
@@ -2,16 +2,35 @@
 # 🎭 Dummy Service - Dummy 데이터 관리 서비스
 # ============================================================================
 
+import io
+import csv
+import json
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Sequence
 from decimal import Decimal
 from datetime import datetime, date
 
-from app.domain.dummy.dummy_repository import DummyRepository
+from app.domain.dummy.dummy_ingest import INGEST_CHUNK_SIZE, ExcelDummyReader, read_chunk
+from app.domain.dummy.dummy_repository import DummyRepository, DUMMY_COLUMNS
 from app.domain.dummy.dummy_schema import DummyDataCreateRequest, DummyDataUpdateRequest, DummyDataResponse
 
 logger = logging.getLogger(__name__)
 
+EXPORT_FORMATS = ('ndjson', 'csv')
+# 적재 결과에 담는 행 오류 최대 개수
+INGEST_MAX_ERRORS = 100
+
+
+def _export_value(value: Any) -> Any:
+    """내보내기용 값 변환 (NUMERIC -> float, 날짜/시각 -> ISO 문자열)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
 class DummyService:
     """Dummy 데이터 관리 서비스 (Repository 패턴)"""
     
@@ -62,16 +81,6 @@ class DummyService:
             logger.error(f"Dummy 데이터 조회 실패: {e}")
             return None
     
-    async def get_all_dummy_data(self, limit: int = 100, offset: int = 0) -> List[DummyDataResponse]:
-        """모든 Dummy 데이터 조회 (페이징)"""
-        try:
-            data_list = await self.repository.get_all_dummy_data(limit, offset)
-            return [DummyDataResponse(**data) for data in data_list]
-            
-        except Exception as e:
-            logger.error(f"Dummy 데이터 목록 조회 실패: {e}")
-            return []
-    
     async def update_dummy_data(self, data_id: int, data: DummyDataUpdateRequest) -> bool:
         """Dummy 데이터 수정"""
         try:
@@ -112,10 +121,10 @@ class DummyService:
             logger.error(f"Dummy 데이터 삭제 실패: {e}")
             return False
     
-    async def search_dummy_data(self, search_term: str, limit: int = 100) -> List[DummyDataResponse]:
-        """Dummy 데이터 검색"""
+    async def search_dummy_data(self, search_term: str, limit: int = 100, fuzzy: bool = False) -> List[DummyDataResponse]:
+        """Dummy 데이터 검색 (관련도 순)"""
         try:
-            data_list = await self.repository.search_dummy_data(search_term, limit)
+            data_list = await self.repository.search_dummy_data(search_term, limit, fuzzy)
             return [DummyDataResponse(**data) for data in data_list]
             
         except Exception as e:
@@ -146,19 +155,137 @@ class DummyService:
             logger.error(f"공정별 Dummy 데이터 조회 실패: {e}")
             return []
     
-    async def get_all_dummy_data(self) -> List[dict]:
-        """전체 더미 데이터 조회"""
+    async def get_all_dummy_data(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> List[dict]:
+        """더미 데이터 조회 (id 역순 키셋 페이지네이션 - limit이 없으면 전체)"""
         try:
-            logger.info("🔍 전체 더미 데이터 조회 요청")
+            logger.info(f"🔍 더미 데이터 조회 요청: limit={limit}")
             
-            all_data = await self.repository.get_all_dummy_data()
+            all_data = await self.repository.get_all_dummy_data(
+                after_id, limit, start_date, end_date, process_name, product_name
+            )
             
-            logger.info(f"✅ 전체 더미 데이터 조회 성공: {len(all_data)}개")
+            logger.info(f"✅ 더미 데이터 조회 성공: {len(all_data)}개")
             return all_data
             
         except Exception as e:
-            logger.error(f"❌ 전체 더미 데이터 조회 실패: {str(e)}")
+            logger.error(f"❌ 더미 데이터 조회 실패: {str(e)}")
             return []
+    
+    async def export_dummy_data(
+        self,
+        export_format: str = 'ndjson',
+        columns: Optional[Sequence[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """더미 데이터를 NDJSON/CSV 조각으로 내보내기 (배치 단위로 생성, 메모리 사용량 일정)"""
+        columns = list(columns or DUMMY_COLUMNS)
+        batches = self.repository.stream_dummy_data(columns, start_date, end_date, process_name, product_name)
+        total = 0
+        
+        if export_format == 'csv':
+            # 엑셀에서 한글 헤더가 깨지지 않도록 BOM 포함
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield '\ufeff' + buffer.getvalue()
+        
+        async for rows in batches:
+            buffer = io.StringIO()
+            if export_format == 'csv':
+                writer = csv.writer(buffer)
+                writer.writerows([[_export_value(value) for value in row.values()] for row in rows])
+            else:
+                for row in rows:
+                    buffer.write(json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False))
+                    buffer.write('\n')
+            total += len(rows)
+            yield buffer.getvalue()
+        
+        logger.info(f"✅ 더미 데이터 내보내기 완료 ({export_format}): {total}행")
+    
+    async def ingest_excel(
+        self,
+        reader: ExcelDummyReader,
+        chunk_size: int = INGEST_CHUNK_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """엑셀 행을 chunk_size개씩 COPY로 적재하며 청크마다 진행 상황을 반환 (마지막 이벤트는 done=True)"""
+        started = time.perf_counter()
+        rows = reader.rows()
+        rows_read = inserted_count = failed_count = 0
+        errors: List[Dict[str, Any]] = []
+        
+        def progress(done: bool) -> Dict[str, Any]:
+            event = {
+                'done': done,
+                'rows_read': rows_read,
+                'inserted_count': inserted_count,
+                'failed_count': failed_count,
+                'elapsed_seconds': round(time.perf_counter() - started, 2)
+            }
+            if done:
+                event['errors'] = errors
+            return event
+        
+        def record_error(row_no: int, message: str):
+            nonlocal failed_count
+            failed_count += 1
+            if len(errors) < INGEST_MAX_ERRORS:
+                errors.append({'row': row_no, 'error': message})
+        
+        # 엑셀 파싱은 동기 작업이므로 스레드에서 실행하고, 현재 청크를 COPY하는 동안 다음 청크를 미리 읽음
+        pending = asyncio.ensure_future(asyncio.to_thread(read_chunk, rows, chunk_size))
+        try:
+            while True:
+                chunk = await pending
+                if not chunk:
+                    break
+                pending = asyncio.ensure_future(asyncio.to_thread(read_chunk, rows, chunk_size))
+                rows_read += len(chunk)
+                
+                records = []
+                for row_no, item in chunk:
+                    if isinstance(item, str):
+                        record_error(row_no, item)
+                    else:
+                        records.append((row_no, item))
+                
+                if records:
+                    inserted, row_errors = await self.repository.copy_dummy_rows(records)
+                    inserted_count += inserted
+                    for row_no, message in row_errors:
+                        record_error(row_no, message)
+                
+                logger.info(f"📥 더미 데이터 적재 중: 읽음 {rows_read}행, 적재 {inserted_count}행, 오류 {failed_count}행")
+                yield progress(False)
+        finally:
+            # 스레드에서 읽는 중이면 끝난 뒤에 워크북을 닫음
+            if not pending.done():
+                await asyncio.wait([pending])
+            await asyncio.to_thread(reader.close)
+        
+        logger.info(f"✅ 더미 데이터 적재 완료: 적재 {inserted_count}행, 오류 {failed_count}행")
+        yield progress(True)
+    
+    async def estimate_dummy_data_count(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        process_name: Optional[str] = None,
+        product_name: Optional[str] = None
+    ) -> Optional[int]:
+        """필터에 맞는 더미 데이터 수 추정"""
+        return await self.repository.estimate_dummy_data_count(start_date, end_date, process_name, product_name)
 
     async def get_unique_product_names(self) -> List[str]:
         """고유한 제품명 목록 조회"""
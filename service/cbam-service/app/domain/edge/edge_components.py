@@ -0,0 +1,220 @@
+# ============================================================================
+# 🧩 Edge Components - 연결 요소 단위 병렬 배출량 계산
+# ============================================================================
+
+"""
+전체 그래프 재계산을 약한 연결 요소(weakly connected component) 단위로 나눠 동시에 계산합니다.
+
+사업장별 그래프는 대부분 서로 연결되지 않으므로 요소끼리는 계산 결과가 서로 영향을 주지 않습니다.
+(consume 분배 비율도 같은 요소 안의 소비 공정만으로 정해짐)
+
+- 큰 요소(EMISSION_PROCESS_POOL_MIN_NODES 이상): 프로세스 풀에서 요소별로 병렬 계산
+- 나머지 작은 요소: 한 번에 묶어 스레드에서 계산 (프로세스 풀 작업과 동시에 진행)
+- 큰 요소가 없거나 프로세스 풀을 쓰지 않으면 분할하지 않고 스레드에서 한 번에 계산
+- 결과는 하나로 합쳐 호출자가 한 번에 저장
+
+조회는 분할 전에 한 번의 스냅샷 조회로 끝나므로(쿼리 수는 요소 수와 무관) 분할은 계산 단계에만 적용합니다.
+그래프가 작거나(EMISSION_PARTITION_MIN_NODES 미만) 부분 재계산(nodes 지정)이면 compute_emissions()를 그대로 사용합니다.
+
+환경변수:
+- EMISSION_PARTITION_MIN_NODES (기본 5000): 요소 분할을 시작하는 전체 노드 수
+- EMISSION_PROCESS_POOL_MIN_NODES (기본 50000): 프로세스 풀로 보낼 요소의 최소 노드 수
+- EMISSION_PROCESS_POOL_WORKERS (기본 min(4, CPU 수 - 1)): 프로세스 풀 크기
+  (0이면 프로세스 풀을 쓰지 않음 - CPU가 1개면 직렬화 비용만 늘어나므로 기본값이 0)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from app.domain.edge.edge_graph import EmissionGraph, NodeKey, ProgressCallback, PROCESS, PRODUCT
+from app.domain.edge.edge_kernel import compute_emissions
+
+logger = logging.getLogger(__name__)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+# ============================================================================
+# 🧩 분할
+# ============================================================================
+
+def connected_components(graph: EmissionGraph) -> List[List[NodeKey]]:
+    """엣지 방향을 무시한 연결 요소 목록 (큰 요소부터, 요소 안의 노드는 정렬)"""
+    parent: Dict[NodeKey, NodeKey] = {node: node for node in graph.nodes()}
+
+    def find(node: NodeKey) -> NodeKey:
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for target, predecessors in graph.predecessors.items():
+        for source, _ in predecessors:
+            source_root, target_root = find(source), find(target)
+            if source_root != target_root:
+                parent[max(source_root, target_root)] = min(source_root, target_root)
+
+    groups: Dict[NodeKey, List[NodeKey]] = {}
+    for node in parent:
+        groups.setdefault(find(node), []).append(node)
+    return sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group[0]))
+
+
+def component_snapshots(
+    snapshot: Dict[str, List[Dict[str, Any]]], components: List[List[NodeKey]]
+) -> List[Dict[str, List[Dict[str, Any]]]]:
+    """요소별로 해당 노드/엣지만 남긴 스냅샷 (프로세스 풀 전달용, 스냅샷은 한 번만 훑음)"""
+    owner: Dict[NodeKey, int] = {node: i for i, component in enumerate(components) for node in component}
+    parts: List[Dict[str, List[Dict[str, Any]]]] = [
+        {'edges': [], 'processes': [], 'products': [], 'product_processes': []} for _ in components
+    ]
+
+    def add(key: str, node: NodeKey, row: Dict[str, Any]):
+        index = owner.get(node)
+        if index is not None:
+            parts[index][key].append(row)
+
+    for edge in snapshot.get('edges', []):
+        add('edges', (edge['source_node_type'], edge['source_id']), edge)
+    for row in snapshot.get('processes', []):
+        add('processes', (PROCESS, row['process_id']), row)
+    for row in snapshot.get('products', []):
+        add('products', (PRODUCT, row['id']), row)
+    for row in snapshot.get('product_processes', []):
+        # 소비 비율은 같은 요소 안의 consume 엣지에만 쓰이므로 제품 기준으로 배정
+        add('product_processes', (PRODUCT, row['product_id']), row)
+    return parts
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """요소별 계산 결과를 compute_emissions()와 같은 형식으로 합침"""
+    merged: Dict[str, Any] = {
+        'process_cumulative': {},
+        'product_attr_em': {},
+        'consumption_amounts': {},
+        'order': [],
+        'cycle_nodes': [],
+    }
+    for result in results:
+        merged['process_cumulative'].update(result['process_cumulative'])
+        merged['product_attr_em'].update(result['product_attr_em'])
+        merged['consumption_amounts'].update(result['consumption_amounts'])
+        merged['order'].extend(result['order'])
+        merged['cycle_nodes'].extend(result['cycle_nodes'])
+    # 요소끼리는 독립이므로 순환을 끊은 노드는 정렬해서 보고
+    merged['cycle_nodes'].sort()
+    return merged
+
+
+def _compute_component(snapshot: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """프로세스 풀 작업: 요소 스냅샷으로 그래프를 만들어 계산"""
+    return compute_emissions(EmissionGraph.from_snapshot(snapshot))
+
+
+# ============================================================================
+# ⚙️ 병렬 계산
+# ============================================================================
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """요소 계산용 프로세스 풀 (처음 사용할 때 생성, 크기 0이면 None)"""
+    global _process_pool
+    workers = int(os.getenv('EMISSION_PROCESS_POOL_WORKERS', str(min(4, (os.cpu_count() or 1) - 1))))
+    if workers <= 0:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # 이벤트 루프/스레드가 있는 부모를 fork하지 않도록 spawn 사용
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"✅ 배출량 계산 프로세스 풀 생성 (workers={workers})")
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """프로세스 풀 종료 (lifespan 종료 시)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+            logger.info("✅ 배출량 계산 프로세스 풀 종료")
+
+
+async def compute_partitioned(
+    graph: EmissionGraph,
+    snapshot: Dict[str, List[Dict[str, Any]]],
+    nodes: Optional[Set[NodeKey]] = None,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """연결 요소 단위로 나눠 동시에 계산한 결과 (이벤트 루프는 막지 않음)"""
+    node_count = len(nodes) if nodes is not None else len(graph.processes) + len(graph.products)
+    large_min = int(os.getenv('EMISSION_PROCESS_POOL_MIN_NODES', '50000'))
+    pool = None
+    if nodes is None and node_count >= max(int(os.getenv('EMISSION_PARTITION_MIN_NODES', '5000')), large_min):
+        pool = get_process_pool()
+    if pool is None:
+        return await asyncio.to_thread(compute_emissions, graph, nodes, progress)
+
+    components = connected_components(graph)
+    large = [component for component in components if len(component) >= large_min]
+    if not large:
+        # 프로세스 풀로 보낼 만큼 큰 요소가 없으면 한 번에 계산하는 편이 빠름
+        return await asyncio.to_thread(compute_emissions, graph, None, progress)
+    small_nodes = {node for component in components[len(large):] for node in component}
+
+    def process_count(component) -> int:
+        return sum(1 for node_type, _ in component if node_type == PROCESS)
+
+    process_total = len(graph.processes)
+    pooled_done = 0
+    thread_done = 0
+
+    def report():
+        if progress:
+            progress(min(pooled_done + thread_done, process_total), process_total)
+
+    def thread_progress(done: int, total: int):
+        nonlocal thread_done
+        thread_done = done
+        report()
+
+    logger.info(
+        f"🧩 연결 요소 {len(components)}개로 분할 계산: 프로세스 풀 {len(large)}개 "
+        f"(최대 {len(components[0]) if components else 0}개 노드), 스레드 {len(small_nodes)}개 노드"
+    )
+
+    loop = asyncio.get_running_loop()
+    pooled = [
+        (process_count(component), loop.run_in_executor(pool, _compute_component, part))
+        for component, part in zip(large, component_snapshots(snapshot, large))
+    ]
+
+    async def run_pooled(count: int, future) -> Dict[str, Any]:
+        nonlocal pooled_done
+        result = await future
+        pooled_done += count
+        report()
+        return result
+
+    tasks = [asyncio.ensure_future(run_pooled(count, future)) for count, future in pooled]
+    if small_nodes:
+        tasks.append(asyncio.ensure_future(
+            asyncio.to_thread(compute_emissions, graph, small_nodes, thread_progress if progress else None)
+        ))
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # 한 요소라도 실패/취소되면 나머지 결과는 버림 (실행 중인 프로세스 작업은 끝나면 무시됨)
+        for task in tasks:
+            task.cancel()
+        for _, future in pooled:
+            future.cancel()
+        raise
+    return merge_results(results)
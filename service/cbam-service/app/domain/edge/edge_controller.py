@@ -2,32 +2,26 @@
 # 🔗 Edge Controller - 엣지 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from app.domain.edge.edge_service import EdgeService
+from app.common.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
+from app.domain.edge.edge_service import get_edge_service
+from app.domain.edge.edge_jobs import get_propagation_jobs
 from app.domain.edge.edge_schema import (
-    EdgeCreateRequest, EdgeUpdateRequest, EdgeResponse
+    EdgeCreateRequest, EdgeUpdateRequest, EdgeResponse, EdgeBulkCreateResponse,
+    EdgeTraversalResponse, EdgeCycleCheckResponse,
+    PropagationJobRequest, PropagationJobResponse
 )
+from app.domain.edge.edge_traversal import DOWNSTREAM, UPSTREAM
 
 logger = logging.getLogger(__name__)
 
 # Gateway를 통해 접근하므로 prefix 제거 (경로 중복 방지)
 router = APIRouter(tags=["Edge"])
 
-# 싱글톤 서비스 인스턴스 (성능 최적화)
-_edge_service_instance = None
-
-def get_edge_service():
-    """엣지 서비스 인스턴스 반환 (싱글톤 패턴)"""
-    global _edge_service_instance
-    if _edge_service_instance is None:
-        _edge_service_instance = EdgeService(None)  # Repository에서 직접 DB 연결 사용
-        logger.info("✅ Edge Service 싱글톤 인스턴스 생성")
-    return _edge_service_instance
-
 # ============================================================================
 # 📊 상태 확인 엔드포인트
 # ============================================================================
@@ -113,19 +107,29 @@ async def create_edge(
 
 @router.get("/", response_model=List[EdgeResponse])
 async def get_edges(
-    skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
-    limit: int = Query(100, ge=1, le=1000, description="조회할 레코드 수")
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="조회할 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    edge_kind: Optional[str] = Query(None, description="엣지 종류 (consume/produce/continue)"),
+    process_id: Optional[int] = Query(None, description="출발/도착 노드가 이 공정인 엣지만")
 ):
-    """모든 엣지 목록 조회 (페이지네이션)"""
+    """모든 엣지 목록 조회 (id 순 키셋 페이지네이션)"""
     try:
-        logger.info(f"📋 엣지 목록 조회 요청: skip={skip}, limit={limit}")
+        logger.info(f"📋 엣지 목록 조회 요청: limit={limit}, edge_kind={edge_kind}, process_id={process_id}")
+        cursor = decode_cursor(after)
         
         edge_service = get_edge_service()
-        edges = await edge_service.get_edges(skip, limit)
+        edges = await edge_service.get_edges(cursor[0] if cursor else None, fetch_limit(limit), edge_kind, process_id)
+        edges = await respond_page(
+            response, edges, limit, lambda e: [e.id], first_page=cursor is None,
+            estimate=lambda: edge_service.estimate_edges_count(edge_kind, process_id)
+        )
         
         logger.info(f"✅ 엣지 목록 조회 성공: {len(edges)}개")
         return edges
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 엣지 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"엣지 목록 조회 중 오류가 발생했습니다: {str(e)}")
@@ -375,6 +379,40 @@ async def propagate_full_graph():
         logger.error(f"❌ 전체 그래프 전파 트리거 실패: {e}")
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
+# ============================================================================
+# 🧵 비동기 그래프 재계산 작업 (요청 시간 제한 없이 실행)
+# ============================================================================
+
+@router.post("/propagate/jobs", response_model=PropagationJobResponse, status_code=202)
+async def submit_propagation_job(request: Optional[PropagationJobRequest] = None):
+    """전체(또는 사업장 단위) 그래프 재계산 작업 제출 - 작업 ID를 바로 반환합니다.
+    같은 범위의 작업이 진행 중이면 새로 만들지 않고 그 작업을 반환합니다(deduplicated=true).
+    """
+    install_id = request.install_id if request else None
+    job, created = get_propagation_jobs().submit(install_id, trigger='edge')
+    return PropagationJobResponse(**job.to_dict(), deduplicated=not created)
+
+@router.get("/propagate/jobs", response_model=List[PropagationJobResponse])
+async def list_propagation_jobs(active_only: bool = Query(False, description="대기/실행 중인 작업만 조회")):
+    """최근 재계산 작업 목록 (최근 제출 순)"""
+    return [PropagationJobResponse(**job.to_dict()) for job in get_propagation_jobs().list_jobs(active_only)]
+
+@router.get("/propagate/jobs/{job_id}", response_model=PropagationJobResponse)
+async def get_propagation_job(job_id: str):
+    """재계산 작업 진행률/결과 조회"""
+    job = get_propagation_jobs().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="재계산 작업을 찾을 수 없습니다")
+    return PropagationJobResponse(**job.to_dict())
+
+@router.post("/propagate/jobs/{job_id}/cancel", response_model=PropagationJobResponse)
+async def cancel_propagation_job(job_id: str):
+    """재계산 작업 취소 - 결과 저장 전이면 아무것도 저장하지 않고 중단합니다"""
+    job = get_propagation_jobs().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="재계산 작업을 찾을 수 없습니다")
+    return PropagationJobResponse(**job.to_dict())
+
 @router.post("/propagate/recalculate-from-edges")
 async def recalc_from_edges():
     """
@@ -386,10 +424,8 @@ async def recalc_from_edges():
     try:
         logger.info("🔁 엣지 기반 재계산 요청: 누적 리셋 후 전체 전파")
         edge_service = get_edge_service()
-        # 1) 누적 리셋
-        await edge_service.repository.reset_all_cumulative_emission()
-        # 2) 전체 전파
-        result = await edge_service.propagate_emissions_full_graph()
+        # 누적 리셋과 전체 전파를 같은 트랜잭션(전역 잠금)에서 실행
+        result = await edge_service.propagate_emissions_full_graph(reset_cumulative=True)
         return {"success": result.get('success', True), "data": result}
     except Exception as e:
         logger.error(f"❌ 엣지 기반 재계산 실패: {e}")
@@ -502,6 +538,75 @@ async def get_edges_by_node(
         logger.error(f"❌ 노드별 엣지 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"노드별 엣지 조회 중 오류가 발생했습니다: {str(e)}")
 
+# ============================================================================
+# 🧭 그래프 탐색 엔드포인트
+# ============================================================================
+
+@router.get("/traversal/reachable", response_model=EdgeTraversalResponse)
+async def get_reachable_nodes(
+    node_type: str = Query(..., description="시작 노드 타입 (process/product)"),
+    node_id: int = Query(..., description="시작 노드 ID"),
+    direction: str = Query(DOWNSTREAM, description="탐색 방향 (downstream/upstream)")
+):
+    """노드에서 도달 가능한 모든 노드 조회"""
+    if direction not in (DOWNSTREAM, UPSTREAM):
+        raise HTTPException(status_code=400, detail=f"탐색 방향은 {DOWNSTREAM} 또는 {UPSTREAM}만 허용됩니다.")
+    try:
+        logger.info(f"🧭 도달 가능 노드 조회 요청: {node_type}({node_id}) {direction}")
+        
+        edge_service = get_edge_service()
+        nodes = await edge_service.get_reachable_nodes(node_type, node_id, direction)
+        
+        logger.info(f"✅ 도달 가능 노드 조회 성공: {node_type}({node_id}) → {len(nodes)}개")
+        return EdgeTraversalResponse(
+            node_type=node_type, node_id=node_id, direction=direction, count=len(nodes), nodes=nodes
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ 도달 가능 노드 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"도달 가능 노드 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/traversal/cycle-check", response_model=EdgeCycleCheckResponse)
+async def check_edge_cycle(
+    source_node_type: str = Query(..., description="소스 노드 타입"),
+    source_id: int = Query(..., description="소스 노드 ID"),
+    target_node_type: str = Query(..., description="타겟 노드 타입"),
+    target_id: int = Query(..., description="타겟 노드 ID")
+):
+    """엣지를 추가하면 사이클이 생기는지 확인"""
+    try:
+        edge_service = get_edge_service()
+        creates_cycle = await edge_service.check_edge_cycle(source_node_type, source_id, target_node_type, target_id)
+        
+        logger.info(f"✅ 사이클 검사: {source_node_type}({source_id}) → {target_node_type}({target_id}) = {creates_cycle}")
+        return EdgeCycleCheckResponse(
+            source_node_type=source_node_type, source_id=source_id,
+            target_node_type=target_node_type, target_id=target_id,
+            creates_cycle=creates_cycle
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ 사이클 검사 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"사이클 검사 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/traversal/product-ancestors/{product_id}", response_model=EdgeTraversalResponse)
+async def get_product_ancestors(product_id: int):
+    """제품 배출량에 기여하는 모든 상류 공정/제품 조회"""
+    try:
+        logger.info(f"🧭 제품 상류 노드 조회 요청: 제품 {product_id}")
+        
+        edge_service = get_edge_service()
+        nodes = await edge_service.get_product_ancestors(product_id)
+        
+        logger.info(f"✅ 제품 상류 노드 조회 성공: 제품 {product_id} → {len(nodes)}개")
+        return EdgeTraversalResponse(
+            node_type='product', node_id=product_id, direction=UPSTREAM, count=len(nodes), nodes=nodes
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ 제품 상류 노드 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"제품 상류 노드 조회 중 오류가 발생했습니다: {str(e)}")
+
 # ============================================================================
 # 📊 통계 및 요약 엔드포인트
 # ============================================================================
@@ -540,33 +645,19 @@ async def get_edge_summary():
 # 📦 일괄 처리 엔드포인트
 # ============================================================================
 
-@router.post("/bulk")
+@router.post("/bulk", response_model=EdgeBulkCreateResponse)
 async def create_edges_bulk(
     edges_data: List[EdgeCreateRequest]
 ):
-    """여러 엣지 일괄 생성"""
+    """여러 엣지 일괄 생성 (일괄 검증/단일 INSERT/배출량 재계산 1회, 행별 결과 반환)"""
     try:
         logger.info(f"📦 엣지 일괄 생성 요청: {len(edges_data)}개")
         
         edge_service = get_edge_service()
-        results = []
-        
-        for edge_data in edges_data:
-            try:
-                result = await edge_service.create_edge(edge_data)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                logger.error(f"❌ 개별 엣지 생성 실패: {str(e)}")
-                # 개별 실패는 전체 실패로 처리하지 않음
-        
-        logger.info(f"✅ 엣지 일괄 생성 완료: {len(results)}/{len(edges_data)}개 성공")
-        return {
-            "message": f"일괄 생성 완료: {len(results)}/{len(edges_data)}개 성공",
-            "success_count": len(results),
-            "total_count": len(edges_data),
-            "results": results
-        }
+        result = await edge_service.create_edges_bulk(edges_data)
+        
+        logger.info(f"✅ 엣지 일괄 생성 완료: {result.success_count}/{result.total_count}개 성공")
+        return result
         
     except Exception as e:
         logger.error(f"❌ 엣지 일괄 생성 실패: {str(e)}")
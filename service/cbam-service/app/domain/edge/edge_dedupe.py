@@ -0,0 +1,76 @@
+# ============================================================================
+# 🧹 Edge Dedupe - 중복 엣지 정리 + 유니크 인덱스 생성 (1회성 마이그레이션)
+# ============================================================================
+
+"""
+같은 (source_node_type, source_id, target_node_type, target_id, edge_kind) 엣지가 여러 개면
+서비스 시작 시 uq_edge_endpoints를 만들지 못하고 NOT EXISTS 검사로 중복을 막습니다.
+이 스크립트는 가장 먼저 생성된 행(id가 가장 작은 행)만 남기고 나머지를 삭제한 뒤 유니크 인덱스를 만듭니다.
+서비스 시작은 데이터를 바꾸지 않으므로, 운영자가 확인 후 직접 실행합니다.
+
+CLI:
+  DATABASE_URL=postgresql://... python -m app.domain.edge.edge_dedupe [--dry-run]
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+from typing import List, Optional
+
+import asyncpg
+
+from app.domain.edge.edge_repository import EDGE_ENDPOINT_COLUMNS, UNIQUE_ENDPOINTS_INDEX, count_duplicate_edges_query
+
+
+async def dedupe_edges(conn: asyncpg.Connection, dry_run: bool = False) -> int:
+    """중복 엣지 삭제 후 유니크 인덱스 생성 (삭제한 행 수, dry_run이면 삭제할 행 수)"""
+    async with conn.transaction():
+        # 정리하는 동안 새 중복이 생기지 않도록 엣지 쓰기를 막음 (조회는 허용)
+        await conn.execute("LOCK TABLE edge IN SHARE ROW EXCLUSIVE MODE")
+        if dry_run:
+            return await conn.fetchval(count_duplicate_edges_query())
+
+        removed = await conn.fetchval(f"""
+            WITH removed AS (
+                DELETE FROM edge e
+                USING (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY {EDGE_ENDPOINT_COLUMNS} ORDER BY id) AS position
+                    FROM edge
+                ) ranked
+                WHERE e.id = ranked.id AND ranked.position > 1
+                RETURNING e.id
+            )
+            SELECT COUNT(*) FROM removed
+        """)
+        await conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {UNIQUE_ENDPOINTS_INDEX} ON edge ({EDGE_ENDPOINT_COLUMNS})")
+    return removed
+
+
+async def _run_cli(database_url: str, dry_run: bool) -> int:
+    conn = await asyncpg.connect(database_url)
+    try:
+        count = await dedupe_edges(conn, dry_run)
+    finally:
+        await conn.close()
+    if dry_run:
+        print(f"삭제 대상 중복 엣지: {count}개")
+    else:
+        print(f"중복 엣지 {count}개 삭제, {UNIQUE_ENDPOINTS_INDEX} 생성 완료 (서비스를 재시작하면 ON CONFLICT 경로를 사용합니다)")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='중복 엣지 정리 후 uq_edge_endpoints 생성')
+    parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 중복 건수만 출력')
+    args = parser.parse_args(argv)
+
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print('DATABASE_URL 환경변수가 설정되지 않았습니다.', file=sys.stderr)
+        return 2
+    return asyncio.run(_run_cli(database_url, args.dry_run))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,335 @@
+# ============================================================================
+# 🧮 Edge Graph - 인메모리 배출량 전파 엔진
+# ============================================================================
+
+"""
+edge / process_attrdir_emission / product / product_process 스냅샷을 메모리에 올려
+위상 정렬 순서대로 continue/produce/consume 규칙을 한 번에 계산합니다.
+
+- continue (공정→공정): target.cumulative = target.attrdir_em + Σ source.cumulative
+- produce  (공정→제품): product.attr_em = Σ 생산 공정 cumulative
+- consume  (제품→공정): target.cumulative += product.attr_em × (to_next/product_amount) × 소비 비율
+"""
+
+import logging
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROCESS = 'process'
+PRODUCT = 'product'
+
+# 엣지 종류별 허용 연결 (source_node_type, target_node_type)
+EDGE_RULES = {
+    'continue': (PROCESS, PROCESS),
+    'produce': (PROCESS, PRODUCT),
+    'consume': (PRODUCT, PROCESS),
+}
+
+NodeKey = Tuple[str, int]
+
+# 진행률 콜백 (계산한 공정 수, 전체 공정 수) - 예외를 던지면 계산이 중단됨
+ProgressCallback = Callable[[int, int], None]
+
+# 진행률 콜백 호출 간격 (공정 수)
+PROGRESS_STEP = 1000
+
+
+def _to_float(value: Any) -> float:
+    return float(value) if value else 0.0
+
+
+def is_valid_edge(edge: Dict[str, Any]) -> bool:
+    """엣지 종류와 노드 타입 조합이 EDGE_RULES에 맞는지"""
+    return EDGE_RULES.get(edge['edge_kind']) == (edge['source_node_type'], edge['target_node_type'])
+
+
+def edge_seeds(edge: Dict[str, Any]) -> List[NodeKey]:
+    """
+    엣지 생성/수정/삭제 시 재계산을 시작할 노드 목록.
+    consume 엣지는 같은 제품을 소비하는 모든 공정의 분배 비율이 바뀌므로 소스 제품도 포함합니다.
+    """
+    seeds = [(edge['target_node_type'], edge['target_id'])]
+    if edge['edge_kind'] == 'consume':
+        seeds.append((edge['source_node_type'], edge['source_id']))
+    return seeds
+
+
+def downstream_scope(
+    seeds: Iterable[NodeKey],
+    successors: Callable[[NodeKey], Iterable[NodeKey]],
+    predecessors: Callable[[NodeKey], Iterable[NodeKey]]
+) -> Tuple[Set[NodeKey], Set[NodeKey]]:
+    """
+    seeds에서 도달 가능한 하류 노드 집합(cone)과
+    cone 재계산에 필요한 노드 집합(scope = cone + 직접 상류 + 상류 제품의 다른 소비 공정)을 반환합니다.
+    successors/predecessors는 규칙에 맞는(EDGE_RULES) 엣지로 이어진 이웃 노드를 돌려줍니다.
+    """
+    cone: Set[NodeKey] = set(seeds)
+    queue = deque(cone)
+    while queue:
+        node = queue.popleft()
+        for target in successors(node):
+            if target not in cone:
+                cone.add(target)
+                queue.append(target)
+
+    scope: Set[NodeKey] = set(cone)
+    for node in cone:
+        for source in predecessors(node):
+            if source in scope:
+                continue
+            scope.add(source)
+            if source[0] == PRODUCT:
+                # 분배 비율 계산에 같은 제품의 모든 소비 공정이 필요
+                scope.update(successors(source))
+
+    return cone, scope
+
+
+def cycle_closing_edges(existing_edges: List[Dict[str, Any]], candidates: List[Dict[str, Any]]) -> Set[int]:
+    """
+    기존 엣지에 candidates를 순서대로 추가할 때 순환을 만드는 후보의 인덱스를 반환합니다.
+    순환을 만드는 후보는 그래프에 추가하지 않으므로 이후 후보 판정에도 영향을 주지 않습니다.
+    """
+    successors: Dict[NodeKey, Set[NodeKey]] = defaultdict(set)
+    for edge in existing_edges:
+        successors[(edge['source_node_type'], edge['source_id'])].add((edge['target_node_type'], edge['target_id']))
+
+    def reachable(start: NodeKey, goal: NodeKey) -> bool:
+        stack = [start]
+        visited: Set[NodeKey] = {start}
+        while stack:
+            node = stack.pop()
+            if node == goal:
+                return True
+            for target in successors.get(node, ()):
+                if target not in visited:
+                    visited.add(target)
+                    stack.append(target)
+        return False
+
+    rejected: Set[int] = set()
+    for index, edge in enumerate(candidates):
+        source = (edge['source_node_type'], edge['source_id'])
+        target = (edge['target_node_type'], edge['target_id'])
+        if reachable(target, source):
+            rejected.add(index)
+            continue
+        successors[source].add(target)
+    return rejected
+
+
+class EmissionGraph:
+    """배출량 전파용 인메모리 그래프"""
+
+    def __init__(
+        self,
+        edges: List[Dict[str, Any]],
+        processes: List[Dict[str, Any]],
+        products: List[Dict[str, Any]],
+        product_processes: List[Dict[str, Any]],
+    ):
+        self.processes: Dict[int, Dict[str, float]] = {
+            row['process_id']: {
+                'attrdir_em': _to_float(row.get('attrdir_em')),
+                'cumulative_emission': _to_float(row.get('cumulative_emission')),
+            }
+            for row in processes
+        }
+        self.products: Dict[int, Dict[str, float]] = {
+            row['id']: {
+                'product_amount': _to_float(row.get('product_amount')),
+                'product_sell': _to_float(row.get('product_sell')),
+                'product_eusell': _to_float(row.get('product_eusell')),
+                'attr_em': _to_float(row.get('attr_em')),
+            }
+            for row in products
+        }
+        self.consumption_amounts: Dict[Tuple[int, int], float] = {
+            (row['product_id'], row['process_id']): _to_float(row.get('consumption_amount'))
+            for row in product_processes
+        }
+
+        self.successors: Dict[NodeKey, List[NodeKey]] = defaultdict(list)
+        self.predecessors: Dict[NodeKey, List[Tuple[NodeKey, str]]] = defaultdict(list)
+        self.edge_counts: Dict[str, int] = {kind: 0 for kind in EDGE_RULES}
+        self.skipped_edges: List[int] = []
+
+        seen: Set[Tuple[NodeKey, NodeKey, str]] = set()
+        for edge in edges:
+            kind = edge['edge_kind']
+            source = (edge['source_node_type'], edge['source_id'])
+            target = (edge['target_node_type'], edge['target_id'])
+
+            if not is_valid_edge(edge) or not self.has_node(source) or not self.has_node(target):
+                self.skipped_edges.append(edge['id'])
+                continue
+            if (source, target, kind) in seen:
+                continue
+            seen.add((source, target, kind))
+
+            self.successors[source].append(target)
+            self.predecessors[target].append((source, kind))
+            self.edge_counts[kind] += 1
+
+        if self.skipped_edges:
+            logger.warning(f"⚠️ 유효하지 않은 엣지 {len(self.skipped_edges)}개 제외: {self.skipped_edges}")
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, List[Dict[str, Any]]]) -> "EmissionGraph":
+        """Repository 스냅샷(dict)으로부터 그래프 생성"""
+        return cls(
+            snapshot.get('edges', []),
+            snapshot.get('processes', []),
+            snapshot.get('products', []),
+            snapshot.get('product_processes', []),
+        )
+
+    def has_node(self, node: NodeKey) -> bool:
+        """스냅샷에 노드 데이터가 있는지 확인"""
+        if node[0] == PROCESS:
+            return node[1] in self.processes
+        return node[1] in self.products
+
+    def nodes(self) -> List[NodeKey]:
+        """그래프의 모든 노드 (정렬된 순서)"""
+        keys = [(PROCESS, pid) for pid in self.processes] + [(PRODUCT, pid) for pid in self.products]
+        return sorted(keys)
+
+    # ============================================================================
+    # 🔀 위상 정렬
+    # ============================================================================
+
+    def topological_order(self, nodes: Optional[Set[NodeKey]] = None) -> Tuple[List[NodeKey], List[NodeKey]]:
+        """
+        Kahn 알고리즘으로 위상 정렬합니다.
+        순환이 있으면 소비(consume) 입력이 미해결인 공정부터 끊어서 진행하고,
+        끊긴 노드는 두 번째 반환값(cycle_nodes)으로 보고합니다.
+        """
+        targets = set(nodes) if nodes is not None else set(self.nodes())
+        indegree: Dict[NodeKey, int] = {node: 0 for node in targets}
+        for node in targets:
+            for source, _ in self.predecessors.get(node, []):
+                if source in targets:
+                    indegree[node] += 1
+
+        ready = deque(sorted(node for node, degree in indegree.items() if degree == 0))
+        order: List[NodeKey] = []
+        cycle_nodes: List[NodeKey] = []
+        resolved: Set[NodeKey] = set()
+
+        while len(order) < len(targets):
+            if not ready:
+                remaining = sorted(node for node in targets if node not in resolved)
+                breakable = [
+                    node for node in remaining
+                    if any(kind == 'consume' and source in targets and source not in resolved
+                           for source, kind in self.predecessors.get(node, []))
+                ]
+                forced = breakable[0] if breakable else remaining[0]
+                logger.warning(f"⚠️ 순환 참조 감지: {forced[0]} {forced[1]}에서 저장값으로 순환을 끊습니다")
+                cycle_nodes.append(forced)
+                indegree[forced] = 0
+                ready.append(forced)
+
+            node = ready.popleft()
+            if node in resolved:
+                continue
+            resolved.add(node)
+            order.append(node)
+            for target in self.successors.get(node, []):
+                if target in targets and target not in resolved:
+                    indegree[target] -= 1
+                    if indegree[target] == 0:
+                        ready.append(target)
+
+        return order, cycle_nodes
+
+    # ============================================================================
+    # 🧮 전파 계산
+    # ============================================================================
+
+    def consumer_shares(self, product_id: int) -> Dict[int, Tuple[float, float]]:
+        """
+        제품을 소비하는 공정별 (배출량 분배비율, 할당 투입량)을 계산합니다.
+        to_next_process = product_amount - product_sell - product_eusell
+        소비량 합계가 0이면 소비 공정 수로 균등 분배합니다.
+        """
+        product = self.products[product_id]
+        consumers = [target[1] for target in self.successors.get((PRODUCT, product_id), []) if target[0] == PROCESS]
+        if not consumers:
+            return {}
+
+        amount = product['product_amount']
+        to_next_process = max(amount - product['product_sell'] - product['product_eusell'], 0.0)
+        to_next_share = (to_next_process / amount) if amount > 0 else 0.0
+
+        total_consumption = sum(self.consumption_amounts.get((product_id, pid), 0.0) for pid in consumers)
+        shares: Dict[int, Tuple[float, float]] = {}
+        for pid in consumers:
+            if total_consumption > 0:
+                ratio = self.consumption_amounts.get((product_id, pid), 0.0) / total_consumption
+            else:
+                ratio = 1.0 / len(consumers)
+            shares[pid] = (to_next_share * ratio, to_next_process * ratio)
+        return shares
+
+    def compute(self, nodes: Optional[Set[NodeKey]] = None, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        위상 순서대로 노드의 누적 배출량/제품 배출량을 한 번에 계산합니다.
+        nodes가 주어지면 해당 노드만 재계산하고, 범위 밖 상류 노드는 저장된 값을 사용합니다.
+        progress가 주어지면 PROGRESS_STEP개 공정마다 (계산한 공정 수, 전체 공정 수)로 호출합니다.
+        """
+        order, cycle_nodes = self.topological_order(nodes)
+        process_total = sum(1 for node_type, _ in order if node_type == PROCESS)
+        if progress:
+            progress(0, process_total)
+
+        process_cumulative: Dict[int, float] = {}
+        product_attr_em: Dict[int, float] = {}
+        consumption_amounts: Dict[Tuple[int, int], float] = {}
+        share_cache: Dict[int, Dict[int, Tuple[float, float]]] = {}
+
+        def process_value(pid: int) -> float:
+            if pid in process_cumulative:
+                return process_cumulative[pid]
+            stored = self.processes[pid]
+            return stored['cumulative_emission'] or stored['attrdir_em']
+
+        def product_value(pid: int) -> float:
+            if pid in product_attr_em:
+                return product_attr_em[pid]
+            return self.products[pid]['attr_em']
+
+        for node_type, node_id in order:
+            if node_type == PROCESS:
+                total = self.processes[node_id]['attrdir_em']
+                for (source_type, source_id), kind in self.predecessors.get((PROCESS, node_id), []):
+                    if kind == 'continue':
+                        total += process_value(source_id)
+                    elif kind == 'consume':
+                        if source_id not in share_cache:
+                            share_cache[source_id] = self.consumer_shares(source_id)
+                        ratio, allocated = share_cache[source_id].get(node_id, (0.0, 0.0))
+                        total += product_value(source_id) * ratio
+                        consumption_amounts[(source_id, node_id)] = allocated
+                process_cumulative[node_id] = total
+                if progress and len(process_cumulative) % PROGRESS_STEP == 0:
+                    progress(len(process_cumulative), process_total)
+            else:
+                producers = [source_id for (source_type, source_id), kind in self.predecessors.get((PRODUCT, node_id), [])
+                             if kind == 'produce']
+                if producers:
+                    product_attr_em[node_id] = sum(process_value(pid) for pid in producers)
+
+        if progress:
+            progress(process_total, process_total)
+        return {
+            'process_cumulative': process_cumulative,
+            'product_attr_em': product_attr_em,
+            'consumption_amounts': consumption_amounts,
+            'order': order,
+            'cycle_nodes': cycle_nodes,
+        }
@@ -0,0 +1,271 @@
+# ============================================================================
+# 🗂️ Edge Index - 워커별 인메모리 인접 인덱스
+# ============================================================================
+
+"""
+edge 테이블 전체를 워커 메모리에 올려 노드별 진출/진입 엣지를 dict로 색인합니다.
+공정 관리 화면의 그래프 조회(노드별 엣지, continue 엣지, 생산/소비 공정, 사이클 검사)는
+DB 왕복 없이 메모리에서 응답합니다.
+
+무효화 규칙:
+- EdgeService가 엣지를 생성/수정/삭제하면 같은 워커의 인덱스를 즉시 갱신하고
+  Postgres NOTIFY(edge_changed)로 변경을 알립니다.
+- 다른 워커는 전용 LISTEN 연결로 알림을 받아 인덱스를 무효화하고, 다음 조회 때 1회 재적재합니다.
+- LISTEN 연결이 끊긴 동안에는 인덱스를 신뢰하지 않고(매 조회 재적재) 재연결을 시도합니다.
+- EdgeService를 거치지 않은 직접 수정(스크립트 등)에 대비해 EDGE_INDEX_TTL(초)이 지나면 재적재합니다.
+
+환경변수:
+- EDGE_INDEX_ENABLED (기본 true): false이면 모든 조회를 DB로 처리
+- EDGE_INDEX_TTL (기본 300): 알림이 없어도 재적재하는 주기(초)
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import asyncpg
+
+from app.common.memory_index import MemoryIndex
+from app.domain.edge.edge_graph import PROCESS, PRODUCT, downstream_scope, is_valid_edge
+from app.domain.edge.edge_traversal import DOWNSTREAM
+
+logger = logging.getLogger(__name__)
+
+EDGE_CHANNEL = 'edge_changed'
+
+# LISTEN 연결 재시도 간격(초)
+LISTENER_RETRY_INTERVAL = 5.0
+
+# NOTIFY 페이로드에 담을 최대 엣지 ID 수
+MAX_PAYLOAD_IDS = 200
+
+NodeKey = Tuple[str, int]
+
+
+class EdgeAdjacencyIndex(MemoryIndex):
+    """노드별 진출/진입 엣지 인덱스 (워커당 1개)"""
+
+    def __init__(self, ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        super().__init__('엣지 인덱스', 'EDGE_INDEX_TTL', 300, 'EDGE_INDEX_ENABLED', ttl, enabled)
+        # 자신이 보낸 알림을 구분하기 위한 워커 식별자
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._edges: Dict[int, Dict[str, Any]] = {}
+        self._outgoing: Dict[NodeKey, Dict[int, Dict[str, Any]]] = {}
+        self._incoming: Dict[NodeKey, Dict[int, Dict[str, Any]]] = {}
+
+        self._database_url: Optional[str] = None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._listener_retry_at = 0.0
+
+    # ============================================================================
+    # 🔄 적재 / 무효화
+    # ============================================================================
+
+    @property
+    def is_fresh(self) -> bool:
+        """메모리 인덱스로 바로 응답할 수 있는지 (LISTEN 연결이 끊긴 동안은 항상 재적재)"""
+        if self._database_url and self._listener is None:
+            return False
+        return super().is_fresh
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> bool:
+        """인덱스가 오래되었으면 loader로 전체 엣지를 다시 적재 (성공 시 True)"""
+        if self.enabled and not self.is_fresh:
+            await self._reconnect_listener_if_needed()
+        return await super().ensure_loaded(loader)
+
+    def _rebuild(self, edges: Iterable[Dict[str, Any]]):
+        self._edges = {}
+        self._outgoing = {}
+        self._incoming = {}
+        for edge in edges:
+            self._add(edge)
+
+    def size(self) -> int:
+        return len(self._edges)
+
+    def _add(self, edge: Dict[str, Any]):
+        edge = dict(edge)
+        self._edges[edge['id']] = edge
+        source = (edge['source_node_type'], edge['source_id'])
+        target = (edge['target_node_type'], edge['target_id'])
+        self._outgoing.setdefault(source, {})[edge['id']] = edge
+        self._incoming.setdefault(target, {})[edge['id']] = edge
+
+    def _remove(self, edge_id: int):
+        edge = self._edges.pop(edge_id, None)
+        if not edge:
+            return
+        source = (edge['source_node_type'], edge['source_id'])
+        target = (edge['target_node_type'], edge['target_id'])
+        self._outgoing.get(source, {}).pop(edge_id, None)
+        self._incoming.get(target, {}).pop(edge_id, None)
+
+    def apply_upsert(self, edges: Iterable[Dict[str, Any]]):
+        """생성/수정된 엣지를 인덱스에 반영"""
+        self._touch()
+        if not self.is_loaded:
+            return
+        for edge in edges:
+            self._remove(edge['id'])
+            self._add(edge)
+
+    def apply_delete(self, edge_ids: Iterable[int]):
+        """삭제된 엣지를 인덱스에서 제거"""
+        self._touch()
+        if not self.is_loaded:
+            return
+        for edge_id in edge_ids:
+            self._remove(edge_id)
+
+    def change_payload(self, operation: str, edge_ids: List[int]) -> str:
+        """NOTIFY 페이로드 (자신이 보낸 알림은 수신 시 무시)"""
+        # NOTIFY 페이로드는 8000바이트 제한이 있어 대량 변경은 ID 없이 건수만 보냄
+        return json.dumps({
+            'origin': self.origin,
+            'op': operation,
+            'count': len(edge_ids),
+            'ids': edge_ids if len(edge_ids) <= MAX_PAYLOAD_IDS else []
+        })
+
+    # ============================================================================
+    # 📡 LISTEN 연결
+    # ============================================================================
+
+    async def start_listener(self, database_url: Optional[str]):
+        """다른 워커의 변경 알림 수신 시작 (lifespan에서 호출)"""
+        if not self.enabled or not database_url:
+            return
+        self._database_url = database_url
+        await self._connect_listener()
+
+    async def stop_listener(self):
+        """LISTEN 연결 종료"""
+        listener = self._listener
+        self._database_url = None
+        self._listener = None
+        if listener is None:
+            return
+        try:
+            await listener.close(timeout=5)
+            logger.info("✅ 엣지 인덱스 LISTEN 연결 종료")
+        except Exception as e:
+            logger.warning(f"⚠️ 엣지 인덱스 LISTEN 연결 종료 실패: {e}")
+            listener.terminate()
+
+    async def _connect_listener(self):
+        self._listener_retry_at = time.monotonic() + LISTENER_RETRY_INTERVAL
+        try:
+            listener = await asyncpg.connect(
+                self._database_url, server_settings={'application_name': 'cbam-service-edge-index'}
+            )
+            await listener.add_listener(EDGE_CHANNEL, self._on_notification)
+            listener.add_termination_listener(self._on_listener_terminated)
+            self._listener = listener
+            # 연결이 끊긴 동안의 변경은 알 수 없으므로 새로 적재
+            self.invalidate('LISTEN 연결 수립')
+            logger.info(f"✅ 엣지 인덱스 LISTEN 시작 (channel={EDGE_CHANNEL})")
+        except Exception as e:
+            self._listener = None
+            logger.warning(f"⚠️ 엣지 인덱스 LISTEN 연결 실패 (조회는 DB로 처리): {e}")
+
+    async def _reconnect_listener_if_needed(self):
+        if self._database_url and self._listener is None and time.monotonic() >= self._listener_retry_at:
+            await self._connect_listener()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload) if payload else {}
+        except ValueError:
+            message = {}
+        if message.get('origin') == self.origin:
+            return
+        self.invalidate(f"다른 워커의 엣지 변경 ({message.get('op', 'unknown')})")
+
+    def _on_listener_terminated(self, connection):
+        if self._listener is connection:
+            self._listener = None
+            self.invalidate('LISTEN 연결 끊김')
+            logger.warning("⚠️ 엣지 인덱스 LISTEN 연결이 끊겼습니다. 다음 조회 때 재연결합니다.")
+
+    # ============================================================================
+    # 🔍 조회 (ensure_loaded 성공 후 호출)
+    # ============================================================================
+
+    def outgoing(self, node: NodeKey, edge_kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """노드에서 나가는 엣지 (id 순)"""
+        edges = self._outgoing.get(node, {})
+        return [dict(edges[edge_id]) for edge_id in sorted(edges)
+                if edge_kind is None or edges[edge_id]['edge_kind'] == edge_kind]
+
+    def incoming(self, node: NodeKey, edge_kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """노드로 들어오는 엣지 (id 순)"""
+        edges = self._incoming.get(node, {})
+        return [dict(edges[edge_id]) for edge_id in sorted(edges)
+                if edge_kind is None or edges[edge_id]['edge_kind'] == edge_kind]
+
+    def edges_by_node(self, node_id: int) -> List[Dict[str, Any]]:
+        """source_id 또는 target_id가 node_id인 엣지 (노드 타입 무관, id 순)"""
+        edge_ids: Set[int] = set()
+        for node_type in (PROCESS, PRODUCT):
+            edge_ids.update(self._outgoing.get((node_type, node_id), {}))
+            edge_ids.update(self._incoming.get((node_type, node_id), {}))
+        return [dict(self._edges[edge_id]) for edge_id in sorted(edge_ids)]
+
+    def reachable(
+        self, node: NodeKey, direction: str = DOWNSTREAM, edge_kinds: Optional[List[str]] = None
+    ) -> List[NodeKey]:
+        """시작 노드에서 도달 가능한 노드 (시작 노드 제외, 타입/ID 순)"""
+        adjacency = self._outgoing if direction == DOWNSTREAM else self._incoming
+        next_key = ('target_node_type', 'target_id') if direction == DOWNSTREAM else ('source_node_type', 'source_id')
+        visited: Set[NodeKey] = {node}
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            for edge in adjacency.get(current, {}).values():
+                if edge_kinds is not None and edge['edge_kind'] not in edge_kinds:
+                    continue
+                neighbor = (edge[next_key[0]], edge[next_key[1]])
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+        visited.discard(node)
+        return sorted(visited)
+
+    def would_create_cycle(self, source: NodeKey, target: NodeKey, edge_kinds: Optional[List[str]] = None) -> bool:
+        """source→target 엣지를 추가하면 사이클이 생기는지"""
+        if source == target:
+            return True
+        return source in self.reachable(target, DOWNSTREAM, edge_kinds)
+
+    def downstream_scope(self, seeds: Iterable[NodeKey]) -> Tuple[Set[NodeKey], Set[NodeKey]]:
+        """seeds의 하류 범위(cone)와 재계산에 필요한 노드 집합(scope) - edge_graph.downstream_scope 참고"""
+        def successors(node: NodeKey) -> List[NodeKey]:
+            return [(edge['target_node_type'], edge['target_id'])
+                    for edge in self._outgoing.get(node, {}).values() if is_valid_edge(edge)]
+
+        def predecessors(node: NodeKey) -> List[NodeKey]:
+            return [(edge['source_node_type'], edge['source_id'])
+                    for edge in self._incoming.get(node, {}).values() if is_valid_edge(edge)]
+
+        return downstream_scope(seeds, successors, predecessors)
+
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 상태 (헬스체크용)"""
+        return {**super().stats(), 'edge_count': len(self._edges), 'listening': self._listener is not None}
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_edge_index = EdgeAdjacencyIndex()
+
+def get_edge_index() -> EdgeAdjacencyIndex:
+    """워커 공용 엣지 인접 인덱스 반환"""
+    return _edge_index
@@ -0,0 +1,217 @@
+# ============================================================================
+# 🧵 Edge Jobs - 비동기 그래프 재계산 작업
+# ============================================================================
+
+"""
+전체(또는 사업장 단위) 그래프 재계산을 HTTP 요청 밖에서 실행합니다.
+
+- submit은 작업 ID를 바로 반환하고, 재계산은 백그라운드 태스크(계산은 스레드)에서 실행
+- 진행률: 계산한 공정 수 / 전체 공정 수 (EmissionGraph/커널의 progress 콜백)
+- 취소: 저장 전이면 다음 진행률 보고 시점에 중단하고 아무것도 저장하지 않음
+- 같은 범위(사업장 또는 전체)의 작업이 대기/실행 중이면 새 작업을 만들지 않고 그 작업을 반환
+  (전체 작업이 실행 중이면 사업장 작업 요청도 전체 작업으로 합침)
+
+작업 목록은 워커 메모리에 보관하며, 완료된 작업은 최근 JOB_HISTORY_SIZE개만 남깁니다.
+"""
+
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_HISTORY_SIZE = 100
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# 전체 그래프 작업의 범위 키
+ALL_SCOPE = 'all'
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 계산 중단"""
+
+
+class PropagationJob:
+    """그래프 재계산 작업 1건의 상태"""
+
+    def __init__(self, install_id: Optional[int] = None, trigger: str = 'api'):
+        self.id = uuid.uuid4().hex
+        self.install_id = install_id
+        self.scope = ALL_SCOPE if install_id is None else f"install:{install_id}"
+        self.trigger = trigger
+        self.status = QUEUED
+        self.phase = 'queued'
+        self.processes_done = 0
+        self.processes_total: Optional[int] = None
+        self.submitted_at = _now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.duplicate_submissions = 0
+        self._cancel = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def report_progress(self, done: int, total: int):
+        """계산 스레드에서 호출되는 진행률 콜백 (취소 요청 시 JobCancelled)"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.processes_done = done
+        self.processes_total = total
+        self.phase = 'saving' if done >= total else 'computing'
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.processes_total
+        return {
+            'job_id': self.id,
+            'install_id': self.install_id,
+            'scope': self.scope,
+            'trigger': self.trigger,
+            'status': self.status,
+            'phase': self.phase,
+            'processes_done': self.processes_done,
+            'processes_total': total,
+            'progress': round(self.processes_done / total, 4) if total else (1.0 if self.status == SUCCEEDED else 0.0),
+            'cancel_requested': self.cancel_requested,
+            'duplicate_submissions': self.duplicate_submissions,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class PropagationJobManager:
+    """그래프 재계산 작업 제출/조회/취소 (범위별 동시 실행 1개)"""
+
+    def __init__(self, edge_service=None, history_size: int = JOB_HISTORY_SIZE):
+        self._edge_service = edge_service
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, PropagationJob]" = OrderedDict()
+        self._active_by_scope: Dict[str, PropagationJob] = {}
+
+    @property
+    def edge_service(self):
+        if self._edge_service is None:
+            from app.domain.edge.edge_service import get_edge_service
+            self._edge_service = get_edge_service()
+        return self._edge_service
+
+    # ============================================================================
+    # 📥 제출/조회/취소
+    # ============================================================================
+
+    def submit(self, install_id: Optional[int] = None, trigger: str = 'api') -> Tuple[PropagationJob, bool]:
+        """작업 제출 - (작업, 새로 만들었는지) 반환. 같은 범위의 활성 작업이 있으면 그 작업을 반환"""
+        scope = ALL_SCOPE if install_id is None else f"install:{install_id}"
+        existing = self._active_by_scope.get(scope) or self._active_by_scope.get(ALL_SCOPE)
+        if existing is not None and existing.active and not existing.cancel_requested:
+            existing.duplicate_submissions += 1
+            logger.info(f"ℹ️ 재계산 작업 {existing.id}({existing.scope})이 이미 진행 중 - 새 요청을 합칩니다")
+            return existing, False
+
+        job = PropagationJob(install_id, trigger)
+        self._jobs[job.id] = job
+        self._active_by_scope[job.scope] = job
+        job._task = asyncio.create_task(self._run(job), name=f'propagation-job-{job.id}')
+        self._prune()
+        logger.info(f"🧵 재계산 작업 제출: {job.id} ({job.scope}, trigger={trigger})")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[PropagationJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, active_only: bool = False) -> List[PropagationJob]:
+        """최근 제출 순 작업 목록"""
+        jobs = list(reversed(self._jobs.values()))
+        return [job for job in jobs if job.active] if active_only else jobs
+
+    def cancel(self, job_id: str) -> Optional[PropagationJob]:
+        """작업 취소 요청 (이미 끝난 작업은 그대로 반환)"""
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return job
+        job._cancel.set()
+        if self._active_by_scope.get(job.scope) is job:
+            # 취소 중인 작업에는 새 요청을 합치지 않음
+            del self._active_by_scope[job.scope]
+        logger.info(f"🛑 재계산 작업 취소 요청: {job.id}")
+        return job
+
+    async def shutdown(self, timeout: float = 10.0):
+        """서비스 종료 시 진행 중인 작업 취소 후 대기"""
+        tasks = []
+        for job in self.list_jobs(active_only=True):
+            self.cancel(job.id)
+            if job._task is not None:
+                tasks.append(job._task)
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    # ============================================================================
+    # ⚙️ 실행
+    # ============================================================================
+
+    async def _run(self, job: PropagationJob):
+        job.status = RUNNING
+        job.phase = 'loading'
+        job.started_at = _now()
+        try:
+            if job.cancel_requested:
+                raise JobCancelled()
+            job.result = await self.edge_service.recalculate_graph(job.install_id, progress=job.report_progress)
+            job.status = SUCCEEDED
+            logger.info(f"✅ 재계산 작업 완료: {job.id} ({job.scope})")
+        except JobCancelled:
+            job.status = CANCELLED
+            logger.info(f"🛑 재계산 작업 취소됨: {job.id} ({job.scope}) - 저장하지 않음")
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            logger.error(f"❌ 재계산 작업 실패: {job.id} ({job.scope}): {e}")
+        finally:
+            job.phase = job.status
+            job.finished_at = _now()
+            if self._active_by_scope.get(job.scope) is job:
+                del self._active_by_scope[job.scope]
+
+    def _prune(self):
+        """완료된 작업은 최근 history_size개만 보관"""
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_job_manager = PropagationJobManager()
+
+def get_propagation_jobs() -> PropagationJobManager:
+    """워커 공용 재계산 작업 관리자 반환"""
+    return _job_manager
@@ -0,0 +1,234 @@
+# ============================================================================
+# ⚡ Edge Kernel - NumPy 벡터화 배출량 전파 커널
+# ============================================================================
+
+"""
+EmissionGraph.compute()와 같은 규칙을 NumPy 배열 연산으로 계산합니다.
+
+- 노드 속성(직접귀속배출량, 저장된 누적값, 제품 생산/판매량)은 노드 배열로,
+  엣지는 source/target 기준 CSR 인접 배열과 엣지별 가중치로 올립니다.
+- consume 분배 비율(to_next 비율 × 소비량 비율)은 그래프 구조에만 의존하므로 모든 엣지를 한 번에 계산합니다.
+- 위상 레벨(진입차수 0인 노드 묶음) 단위로 Σ 가중치 × 상류 값을 bincount로 누적합니다.
+- 순환은 EmissionGraph와 같은 규칙(미해결 consume 입력이 있는 가장 작은 노드부터)으로 끊습니다.
+
+NumPy가 없으면 compute_emissions()는 EmissionGraph.compute()로 계산합니다.
+
+환경변수:
+- EMISSION_KERNEL (기본 auto): auto | numpy | python
+- EMISSION_KERNEL_MIN_NODES (기본 2000): auto일 때 커널을 쓰는 최소 계산 노드 수
+"""
+
+import os
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy는 선택 의존성
+    np = None
+
+from app.domain.edge.edge_graph import EmissionGraph, ProgressCallback, PROCESS
+
+logger = logging.getLogger(__name__)
+
+NodeKey = Tuple[str, int]
+
+KIND_CONTINUE = 0
+KIND_PRODUCE = 1
+KIND_CONSUME = 2
+_KIND_CODES = {'continue': KIND_CONTINUE, 'produce': KIND_PRODUCE, 'consume': KIND_CONSUME}
+
+
+def kernel_available() -> bool:
+    """NumPy 커널 사용 가능 여부"""
+    return np is not None
+
+
+def _gather(indptr, rows):
+    """CSR에서 rows에 속한 엣지 위치를 한 번에 모음"""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), counts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total, dtype=np.int64), counts
+
+
+class VectorizedEmissionKernel:
+    """EmissionGraph를 배열로 변환해 위상 레벨 단위로 계산"""
+
+    def __init__(self, graph: EmissionGraph):
+        if np is None:
+            raise RuntimeError("NumPy가 설치되지 않아 벡터화 커널을 사용할 수 없습니다.")
+
+        self.graph = graph
+        self.nodes: List[NodeKey] = graph.nodes()
+        self.index: Dict[NodeKey, int] = {node: i for i, node in enumerate(self.nodes)}
+        node_count = len(self.nodes)
+        self.process_count = sum(1 for node_type, _ in self.nodes if node_type == PROCESS)
+        self.is_process = np.arange(node_count) < self.process_count
+
+        # 노드 속성
+        attrdir = np.zeros(node_count)
+        stored = np.zeros(node_count)
+        amount = np.zeros(node_count)
+        to_next = np.zeros(node_count)
+        for i, (node_type, node_id) in enumerate(self.nodes):
+            if node_type == PROCESS:
+                row = graph.processes[node_id]
+                attrdir[i] = row['attrdir_em']
+                stored[i] = row['cumulative_emission'] or row['attrdir_em']
+            else:
+                row = graph.products[node_id]
+                stored[i] = row['attr_em']
+                amount[i] = row['product_amount']
+                to_next[i] = max(row['product_amount'] - row['product_sell'] - row['product_eusell'], 0.0)
+        self.attrdir = attrdir
+        self.stored = stored
+
+        # 엣지 배열 (EmissionGraph에서 이미 검증/중복 제거됨)
+        sources: List[int] = []
+        targets: List[int] = []
+        kinds: List[int] = []
+        consumption: List[float] = []
+        for target, predecessors in graph.predecessors.items():
+            target_index = self.index[target]
+            for source, kind in predecessors:
+                sources.append(self.index[source])
+                targets.append(target_index)
+                kinds.append(_KIND_CODES[kind])
+                consumption.append(
+                    graph.consumption_amounts.get((source[1], target[1]), 0.0) if kind == 'consume' else 0.0
+                )
+        self.src = np.asarray(sources, dtype=np.int64)
+        self.dst = np.asarray(targets, dtype=np.int64)
+        self.kind = np.asarray(kinds, dtype=np.int8)
+        consumption_arr = np.asarray(consumption, dtype=np.float64)
+
+        # consume 분배: ratio = 소비량 / 제품별 소비량 합 (합이 0이면 소비 공정 수로 균등)
+        is_consume = self.kind == KIND_CONSUME
+        consume_src = self.src[is_consume]
+        total_consumption = np.bincount(consume_src, weights=consumption_arr[is_consume], minlength=node_count)
+        consumer_count = np.bincount(consume_src, minlength=node_count)
+        total_for_edge = total_consumption[consume_src]
+        ratio = np.where(
+            total_for_edge > 0,
+            consumption_arr[is_consume] / np.where(total_for_edge > 0, total_for_edge, 1.0),
+            1.0 / np.maximum(consumer_count[consume_src], 1)
+        )
+        product_amount = amount[consume_src]
+        to_next_share = np.where(product_amount > 0, to_next[consume_src] / np.where(product_amount > 0, product_amount, 1.0), 0.0)
+
+        self.weight = np.ones(len(self.src))
+        self.weight[is_consume] = to_next_share * ratio
+        self.allocated = np.zeros(len(self.src))
+        self.allocated[is_consume] = to_next[consume_src] * ratio
+        self.has_producer = np.bincount(self.dst[self.kind == KIND_PRODUCE], minlength=node_count) > 0
+
+        # target 기준 / source 기준 CSR
+        self.in_order = np.argsort(self.dst, kind='stable')
+        self.in_indptr = np.concatenate(([0], np.cumsum(np.bincount(self.dst, minlength=node_count))))
+        self.out_order = np.argsort(self.src, kind='stable')
+        self.out_indptr = np.concatenate(([0], np.cumsum(np.bincount(self.src, minlength=node_count))))
+
+    def compute(self, nodes: Optional[Set[NodeKey]] = None, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """EmissionGraph.compute()와 같은 형식의 결과를 반환 (progress는 레벨마다 호출)"""
+        node_count = len(self.nodes)
+        in_targets = np.zeros(node_count, dtype=bool)
+        if nodes is None:
+            in_targets[:] = True
+        else:
+            in_targets[[self.index[node] for node in nodes if node in self.index]] = True
+        target_total = int(in_targets.sum())
+
+        internal = in_targets[self.src] & in_targets[self.dst]
+        indegree = np.bincount(self.dst[internal], minlength=node_count)
+        resolved = np.zeros(node_count, dtype=bool)
+        value = self.stored.copy()
+        is_consume = self.kind == KIND_CONSUME
+
+        order: List[int] = []
+        cycle_nodes: List[int] = []
+        frontier = np.flatnonzero(in_targets & (indegree == 0))
+        process_total = int((in_targets & self.is_process).sum())
+        process_done = 0
+        if progress:
+            progress(0, process_total)
+
+        while len(order) < target_total:
+            if frontier.size == 0:
+                # 순환: 미해결 consume 입력이 있는 노드 중 가장 작은 노드부터 저장값으로 끊음
+                remaining = in_targets & ~resolved
+                unresolved_source = in_targets[self.src] & ~resolved[self.src]
+                candidates = self.dst[is_consume & remaining[self.dst] & unresolved_source]
+                forced = int(candidates.min()) if candidates.size else int(np.flatnonzero(remaining)[0])
+                logger.warning(f"⚠️ 순환 참조 감지: {self.nodes[forced][0]} {self.nodes[forced][1]}에서 저장값으로 순환을 끊습니다")
+                cycle_nodes.append(forced)
+                frontier = np.array([forced], dtype=np.int64)
+
+            self._evaluate(frontier, value)
+            resolved[frontier] = True
+            order.extend(frontier.tolist())
+            if progress:
+                process_done += int(self.is_process[frontier].sum())
+                progress(process_done, process_total)
+
+            positions, _ = _gather(self.out_indptr, frontier)
+            successors = self.dst[self.out_order[positions]]
+            successors = successors[in_targets[successors] & ~resolved[successors]]
+            if successors.size:
+                np.subtract.at(indegree, successors, 1)
+                successors = np.unique(successors)
+                frontier = successors[indegree[successors] == 0]
+            else:
+                frontier = np.empty(0, dtype=np.int64)
+
+        order_arr = np.asarray(order, dtype=np.int64)
+        processes = order_arr[self.is_process[order_arr]]
+        products = order_arr[~self.is_process[order_arr] & self.has_producer[order_arr]]
+        consumed = is_consume & resolved[self.dst]
+
+        return {
+            'process_cumulative': {
+                self.nodes[i][1]: v for i, v in zip(processes.tolist(), value[processes].tolist())
+            },
+            'product_attr_em': {
+                self.nodes[i][1]: v for i, v in zip(products.tolist(), value[products].tolist())
+            },
+            'consumption_amounts': {
+                (self.nodes[s][1], self.nodes[d][1]): a
+                for s, d, a in zip(self.src[consumed].tolist(), self.dst[consumed].tolist(), self.allocated[consumed].tolist())
+            },
+            'order': [self.nodes[i] for i in order],
+            'cycle_nodes': [self.nodes[i] for i in cycle_nodes],
+        }
+
+    def _evaluate(self, frontier, value):
+        """한 레벨의 노드 값을 계산 (공정: attrdir + Σ, 생산자가 있는 제품: Σ produce)"""
+        positions, counts = _gather(self.in_indptr, frontier)
+        edges = self.in_order[positions]
+        local = np.repeat(np.arange(frontier.size), counts)
+        sums = np.bincount(local, weights=self.weight[edges] * value[self.src[edges]], minlength=frontier.size)
+
+        process_mask = self.is_process[frontier]
+        value[frontier[process_mask]] = self.attrdir[frontier[process_mask]] + sums[process_mask]
+        product_mask = ~process_mask & self.has_producer[frontier]
+        value[frontier[product_mask]] = sums[product_mask]
+
+
+def compute_emissions(
+    graph: EmissionGraph, nodes: Optional[Set[NodeKey]] = None, progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """설정과 그래프 크기에 따라 NumPy 커널 또는 EmissionGraph.compute()로 계산"""
+    mode = os.getenv('EMISSION_KERNEL', 'auto').strip().lower()
+    min_nodes = int(os.getenv('EMISSION_KERNEL_MIN_NODES', '2000'))
+    node_count = len(nodes) if nodes is not None else len(graph.processes) + len(graph.products)
+
+    use_kernel = np is not None and (mode == 'numpy' or (mode == 'auto' and node_count >= min_nodes))
+    if mode == 'numpy' and np is None:
+        logger.warning("⚠️ EMISSION_KERNEL=numpy 이지만 NumPy가 없어 기본 계산을 사용합니다.")
+
+    if use_kernel:
+        return VectorizedEmissionKernel(graph).compute(nodes, progress)
+    return graph.compute(nodes, progress)
@@ -0,0 +1,100 @@
+# ============================================================================
+# 🔒 Edge Locks - 배출량 전파 동시성 제어
+# ============================================================================
+
+"""
+배출량 전파가 동시에 실행될 때 쓰기가 섞이지 않도록 두 단계로 제어합니다.
+
+1) 워커 간: Postgres advisory lock (pg_advisory_xact_lock, 트랜잭션 종료 시 자동 해제)
+   - 전체 그래프 전파: 전역 키를 배타(exclusive)로 잡음
+   - 부분 전파(사업장/하류 범위): 전역 키를 공유(shared)로 잡고, 범위에 속한 사업장 키를
+     ID 오름차순으로 배타로 잡음 → 서로 다른 사업장은 병렬, 같은 사업장은 순차
+2) 워커 내: SingleFlight
+   - 같은 키의 전파가 아직 스냅샷을 읽기 전이면 새 요청은 그 결과를 함께 받음
+   - 이미 스냅샷을 읽은 뒤라면 뒤따르는 1회(follower)에 합류 (이후 요청도 같은 follower를 공유)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# advisory lock 2-키 형식의 첫 번째 키 (배출량 전파 전용 네임스페이스, 'CB')
+PROPAGATION_LOCK_CLASS = 0x4342
+# 전역 키 (사업장 ID는 1부터 시작하므로 0과 겹치지 않음)
+GLOBAL_LOCK_ID = 0
+
+
+async def acquire_propagation_locks(conn, install_ids: Optional[Iterable[int]] = None) -> None:
+    """현재 트랜잭션에 전파 advisory lock 획득 (install_ids가 None이면 전체 그래프 배타 잠금)"""
+    if install_ids is None:
+        await conn.execute("SELECT pg_advisory_xact_lock($1, $2)", PROPAGATION_LOCK_CLASS, GLOBAL_LOCK_ID)
+        return
+
+    await conn.execute("SELECT pg_advisory_xact_lock_shared($1, $2)", PROPAGATION_LOCK_CLASS, GLOBAL_LOCK_ID)
+    # 항상 같은 순서로 잡아야 교착 상태가 생기지 않음
+    for install_id in sorted(set(install_ids)):
+        await conn.execute("SELECT pg_advisory_xact_lock($1, $2)", PROPAGATION_LOCK_CLASS, install_id)
+
+
+class _Flight:
+    """진행 중인 전파 1회"""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.sealed = False  # 스냅샷을 읽기 시작하면 True (이후 요청은 follower로)
+        self.waiters = 1
+
+
+class SingleFlight:
+    """키별로 동시에 1회만 실행하고 결과를 대기자와 공유"""
+
+    def __init__(self):
+        self._running: Dict[Hashable, _Flight] = {}
+        self._queued: Dict[Hashable, _Flight] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[Callable[[], None]], Awaitable[Any]]) -> Any:
+        """fn(seal)을 실행. fn은 최신 데이터를 읽기 직전에 seal()을 호출해야 함"""
+        flight = self._running.get(key)
+        if flight is not None and not flight.sealed:
+            flight.waiters += 1
+            logger.info(f"ℹ️ 진행 중인 전파({key})에 합류 - 결과를 공유합니다")
+            return await asyncio.shield(flight.task)
+
+        queued = self._queued.get(key)
+        if queued is not None:
+            queued.waiters += 1
+            logger.info(f"ℹ️ 대기 중인 후속 전파({key})에 합류")
+            return await asyncio.shield(queued.task)
+
+        flight = _Flight()
+        if key in self._running:
+            self._queued[key] = flight
+            flight.task = asyncio.create_task(self._follow(key, flight, fn, self._running[key].task))
+        else:
+            self._running[key] = flight
+            flight.task = asyncio.create_task(self._execute(key, flight, fn))
+        return await asyncio.shield(flight.task)
+
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    async def _follow(self, key: Hashable, flight: _Flight, fn, previous: asyncio.Task) -> Any:
+        await asyncio.wait([previous])
+        if self._queued.get(key) is flight:
+            del self._queued[key]
+        self._running[key] = flight
+        return await self._execute(key, flight, fn)
+
+    async def _execute(self, key: Hashable, flight: _Flight, fn) -> Any:
+        def seal():
+            flight.sealed = True
+
+        try:
+            return await fn(seal)
+        finally:
+            if self._running.get(key) is flight:
+                del self._running[key]
+            if flight.waiters > 1:
+                logger.info(f"✅ 전파({key}) 결과를 {flight.waiters}개 요청이 공유")
@@ -4,26 +4,49 @@
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 import asyncpg
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+from app.domain.edge import edge_traversal
+from app.domain.edge.edge_locks import acquire_propagation_locks
+from app.domain.edge.edge_traversal import DOWNSTREAM
+
 logger = logging.getLogger(__name__)
 
+UNIQUE_ENDPOINTS_INDEX = 'uq_edge_endpoints'
+EDGE_ENDPOINT_COLUMNS = 'source_node_type, source_id, target_node_type, target_id, edge_kind'
+
+# 유니크 인덱스 사용 가능 여부 (중복 엣지가 남아 있어 만들지 못했으면 False → ON CONFLICT 대신 NOT EXISTS로 중복 방지)
+_endpoints_unique: Optional[bool] = None
+
+
+def count_duplicate_edges_query() -> str:
+    """같은 (소스, 타겟, 종류) 엣지 중 가장 먼저 생성된 행을 제외한 행 수"""
+    return f"""
+        SELECT COALESCE(SUM(copies - 1), 0)::bigint
+        FROM (SELECT COUNT(*) AS copies FROM edge GROUP BY {EDGE_ENDPOINT_COLUMNS} HAVING COUNT(*) > 1) duplicates
+    """
+
+
 class EdgeRepository:
     """엣지 데이터 접근 클래스 (asyncpg 연결 풀)"""
     
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -35,20 +58,17 @@ class EdgeRepository:
         self._initialization_attempted = True
         
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-edge'
-                }
-            )
-            logger.info("✅ Edge 데이터베이스 연결 풀 생성 성공")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
+            
+            logger.info("✅ Edge 공용 연결 풀 연결 성공")
             
-            # 테이블 생성은 선택적으로 실행
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_edge_table_async()
+                await self.pool_manager.run_once('edge.edge_table', self._create_edge_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -69,6 +89,16 @@ class EdgeRepository:
         
         logger.info("✅ Edge 연결 풀 정상 상태 확인")
     
+    @asynccontextmanager
+    async def _connection(self, conn=None) -> AsyncIterator[asyncpg.Connection]:
+        """주어진 연결(전파 트랜잭션)을 그대로 쓰거나 풀에서 새로 획득"""
+        if conn is not None:
+            yield conn
+            return
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as acquired:
+            yield acquired
+    
     async def _create_edge_table_async(self):
         """edge 테이블 생성 (비동기)"""
         if not self.pool:
@@ -102,22 +132,54 @@ class EdgeRepository:
                         );
                     """)
                     
-                    # 인덱스 생성
-                    await conn.execute("""
-                        CREATE INDEX idx_edge_kind ON edge (edge_kind);
-                        CREATE INDEX idx_edge_source_id ON edge (source_id);
-                        CREATE INDEX idx_edge_source_node_type ON edge (source_node_type);
-                        CREATE INDEX idx_edge_target_id ON edge (target_id);
-                        CREATE INDEX idx_edge_target_node_type ON edge (target_node_type);
-                    """)
-                    
                     logger.info("✅ edge 테이블 생성 완료")
                 else:
                     logger.info("✅ edge 테이블이 이미 존재합니다.")
+                
+                # 인덱스는 기존 테이블에도 적용 (없을 때만 생성)
+                await self._ensure_edge_indexes_async(conn)
                     
         except Exception as e:
             logger.error(f"❌ edge 테이블 생성 실패: {str(e)}")
     
+    async def _ensure_edge_indexes_async(self, conn):
+        """
+        edge 인덱스 정리
+        - (source_node_type, source_id, target_node_type, target_id, edge_kind) 유니크 인덱스: 중복 엣지 방지 + ON CONFLICT 대상
+          (기존 중복 엣지가 있으면 데이터를 건드리지 않고 건너뜀 → python -m app.domain.edge.edge_dedupe 로 정리)
+        - (source_node_type, source_id) / (target_node_type, target_id): 인접 노드 조회용 복합 인덱스
+        - 기존 단일 컬럼 source/target 인덱스는 복합 인덱스로 대체되어 삭제
+        """
+        global _endpoints_unique
+        async with conn.transaction():
+            _endpoints_unique = await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_index WHERE indexrelid = to_regclass($1) AND indrelid = 'edge'::regclass)",
+                UNIQUE_ENDPOINTS_INDEX
+            )
+            if not _endpoints_unique:
+                duplicates = await conn.fetchval(count_duplicate_edges_query())
+                if duplicates:
+                    logger.warning(
+                        f"⚠️ 중복 엣지 {duplicates}개가 있어 {UNIQUE_ENDPOINTS_INDEX} 생성을 건너뜁니다 "
+                        f"(정리: python -m app.domain.edge.edge_dedupe)"
+                    )
+                else:
+                    await conn.execute(f"CREATE UNIQUE INDEX {UNIQUE_ENDPOINTS_INDEX} ON edge ({EDGE_ENDPOINT_COLUMNS})")
+                    _endpoints_unique = True
+
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_edge_source ON edge (source_node_type, source_id);
+                CREATE INDEX IF NOT EXISTS idx_edge_target ON edge (target_node_type, target_id);
+                CREATE INDEX IF NOT EXISTS idx_edge_kind ON edge (edge_kind);
+                DROP INDEX IF EXISTS idx_edge_source_id;
+                DROP INDEX IF EXISTS idx_edge_source_node_type;
+                DROP INDEX IF EXISTS idx_edge_target_id;
+                DROP INDEX IF EXISTS idx_edge_target_node_type;
+            """)
+            # 노드 타입/엣지 종류 컬럼 타입 (운영 스키마는 enum, 자동 생성 테이블은 VARCHAR)
+            await edge_traversal.edge_column_types(conn, refresh=True)
+        logger.info("✅ edge 인덱스 확인 완료")
+    
     # ============================================================================
     # 📋 기본 CRUD 작업
     # ============================================================================
@@ -128,70 +190,231 @@ class EdgeRepository:
             await self._ensure_pool_initialized()
             
             async with self.pool.acquire() as conn:
-                # 중복 방지: 동일 (source_node_type, source_id, target_node_type, target_id, edge_kind) 존재 여부 확인
-                dup_row = await conn.fetchrow(
-                    """
-                    SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
+                node_type, edge_kind = await edge_traversal.edge_column_types(conn)
+                # 유니크 인덱스 기반 upsert: 한 번의 왕복으로 생성하거나 기존 엣지를 반환
+                row = await conn.fetchrow(
+                    f"""
+                    WITH inserted AS (
+                        INSERT INTO edge (source_node_type, source_id, target_node_type, target_id, edge_kind)
+                        SELECT $1::{node_type}, $2::int, $3::{node_type}, $4::int, $5::{edge_kind}
+                        {self._insert_guard('$1', '$2', '$3', '$4', '$5')}
+                        RETURNING id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
+                    )
+                    SELECT *, TRUE AS created FROM inserted
+                    UNION ALL
+                    SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at, FALSE AS created
                     FROM edge
                     WHERE source_node_type = $1 AND source_id = $2 AND target_node_type = $3 AND target_id = $4 AND edge_kind = $5
+                      AND NOT EXISTS (SELECT 1 FROM inserted)
                     LIMIT 1
                     """,
-                    edge_data['source_node_type'],
-                    edge_data['source_id'],
-                    edge_data['target_node_type'],
-                    edge_data['target_id'],
-                    edge_data['edge_kind']
+                    *self._edge_values(edge_data)
                 )
-                if dup_row:
-                    logger.info(
-                        f"⚠️ 중복 엣지 감지: {dup_row['id']} (생성 건은 무시하고 기존 레코드 반환)"
-                    )
-                    return dict(dup_row)
                 
-                query = """
-                    INSERT INTO edge (source_node_type, source_id, target_node_type, target_id, edge_kind)
-                    VALUES ($1, $2, $3, $4, $5)
-                    RETURNING id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
-                """
-                
-                row = await conn.fetchrow(
-                    query,
-                    edge_data['source_node_type'],
-                    edge_data['source_id'],
-                    edge_data['target_node_type'],
-                    edge_data['target_id'],
-                    edge_data['edge_kind']
-                )
+                if row is None:
+                    # 동시 요청이 같은 엣지를 먼저 커밋한 경우: 위 문장의 스냅샷에는 보이지 않으므로 다시 조회
+                    row = await conn.fetchrow(
+                        """
+                        SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at, FALSE AS created
+                        FROM edge
+                        WHERE source_node_type = $1 AND source_id = $2 AND target_node_type = $3 AND target_id = $4 AND edge_kind = $5
+                        """,
+                        *self._edge_values(edge_data)
+                    )
                 
                 if row:
-                    logger.info(f"✅ 엣지 생성 성공: ID {row['id']}")
+                    if row['created']:
+                        logger.info(f"✅ 엣지 생성 성공: ID {row['id']}")
+                    else:
+                        logger.info(f"⚠️ 중복 엣지 감지: {row['id']} (생성 건은 무시하고 기존 레코드 반환)")
                     return dict(row)
                 return None
                 
         except Exception as e:
             logger.error(f"❌ 엣지 생성 실패: {str(e)}")
             return None
-    
-    async def get_edges(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """모든 엣지 조회 (페이지네이션)"""
+
+    # ============================================================================
+    # 📦 일괄 처리 (bulk)
+    # ============================================================================
+
+    async def get_bulk_validation_context(self, process_ids: List[int], product_ids: List[int]) -> Dict[str, Any]:
+        """일괄 엣지 검증에 필요한 노드 존재 여부와 공정별 귀속 제품을 한 번에 조회합니다."""
+        try:
+            await self._ensure_pool_initialized()
+
+            async with self.pool.acquire() as conn:
+                process_rows = await conn.fetch(
+                    "SELECT id FROM process WHERE id = ANY($1::int[])", process_ids
+                )
+                product_rows = await conn.fetch(
+                    "SELECT id FROM product WHERE id = ANY($1::int[])", product_ids
+                )
+                process_product_rows = await conn.fetch(
+                    """
+                    SELECT DISTINCT process_id, product_id
+                    FROM product_process
+                    WHERE process_id = ANY($1::int[])
+                    """,
+                    process_ids
+                )
+
+            process_products: Dict[int, set] = {}
+            for row in process_product_rows:
+                process_products.setdefault(row['process_id'], set()).add(row['product_id'])
+
+            return {
+                'process_ids': {row['id'] for row in process_rows},
+                'product_ids': {row['id'] for row in product_rows},
+                'process_products': process_products
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 일괄 엣지 검증 데이터 조회 실패: {str(e)}")
+            raise
+
+    async def find_existing_edges(self, edges: List[Dict[str, Any]]) -> Dict[Tuple[str, int, str, int, str], int]:
+        """주어진 엣지 중 이미 존재하는 것을 한 번의 쿼리로 찾아 {(source_node_type, source_id, target_node_type, target_id, edge_kind): id}로 반환합니다."""
+        if not edges:
+            return {}
+        try:
+            await self._ensure_pool_initialized()
+
+            async with self.pool.acquire() as conn:
+                values = await self._edge_columns_unnest(conn)
+                rows = await conn.fetch(
+                    f"""
+                    SELECT DISTINCT ON (e.source_node_type, e.source_id, e.target_node_type, e.target_id, e.edge_kind)
+                           e.id, e.source_node_type, e.source_id, e.target_node_type, e.target_id, e.edge_kind
+                    FROM {values}
+                    JOIN edge e
+                      ON e.source_node_type = v.source_node_type AND e.source_id = v.source_id
+                     AND e.target_node_type = v.target_node_type AND e.target_id = v.target_id
+                     AND e.edge_kind = v.edge_kind
+                    ORDER BY e.source_node_type, e.source_id, e.target_node_type, e.target_id, e.edge_kind, e.id
+                    """,
+                    *self._edge_columns(edges)
+                )
+
+            return {
+                (row['source_node_type'], row['source_id'], row['target_node_type'], row['target_id'], row['edge_kind']): row['id']
+                for row in rows
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 기존 엣지 일괄 조회 실패: {str(e)}")
+            raise
+
+    async def create_edges_bulk(self, edges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """엣지를 다중 행 INSERT 한 번으로 생성하고 실제로 생성된 행만 반환합니다(이미 존재하는 엣지는 건너뜀)."""
+        if not edges:
+            return []
+        try:
+            await self._ensure_pool_initialized()
+
+            async with self.pool.acquire() as conn:
+                values = await self._edge_columns_unnest(conn)
+                rows = await conn.fetch(
+                    f"""
+                    INSERT INTO edge (source_node_type, source_id, target_node_type, target_id, edge_kind)
+                    SELECT v.source_node_type, v.source_id, v.target_node_type, v.target_id, v.edge_kind
+                    FROM {values}
+                    {self._insert_guard('v.source_node_type', 'v.source_id', 'v.target_node_type', 'v.target_id', 'v.edge_kind')}
+                    RETURNING id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
+                    """,
+                    *self._edge_columns(edges)
+                )
+
+            logger.info(f"✅ 엣지 일괄 생성 성공: {len(rows)}/{len(edges)}개")
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"❌ 엣지 일괄 생성 실패: {str(e)}")
+            raise
+
+    @staticmethod
+    def _insert_guard(*values: str) -> str:
+        """중복 엣지 INSERT 방지 절 (유니크 인덱스가 없으면 같은 엣지가 있는지 직접 확인)"""
+        if _endpoints_unique is not False:
+            return f"ON CONFLICT ({EDGE_ENDPOINT_COLUMNS}) DO NOTHING"
+        columns = EDGE_ENDPOINT_COLUMNS.split(', ')
+        matches = ' AND '.join(f"e.{column} = {value}" for column, value in zip(columns, values))
+        return f"WHERE NOT EXISTS (SELECT 1 FROM edge e WHERE {matches})"
+
+    @staticmethod
+    def _edge_values(edge: Dict[str, Any]) -> List[Any]:
+        """유니크 키 컬럼 순서의 파라미터"""
+        return [
+            edge['source_node_type'],
+            edge['source_id'],
+            edge['target_node_type'],
+            edge['target_id'],
+            edge['edge_kind'],
+        ]
+
+    @staticmethod
+    async def _edge_columns_unnest(conn) -> str:
+        """_edge_columns 파라미터($1~$5)를 edge 컬럼 타입으로 펼친 행 집합 v"""
+        node_type, edge_kind = await edge_traversal.edge_column_types(conn)
+        return (
+            f"unnest($1::{node_type}[], $2::int[], $3::{node_type}[], $4::int[], $5::{edge_kind}[]) "
+            f"AS v(source_node_type, source_id, target_node_type, target_id, edge_kind)"
+        )
+
+    @staticmethod
+    def _edge_columns(edges: List[Dict[str, Any]]) -> List[List[Any]]:
+        """unnest 파라미터용 컬럼 배열"""
+        return [
+            [edge['source_node_type'] for edge in edges],
+            [edge['source_id'] for edge in edges],
+            [edge['target_node_type'] for edge in edges],
+            [edge['target_id'] for edge in edges],
+            [edge['edge_kind'] for edge in edges],
+        ]
+
+    async def get_edges(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = 100,
+        edge_kind: Optional[str] = None,
+        process_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """엣지 목록 조회 (id 순 키셋 페이지네이션)"""
         try:
             await self._ensure_pool_initialized()
             
             async with self.pool.acquire() as conn:
-                query = """
+                query = self._edge_filters(edge_kind, process_id).after(['id'], [after_id] if after_id is not None else None)
+                rows = await conn.fetch(f"""
                     SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
                     FROM edge
+                    {query.where_sql}
                     ORDER BY id
-                    LIMIT $1 OFFSET $2
-                """
-                
-                rows = await conn.fetch(query, limit, skip)
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 return [dict(row) for row in rows]
                 
         except Exception as e:
             logger.error(f"❌ 엣지 목록 조회 실패: {str(e)}")
             return []
     
+    async def estimate_edges_count(self, edge_kind: Optional[str] = None, process_id: Optional[int] = None) -> Optional[int]:
+        """필터에 맞는 엣지 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM edge", self._edge_filters(edge_kind, process_id))
+    
+    def _edge_filters(self, edge_kind: Optional[str] = None, process_id: Optional[int] = None) -> KeysetQuery:
+        """엣지 목록 필터 조건 (엣지 종류, 공정이 출발/도착 노드인 엣지 - idx_edge_source/target 사용)"""
+        query = KeysetQuery().where("edge_kind = {}", edge_kind)
+        if process_id is not None:
+            placeholder = query.param(process_id)
+            query.conditions.append(
+                f"((source_node_type = 'process' AND source_id = {placeholder}) "
+                f"OR (target_node_type = 'process' AND target_id = {placeholder}))"
+            )
+        return query
+    
     async def get_all_edges(self) -> List[Dict[str, Any]]:
         """모든 엣지 조회 (페이지네이션 제한 없음) - 배출량 전파용"""
         try:
@@ -212,6 +435,31 @@ class EdgeRepository:
             logger.error(f"❌ 전체 엣지 조회 실패: {str(e)}")
             return []
     
+    async def get_edge_index_rows(self) -> List[Dict[str, Any]]:
+        """인메모리 인접 인덱스 적재용 전체 엣지 조회 (실패 시 예외 - 빈 인덱스 방지)"""
+        await self._ensure_pool_initialized()
+        
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind, created_at, updated_at
+                FROM edge
+                ORDER BY id
+            """)
+            return [dict(row) for row in rows]
+    
+    async def notify_edge_change(self, channel: str, payload: str) -> bool:
+        """엣지 변경을 다른 워커에 알림 (Postgres NOTIFY)"""
+        try:
+            await self._ensure_pool_initialized()
+            
+            async with self.pool.acquire() as conn:
+                await conn.execute("SELECT pg_notify($1, $2)", channel, payload)
+                return True
+                
+        except Exception as e:
+            logger.warning(f"⚠️ 엣지 변경 알림 실패: {str(e)}")
+            return False
+    
     async def get_edge(self, edge_id: int) -> Optional[Dict[str, Any]]:
         """특정 엣지 조회"""
         try:
@@ -325,6 +573,65 @@ class EdgeRepository:
             logger.error(f"❌ 노드별 엣지 조회 실패: {str(e)}")
             return []
     
+    # ============================================================================
+    # 🧭 그래프 탐색 (재귀 CTE, 질의당 DB 왕복 1회)
+    # ============================================================================
+    
+    async def get_reachable_nodes(
+        self, node_type: str, node_id: int, direction: str = DOWNSTREAM, edge_kinds: Optional[List[str]] = None
+    ) -> List[Tuple[str, int]]:
+        """노드에서 하류/상류로 도달 가능한 노드 목록"""
+        try:
+            await self._ensure_pool_initialized()
+            
+            async with self.pool.acquire() as conn:
+                return await edge_traversal.reachable_nodes(conn, node_type, node_id, direction, edge_kinds)
+                
+        except Exception as e:
+            logger.error(f"❌ 도달 가능 노드 조회 실패: {str(e)}")
+            raise e
+    
+    async def would_create_cycle(
+        self, source_type: str, source_id: int, target_type: str, target_id: int,
+        edge_kinds: Optional[List[str]] = None
+    ) -> bool:
+        """source → target 엣지 추가 시 사이클 발생 여부"""
+        try:
+            await self._ensure_pool_initialized()
+            
+            async with self.pool.acquire() as conn:
+                return await edge_traversal.would_create_cycle(
+                    conn, (source_type, source_id), (target_type, target_id), edge_kinds
+                )
+                
+        except Exception as e:
+            logger.error(f"❌ 사이클 검사 실패: {str(e)}")
+            raise e
+    
+    async def get_product_ancestors(self, product_id: int) -> List[Dict[str, Any]]:
+        """제품의 모든 상류 공정/제품 조회"""
+        try:
+            await self._ensure_pool_initialized()
+            
+            async with self.pool.acquire() as conn:
+                return await edge_traversal.product_ancestors(conn, product_id)
+                
+        except Exception as e:
+            logger.error(f"❌ 제품 {product_id} 상류 노드 조회 실패: {str(e)}")
+            raise e
+    
+    async def get_downstream_scope(
+        self, seeds: List[Tuple[str, int]], conn=None
+    ) -> Tuple[Set[Tuple[str, int]], Set[Tuple[str, int]]]:
+        """seeds의 하류 범위(cone)와 재계산에 필요한 노드 집합(scope) - 재귀 CTE 1회"""
+        try:
+            async with self._connection(conn) as conn:
+                return await edge_traversal.downstream_scope(conn, seeds)
+                
+        except Exception as e:
+            logger.error(f"❌ 하류 범위 조회 실패: {str(e)}")
+            raise e
+    
     # ============================================================================
     # 🔗 배출량 전파 관련 메서드들
     # ============================================================================
@@ -418,11 +725,10 @@ class EdgeRepository:
             logger.error(f"❌ 공정 {process_id} 누적 배출량 업데이트 실패: {str(e)}")
             return False
 
-    async def reset_all_cumulative_emission(self) -> bool:
+    async def reset_all_cumulative_emission(self, conn=None) -> bool:
         """모든 공정의 누적 배출량을 0으로 리셋합니다(엣지 삭제 후 정리용)."""
         try:
-            await self._ensure_pool_initialized()
-            async with self.pool.acquire() as conn:
+            async with self._connection(conn) as conn:
                 query = """
                     UPDATE process_attrdir_emission
                     SET cumulative_emission = 0, calculation_date = NOW(), updated_at = NOW()
@@ -450,6 +756,195 @@ class EdgeRepository:
             logger.error(f"❌ 누적 배출량을 직접귀속배출량으로 초기화 실패: {str(e)}")
             return False
     
+    async def get_propagation_snapshot(
+        self,
+        process_ids: Optional[List[int]] = None,
+        product_ids: Optional[List[int]] = None,
+        conn=None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """배출량 전파에 필요한 엣지/공정/제품/제품-공정 데이터를 한 번에 조회합니다.
+        process_ids/product_ids가 주어지면 해당 노드와 그 사이의 엣지만 조회합니다(부분 재계산용).
+        conn(propagation_transaction)이 주어지면 그 트랜잭션 안에서 조회합니다.
+        """
+        try:
+            if conn is not None:
+                # advisory lock 획득 이후에 커밋된 값까지 읽어야 하므로 전파 트랜잭션(READ COMMITTED)에서 조회
+                snapshot = await self._fetch_propagation_snapshot(conn, process_ids, product_ids)
+            else:
+                await self._ensure_pool_initialized()
+                async with self.pool.acquire() as conn:
+                    # 동일 스냅샷 기준으로 읽기 위해 읽기 전용 REPEATABLE READ 트랜잭션 사용
+                    async with conn.transaction(isolation='repeatable_read', readonly=True):
+                        snapshot = await self._fetch_propagation_snapshot(conn, process_ids, product_ids)
+
+            logger.info(
+                f"🔍 전파 스냅샷 조회: 엣지 {len(snapshot['edges'])}개, 공정 {len(snapshot['processes'])}개, "
+                f"제품 {len(snapshot['products'])}개, 제품-공정 {len(snapshot['product_processes'])}개"
+            )
+            return snapshot
+
+        except Exception as e:
+            logger.error(f"❌ 전파 스냅샷 조회 실패: {str(e)}")
+            raise
+
+    async def _fetch_propagation_snapshot(
+        self, conn, process_ids: Optional[List[int]], product_ids: Optional[List[int]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        scoped = process_ids is not None or product_ids is not None
+        args = [list(process_ids or []), list(product_ids or [])] if scoped else []
+
+        edge_filter = """
+            WHERE ((source_node_type = 'process' AND source_id = ANY($1::int[]))
+                   OR (source_node_type = 'product' AND source_id = ANY($2::int[])))
+              AND ((target_node_type = 'process' AND target_id = ANY($1::int[]))
+                   OR (target_node_type = 'product' AND target_id = ANY($2::int[])))
+        """ if scoped else ""
+        process_filter = "WHERE p.id = ANY($1::int[])" if scoped else ""
+        product_filter = "WHERE id = ANY($1::int[])" if scoped else ""
+        product_process_filter = "WHERE product_id = ANY($1::int[])" if scoped else ""
+
+        edges = await conn.fetch(f"""
+            SELECT id, source_node_type, source_id, target_node_type, target_id, edge_kind
+            FROM edge
+            {edge_filter}
+            ORDER BY id
+        """, *args)
+        processes = await conn.fetch(f"""
+            SELECT p.id AS process_id,
+                   COALESCE(pae.attrdir_em, 0) AS attrdir_em,
+                   COALESCE(pae.cumulative_emission, 0) AS cumulative_emission
+            FROM process p
+            LEFT JOIN process_attrdir_emission pae ON p.id = pae.process_id
+            {process_filter}
+        """, *args[:1])
+        products = await conn.fetch(f"""
+            SELECT id, product_amount, product_sell, product_eusell, attr_em
+            FROM product
+            {product_filter}
+        """, *args[1:])
+        product_processes = await conn.fetch(f"""
+            SELECT product_id, process_id, COALESCE(consumption_amount, 0) AS consumption_amount
+            FROM product_process
+            {product_process_filter}
+        """, *args[1:])
+
+        return {
+            'edges': [dict(row) for row in edges],
+            'processes': [dict(row) for row in processes],
+            'products': [dict(row) for row in products],
+            'product_processes': [dict(row) for row in product_processes],
+        }
+
+    async def get_scope_install_ids(
+        self, process_ids: List[int], product_ids: List[int], conn=None
+    ) -> List[int]:
+        """공정/제품이 속한 사업장 ID (전파 잠금 대상, 오름차순)"""
+        async with self._connection(conn) as conn:
+            rows = await conn.fetch("""
+                SELECT install_id FROM process WHERE id = ANY($1::int[]) AND install_id IS NOT NULL
+                UNION
+                SELECT install_id FROM product WHERE id = ANY($2::int[]) AND install_id IS NOT NULL
+                ORDER BY 1
+            """, list(process_ids), list(product_ids))
+            return [row['install_id'] for row in rows]
+
+    @asynccontextmanager
+    async def propagation_transaction(
+        self, install_ids: Optional[List[int]] = None
+    ) -> AsyncIterator[asyncpg.Connection]:
+        """배출량 전파 1회를 감싸는 트랜잭션 (advisory lock 포함, 종료 시 자동 해제).
+        install_ids가 없으면 전체 그래프를 배타적으로 잠그고,
+        주어지면 그 사업장만 잠가 다른 사업장의 전파와 병렬로 실행됩니다.
+        """
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                started = datetime.now()
+                await acquire_propagation_locks(conn, install_ids)
+                waited = (datetime.now() - started).total_seconds()
+                if waited > 0.5:
+                    scope = "전체 그래프" if install_ids is None else f"사업장 {sorted(install_ids)}"
+                    logger.info(f"🔒 전파 잠금 대기 {waited:.2f}s ({scope})")
+                yield conn
+
+    async def get_install_nodes(self, install_id: int) -> Dict[str, List[int]]:
+        """사업장에 속한 공정/제품 ID 조회 (사업장 단위 재계산 시드용)"""
+        try:
+            await self._ensure_pool_initialized()
+
+            async with self.pool.acquire() as conn:
+                process_ids = await conn.fetch(
+                    "SELECT id FROM process WHERE install_id = $1 ORDER BY id", install_id
+                )
+                product_ids = await conn.fetch(
+                    "SELECT id FROM product WHERE install_id = $1 ORDER BY id", install_id
+                )
+            return {
+                'process_ids': [row['id'] for row in process_ids],
+                'product_ids': [row['id'] for row in product_ids],
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 사업장 {install_id} 노드 조회 실패: {str(e)}")
+            raise
+
+    async def apply_propagation_results(
+        self,
+        process_cumulative: Dict[int, float],
+        product_attr_em: Dict[int, float],
+        consumption_amounts: Dict[Tuple[int, int], float],
+        conn=None
+    ) -> Dict[str, int]:
+        """전파 계산 결과를 하나의 트랜잭션에서 테이블별 단일 배치 쿼리로 저장합니다.
+        conn(propagation_transaction)이 주어지면 그 트랜잭션 안에서 저장합니다.
+        """
+        try:
+            async with self._connection(conn) as conn:
+                async with conn.transaction():
+                    if process_cumulative:
+                        await conn.execute("""
+                            INSERT INTO process_attrdir_emission (process_id, cumulative_emission, calculation_date)
+                            SELECT v.process_id, v.cumulative_emission, NOW()
+                            FROM unnest($1::int[], $2::numeric[]) AS v(process_id, cumulative_emission)
+                            ON CONFLICT (process_id) DO UPDATE SET
+                                cumulative_emission = EXCLUDED.cumulative_emission,
+                                calculation_date = NOW(),
+                                updated_at = NOW()
+                        """, list(process_cumulative.keys()), list(process_cumulative.values()))
+
+                    if product_attr_em:
+                        await conn.execute("""
+                            UPDATE product AS p
+                            SET attr_em = v.attr_em, updated_at = NOW()
+                            FROM unnest($1::int[], $2::numeric[]) AS v(product_id, attr_em)
+                            WHERE p.id = v.product_id
+                        """, list(product_attr_em.keys()), list(product_attr_em.values()))
+
+                    if consumption_amounts:
+                        keys = list(consumption_amounts.keys())
+                        await conn.execute("""
+                            INSERT INTO product_process (product_id, process_id, consumption_amount)
+                            SELECT v.product_id, v.process_id, v.consumption_amount
+                            FROM unnest($1::int[], $2::int[], $3::numeric[]) AS v(product_id, process_id, consumption_amount)
+                            ON CONFLICT (product_id, process_id) DO UPDATE SET
+                                consumption_amount = EXCLUDED.consumption_amount,
+                                updated_at = NOW()
+                        """, [k[0] for k in keys], [k[1] for k in keys], list(consumption_amounts.values()))
+
+            logger.info(
+                f"✅ 전파 결과 일괄 저장: 공정 {len(process_cumulative)}개, "
+                f"제품 {len(product_attr_em)}개, 투입량 {len(consumption_amounts)}개"
+            )
+            return {
+                'processes': len(process_cumulative),
+                'products': len(product_attr_em),
+                'consumption_amounts': len(consumption_amounts),
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 전파 결과 일괄 저장 실패: {str(e)}")
+            raise
+
     async def get_products_by_process(self, process_id: int) -> List[int]:
         """공정에 귀속된 제품 ID 목록 조회"""
         try:
@@ -581,6 +1076,25 @@ class EdgeRepository:
             logger.error(f"제품 {product_id}를 소비하는 공정 조회 실패: {str(e)}")
             return []
     
+    async def get_consumption_amounts(self, product_id: int, process_ids: List[int]) -> Dict[int, float]:
+        """제품을 소비하는 공정별 consumption_amount 조회 (product_process)"""
+        if not process_ids:
+            return {}
+        try:
+            await self._ensure_pool_initialized()
+            
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT process_id, COALESCE(consumption_amount, 0) AS consumption_amount
+                    FROM product_process
+                    WHERE product_id = $1 AND process_id = ANY($2::int[])
+                """, product_id, process_ids)
+                return {row['process_id']: row['consumption_amount'] for row in rows}
+                
+        except Exception as e:
+            logger.error(f"❌ 제품 {product_id} 소비량 조회 실패: {str(e)}")
+            raise e
+    
     async def update_process_material_amount(self, process_id: int, product_id: int, amount: float) -> bool:
         """공정의 원료 투입량을 업데이트합니다."""
         try:
@@ -3,7 +3,7 @@
 # ============================================================================
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 class EdgeCreateRequest(BaseModel):
@@ -47,3 +47,67 @@ class EdgeUpdateRequest(BaseModel):
     target_node_type: Optional[str] = Field(None, description="타겟 노드 타입")
     target_id: Optional[int] = Field(None, description="타겟 노드 ID")
     edge_kind: Optional[str] = Field(None, description="엣지 종류")
+
+class EdgeBulkRowResult(BaseModel):
+    """일괄 생성 요청의 행별 처리 결과"""
+    index: int = Field(..., description="요청 목록 내 위치 (0부터)")
+    status: str = Field(..., description="처리 결과 (created/duplicate/invalid/cycle)")
+    edge_id: Optional[int] = Field(None, description="생성되었거나 이미 존재하는 엣지 ID")
+    error: Optional[str] = Field(None, description="실패 사유")
+
+class EdgeBulkCreateResponse(BaseModel):
+    """엣지 일괄 생성 응답"""
+    message: str = Field(..., description="처리 결과 메시지")
+    total_count: int = Field(..., description="요청 엣지 수")
+    success_count: int = Field(..., description="새로 생성된 엣지 수")
+    duplicate_count: int = Field(..., description="이미 존재해 건너뛴 엣지 수")
+    failed_count: int = Field(..., description="검증 실패 엣지 수 (invalid/cycle)")
+    results: List[EdgeBulkRowResult] = Field(..., description="행별 처리 결과")
+    created_edges: List[EdgeResponse] = Field(default_factory=list, description="새로 생성된 엣지 목록")
+    propagation_result: Optional[Dict[str, Any]] = Field(None, description="생성 후 1회 실행한 하류 배출량 재계산 결과")
+
+class GraphNodeRef(BaseModel):
+    """그래프 탐색 결과 노드"""
+    node_type: str = Field(..., description="노드 타입 (process/product)")
+    node_id: int = Field(..., description="노드 ID")
+    node_name: Optional[str] = Field(None, description="공정명 또는 제품명")
+
+class EdgeTraversalResponse(BaseModel):
+    """그래프 탐색 응답"""
+    node_type: str = Field(..., description="시작 노드 타입")
+    node_id: int = Field(..., description="시작 노드 ID")
+    direction: str = Field(..., description="탐색 방향 (downstream/upstream)")
+    count: int = Field(..., description="도달한 노드 수")
+    nodes: List[GraphNodeRef] = Field(..., description="도달한 노드 목록 (시작 노드 제외)")
+
+class EdgeCycleCheckResponse(BaseModel):
+    """엣지 추가 시 사이클 발생 여부"""
+    source_node_type: str = Field(..., description="소스 노드 타입")
+    source_id: int = Field(..., description="소스 노드 ID")
+    target_node_type: str = Field(..., description="타겟 노드 타입")
+    target_id: int = Field(..., description="타겟 노드 ID")
+    creates_cycle: bool = Field(..., description="엣지를 추가하면 사이클이 생기는지 여부")
+
+class PropagationJobRequest(BaseModel):
+    """그래프 재계산 작업 제출 요청"""
+    install_id: Optional[int] = Field(None, description="사업장 ID (없으면 전체 그래프)")
+
+class PropagationJobResponse(BaseModel):
+    """그래프 재계산 작업 상태"""
+    job_id: str = Field(..., description="작업 ID")
+    install_id: Optional[int] = Field(None, description="사업장 ID (전체 그래프면 null)")
+    scope: str = Field(..., description="작업 범위 (all 또는 install:<id>)")
+    trigger: str = Field(..., description="작업을 제출한 경로")
+    status: str = Field(..., description="queued/running/succeeded/failed/cancelled")
+    phase: str = Field(..., description="진행 단계 (loading/computing/saving 또는 최종 상태)")
+    processes_done: int = Field(..., description="계산한 공정 수")
+    processes_total: Optional[int] = Field(None, description="계산할 전체 공정 수 (그래프 로딩 전에는 null)")
+    progress: float = Field(..., description="진행률 (0~1)")
+    cancel_requested: bool = Field(..., description="취소 요청 여부")
+    duplicate_submissions: int = Field(..., description="이 작업으로 합쳐진 중복 제출 수")
+    submitted_at: datetime = Field(..., description="제출 시각")
+    started_at: Optional[datetime] = Field(None, description="시작 시각")
+    finished_at: Optional[datetime] = Field(None, description="종료 시각")
+    result: Optional[Dict[str, Any]] = Field(None, description="재계산 결과 요약")
+    error: Optional[str] = Field(None, description="실패 사유")
+    deduplicated: bool = Field(False, description="이미 진행 중인 작업을 반환했는지 여부 (제출 응답에서만 사용)")
@@ -3,21 +3,38 @@
 # ============================================================================
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 from decimal import Decimal
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.domain.edge.edge_repository import EdgeRepository
-from app.domain.edge.edge_schema import EdgeResponse
+from app.domain.edge.edge_graph import (
+    EmissionGraph, EDGE_RULES, PROCESS, PRODUCT, ProgressCallback, cycle_closing_edges, edge_seeds
+)
+from app.domain.edge.edge_components import compute_partitioned
+from app.domain.edge.edge_locks import SingleFlight
+from app.domain.edge.edge_traversal import DOWNSTREAM
+from app.domain.edge.edge_index import EDGE_CHANNEL, EdgeAdjacencyIndex, get_edge_index
+from app.domain.edge.edge_schema import EdgeCreateRequest, EdgeResponse, EdgeBulkRowResult, EdgeBulkCreateResponse
 
 logger = logging.getLogger(__name__)
 
+# 단일 엣지 전파 응답에 표시할 계산 공식
+PROPAGATION_FORMULAS = {
+    'continue': 'target.cumulative_emission = target.attrdir_em + Σ source.cumulative_emission',
+    'produce': 'product.attr_em = Σ 생산 공정 cumulative_emission',
+    'consume': 'target.cumulative_emission = target.attrdir_em + product.attr_em × (to_next_process / product_amount) × 소비 비율',
+}
+
 class EdgeService:
     """엣지 기반 배출량 전파 서비스 (Repository 패턴)"""
     
     def __init__(self, db: Session):
         self.repository = EdgeRepository(db)
+        self.index = get_edge_index()
+        # 같은 범위의 동시 전파 요청은 한 번만 실행하고 결과 공유
+        self._flights = SingleFlight()
         logger.info("✅ Edge Service 초기화 완료")
     
     async def initialize(self):
@@ -36,6 +53,9 @@ class EdgeService:
     async def get_continue_edges(self, source_process_id: int) -> List[Dict[str, Any]]:
         """특정 공정에서 나가는 continue 엣지들을 조회합니다."""
         try:
+            index = await self._adjacency()
+            if index:
+                return index.outgoing((PROCESS, source_process_id), 'continue')
             return await self.repository.get_continue_edges(source_process_id)
         except Exception as e:
             logger.error(f"공정 {source_process_id}의 continue 엣지 조회 실패: {e}")
@@ -143,7 +163,7 @@ class EdgeService:
         """
         try:
             # 🔧 수정: produce 관계만 고려하여 순환 참조 방지
-            connected_processes = await self.repository.get_processes_connected_to_product(product_id)
+            connected_processes = await self.get_processes_connected_to_product(product_id)
             seen = set()
             total_emission = 0.0
             
@@ -215,7 +235,7 @@ class EdgeService:
                 return False
             
             # 3. 제품 소비량 조회 (product_process 테이블에서)
-            consumption_data = await self.repository.get_processes_consuming_product(source_product_id)
+            consumption_data = await self.get_processes_consuming_product(source_product_id)
             consumption_amount = 0.0
             
             for consume_data in consumption_data:
@@ -297,78 +317,113 @@ class EdgeService:
             logger.error(f"제품 {source_product_id} → 공정 {target_process_id} 배출량 전달 실패: {e}")
             return False
     
-    async def propagate_emissions_full_graph(self) -> Dict[str, Any]:
-        """전체 그래프에 대해 배출량 전파를 실행합니다."""
+    async def _propagate(
+        self,
+        seeds: Optional[List[Tuple[str, int]]] = None,
+        progress: Optional[ProgressCallback] = None,
+        reset_cumulative: bool = False,
+        on_snapshot: Optional[Callable[[], None]] = None
+    ) -> Tuple[EmissionGraph, Dict[str, Any], Optional[Set[Tuple[str, int]]]]:
+        """전파 1회: 하나의 트랜잭션에서 advisory lock → 스냅샷 조회 → 계산 → 결과 저장. (graph, result, cone) 반환
+        seeds가 None이면 전체 그래프(전역 배타 잠금), 아니면 seeds 하류 범위(cone)만 재계산하고 범위에 속한 사업장만 잠급니다.
+        잠금을 기다리는 사이 엣지가 바뀔 수 있으므로 잠금 후 범위를 다시 계산하고(인접 인덱스, 없으면 같은 연결의 재귀 CTE),
+        범위가 잠그지 않은 사업장으로 넓어졌으면 트랜잭션을 끝내(잠금 해제) 더 큰 집합을 ID 순서로 다시 잠급니다.
+        """
+        cone: Optional[Set[Tuple[str, int]]] = None
+        install_ids: Optional[List[int]] = None
+        if seeds is not None:
+            # 잠글 사업장 추정 (잠금 밖 - 인접 인덱스 또는 재귀 CTE)
+            _, scope = await self._downstream_scope(seeds)
+            install_ids = await self.repository.get_scope_install_ids(*self._split_nodes(scope))
+
+        while True:
+            async with self.repository.propagation_transaction(install_ids) as conn:
+                process_ids = product_ids = None
+                if seeds is not None:
+                    cone, scope = await self._downstream_scope(seeds, conn=conn)
+                    process_ids, product_ids = self._split_nodes(scope)
+                    required = await self.repository.get_scope_install_ids(process_ids, product_ids, conn=conn)
+                    missing = set(required) - set(install_ids)
+                    if missing:
+                        logger.info(f"🔒 잠금 대기 중 하류 범위가 사업장 {sorted(missing)}로 넓어져 다시 잠급니다")
+                        install_ids = sorted(set(install_ids) | missing)
+                        continue
+
+                if on_snapshot:
+                    on_snapshot()
+                if reset_cumulative:
+                    await self.repository.reset_all_cumulative_emission(conn=conn)
+                snapshot = await self.repository.get_propagation_snapshot(process_ids, product_ids, conn=conn)
+                graph = EmissionGraph.from_snapshot(snapshot)
+                nodes = None if cone is None else {node for node in cone if graph.has_node(node)}
+                # 계산은 이벤트 루프 밖에서 (전체 그래프는 연결 요소 단위로 병렬 계산)
+                result = await compute_partitioned(graph, snapshot, nodes, progress)
+                await self.repository.apply_propagation_results(
+                    result['process_cumulative'],
+                    result['product_attr_em'],
+                    result['consumption_amounts'],
+                    conn=conn
+                )
+            return graph, result, cone
+
+    @staticmethod
+    def _split_nodes(nodes: Set[Tuple[str, int]]) -> Tuple[List[int], List[int]]:
+        """노드 집합 → (공정 ID 목록, 제품 ID 목록)"""
+        return (
+            sorted(node_id for node_type, node_id in nodes if node_type == PROCESS),
+            sorted(node_id for node_type, node_id in nodes if node_type == PRODUCT)
+        )
+
+    async def _downstream_scope(
+        self, seeds: List[Tuple[str, int]], conn=None
+    ) -> Tuple[Set[Tuple[str, int]], Set[Tuple[str, int]]]:
+        """seeds의 하류 범위(cone)와 계산에 필요한 노드 집합(scope) - 인접 인덱스, 없으면 재귀 CTE 1회 (conn: 전파 트랜잭션)"""
+        index = await self._adjacency()
+        if index:
+            return index.downstream_scope(seeds)
+        return await self.repository.get_downstream_scope(seeds, conn=conn)
+
+    @staticmethod
+    def _summary(graph: EmissionGraph, result: Dict[str, Any]) -> Dict[str, Any]:
+        total_propagated = sum(
+            cumulative - graph.processes[pid]['attrdir_em']
+            for pid, cumulative in result['process_cumulative'].items()
+        )
+        return {
+            'processed_edges': dict(graph.edge_counts),
+            'total_processes_calculated': len(result['process_cumulative']),
+            'total_emission_propagated': float(total_propagated),
+            'updated_process_ids': sorted(result['process_cumulative'].keys()),
+            'updated_product_ids': sorted(result['product_attr_em'].keys()),
+            'cycle_nodes': [f"{node_type}_{node_id}" for node_type, node_id in result['cycle_nodes']]
+        }
+
+    async def propagate_emissions_full_graph(self, reset_cumulative: bool = False) -> Dict[str, Any]:
+        """전체 그래프에 대해 배출량 전파를 실행합니다.
+        엣지/공정/제품 데이터를 일괄 조회해 메모리에서 위상 순서대로 계산한 뒤
+        결과를 같은 트랜잭션에서 배치로 저장합니다(쿼리 수는 엣지 수와 무관).
+        동시에 들어온 전체 전파 요청은 한 번만 실행해 결과를 공유하고,
+        다른 워커의 전파와는 advisory lock으로 직렬화됩니다.
+        """
         try:
             logger.info("🔄 전체 그래프 배출량 전파 시작")
-            # 중요: 전파를 여러 번 호출해도 결과가 누적되지 않도록
-            # 모든 공정의 누적값을 먼저 직접귀속배출량으로 초기화한다(직접 배출량 복원)
-            try:
-                await self.repository.reset_cumulative_to_direct_emission()
-                logger.info("🧹 누적 배출량을 직접귀속배출량으로 초기화 완료 (전파 시작 전)")
-            except Exception as e:
-                logger.warning(f"⚠️ 누적 초기화 경고(무시 가능): {e}")
-            
-            # 모든 엣지를 조회 (페이지네이션 제한 없이)
-            all_edges = await self.repository.get_all_edges()
-            
-            if not all_edges:
-                logger.info("전체 그래프에 엣지가 없습니다.")
-                return {'success': True, 'message': '전체 그래프에 엣지가 없습니다.'}
-            
-            # 엣지 종류별로 분류
-            continue_edges = [edge for edge in all_edges if edge['edge_kind'] == 'continue']
-            produce_edges = [edge for edge in all_edges if edge['edge_kind'] == 'produce']
-            consume_edges = [edge for edge in all_edges if edge['edge_kind'] == 'consume']
-            
-            logger.info(f"전체 그래프 엣지 분류: continue={len(continue_edges)}, produce={len(produce_edges)}, consume={len(consume_edges)}")
             
-            # 🔍 디버깅: 각 엣지 상세 정보 로깅
-            for edge in all_edges:
-                logger.debug(f"  엣지 ID: {edge['id']}, 소스: {edge['source_id']}({edge['source_node_type']}), 타겟: {edge['target_id']}({edge['target_node_type']}), 종류: {edge['edge_kind']}")
+            async def run(seal):
+                # 모든 공정을 직접귀속배출량에서 다시 계산하므로 여러 번 호출해도 누적되지 않는다
+                return await self._propagate(reset_cumulative=reset_cumulative, on_snapshot=seal)
             
-            # 1. continue 엣지들 처리 (공정→공정)
-            for edge in continue_edges:
-                success = await self.propagate_emissions_continue(edge['source_id'], edge['target_id'])
-                if not success:
-                    logger.warning(f"continue 엣지 {edge['id']} 처리 실패")
-            
-            # 2. produce 엣지들 처리 (공정→제품)
-            for edge in produce_edges:
-                success = await self.propagate_emissions_produce(edge['source_id'], edge['target_id'])
-                if not success:
-                    logger.warning(f"produce 엣지 {edge['id']} 처리 실패")
-            
-            # 3. consume 엣지들 처리 (제품→공정)
-            for edge in consume_edges:
-                success = await self.propagate_emissions_consume(edge['source_id'], edge['target_id'])
-                if not success:
-                    logger.warning(f"consume 엣지 {edge['id']} 처리 실패")
-            
-            # 4. 🔧 추가: produce 엣지에 연결된 제품들의 배출량을 업데이트
-            logger.info("🔄 제품 배출량 업데이트 시작")
-            updated_products = 0
-            product_ids = set()
-            
-            # produce 엣지에서 제품 ID 추출
-            for edge in produce_edges:
-                product_ids.add(edge['target_id'])
-            
-            for product_id in product_ids:
-                success = await self.update_product_emission_from_processes(product_id)
-                if success:
-                    updated_products += 1
+            graph, result, _ = await self._flights.run(('full', reset_cumulative), run)
             
-            logger.info(f"✅ 제품 배출량 업데이트 완료: {updated_products}/{len(product_ids)}개 제품")
+            logger.info(
+                f"전체 그래프 엣지 분류: continue={graph.edge_counts['continue']}, "
+                f"produce={graph.edge_counts['produce']}, consume={graph.edge_counts['consume']}"
+            )
+            logger.info(f"✅ 제품 배출량 업데이트 완료: {len(result['product_attr_em'])}개 제품")
             logger.info("✅ 전체 그래프 배출량 전파 완료")
             return {
                 'success': True,
                 'message': '전체 그래프 배출량 전파 완료',
-                'processed_edges': {
-                    'continue': len(continue_edges),
-                    'produce': len(produce_edges),
-                    'consume': len(consume_edges)
-                }
+                **self._summary(graph, result)
             }
             
         except Exception as e:
@@ -379,48 +434,198 @@ class EdgeService:
                 'message': '전체 그래프 배출량 전파 실패'
             }
     
-    async def _detect_cycles(self, edges: List[Dict[str, Any]]) -> bool:
-        """순환 참조(사이클)를 감지합니다."""
+    async def recalculate_downstream(self, seeds: List[Tuple[str, int]]) -> Dict[str, Any]:
+        """변경된 노드(seeds)의 하류 노드만 재계산합니다.
+        하류 범위(cone) 밖의 상류 노드는 저장된 누적값을 그대로 사용하므로
+        비용은 전체 그래프가 아니라 하류 범위 크기에 비례합니다.
+        범위에 속한 사업장만 잠그므로 다른 사업장의 재계산과는 병렬로 실행됩니다.
+        """
         try:
-            # 그래프 구성
-            graph = {}
-            for edge in edges:
-                source_key = f"{edge['source_node_type']}_{edge['source_id']}"
-                target_key = f"{edge['target_node_type']}_{edge['target_id']}"
-                
-                if source_key not in graph:
-                    graph[source_key] = []
-                graph[source_key].append(target_key)
-            
-            # DFS로 사이클 감지
-            visited = set()
-            rec_stack = set()
+            logger.info(f"🔄 하류 배출량 재계산 시작: seeds={seeds}")
             
-            def has_cycle_util(node):
-                visited.add(node)
-                rec_stack.add(node)
-                
-                for neighbor in graph.get(node, []):
-                    if neighbor not in visited:
-                        if has_cycle_util(neighbor):
-                            return True
-                    elif neighbor in rec_stack:
-                        return True
-                
-                rec_stack.remove(node)
-                return False
+            async def run(seal):
+                # 하류 범위의 사업장만 잠그고, 잠근 뒤 다시 계산한 범위의 노드만 조회/계산/저장
+                return await self._propagate(seeds, on_snapshot=seal)
             
-            for node in graph:
-                if node not in visited:
-                    if has_cycle_util(node):
-                        logger.error(f"순환 참조 발견: 노드 {node}")
-                        return True
+            graph, result, cone = await self._flights.run(('downstream', tuple(sorted(set(seeds)))), run)
             
-            return False
+            logger.info(
+                f"✅ 하류 배출량 재계산 완료: 공정 {len(result['process_cumulative'])}개, "
+                f"제품 {len(result['product_attr_em'])}개 (범위 {len(cone)}개 노드)"
+            )
+            summary = self._summary(graph, result)
+            return {
+                'success': True,
+                'message': '하류 배출량 재계산 완료',
+                'total_processes_calculated': summary['total_processes_calculated'],
+                'updated_process_ids': summary['updated_process_ids'],
+                'updated_product_ids': summary['updated_product_ids'],
+                'cycle_nodes': summary['cycle_nodes']
+            }
             
         except Exception as e:
-            logger.error(f"순환 참조 감지 실패: {e}")
-            return False
+            logger.error(f"하류 배출량 재계산 실패: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'message': '하류 배출량 재계산 실패'
+            }
+    
+    async def recalculate_graph(
+        self, install_id: Optional[int] = None, progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """전체(또는 사업장 단위) 그래프 재계산 - 비동기 재계산 작업(edge_jobs)용.
+        install_id가 주어지면 해당 사업장의 공정/제품과 그 하류만 재계산합니다.
+        계산은 스레드에서 실행해 이벤트 루프를 막지 않고, progress로 진행률을 보고합니다.
+        progress가 예외를 던지면(작업 취소) 결과를 저장하지 않고 그 예외를 그대로 전달합니다.
+        """
+        scope_label = f"사업장 {install_id}" if install_id is not None else "전체"
+        logger.info(f"🔄 {scope_label} 그래프 재계산 시작")
+
+        if install_id is None:
+            graph, result, _ = await self._propagate(progress=progress)
+        else:
+            install_nodes = await self.repository.get_install_nodes(install_id)
+            seeds = [(PROCESS, pid) for pid in install_nodes['process_ids']] + \
+                    [(PRODUCT, pid) for pid in install_nodes['product_ids']]
+            graph, result, _ = await self._propagate(seeds, progress=progress)
+
+        summary = self._summary(graph, result)
+        logger.info(f"✅ {scope_label} 그래프 재계산 완료: 공정 {summary['total_processes_calculated']}개")
+        return {
+            'install_id': install_id,
+            'processed_edges': summary['processed_edges'],
+            'total_processes_calculated': summary['total_processes_calculated'],
+            'total_products_calculated': len(result['product_attr_em']),
+            'total_emission_propagated': summary['total_emission_propagated'],
+            'cycle_nodes': summary['cycle_nodes']
+        }
+
+    async def recalculate_from_process(self, process_id: int) -> Dict[str, Any]:
+        """특정 공정에서 시작해 하류 공정/제품의 배출량만 재계산합니다."""
+        result = await self.recalculate_downstream([(PROCESS, process_id)])
+        if not result['success']:
+            raise Exception(result.get('error', f'공정 {process_id} 재계산 실패'))
+        
+        return {
+            'updated_process_ids': result['updated_process_ids'],
+            'updated_product_ids': result['updated_product_ids'],
+            'date': datetime.now(timezone.utc)
+        }
+
+    async def propagate_emissions(self, source_id: int, target_id: int, edge_kind: str) -> Dict[str, Any]:
+        """단일 엣지 기준 배출량 전파.
+        타겟 노드의 하류를 재계산하고 타겟의 재계산 전/후 배출량을 반환합니다.
+        propagated_amount는 타겟에 유입된 배출량(타겟 배출량 - 타겟 자체 직접귀속배출량)입니다.
+        """
+        if edge_kind not in EDGE_RULES:
+            raise ValueError(f"지원하지 않는 엣지 종류입니다: {edge_kind}")
+
+        source = (EDGE_RULES[edge_kind][0], source_id)
+        target = (EDGE_RULES[edge_kind][1], target_id)
+
+        before = await self._load_node_graph([source, target])
+        for node in (source, target):
+            if not before.has_node(node):
+                raise ValueError(f"{node[0]} {node[1]}을(를) 찾을 수 없습니다.")
+
+        result = await self.recalculate_downstream([target])
+        if not result['success']:
+            raise Exception(result.get('error', f'{edge_kind} 엣지 전파 실패'))
+
+        after = await self._load_node_graph([target])
+        target_new = self._node_emission(after, target)
+        target_base = after.processes[target_id]['attrdir_em'] if target[0] == PROCESS else 0.0
+
+        return {
+            'source_process_id': source_id,
+            'target_process_id': target_id,
+            'edge_kind': edge_kind,
+            'source_original_emission': self._node_emission(before, source),
+            'target_original_emission': self._node_emission(before, target),
+            'propagated_amount': target_new - target_base,
+            'target_new_emission': target_new,
+            'propagation_formula': PROPAGATION_FORMULAS[edge_kind],
+            'calculation_date': datetime.now(timezone.utc)
+        }
+
+    async def _load_node_graph(self, nodes: List[Tuple[str, int]]) -> EmissionGraph:
+        """지정한 노드들의 저장된 배출량만 조회"""
+        snapshot = await self.repository.get_propagation_snapshot(
+            process_ids=[node_id for node_type, node_id in nodes if node_type == PROCESS],
+            product_ids=[node_id for node_type, node_id in nodes if node_type == PRODUCT]
+        )
+        return EmissionGraph.from_snapshot(snapshot)
+
+    @staticmethod
+    def _node_emission(graph: EmissionGraph, node: Tuple[str, int]) -> float:
+        """공정은 누적 배출량(없으면 직접귀속배출량), 제품은 attr_em"""
+        node_type, node_id = node
+        if node_type == PROCESS:
+            stored = graph.processes[node_id]
+            return stored['cumulative_emission'] or stored['attrdir_em']
+        return graph.products[node_id]['attr_em']
+
+    @staticmethod
+    def _edge_rule_error(edge_data) -> Optional[str]:
+        """DB 조회 없이 확인 가능한 엣지 규칙 검증 (오류 메시지, 통과 시 None)"""
+        source_type = edge_data.source_node_type
+        target_type = edge_data.target_node_type
+        edge_kind = edge_data.edge_kind
+        
+        # 1. 기본 유효성 검증
+        if not source_type or not target_type or not edge_kind:
+            return '필수 필드가 누락되었습니다.'
+        
+        # 2. 노드 타입 유효성 검증
+        valid_node_types = ['process', 'product']
+        if source_type not in valid_node_types or target_type not in valid_node_types:
+            return f'유효하지 않은 노드 타입입니다. 허용된 타입: {valid_node_types}'
+        
+        # 3. 엣지 종류 유효성 검증
+        valid_edge_kinds = ['consume', 'produce', 'continue']
+        if edge_kind not in valid_edge_kinds:
+            return f'유효하지 않은 엣지 종류입니다. 허용된 종류: {valid_edge_kinds}'
+        
+        # 4. 엣지 종류별 연결 규칙 검증
+        validation_rules = {
+            'consume': {
+                'valid_combinations': [
+                    ('product', 'process'),  # 제품 → 공정 (소비)
+                ],
+                'description': '제품이 공정에서 소비됨'
+            },
+            'produce': {
+                'valid_combinations': [
+                    ('process', 'product'),  # 공정 → 제품 (생산)
+                ],
+                'description': '공정이 제품을 생산함'
+            },
+            'continue': {
+                'valid_combinations': [
+                    ('process', 'process'),  # 공정 → 공정 (연속)
+                ],
+                'description': '공정이 공정으로 연결됨'
+            }
+        }
+        
+        rule = validation_rules.get(edge_kind)
+        if not rule:
+            return f'알 수 없는 엣지 종류: {edge_kind}'
+        
+        valid_combination = (source_type, target_type)
+        if valid_combination not in rule['valid_combinations']:
+            return f'{edge_kind} 엣지는 {rule["description"]}만 허용됩니다. 현재: {source_type} → {target_type}'
+        
+        # 5. 동일 노드 간 연결 방지
+        if source_type == target_type and edge_data.source_id == edge_data.target_id:
+            return '동일한 노드 간 연결은 허용되지 않습니다.'
+        
+        # 6. 제품-제품 연결 방지 (continue 엣지)
+        if source_type == 'product' and target_type == 'product':
+            return '제품 간 직접 연결은 허용되지 않습니다.'
+        
+        return None
     
     async def _validate_edge(self, edge_data) -> Dict[str, Any]:
         """엣지 유효성 검증"""
@@ -429,60 +634,10 @@ class EdgeService:
             target_type = edge_data.target_node_type
             edge_kind = edge_data.edge_kind
             
-            # 1. 기본 유효성 검증
-            if not source_type or not target_type or not edge_kind:
-                return {'valid': False, 'error': '필수 필드가 누락되었습니다.'}
-            
-            # 2. 노드 타입 유효성 검증
-            valid_node_types = ['process', 'product']
-            if source_type not in valid_node_types or target_type not in valid_node_types:
-                return {'valid': False, 'error': f'유효하지 않은 노드 타입입니다. 허용된 타입: {valid_node_types}'}
-            
-            # 3. 엣지 종류 유효성 검증
-            valid_edge_kinds = ['consume', 'produce', 'continue']
-            if edge_kind not in valid_edge_kinds:
-                return {'valid': False, 'error': f'유효하지 않은 엣지 종류입니다. 허용된 종류: {valid_edge_kinds}'}
-            
-            # 4. 엣지 종류별 연결 규칙 검증
-            validation_rules = {
-                'consume': {
-                    'valid_combinations': [
-                        ('product', 'process'),  # 제품 → 공정 (소비)
-                    ],
-                    'description': '제품이 공정에서 소비됨'
-                },
-                'produce': {
-                    'valid_combinations': [
-                        ('process', 'product'),  # 공정 → 제품 (생산)
-                    ],
-                    'description': '공정이 제품을 생산함'
-                },
-                'continue': {
-                    'valid_combinations': [
-                        ('process', 'process'),  # 공정 → 공정 (연속)
-                    ],
-                    'description': '공정이 공정으로 연결됨'
-                }
-            }
-            
-            rule = validation_rules.get(edge_kind)
-            if not rule:
-                return {'valid': False, 'error': f'알 수 없는 엣지 종류: {edge_kind}'}
-            
-            valid_combination = (source_type, target_type)
-            if valid_combination not in rule['valid_combinations']:
-                return {
-                    'valid': False, 
-                    'error': f'{edge_kind} 엣지는 {rule["description"]}만 허용됩니다. 현재: {source_type} → {target_type}'
-                }
-            
-            # 5. 동일 노드 간 연결 방지
-            if source_type == target_type and edge_data.source_id == edge_data.target_id:
-                return {'valid': False, 'error': '동일한 노드 간 연결은 허용되지 않습니다.'}
-            
-            # 6. 제품-제품 연결 방지 (continue 엣지)
-            if source_type == 'product' and target_type == 'product':
-                return {'valid': False, 'error': '제품 간 직접 연결은 허용되지 않습니다.'}
+            # 1~6. 노드 타입/엣지 종류/연결 규칙 검증
+            rule_error = self._edge_rule_error(edge_data)
+            if rule_error:
+                return {'valid': False, 'error': rule_error}
             
             # 7. 공정-공정 연결 시 같은 제품에 귀속된 공정들끼리만 연결 가능
             if edge_kind == 'continue' and source_type == 'process' and target_type == 'process':
@@ -492,6 +647,11 @@ class EdgeService:
                 if not same_product_check['valid']:
                     return same_product_check
             
+            # 8. 순환 참조 방지 (타겟에서 소스로 돌아오는 경로가 이미 있는지)
+            cycle_error = await self._cycle_error(source_type, edge_data.source_id, target_type, edge_data.target_id)
+            if cycle_error:
+                return {'valid': False, 'error': cycle_error}
+            
             logger.info(f"✅ 엣지 유효성 검증 통과: {source_type}({edge_data.source_id}) → {target_type}({edge_data.target_id}) ({edge_kind})")
             return {'valid': True, 'error': None}
             
@@ -499,6 +659,12 @@ class EdgeService:
             logger.error(f"❌ 엣지 유효성 검증 중 오류: {str(e)}")
             return {'valid': False, 'error': f'유효성 검증 중 오류가 발생했습니다: {str(e)}'}
     
+    async def _cycle_error(self, source_type: str, source_id: int, target_type: str, target_id: int) -> Optional[str]:
+        """source → target 엣지가 순환 참조를 만들면 오류 메시지"""
+        if await self.check_edge_cycle(source_type, source_id, target_type, target_id):
+            return f'순환 참조가 발생합니다: {target_type}({target_id})에서 {source_type}({source_id})로 이어지는 경로가 이미 있습니다.'
+        return None
+    
     async def _check_same_product_processes(self, source_process_id: int, target_process_id: int) -> Dict[str, Any]:
         """두 공정이 같은 제품에 귀속되어 있는지 확인"""
         try:
@@ -522,7 +688,7 @@ class EdgeService:
             return {'valid': False, 'error': f'공정 제품 귀속 확인 중 오류가 발생했습니다: {str(e)}'}
 
     async def create_edge(self, edge_data) -> Optional[EdgeResponse]:
-        """엣지 생성 (Repository 패턴) - 엣지 생성 후 전체 그래프 재계산"""
+        """엣지 생성 (Repository 패턴) - 엣지 생성 후 하류 노드 재계산"""
         try:
             logger.info(f"엣지 생성 시작: {edge_data}")
             
@@ -545,18 +711,24 @@ class EdgeService:
             result = await self.repository.create_edge(edge_dict)
             
             if result:
+                if not result.pop('created', True):
+                    # 이미 존재하는 엣지: 그래프가 바뀌지 않았으므로 재계산 생략
+                    logger.info(f"ℹ️ 기존 엣지 반환: ID {result['id']}")
+                    return EdgeResponse(**result)
+
                 logger.info(f"✅ 엣지 생성 완료: ID {result['id']}")
-                
+                await self._publish_edge_change('create', upserted=[result])
+
                 try:
-                    # 엣지 생성 후 전체 그래프 배출량 전파 실행
-                    logger.info("🔄 엣지 변경으로 인한 전체 그래프 배출량 전파 시작")
-                    propagation_result = await self.propagate_emissions_full_graph()
+                    # 엣지 생성 후 영향받는 하류 노드만 배출량 재계산
+                    logger.info("🔄 엣지 변경으로 인한 하류 배출량 재계산 시작")
+                    propagation_result = await self.recalculate_downstream(edge_seeds(result))
                     
                     if propagation_result['success']:
-                        logger.info("✅ 전체 그래프 배출량 전파 완료")
+                        logger.info("✅ 하류 배출량 재계산 완료")
                         result['propagation_result'] = propagation_result
                     else:
-                        logger.warning(f"⚠️ 전체 그래프 배출량 전파 실패: {propagation_result.get('error', 'Unknown error')}")
+                        logger.warning(f"⚠️ 하류 배출량 재계산 실패: {propagation_result.get('error', 'Unknown error')}")
                         result['propagation_result'] = propagation_result
                         # 배출량 전파 실패는 엣지 생성을 실패시키지 않음 (경고만)
                         
@@ -579,16 +751,146 @@ class EdgeService:
             import traceback
             logger.error(f"스택 트레이스: {traceback.format_exc()}")
             raise e
-    
-    async def get_edges(self, skip: int = 0, limit: int = 100) -> List[EdgeResponse]:
-        """모든 엣지 조회 (Repository 패턴)"""
+
+    async def create_edges_bulk(self, edges_data: List[EdgeCreateRequest]) -> EdgeBulkCreateResponse:
+        """엣지 일괄 생성 - 메모리 검증 후 한 번에 INSERT하고, 배출량 재계산은 마지막에 1회만 실행"""
+        logger.info(f"📦 엣지 일괄 생성 시작: {len(edges_data)}개")
+        results: List[Optional[EdgeBulkRowResult]] = [None] * len(edges_data)
+        edges = [
+            {
+                'source_node_type': edge_data.source_node_type,
+                'source_id': edge_data.source_id,
+                'target_node_type': edge_data.target_node_type,
+                'target_id': edge_data.target_id,
+                'edge_kind': edge_data.edge_kind
+            }
+            for edge_data in edges_data
+        ]
+        edge_key = lambda edge: (edge['source_node_type'], edge['source_id'], edge['target_node_type'], edge['target_id'], edge['edge_kind'])
+
+        # 1. 규칙 검증 + 요청 내 중복 제거 (DB 조회 없음)
+        pending: List[int] = []
+        first_index: Dict[Tuple, int] = {}
+        for index, (edge_data, edge) in enumerate(zip(edges_data, edges)):
+            rule_error = self._edge_rule_error(edge_data)
+            if rule_error:
+                results[index] = EdgeBulkRowResult(index=index, status='invalid', error=rule_error)
+            elif edge_key(edge) in first_index:
+                results[index] = EdgeBulkRowResult(
+                    index=index, status='duplicate', error=f'요청 내 {first_index[edge_key(edge)]}번 행과 중복'
+                )
+            else:
+                first_index[edge_key(edge)] = index
+                pending.append(index)
+
+        # 2. 노드 존재 여부 / 공정 간 같은 제품 귀속 검증 (일괄 조회)
+        process_ids = sorted({edges[i][side + '_id'] for i in pending for side in ('source', 'target')
+                              if edges[i][side + '_node_type'] == PROCESS})
+        product_ids = sorted({edges[i][side + '_id'] for i in pending for side in ('source', 'target')
+                              if edges[i][side + '_node_type'] == PRODUCT})
+        context = await self.repository.get_bulk_validation_context(process_ids, product_ids)
+        known = {PROCESS: context['process_ids'], PRODUCT: context['product_ids']}
+
+        remaining: List[int] = []
+        for index in pending:
+            edge = edges[index]
+            missing = [
+                f"{edge[side + '_node_type']} {edge[side + '_id']}"
+                for side in ('source', 'target')
+                if edge[side + '_id'] not in known[edge[side + '_node_type']]
+            ]
+            if missing:
+                results[index] = EdgeBulkRowResult(index=index, status='invalid', error=f"존재하지 않는 노드: {', '.join(missing)}")
+                continue
+            if edge['edge_kind'] == 'continue':
+                source_products = context['process_products'].get(edge['source_id'], set())
+                target_products = context['process_products'].get(edge['target_id'], set())
+                if not source_products & target_products:
+                    results[index] = EdgeBulkRowResult(
+                        index=index, status='invalid',
+                        error=f"공정 {edge['source_id']}와 {edge['target_id']}가 서로 다른 제품에 귀속되어 있습니다."
+                    )
+                    continue
+            remaining.append(index)
+
+        # 3. 기존 엣지와 중복 확인 (단일 쿼리)
+        existing = await self.repository.find_existing_edges([edges[i] for i in remaining])
+        candidates: List[int] = []
+        for index in remaining:
+            existing_id = existing.get(edge_key(edges[index]))
+            if existing_id is not None:
+                results[index] = EdgeBulkRowResult(index=index, status='duplicate', edge_id=existing_id)
+            else:
+                candidates.append(index)
+
+        # 4. 기존 그래프 + 신규 엣지 전체에 대한 순환 검증
+        all_edges = await self.repository.get_all_edges()
+        cycle_indexes = cycle_closing_edges(all_edges, [edges[i] for i in candidates])
+        to_insert: List[int] = []
+        for position, index in enumerate(candidates):
+            if position in cycle_indexes:
+                results[index] = EdgeBulkRowResult(index=index, status='cycle', error='엣지를 추가하면 순환 참조가 발생합니다.')
+            else:
+                to_insert.append(index)
+
+        # 5. 다중 행 INSERT 1회
+        created_rows = await self.repository.create_edges_bulk([edges[i] for i in to_insert])
+        if created_rows:
+            await self._publish_edge_change('bulk_create', upserted=created_rows)
+        created_by_key = {edge_key(row): row for row in created_rows}
+        for index in to_insert:
+            row = created_by_key.get(edge_key(edges[index]))
+            if row:
+                results[index] = EdgeBulkRowResult(index=index, status='created', edge_id=row['id'])
+            else:
+                # 검증 이후 다른 요청이 같은 엣지를 먼저 생성한 경우
+                results[index] = EdgeBulkRowResult(index=index, status='duplicate')
+
+        # 6. 생성된 엣지의 하류 배출량 재계산 1회
+        propagation_result = None
+        if created_rows:
+            seeds: List[Tuple[str, int]] = []
+            for row in created_rows:
+                for seed in edge_seeds(row):
+                    if seed not in seeds:
+                        seeds.append(seed)
+            propagation_result = await self.recalculate_downstream(seeds)
+            if not propagation_result['success']:
+                logger.warning(f"⚠️ 일괄 생성 후 하류 배출량 재계산 실패: {propagation_result.get('error', 'Unknown error')}")
+
+        counts = {status: sum(1 for result in results if result.status == status)
+                  for status in ('created', 'duplicate', 'invalid', 'cycle')}
+        logger.info(f"✅ 엣지 일괄 생성 완료: {counts}")
+        return EdgeBulkCreateResponse(
+            message=f"일괄 생성 완료: {counts['created']}/{len(edges_data)}개 생성",
+            total_count=len(edges_data),
+            success_count=counts['created'],
+            duplicate_count=counts['duplicate'],
+            failed_count=counts['invalid'] + counts['cycle'],
+            results=results,
+            created_edges=[EdgeResponse(**row) for row in created_rows],
+            propagation_result=propagation_result
+        )
+
+    async def get_edges(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = 100,
+        edge_kind: Optional[str] = None,
+        process_id: Optional[int] = None
+    ) -> List[EdgeResponse]:
+        """엣지 목록 조회 (Repository 패턴, id 순 키셋 페이지네이션)"""
         try:
-            edges = await self.repository.get_edges(skip, limit)
+            edges = await self.repository.get_edges(after_id, limit, edge_kind, process_id)
             return [EdgeResponse(**edge) for edge in edges]
         except Exception as e:
             logger.error(f"엣지 조회 실패: {e}")
             return []
     
+    async def estimate_edges_count(self, edge_kind: Optional[str] = None, process_id: Optional[int] = None) -> Optional[int]:
+        """필터에 맞는 엣지 수 추정"""
+        return await self.repository.estimate_edges_count(edge_kind, process_id)
+    
     async def get_edge(self, edge_id: int) -> Optional[EdgeResponse]:
         """특정 엣지 조회 (Repository 패턴)"""
         try:
@@ -618,21 +920,35 @@ class EdgeService:
             if edge_data.edge_kind is not None:
                 update_data['edge_kind'] = edge_data.edge_kind
             
+            # 수정 전 엣지 (이전 연결의 하류도 재계산 대상)
+            previous = await self.repository.get_edge(edge_id)
+            
+            # 연결 대상이 바뀌면 생성과 같이 순환 참조 검사
+            if previous and any(previous[key] != value for key, value in update_data.items() if key != 'edge_kind'):
+                updated = {**previous, **update_data}
+                cycle_error = await self._cycle_error(
+                    updated['source_node_type'], updated['source_id'], updated['target_node_type'], updated['target_id']
+                )
+                if cycle_error:
+                    raise ValueError(f"엣지 유효성 검증 실패: {cycle_error}")
+            
             # Repository를 통해 엣지 수정
             result = await self.repository.update_edge(edge_id, update_data)
             
             if result:
                 logger.info(f"✅ 엣지 {edge_id} 수정 완료")
+                await self._publish_edge_change('update', upserted=[result])
                 
-                # 엣지 수정 후 전체 그래프 배출량 전파 실행
-                logger.info("🔄 엣지 변경으로 인한 전체 그래프 배출량 전파 시작")
-                propagation_result = await self.propagate_emissions_full_graph()
+                # 엣지 수정 후 이전/현재 연결의 하류 노드만 배출량 재계산
+                logger.info("🔄 엣지 변경으로 인한 하류 배출량 재계산 시작")
+                seeds = edge_seeds(result) + (edge_seeds(previous) if previous else [])
+                propagation_result = await self.recalculate_downstream(seeds)
                 
                 if propagation_result['success']:
-                    logger.info("✅ 전체 그래프 배출량 전파 완료")
+                    logger.info("✅ 하류 배출량 재계산 완료")
                     result['propagation_result'] = propagation_result
                 else:
-                    logger.warning(f"⚠️ 전체 그래프 배출량 전파 실패: {propagation_result.get('error', 'Unknown error')}")
+                    logger.warning(f"⚠️ 하류 배출량 재계산 실패: {propagation_result.get('error', 'Unknown error')}")
                     result['propagation_result'] = propagation_result
                 
                 return EdgeResponse(**result)
@@ -651,15 +967,21 @@ class EdgeService:
         try:
             logger.info(f"엣지 {edge_id} 삭제 시작")
             
+            # 삭제 전 엣지 (끊긴 연결의 하류가 재계산 대상)
+            previous = await self.repository.get_edge(edge_id)
+            
             # Repository를 통해 엣지 삭제
             success = await self.repository.delete_edge(edge_id)
             
             if success:
                 logger.info(f"✅ 엣지 {edge_id} 삭제 완료")
+                await self._publish_edge_change('delete', deleted=[edge_id])
                 
-                # 🔧 단일책임원칙: 엣지 삭제는 삭제만 담당
-                # 배출량 전파는 프론트엔드에서 별도 API 호출로 처리
-                logger.info("✅ 엣지 삭제 완료 - 배출량 전파는 프론트엔드에서 처리")
+                # 끊긴 연결의 하류 노드만 재계산 (비용이 하류 범위에 비례하므로 삭제 시에도 수행)
+                if previous:
+                    propagation_result = await self.recalculate_downstream(edge_seeds(previous))
+                    if not propagation_result['success']:
+                        logger.warning(f"⚠️ 하류 배출량 재계산 실패: {propagation_result.get('error', 'Unknown error')}")
                 
                 return True
             else:
@@ -688,12 +1010,88 @@ class EdgeService:
     async def get_edges_by_node(self, node_id: int) -> List[EdgeResponse]:
         """노드와 연결된 엣지 조회"""
         try:
-            edges = await self.repository.get_edges_by_node(node_id)
+            index = await self._adjacency()
+            edges = index.edges_by_node(node_id) if index else await self.repository.get_edges_by_node(node_id)
             return [EdgeResponse(**edge) for edge in edges]
         except Exception as e:
             logger.error(f"노드별 엣지 조회 실패: {e}")
             return []
     
+    async def get_reachable_nodes(self, node_type: str, node_id: int, direction: str = DOWNSTREAM) -> List[Dict[str, Any]]:
+        """노드에서 하류/상류로 도달 가능한 노드 목록"""
+        index = await self._adjacency()
+        if index:
+            nodes = index.reachable((node_type, node_id), direction)
+        else:
+            nodes = await self.repository.get_reachable_nodes(node_type, node_id, direction)
+        return [{'node_type': reached_type, 'node_id': reached_id} for reached_type, reached_id in nodes]
+    
+    async def get_product_ancestors(self, product_id: int) -> List[Dict[str, Any]]:
+        """제품 배출량에 기여하는 모든 상류 공정/제품"""
+        return await self.repository.get_product_ancestors(product_id)
+    
+    async def check_edge_cycle(
+        self, source_type: str, source_id: int, target_type: str, target_id: int,
+        edge_kinds: Optional[List[str]] = None
+    ) -> bool:
+        """source → target 엣지를 추가하면 사이클이 생기는지 확인"""
+        index = await self._adjacency()
+        if index:
+            return index.would_create_cycle((source_type, source_id), (target_type, target_id), edge_kinds)
+        return await self.repository.would_create_cycle(source_type, source_id, target_type, target_id, edge_kinds)
+    
+    async def get_processes_connected_to_product(self, product_id: int) -> List[Dict[str, Any]]:
+        """제품을 생산하는(produce) 공정 목록"""
+        index = await self._adjacency()
+        if not index:
+            return await self.repository.get_processes_connected_to_product(product_id)
+        process_ids = sorted({edge['source_id'] for edge in index.incoming((PRODUCT, product_id), 'produce')})
+        return [{'process_id': process_id, 'edge_kind': 'produce'} for process_id in process_ids]
+    
+    async def get_processes_consuming_product(self, product_id: int) -> List[Dict[str, Any]]:
+        """제품을 소비하는(consume) 공정 목록과 소비량"""
+        index = await self._adjacency()
+        if not index:
+            return await self.repository.get_processes_consuming_product(product_id)
+        consume_edges = index.outgoing((PRODUCT, product_id), 'consume')
+        amounts = await self.repository.get_consumption_amounts(
+            product_id, sorted({edge['target_id'] for edge in consume_edges})
+        )
+        return [
+            {
+                'process_id': edge['target_id'],
+                'edge_kind': 'consume',
+                'consumption_amount': amounts.get(edge['target_id'], 0)
+            }
+            for edge in sorted(consume_edges, key=lambda edge: edge['target_id'])
+        ]
+    
+    # ============================================================================
+    # 🗂️ 인메모리 인접 인덱스
+    # ============================================================================
+    
+    async def _adjacency(self) -> Optional[EdgeAdjacencyIndex]:
+        """최신 인접 인덱스 (비활성/적재 실패 시 None → DB 조회)"""
+        if not self.index.enabled:
+            return None
+        try:
+            if await self.index.ensure_loaded(self.repository.get_edge_index_rows):
+                return self.index
+        except Exception as e:
+            logger.warning(f"⚠️ 엣지 인덱스 적재 실패 (DB로 조회): {e}")
+        return None
+    
+    async def _publish_edge_change(
+        self, operation: str, upserted: Optional[List[Dict[str, Any]]] = None, deleted: Optional[List[int]] = None
+    ):
+        """같은 워커 인덱스를 즉시 갱신하고 다른 워커에 NOTIFY"""
+        if upserted:
+            self.index.apply_upsert(upserted)
+        if deleted:
+            self.index.apply_delete(deleted)
+        edge_ids = [edge['id'] for edge in upserted or []] + list(deleted or [])
+        await self.repository.notify_edge_change(EDGE_CHANNEL, self.index.change_payload(operation, edge_ids))
+    
     # ============================================================================
     # 🔄 전체 그래프 배출량 전파 메서드들
     # ============================================================================
@@ -736,3 +1134,17 @@ class EdgeService:
                 'error': str(e),
                 'message': f'공정 체인 {chain_id} 배출량 전파 실패'
             }
+
+# ============================================================================
+# 📦 공용 인스턴스
+# ============================================================================
+
+_edge_service_instance: Optional[EdgeService] = None
+
+def get_edge_service() -> EdgeService:
+    """엣지 서비스 공용 인스턴스 반환 (lifespan에서 초기화, 요청 간 재사용)"""
+    global _edge_service_instance
+    if _edge_service_instance is None:
+        _edge_service_instance = EdgeService(None)  # Repository에서 공용 연결 풀 사용
+        logger.info("✅ Edge Service 공용 인스턴스 생성")
+    return _edge_service_instance
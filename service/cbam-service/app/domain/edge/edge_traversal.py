@@ -0,0 +1,163 @@
+# ============================================================================
+# 🧭 Edge Traversal - 재귀 CTE 기반 그래프 탐색
+# ============================================================================
+
+"""
+edge 테이블 위에서 그래프 탐색 질의를 한 번의 WITH RECURSIVE 쿼리로 처리합니다.
+체인 깊이와 무관하게 DB 왕복은 1회입니다.
+
+- 도달 가능 노드: X에서 하류(downstream) 또는 상류(upstream)로 닿는 모든 노드
+- 사이클 검사: X→Y 엣지를 추가하면 Y에서 X로 돌아오는 경로가 생기는지
+- 제품 상류: 제품 P의 배출량에 기여하는 모든 공정/제품
+- 하류 재계산 범위: 시드의 하류(cone)와 재계산에 필요한 상류 노드(scope)
+
+재귀 항은 UNION(중복 제거)으로 합치므로 이미 사이클이 있는 그래프에서도 종료됩니다.
+함수들은 asyncpg 연결을 받으며, 풀 관리와 오류 처리는 EdgeRepository가 담당합니다.
+
+노드 타입/엣지 종류 파라미터는 edge 컬럼의 실제 타입으로 캐스팅합니다.
+(운영 스키마는 enum node_type/edge_kind, 서비스가 직접 만든 테이블은 VARCHAR - 컬럼 쪽을 캐스팅하지 않으므로
+ (source_node_type, source_id) 인덱스를 그대로 사용)
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.domain.edge.edge_graph import EDGE_RULES
+
+DOWNSTREAM = 'downstream'
+UPSTREAM = 'upstream'
+
+# 탐색 방향별 (출발 컬럼, 도착 컬럼)
+_DIRECTION_COLUMNS = {
+    DOWNSTREAM: (('source_node_type', 'source_id'), ('target_node_type', 'target_id')),
+    UPSTREAM: (('target_node_type', 'target_id'), ('source_node_type', 'source_id')),
+}
+
+NodeKey = Tuple[str, int]
+
+# edge의 (노드 타입 컬럼, 엣지 종류 컬럼) 타입 이름 (워커당 한 번 조회)
+_column_types: Optional[Tuple[str, str]] = None
+
+
+async def edge_column_types(conn, refresh: bool = False) -> Tuple[str, str]:
+    """edge.source_node_type / edge.edge_kind 컬럼의 타입 이름 (파라미터 캐스팅용, 예: ('node_type', 'edge_kind'))"""
+    global _column_types
+    if _column_types is None or refresh:
+        rows = await conn.fetch("""
+            SELECT attname, atttypid::regtype::text AS type_name
+            FROM pg_attribute
+            WHERE attrelid = 'edge'::regclass AND attname IN ('source_node_type', 'edge_kind')
+        """)
+        types = {row['attname']: row['type_name'] for row in rows}
+        _column_types = (types['source_node_type'], types['edge_kind'])
+    return _column_types
+
+
+def _reach_cte(direction: str, node_type: str, edge_kind: str) -> str:
+    """$1/$2 노드에서 direction 방향으로 닿는 노드 집합 (edge_kind 필터: $3, NULL이면 전체)"""
+    if direction not in _DIRECTION_COLUMNS:
+        raise ValueError(f"지원하지 않는 탐색 방향: {direction}")
+    (from_type, from_id), (to_type, to_id) = _DIRECTION_COLUMNS[direction]
+    return f"""
+        WITH RECURSIVE reach(node_type, node_id) AS (
+            SELECT $1::{node_type}, $2::integer
+            UNION
+            SELECT e.{to_type}, e.{to_id}
+            FROM reach r
+            JOIN edge e ON e.{from_type} = r.node_type AND e.{from_id} = r.node_id
+            WHERE $3::{edge_kind}[] IS NULL OR e.edge_kind = ANY($3::{edge_kind}[])
+        )
+    """
+
+
+async def reachable_nodes(
+    conn, node_type: str, node_id: int, direction: str = DOWNSTREAM, edge_kinds: Optional[List[str]] = None
+) -> List[NodeKey]:
+    """시작 노드에서 도달 가능한 노드 목록 (시작 노드 제외)"""
+    rows = await conn.fetch(
+        _reach_cte(direction, *await edge_column_types(conn)) + """
+        SELECT node_type, node_id
+        FROM reach
+        WHERE NOT (node_type = $1 AND node_id = $2)
+        ORDER BY node_type, node_id
+        """,
+        node_type, node_id, edge_kinds
+    )
+    return [(row['node_type'], row['node_id']) for row in rows]
+
+
+async def would_create_cycle(
+    conn, source: NodeKey, target: NodeKey, edge_kinds: Optional[List[str]] = None
+) -> bool:
+    """source→target 엣지를 추가하면 사이클이 생기는지 (target에서 source로 이미 닿는지)"""
+    if source == target:
+        return True
+    # EXISTS는 source를 찾는 즉시 재귀를 멈춥니다.
+    return await conn.fetchval(
+        _reach_cte(DOWNSTREAM, *await edge_column_types(conn)) + """
+        SELECT EXISTS (SELECT 1 FROM reach WHERE node_type = $4 AND node_id = $5)
+        """,
+        target[0], target[1], edge_kinds, source[0], source[1]
+    )
+
+
+async def product_ancestors(conn, product_id: int) -> List[Dict[str, Any]]:
+    """제품의 배출량에 기여하는 모든 상류 공정/제품 (이름 포함)"""
+    rows = await conn.fetch(
+        _reach_cte(UPSTREAM, *await edge_column_types(conn)) + """
+        SELECT r.node_type, r.node_id,
+               COALESCE(pr.process_name, p.product_name) AS node_name
+        FROM reach r
+        LEFT JOIN process pr ON r.node_type = 'process' AND pr.id = r.node_id
+        LEFT JOIN product p ON r.node_type = 'product' AND p.id = r.node_id
+        WHERE NOT (r.node_type = $1 AND r.node_id = $2)
+        ORDER BY r.node_type, r.node_id
+        """,
+        'product', product_id, None
+    )
+    return [dict(row) for row in rows]
+
+
+def _valid_edge_condition(alias: str) -> str:
+    """EDGE_RULES에 맞는 엣지만 통과시키는 조건 (edge_graph.is_valid_edge와 동일)"""
+    rules = ', '.join(f"('{kind}', '{source}', '{target}')" for kind, (source, target) in EDGE_RULES.items())
+    return f"({alias}.edge_kind, {alias}.source_node_type, {alias}.target_node_type) IN ({rules})"
+
+
+async def downstream_scope(conn, seeds: List[NodeKey]) -> Tuple[Set[NodeKey], Set[NodeKey]]:
+    """
+    seeds의 하류 범위(cone)와 재계산에 필요한 노드 집합(scope = cone + 직접 상류 + 상류 제품의 다른 소비 공정)
+    - edge_graph.downstream_scope와 같은 결과를 재귀 CTE 1회로 계산
+    """
+    if not seeds:
+        return set(), set()
+    valid = _valid_edge_condition('e')
+    node_type, _ = await edge_column_types(conn)
+    rows = await conn.fetch(
+        f"""
+        WITH RECURSIVE cone(node_type, node_id) AS (
+            SELECT * FROM unnest($1::{node_type}[], $2::integer[])
+            UNION
+            SELECT e.target_node_type, e.target_id
+            FROM cone c
+            JOIN edge e ON e.source_node_type = c.node_type AND e.source_id = c.node_id
+            WHERE {valid}
+        ), upstream AS (
+            SELECT DISTINCT e.source_node_type AS node_type, e.source_id AS node_id
+            FROM cone c
+            JOIN edge e ON e.target_node_type = c.node_type AND e.target_id = c.node_id
+            WHERE {valid}
+        )
+        SELECT node_type, node_id, TRUE AS in_cone FROM cone
+        UNION ALL
+        SELECT node_type, node_id, FALSE FROM upstream
+        UNION ALL
+        SELECT e.target_node_type, e.target_id, FALSE
+        FROM upstream u
+        JOIN edge e ON e.source_node_type = u.node_type AND e.source_id = u.node_id
+        WHERE u.node_type = 'product' AND {valid}
+        """,
+        [node_type for node_type, _ in seeds], [node_id for _, node_id in seeds]
+    )
+    cone = {(row['node_type'], row['node_id']) for row in rows if row['in_cone']}
+    scope = {(row['node_type'], row['node_id']) for row in rows}
+    return cone, scope
@@ -2,11 +2,14 @@
 # 🏭 Fuel Directory Controller - 연료 디렉토리 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
-from typing import List
+from typing import Any, Dict, Optional, List
 import time
+from datetime import date, datetime
 
+from app.common.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
+from app.common.text_search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
 from app.domain.fueldir.fueldir_service import FuelDirService
 from app.domain.fueldir.fueldir_schema import (
     FuelDirCreateRequest, 
@@ -45,13 +48,28 @@ async def create_fueldir(fueldir_data: FuelDirCreateRequest):
         raise HTTPException(status_code=500, detail=f"연료직접배출량 생성 중 오류가 발생했습니다: {str(e)}")
 
 @router.get("/list", response_model=List[FuelDirResponse])
-async def get_fueldirs(skip: int = 0, limit: int = 100):
-    """모든 연료직접배출량 데이터 조회"""
+async def get_fueldirs(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="조회할 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    process_id: Optional[int] = Query(None, description="공정 ID"),
+    install_id: Optional[int] = Query(None, description="사업장 ID"),
+    start_date: Optional[date] = Query(None, description="생성일 시작 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="생성일 종료 (YYYY-MM-DD, 포함)")
+):
+    """모든 연료직접배출량 데이터 조회 (최신순 키셋 페이지네이션)"""
     try:
-        logger.info("📋 연료직접배출량 목록 조회 요청")
-        fueldirs = await fueldir_service.get_fueldirs(skip, limit)
+        logger.info(f"📋 연료직접배출량 목록 조회 요청: limit={limit}, process_id={process_id}, install_id={install_id}")
+        cursor = decode_cursor(after, (datetime, int))
+        fueldirs = await fueldir_service.get_fueldirs(cursor, fetch_limit(limit), process_id, install_id, start_date, end_date)
+        fueldirs = await respond_page(
+            response, fueldirs, limit, lambda m: [m.created_at, m.id], first_page=cursor is None,
+            estimate=lambda: fueldir_service.estimate_fueldirs_count(process_id, install_id, start_date, end_date)
+        )
         logger.info(f"✅ 연료직접배출량 목록 조회 성공: {len(fueldirs)}개")
         return fueldirs
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 연료직접배출량 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"연료직접배출량 목록 조회 중 오류가 발생했습니다: {str(e)}")
@@ -68,7 +86,7 @@ async def get_fueldirs_by_process(process_id: int):
         logger.error(f"❌ 공정별 연료직접배출량 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"공정별 연료직접배출량 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/{fueldir_id}", response_model=FuelDirResponse)
+@router.get("/{fueldir_id:int}", response_model=FuelDirResponse)
 async def get_fueldir(fueldir_id: int):
     """특정 연료직접배출량 데이터 조회"""
     try:
@@ -85,7 +103,7 @@ async def get_fueldir(fueldir_id: int):
         logger.error(f"❌ 연료직접배출량 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"연료직접배출량 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.put("/{fueldir_id}", response_model=FuelDirResponse)
+@router.put("/{fueldir_id:int}", response_model=FuelDirResponse)
 async def update_fueldir(fueldir_id: int, fueldir_data: FuelDirUpdateRequest):
     """연료직접배출량 데이터 수정"""
     try:
@@ -102,7 +120,7 @@ async def update_fueldir(fueldir_id: int, fueldir_data: FuelDirUpdateRequest):
         logger.error(f"❌ 연료직접배출량 수정 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"연료직접배출량 수정 중 오류가 발생했습니다: {str(e)}")
 
-@router.delete("/{fueldir_id}")
+@router.delete("/{fueldir_id:int}")
 async def delete_fueldir(fueldir_id: int):
     """연료직접배출량 데이터 삭제"""
     try:
@@ -163,12 +181,26 @@ async def get_all_fuels():
         logger.error(f"❌ 모든 연료 마스터 데이터 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"연료 마스터 데이터 조회 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/fuel-master/cache/refresh", response_model=Dict[str, Any])
+async def refresh_fuel_master_cache():
+    """연료 마스터 캐시 무효화 후 재적재 (이 워커 즉시, 다른 워커는 TTL 안에 반영)"""
+    try:
+        logger.info("🗃️ 연료 마스터 캐시 재적재 요청")
+        return await fueldir_service.refresh_fuel_master()
+    except Exception as e:
+        logger.error(f"❌ 연료 마스터 캐시 재적재 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"연료 마스터 캐시 재적재 중 오류가 발생했습니다: {str(e)}")
+
 @router.get("/fuel-master/search/{fuel_name}", response_model=List[FuelMasterResponse])
-async def search_fuels(fuel_name: str):
-    """연료명으로 검색 (부분 검색)"""
+async def search_fuels(
+    fuel_name: str,
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, description="최대 결과 수"),
+    fuzzy: bool = Query(False, description="오타 허용 검색 (유사도 기반)")
+):
+    """연료명으로 검색 (부분 검색, 관련도 순)"""
     try:
-        logger.info(f"🔍 연료 마스터 검색 요청: '{fuel_name}'")
-        fuels = await fueldir_service.search_fuels(fuel_name)
+        logger.info(f"🔍 연료 마스터 검색 요청: '{fuel_name}' (fuzzy={fuzzy})")
+        fuels = await fueldir_service.search_fuels(fuel_name, limit, fuzzy)
         logger.info(f"✅ 연료 마스터 검색 성공: '{fuel_name}' → {len(fuels)}개 결과")
         return fuels
     except Exception as e:
@@ -4,27 +4,37 @@
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime
 import asyncpg
 from decimal import Decimal
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+from app.common.master_cache import MasterDataCache, name_match_args, name_match_query
+from app.common.text_search import SEARCH_DEFAULT_LIMIT, TrigramSearch, ensure_trigram_indexes
+
 logger = logging.getLogger(__name__)
 
+_FUEL_MASTER_MATCH_QUERY = name_match_query(
+    'fuel_master', 'id, fuel_name, fuel_engname, fuel_factor, net_calory', 'fuel_name', 'fuel_engname'
+)
+
 class FuelDirRepository:
     """연료직접배출량 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -36,20 +46,18 @@ class FuelDirRepository:
         self._initialization_attempted = True
         
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-fueldir'
-                }
-            )
-            logger.info("✅ FuelDir 데이터베이스 연결 풀 생성 성공")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
             
-            # 테이블 생성은 선택적으로 실행
+            logger.info("✅ FuelDir 공용 연결 풀 연결 성공")
+            
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_fueldir_table_async()
+                await self.pool_manager.run_once('fueldir.fueldir_table', self._create_fueldir_table_async)
+                await self.pool_manager.run_once('fueldir.fuel_master_search', self._create_fuel_master_indexes_async)
             except Exception as e:
                 logger.warning(f"⚠️ FuelDir 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -119,11 +127,26 @@ class FuelDirRepository:
                     logger.info("✅ fueldir 테이블 생성 완료")
                 else:
                     logger.info("✅ fueldir 테이블이 이미 존재합니다.")
+                
+                # 목록 키셋 페이지네이션(created_at, id 역순)용 인덱스
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_fueldir_created_at_id ON fueldir (created_at DESC, id DESC);
+                """)
                     
         except Exception as e:
             logger.error(f"❌ fueldir 테이블 생성 실패: {str(e)}")
             logger.warning("⚠️ 테이블 생성 실패로 인해 일부 기능이 제한될 수 있습니다.")
 
+    async def _create_fuel_master_indexes_async(self):
+        """fuel_master 연료명 자동완성 검색용 트라이그램 인덱스 생성 (테이블이 있을 때만)"""
+        try:
+            async with self.pool.acquire() as conn:
+                exists = await conn.fetchval("SELECT to_regclass('fuel_master') IS NOT NULL")
+                if exists:
+                    await ensure_trigram_indexes(conn, 'fuel_master', ['fuel_name', 'fuel_engname'])
+        except Exception as e:
+            logger.warning(f"⚠️ fuel_master 검색 인덱스 생성 실패: {str(e)}")
+
     # ============================================================================
     # 📋 기존 FuelDir CRUD 메서드들
     # ============================================================================
@@ -241,15 +264,35 @@ class FuelDirRepository:
             logger.error(f"❌ 에러 상세: {e}")
             raise
 
-    async def get_fueldirs(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """모든 연료직접배출량 데이터 조회"""
+    async def get_fueldirs(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """모든 연료직접배출량 데이터 조회 (created_at, id 역순 키셋 페이지네이션)"""
         await self._ensure_pool_initialized()
         try:
-            return await self._get_fueldirs_db(skip, limit)
+            return await self._get_fueldirs_db(after, limit, process_id, install_id, start_date, end_date)
         except Exception as e:
             logger.error(f"❌ FuelDir 목록 조회 실패: {str(e)}")
             return []
 
+    async def estimate_fueldirs_count(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 연료직접배출량 데이터 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM fueldir", self._fueldir_filters(process_id, install_id, start_date, end_date))
+
     async def get_fueldirs_by_process(self, process_id: int) -> List[Dict[str, Any]]:
         """특정 공정의 연료직접배출량 데이터 조회"""
         await self._ensure_pool_initialized()
@@ -311,11 +354,8 @@ class FuelDirRepository:
         
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.fetchrow("""
-                    SELECT id, fuel_name, fuel_engname, fuel_factor, net_calory
-                    FROM fuel_master
-                    WHERE fuel_name = $1
-                """, fuel_name)
+                # 캐시 조회(MasterDataCache.lookup)와 같은 규칙: 정확한 이름 → 영문명 → 정규화 이름
+                result = await conn.fetchrow(_FUEL_MASTER_MATCH_QUERY, *name_match_args(fuel_name))
                 
                 if result:
                     logger.info(f"✅ 연료 마스터 조회 성공: {fuel_name}")
@@ -328,18 +368,26 @@ class FuelDirRepository:
             logger.error(f"❌ 연료 마스터 조회 실패: {str(e)}")
             return None
 
-    async def search_fuels(self, search_term: str) -> List[Dict[str, Any]]:
-        """연료명으로 검색 (부분 검색)"""
+    async def search_fuels(
+        self, search_term: str, limit: int = SEARCH_DEFAULT_LIMIT, fuzzy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """연료명/영문명으로 검색 (부분 검색, fuzzy면 오타 허용 - 관련도 순)"""
         await self._ensure_pool_initialized()
+        if not search_term.strip():
+            return []
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                search = TrigramSearch(['fuel_name', 'fuel_engname'], search_term, fuzzy)
+                query = KeysetQuery()
+                order_sql = search.apply(query)
+                results = await search.fetch(conn, f"""
                     SELECT id, fuel_name, fuel_engname, fuel_factor, net_calory
                     FROM fuel_master
-                    WHERE fuel_name ILIKE $1 OR fuel_engname ILIKE $1
-                    ORDER BY fuel_name
-                """, f'%{search_term}%')
+                    {query.where_sql}
+                    {order_sql}
+                    {query.limit_sql(limit)}
+                """, query)
                 
                 logger.info(f"✅ 연료 마스터 검색 성공: '{search_term}' → {len(results)}개 결과")
                 return [dict(row) for row in results]
@@ -348,43 +396,53 @@ class FuelDirRepository:
             logger.error(f"❌ 연료 마스터 검색 실패: {str(e)}")
             return []
 
-    async def get_all_fuels(self) -> List[Dict[str, Any]]:
-        """모든 연료 마스터 데이터 조회"""
+    async def load_fuel_master(self) -> List[Dict[str, Any]]:
+        """연료 마스터 전체 조회 (캐시 적재용 - 실패 시 예외)"""
         await self._ensure_pool_initialized()
+        if not self.pool:
+            raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
         
+        async with self.pool.acquire() as conn:
+            results = await conn.fetch("""
+                SELECT id, fuel_name, fuel_engname, fuel_factor, net_calory
+                FROM fuel_master
+                ORDER BY fuel_name
+            """)
+            return [dict(row) for row in results]
+
+    async def get_all_fuels(self) -> List[Dict[str, Any]]:
+        """모든 연료 마스터 데이터 조회"""
         try:
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
-                    SELECT id, fuel_name, fuel_engname, fuel_factor, net_calory
-                    FROM fuel_master
-                    ORDER BY fuel_name
-                """)
-                
-                logger.info(f"✅ 모든 연료 마스터 조회 성공: {len(results)}개")
-                return [dict(row) for row in results]
+            results = await self.load_fuel_master()
+            logger.info(f"✅ 모든 연료 마스터 조회 성공: {len(results)}개")
+            return results
                 
         except Exception as e:
             logger.error(f"❌ 모든 연료 마스터 조회 실패: {str(e)}")
             return []
 
+    @staticmethod
+    def fuel_factor_response(fuel_name: str, fuel: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """연료 마스터 행 → 배출계수 응답 (없으면 found=False)"""
+        if fuel:
+            return {
+                'fuel_name': fuel['fuel_name'],
+                'fuel_factor': float(fuel['fuel_factor']),
+                'net_calory': float(fuel['net_calory']) if fuel['net_calory'] else None,
+                'found': True
+            }
+        return {
+            'fuel_name': fuel_name,
+            'fuel_factor': None,
+            'net_calory': None,
+            'found': False
+        }
+
     async def get_fuel_factor_by_name(self, fuel_name: str) -> Optional[Dict[str, Any]]:
         """연료명으로 배출계수만 조회 (간단한 응답)"""
         try:
             fuel = await self.get_fuel_by_name(fuel_name)
-            if fuel:
-                return {
-                    'fuel_name': fuel['fuel_name'],
-                    'fuel_factor': float(fuel['fuel_factor']),
-                    'net_calory': float(fuel['net_calory']) if fuel['net_calory'] else None,
-                    'found': True
-                }
-            else:
-                return {
-                    'fuel_name': fuel_name,
-                    'fuel_factor': None,
-                    'net_calory': None,
-                    'found': False
-                }
+            return self.fuel_factor_response(fuel_name, fuel)
                 
         except Exception as e:
             logger.error(f"❌ 배출계수 조회 실패: {str(e)}")
@@ -399,18 +457,46 @@ class FuelDirRepository:
     # 📋 기존 DB 작업 메서드들
     # ============================================================================
 
-    async def _get_fueldirs_db(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def _fueldir_filters(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> KeysetQuery:
+        """연료직접배출량 목록 필터 조건 (공정/사업장/생성일 기간, 종료일 포함)"""
+        return (
+            KeysetQuery()
+            .where("process_id = {}", process_id)
+            .where("process_id IN (SELECT id FROM process WHERE install_id = {})", install_id)
+            .where("created_at >= {}::date", start_date)
+            .where("created_at < {}::date + 1", end_date)
+        )
+
+    async def _get_fueldirs_db(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
         """모든 연료직접배출량 데이터 조회 (DB 작업)"""
         if not self.pool:
             raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
             
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = self._fueldir_filters(process_id, install_id, start_date, end_date).after(
+                    ['created_at', 'id'], after, descending=True
+                )
+                results = await conn.fetch(f"""
                     SELECT * FROM fueldir 
-                    ORDER BY created_at DESC 
-                    OFFSET $1 LIMIT $2
-                """, skip, limit)
+                    {query.where_sql}
+                    ORDER BY created_at DESC, id DESC 
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(row) for row in results]
                 
@@ -561,3 +647,14 @@ class FuelDirRepository:
             logger.error(f"❌ 에러 타입: {type(e)}")
             logger.error(f"❌ 에러 상세: {e}")
             return {}
+
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_fuel_master_cache = MasterDataCache('fuel_master', 'fuel_name', 'fuel_engname')
+
+def get_fuel_master_cache() -> MasterDataCache:
+    """워커 공용 연료 마스터 캐시 반환"""
+    return _fuel_master_cache
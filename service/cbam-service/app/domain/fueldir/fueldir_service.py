@@ -3,17 +3,19 @@
 # ============================================================================
 
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime
 from decimal import Decimal
-from app.domain.fueldir.fueldir_repository import FuelDirRepository
+from app.common.text_search import SEARCH_DEFAULT_LIMIT
+from app.common.master_cache import MasterDataCache
+from app.domain.fueldir.fueldir_repository import FuelDirRepository, get_fuel_master_cache
 from app.domain.fueldir.fueldir_schema import (
     FuelDirCreateRequest, FuelDirResponse, FuelDirUpdateRequest, 
     FuelDirCalculationRequest, FuelDirCalculationResponse,
     FuelMasterSearchRequest, FuelMasterResponse, 
     FuelMasterListResponse, FuelMasterFactorResponse
 )
-from app.domain.calculation.calculation_service import CalculationService
+from app.domain.calculation.calculation_scheduler import get_recalculation_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,8 @@ class FuelDirService:
     
     def __init__(self):
         self.fueldir_repository = FuelDirRepository()
-        self._calc_service = CalculationService()
+        self.master_cache = get_fuel_master_cache()
+        self._recalc_scheduler = get_recalculation_scheduler()
         logger.info("✅ FuelDir 서비스 초기화 완료")
     
     # ============================================================================
@@ -57,7 +60,7 @@ class FuelDirService:
             if saved_fueldir:
                 # 투입 생성 후 재계산 트리거
                 try:
-                    await self._calc_service.recalculate_from_process(request.process_id)
+                    await self._recalc_scheduler.request_recalculation(request.process_id, reason='fueldir_create')
                 except Exception as e:
                     logger.warning(f"⚠️ 재계산 트리거 실패(연료 생성 후): {e}")
                 return FuelDirResponse(**saved_fueldir)
@@ -67,15 +70,33 @@ class FuelDirService:
             logger.error(f"Error creating fueldir: {e}")
             raise e
     
-    async def get_fueldirs(self, skip: int = 0, limit: int = 100) -> List[FuelDirResponse]:
-        """모든 연료직접배출량 데이터 조회"""
+    async def get_fueldirs(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[FuelDirResponse]:
+        """모든 연료직접배출량 데이터 조회 (최신순 키셋 페이지네이션)"""
         try:
-            fueldirs = await self.fueldir_repository.get_fueldirs(skip, limit)
+            fueldirs = await self.fueldir_repository.get_fueldirs(after, limit, process_id, install_id, start_date, end_date)
             return [FuelDirResponse(**fueldir) for fueldir in fueldirs]
         except Exception as e:
             logger.error(f"Error getting fueldirs: {e}")
             raise e
     
+    async def estimate_fueldirs_count(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 연료직접배출량 데이터 수 추정"""
+        return await self.fueldir_repository.estimate_fueldirs_count(process_id, install_id, start_date, end_date)
+    
     async def get_fueldirs_by_process(self, process_id: int) -> List[FuelDirResponse]:
         """특정 공정의 연료직접배출량 데이터 조회"""
         try:
@@ -137,7 +158,7 @@ class FuelDirService:
                         existing_fueldir = await self.fueldir_repository.get_fueldir(fueldir_id)
                         process_id = existing_fueldir['process_id'] if existing_fueldir else None
                     if process_id is not None:
-                        await self._calc_service.recalculate_from_process(process_id)
+                        await self._recalc_scheduler.request_recalculation(process_id, reason='fueldir_update')
                 except Exception as e:
                     logger.warning(f"⚠️ 재계산 트리거 실패(연료 업데이트 후): {e}")
                 return FuelDirResponse(**updated_fueldir)
@@ -202,10 +223,26 @@ class FuelDirService:
     # 🏗️ Fuel Master 관련 메서드들 (새로 추가)
     # ============================================================================
 
+    async def _fuel_master(self) -> Optional[MasterDataCache]:
+        """최신 연료 마스터 캐시 (비활성/적재 실패 시 None → DB 조회)"""
+        try:
+            if await self.master_cache.ensure_loaded(self.fueldir_repository.load_fuel_master):
+                return self.master_cache
+        except Exception as e:
+            logger.warning(f"⚠️ 연료 마스터 캐시 적재 실패 (DB로 조회): {e}")
+        return None
+
+    async def refresh_fuel_master(self) -> Dict[str, Any]:
+        """연료 마스터 캐시 무효화 후 즉시 재적재 (마스터 데이터 변경 시 호출)"""
+        self.master_cache.invalidate('refresh 요청')
+        await self._fuel_master()
+        return self.master_cache.stats()
+
     async def get_fuel_by_name(self, fuel_name: str) -> Optional[FuelMasterResponse]:
-        """연료명으로 마스터 데이터 조회"""
+        """연료명으로 마스터 데이터 조회 (워커 메모리 캐시, 적재 실패 시 DB)"""
         try:
-            fuel = await self.fueldir_repository.get_fuel_by_name(fuel_name)
+            cache = await self._fuel_master()
+            fuel = cache.lookup(fuel_name) if cache else await self.fueldir_repository.get_fuel_by_name(fuel_name)
             if fuel:
                 return FuelMasterResponse(**fuel)
             return None
@@ -213,19 +250,22 @@ class FuelDirService:
             logger.error(f"Error getting fuel by name '{fuel_name}': {e}")
             raise e
 
-    async def search_fuels(self, search_term: str) -> List[FuelMasterResponse]:
-        """연료명으로 검색 (부분 검색)"""
+    async def search_fuels(
+        self, search_term: str, limit: int = SEARCH_DEFAULT_LIMIT, fuzzy: bool = False
+    ) -> List[FuelMasterResponse]:
+        """연료명으로 검색 (부분 검색, fuzzy면 오타 허용)"""
         try:
-            fuels = await self.fueldir_repository.search_fuels(search_term)
+            fuels = await self.fueldir_repository.search_fuels(search_term, limit, fuzzy)
             return [FuelMasterResponse(**fuel) for fuel in fuels]
         except Exception as e:
             logger.error(f"Error searching fuels with term '{search_term}': {e}")
             raise e
 
     async def get_all_fuels(self) -> FuelMasterListResponse:
-        """모든 연료 마스터 데이터 조회"""
+        """모든 연료 마스터 데이터 조회 (워커 메모리 캐시, 적재 실패 시 DB)"""
         try:
-            fuels = await self.fueldir_repository.get_all_fuels()
+            cache = await self._fuel_master()
+            fuels = cache.rows() if cache else await self.fueldir_repository.get_all_fuels()
             fuel_responses = [FuelMasterResponse(**fuel) for fuel in fuels]
             return FuelMasterListResponse(
                 fuels=fuel_responses,
@@ -236,9 +276,13 @@ class FuelDirService:
             raise e
 
     async def get_fuel_factor_by_name(self, fuel_name: str) -> FuelMasterFactorResponse:
-        """연료명으로 배출계수 조회 (자동 매핑 기능)"""
+        """연료명으로 배출계수 조회 (자동 매핑 기능 - 워커 메모리 캐시, 적재 실패 시 DB)"""
         try:
-            factor_data = await self.fueldir_repository.get_fuel_factor_by_name(fuel_name)
+            cache = await self._fuel_master()
+            if cache:
+                factor_data = FuelDirRepository.fuel_factor_response(fuel_name, cache.lookup(fuel_name))
+            else:
+                factor_data = await self.fueldir_repository.get_fuel_factor_by_name(fuel_name)
             return FuelMasterFactorResponse(**factor_data)
         except Exception as e:
             logger.error(f"Error getting fuel factor for '{fuel_name}': {e}")
@@ -301,7 +345,7 @@ class FuelDirService:
         """연료명으로 연료직접배출량 검색"""
         try:
             # 간단한 구현: 모든 데이터를 가져와서 필터링
-            all_fueldirs = await self.fueldir_repository.get_fueldirs(0, 1000)  # 충분히 큰 수
+            all_fueldirs = await self.fueldir_repository.get_fueldirs(limit=1000)  # 충분히 큰 수
             filtered_fueldirs = [
                 fueldir for fueldir in all_fueldirs 
                 if fuel_name.lower() in fueldir['fuel_name'].lower()
@@ -320,7 +364,7 @@ class FuelDirService:
         """날짜 범위로 연료직접배출량 조회"""
         try:
             # 간단한 구현: 모든 데이터를 가져와서 필터링
-            all_fueldirs = await self.fueldir_repository.get_fueldirs(0, 1000)
+            all_fueldirs = await self.fueldir_repository.get_fueldirs(limit=1000)
             filtered_fueldirs = [
                 fueldir for fueldir in all_fueldirs 
                 if start_date <= fueldir['created_at'] <= end_date
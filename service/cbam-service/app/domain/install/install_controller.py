@@ -2,10 +2,12 @@
 # 🏭 Install Controller - 사업장 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
+from app.common.pagination import MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
 from app.domain.install.install_service import InstallService
 from app.domain.install.install_schema import (
     InstallCreateRequest, InstallResponse, InstallUpdateRequest, InstallNameResponse
@@ -28,14 +30,26 @@ def get_install_service():
 
 # 실제 경로: /install/ (사업장 목록 조회)
 @router.get("/", response_model=List[InstallResponse])
-async def get_installs():
-    """사업장 목록 조회"""
+async def get_installs(
+    response: Response,
+    reporting_year: Optional[int] = Query(None, description="보고기간 (년도)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT, description="페이지 크기 (없으면 전체)"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값")
+):
+    """사업장 목록 조회 (최신순 키셋 페이지네이션)"""
     try:
-        logger.info("📋 사업장 목록 조회 요청")
+        logger.info(f"📋 사업장 목록 조회 요청: reporting_year={reporting_year}, limit={limit}")
+        cursor = decode_cursor(after, (datetime, int))
         install_service = get_install_service()
-        installs = await install_service.get_installs()
+        installs = await install_service.get_installs(reporting_year, cursor, fetch_limit(limit))
+        installs = await respond_page(
+            response, installs, limit, lambda i: [i.created_at, i.id], first_page=cursor is None,
+            estimate=lambda: install_service.estimate_installs_count(reporting_year)
+        )
         logger.info(f"✅ 사업장 목록 조회 성공: {len(installs)}개")
         return installs
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 사업장 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"사업장 목록 조회 중 오류가 발생했습니다: {str(e)}")
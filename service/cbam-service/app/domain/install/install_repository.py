@@ -4,10 +4,13 @@
 
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import asyncpg
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+
 from app.domain.install.install_schema import InstallCreateRequest, InstallUpdateRequest
 
 logger = logging.getLogger(__name__)
@@ -15,26 +18,18 @@ logger = logging.getLogger(__name__)
 class InstallRepository:
     """사업장 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        # asyncpg 연결 풀 초기화 (요청 간 풀 공유)
-        # 여러 요청이 동시에 들어올 때 매번 새 풀을 만들면 DB 커넥션 초과가 발생한다.
-        # 클래스 레벨의 공유 풀을 사용해 모든 인스턴스가 재사용하도록 한다.
-        if not hasattr(InstallRepository, "_shared_pool"):
-            InstallRepository._shared_pool = None  # type: ignore[attr-defined]
-        if not hasattr(InstallRepository, "_shared_init_attempted"):
-            InstallRepository._shared_init_attempted = False  # type: ignore[attr-defined]
-
-        # 인스턴스는 클래스 공유 상태를 참조
-        self.pool = InstallRepository._shared_pool  # type: ignore[attr-defined]
-        self._initialization_attempted = InstallRepository._shared_init_attempted  # type: ignore[attr-defined]
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
+        self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -44,32 +39,19 @@ class InstallRepository:
             return
         
         self._initialization_attempted = True
-        InstallRepository._shared_init_attempted = True  # type: ignore[attr-defined]
         
         try:
-            # asyncpg 연결 풀 생성
-            # 이미 공유 풀 존재 시 재사용
-            if InstallRepository._shared_pool is not None:  # type: ignore[attr-defined]
-                self.pool = InstallRepository._shared_pool  # type: ignore[attr-defined]
-                logger.info("♻️ Install 공유 커넥션 풀 재사용")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
                 return
-
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-install'
-                }
-            )
             
-            logger.info("✅ Install 데이터베이스 연결 풀 생성 성공")
-            InstallRepository._shared_pool = self.pool  # type: ignore[attr-defined]
+            logger.info("✅ Install 공용 연결 풀 연결 성공")
             
-            # 테이블 생성은 선택적으로 실행
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_install_table_async()
+                await self.pool_manager.run_once('install.install_table', self._create_install_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ Install 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -119,6 +101,11 @@ class InstallRepository:
                 else:
                     logger.info("✅ install 테이블 확인 완료")
                 
+                # 목록 키셋 페이지네이션(created_at, id 역순)용 인덱스
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_install_created_at_id ON install (created_at DESC, id DESC);
+                """)
+                
         except Exception as e:
             logger.error(f"❌ Install 테이블 생성 실패: {str(e)}")
             logger.warning("⚠️ 테이블 생성 실패로 인해 일부 기능이 제한될 수 있습니다.")
@@ -142,15 +129,26 @@ class InstallRepository:
             logger.error(f"❌ 사업장 생성 실패: {str(e)}")
             raise
     
-    async def get_installs(self) -> List[Dict[str, Any]]:
-        """사업장 목록 조회"""
+    async def get_installs(
+        self,
+        reporting_year: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """사업장 목록 조회 (최신순 키셋 페이지네이션 - limit이 없으면 전체)"""
         await self._ensure_pool_initialized()
         try:
-            return await self._get_installs_db()
+            return await self._get_installs_db(reporting_year, after, limit)
         except Exception as e:
             logger.error(f"❌ 사업장 목록 조회 실패: {str(e)}")
             raise
     
+    async def estimate_installs_count(self, reporting_year: Optional[int] = None) -> Optional[int]:
+        """필터에 맞는 사업장 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM install", KeysetQuery().where("reporting_year = {}", reporting_year))
+    
     async def get_install_names(self) -> List[Dict[str, Any]]:
         """사업장명 목록 조회 (드롭다운용)"""
         await self._ensure_pool_initialized()
@@ -250,18 +248,28 @@ class InstallRepository:
             logger.error(f"❌ 사업장 생성 실패: {str(e)}")
             raise
 
-    async def _get_installs_db(self) -> List[Dict[str, Any]]:
+    async def _get_installs_db(
+        self,
+        reporting_year: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """데이터베이스에서 사업장 목록 조회"""
         if not self.pool:
             raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
             
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = KeysetQuery().where("reporting_year = {}", reporting_year).after(
+                    ['created_at', 'id'], after, descending=True
+                )
+                results = await conn.fetch(f"""
                     SELECT id, install_name, reporting_year, created_at, updated_at
                     FROM install
-                    ORDER BY created_at DESC
-                """)
+                    {query.where_sql}
+                    ORDER BY created_at DESC, id DESC
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 installs = []
                 for result in results:
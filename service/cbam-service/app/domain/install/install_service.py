@@ -3,7 +3,7 @@
 # ============================================================================
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from app.domain.install.install_repository import InstallRepository
@@ -50,15 +50,24 @@ class InstallService:
             logger.error(f"Error creating install: {e}")
             raise e
     
-    async def get_installs(self) -> List[InstallResponse]:
-        """사업장 목록 조회"""
+    async def get_installs(
+        self,
+        reporting_year: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[InstallResponse]:
+        """사업장 목록 조회 (최신순 키셋 페이지네이션)"""
         try:
-            installs = await self.install_repository.get_installs()
+            installs = await self.install_repository.get_installs(reporting_year, after, limit)
             return [InstallResponse(**install) for install in installs]
         except Exception as e:
             logger.error(f"Error getting installs: {e}")
             raise e
     
+    async def estimate_installs_count(self, reporting_year: Optional[int] = None) -> Optional[int]:
+        """필터에 맞는 사업장 수 추정"""
+        return await self.install_repository.estimate_installs_count(reporting_year)
+    
     async def get_install_names(self) -> List[InstallNameResponse]:
         """사업장명 목록 조회 (드롭다운용)"""
         try:
@@ -2,15 +2,16 @@
 # 🏭 Mapping Controller - 매핑 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, File, HTTPException, Query, Response, UploadFile
 import logging
-from typing import List
+from typing import List, Optional
 
-from app.domain.mapping.mapping_service import HSCNMappingService
+from app.common.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
+from app.domain.mapping.mapping_service import HSCNMappingService, IMPORT_FORMATS
 from app.domain.mapping.mapping_schema import (
     HSCNMappingCreateRequest, HSCNMappingResponse, HSCNMappingUpdateRequest,
     HSCNMappingFullResponse, HSCodeLookupResponse, MappingStatsResponse,
-    HSCNMappingBatchCreateRequest, HSCNMappingBatchResponse
+    HSCNMappingBatchCreateRequest, HSCNMappingBatchResponse, HSCNMappingImportResponse
 )
 
 logger = logging.getLogger(__name__)
@@ -28,18 +29,22 @@ def get_mapping_service():
 # ============================================================================
 
 @router.get("/cncode/lookup/{hs_code}", response_model=List[HSCNMappingResponse])
-async def lookup_cn_code_by_hs_code(hs_code: str):
+async def lookup_cn_code_by_hs_code(
+    hs_code: str,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="최대 결과 수")
+):
     """
     HS 코드로 CN 코드 조회 (부분 검색 허용)
     
     - **hs_code**: HS 코드 (예: 72, 720, 7208, 720851) - 2자리 이상 입력
+    - **limit**: 최대 결과 수 (hscode, cncode 순으로 앞에서부터)
     - **응답**: CN 코드 매핑 정보 목록
     """
     try:
         logger.info(f"🔍 HS 코드 조회 요청: {hs_code}")
         
         mapping_service = get_mapping_service()
-        result = await mapping_service.lookup_by_hs_code(hs_code)
+        result = await mapping_service.lookup_by_hs_code(hs_code, limit)
         
         if not result.success:
             raise HTTPException(status_code=400, detail=result.message)
@@ -59,21 +64,29 @@ async def lookup_cn_code_by_hs_code(hs_code: str):
 
 @router.get("/mapping", response_model=List[HSCNMappingFullResponse])
 async def get_all_mappings(
-    skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
-    limit: int = Query(100, ge=1, le=1000, description="조회할 레코드 수")
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="조회할 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값")
 ):
-    """모든 HS-CN 매핑 조회 (페이지네이션)"""
+    """모든 HS-CN 매핑 조회 (id 순 키셋 페이지네이션)"""
     try:
-        logger.info(f"📋 HS-CN 매핑 목록 조회 요청: skip={skip}, limit={limit}")
+        logger.info(f"📋 HS-CN 매핑 목록 조회 요청: limit={limit}")
+        cursor = decode_cursor(after)
         mapping_service = get_mapping_service()
-        mappings = await mapping_service.get_all_mappings(skip, limit)
+        mappings = await mapping_service.get_all_mappings(cursor[0] if cursor else None, fetch_limit(limit))
+        mappings = await respond_page(
+            response, mappings, limit, lambda m: [m.id], first_page=cursor is None,
+            estimate=mapping_service.estimate_mappings_count
+        )
         logger.info(f"✅ HS-CN 매핑 목록 조회 성공: {len(mappings)}개")
         return mappings
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ HS-CN 매핑 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"매핑 목록 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/mapping/{mapping_id}", response_model=HSCNMappingFullResponse)
+@router.get("/mapping/{mapping_id:int}", response_model=HSCNMappingFullResponse)
 async def get_mapping(mapping_id: int):
     """특정 HS-CN 매핑 조회"""
     try:
@@ -109,7 +122,7 @@ async def create_mapping(request: HSCNMappingCreateRequest):
         logger.error(f"❌ HS-CN 매핑 생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"매핑 생성 중 오류가 발생했습니다: {str(e)}")
 
-@router.put("/mapping/{mapping_id}", response_model=HSCNMappingFullResponse)
+@router.put("/mapping/{mapping_id:int}", response_model=HSCNMappingFullResponse)
 async def update_mapping(mapping_id: int, request: HSCNMappingUpdateRequest):
     """HS-CN 매핑 수정"""
     try:
@@ -127,7 +140,7 @@ async def update_mapping(mapping_id: int, request: HSCNMappingUpdateRequest):
         logger.error(f"❌ HS-CN 매핑 수정 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"매핑 수정 중 오류가 발생했습니다: {str(e)}")
 
-@router.delete("/mapping/{mapping_id}")
+@router.delete("/mapping/{mapping_id:int}")
 async def delete_mapping(mapping_id: int):
     """HS-CN 매핑 삭제"""
     try:
@@ -150,12 +163,15 @@ async def delete_mapping(mapping_id: int):
 # ============================================================================
 
 @router.get("/mapping/search/hs/{hs_code}", response_model=List[HSCNMappingFullResponse])
-async def search_by_hs_code(hs_code: str):
-    """HS 코드로 검색"""
+async def search_by_hs_code(
+    hs_code: str,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="최대 결과 수")
+):
+    """HS 코드로 검색 (접두사 일치)"""
     try:
         logger.info(f"🔍 HS 코드 검색 요청: {hs_code}")
         mapping_service = get_mapping_service()
-        mappings = await mapping_service.search_by_hs_code(hs_code)
+        mappings = await mapping_service.search_by_hs_code(hs_code, limit)
         logger.info(f"✅ HS 코드 검색 성공: {len(mappings)}개 결과")
         return mappings
     except Exception as e:
@@ -163,12 +179,15 @@ async def search_by_hs_code(hs_code: str):
         raise HTTPException(status_code=500, detail=f"HS 코드 검색 중 오류가 발생했습니다: {str(e)}")
 
 @router.get("/mapping/search/cn/{cn_code}", response_model=List[HSCNMappingFullResponse])
-async def search_by_cn_code(cn_code: str):
-    """CN 코드로 검색"""
+async def search_by_cn_code(
+    cn_code: str,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="최대 결과 수")
+):
+    """CN 코드로 검색 (접두사 일치)"""
     try:
         logger.info(f"🔍 CN 코드 검색 요청: {cn_code}")
         mapping_service = get_mapping_service()
-        mappings = await mapping_service.search_by_cn_code(cn_code)
+        mappings = await mapping_service.search_by_cn_code(cn_code, limit)
         logger.info(f"✅ CN 코드 검색 성공: {len(mappings)}개 결과")
         return mappings
     except Exception as e:
@@ -222,6 +241,33 @@ async def create_mappings_batch(request: HSCNMappingBatchCreateRequest):
         logger.error(f"❌ HS-CN 매핑 일괄 생성 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"매핑 일괄 생성 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/mapping/import", response_model=HSCNMappingImportResponse)
+async def import_mappings(
+    file: UploadFile = File(..., description="CSV(헤더 포함) 또는 JSON Lines 파일"),
+    format: Optional[str] = Query(None, description="입력 형식 (csv/jsonl, 없으면 파일 확장자로 판단)")
+):
+    """HS-CN 매핑 대량 가져오기 ((hscode, cncode_total) 기준 upsert - CN 코드 연간 갱신용)"""
+    import_format = format
+    if not import_format:
+        extension = (file.filename or '').rsplit('.', 1)[-1].lower()
+        import_format = 'jsonl' if extension in ('jsonl', 'ndjson') else extension
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {import_format} (csv/jsonl)")
+    
+    try:
+        content = await file.read()
+        logger.info(f"📦 HS-CN 매핑 대량 가져오기 요청: {file.filename} ({import_format}, {len(content)} bytes)")
+        mapping_service = get_mapping_service()
+        result = await mapping_service.import_mappings(content, import_format)
+        logger.info(
+            f"✅ HS-CN 매핑 대량 가져오기 완료: 신규 {result.inserted_count}개, 수정 {result.updated_count}개, "
+            f"동일 {result.unchanged_count}개, 건너뜀 {result.skipped_count}개"
+        )
+        return result
+    except Exception as e:
+        logger.error(f"❌ HS-CN 매핑 대량 가져오기 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"매핑 대량 가져오기 중 오류가 발생했습니다: {str(e)}")
+
 # ============================================================================
 # 📦 Router Export
 # ============================================================================
@@ -0,0 +1,123 @@
+# ============================================================================
+# 🗂️ Mapping Index - 워커별 HS/CN 코드 접두사 인덱스
+# ============================================================================
+
+"""
+hs_cn_mapping 전체를 워커 메모리에 올려 hscode / cncode_total 기준 정렬 배열로 색인합니다.
+제품 입력 화면의 HS 코드 자동완성(/cncode/lookup, /mapping/search/hs|cn)은
+이진 탐색(bisect)으로 접두사 구간을 찾아 limit개까지만 잘라 DB 왕복 없이 응답합니다.
+
+무효화 규칙:
+- 같은 워커의 생성/수정/삭제는 인덱스에 즉시 반영 (일괄 생성은 무효화 후 다음 조회 때 재적재)
+- 다른 워커의 변경은 MAPPING_INDEX_TTL(초)이 지나면 재적재해 반영
+- 적재에 실패하면 호출자가 DB(text_pattern_ops 인덱스)로 조회
+
+환경변수:
+- MAPPING_INDEX_ENABLED (기본 true): false이면 모든 조회를 DB로 처리
+- MAPPING_INDEX_TTL (기본 300): 재적재 주기(초)
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.common.memory_index import MemoryIndex
+
+HSCODE = 'hscode'
+CNCODE = 'cncode_total'
+
+# 코드별 정렬 키 (응답 정렬 순서와 동일: hscode 검색은 hscode, cncode 순 / cncode 검색은 cncode, hscode 순)
+_SORT_KEYS: Dict[str, Tuple[str, str]] = {
+    HSCODE: (HSCODE, CNCODE),
+    CNCODE: (CNCODE, HSCODE),
+}
+
+SortKey = Tuple[str, str, int]
+
+
+class HSCNPrefixIndex(MemoryIndex):
+    """hscode / cncode_total 접두사 인덱스 (워커당 1개)"""
+
+    def __init__(self, ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        super().__init__('HS-CN 인덱스', 'MAPPING_INDEX_TTL', 300, 'MAPPING_INDEX_ENABLED', ttl, enabled)
+
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        # 코드별 정렬 키 배열 (bisect 대상, 마지막 원소는 매핑 ID)
+        self._keys: Dict[str, List[SortKey]] = {code: [] for code in _SORT_KEYS}
+
+    # ============================================================================
+    # 🔄 색인 구성 / 부분 반영
+    # ============================================================================
+
+    @staticmethod
+    def _sort_key(row: Dict[str, Any], code: str) -> SortKey:
+        first, second = _SORT_KEYS[code]
+        return (row[first] or '', row[second] or '', row['id'])
+
+    def _rebuild(self, rows: Iterable[Dict[str, Any]]):
+        self._rows = {row['id']: dict(row) for row in rows}
+        self._keys = {
+            code: sorted(self._sort_key(row, code) for row in self._rows.values())
+            for code in _SORT_KEYS
+        }
+
+    def size(self) -> int:
+        return len(self._rows)
+
+    def _remove(self, mapping_id: int):
+        row = self._rows.pop(mapping_id, None)
+        if not row:
+            return
+        for code, keys in self._keys.items():
+            key = self._sort_key(row, code)
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+
+    def apply_upsert(self, rows: Iterable[Dict[str, Any]]):
+        """생성/수정된 매핑을 인덱스에 반영"""
+        self._touch()
+        if not self.is_loaded:
+            return
+        for row in rows:
+            self._remove(row['id'])
+            self._rows[row['id']] = dict(row)
+            for code, keys in self._keys.items():
+                insort(keys, self._sort_key(row, code))
+
+    def apply_delete(self, mapping_ids: Iterable[int]):
+        """삭제된 매핑을 인덱스에서 제거"""
+        self._touch()
+        if not self.is_loaded:
+            return
+        for mapping_id in mapping_ids:
+            self._remove(mapping_id)
+
+    # ============================================================================
+    # 🔍 조회 (ensure_loaded()가 True일 때만 사용)
+    # ============================================================================
+
+    def prefix(self, code: str, prefix: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """code(hscode/cncode_total)가 prefix로 시작하는 매핑 (정렬 순서, 최대 limit개)"""
+        keys = self._keys[code]
+        results: List[Dict[str, Any]] = []
+        index = bisect_left(keys, (prefix, '', 0))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(dict(self._rows[keys[index][2]]))
+            index += 1
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 상태 (헬스체크용)"""
+        return {**super().stats(), 'mapping_count': len(self._rows)}
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_hscn_index = HSCNPrefixIndex()
+
+def get_hscn_index() -> HSCNPrefixIndex:
+    """워커 공용 HS-CN 접두사 인덱스 반환"""
+    return _hscn_index
@@ -7,24 +7,35 @@ import logging
 from typing import List, Optional, Dict, Any
 import asyncpg
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+
 from app.domain.mapping.mapping_schema import HSCNMappingCreateRequest, HSCNMappingUpdateRequest
 
 logger = logging.getLogger(__name__)
 
+# 일괄 가져오기(COPY) 컬럼 순서 - (hscode, cncode_total)이 upsert 키
+IMPORT_COLUMNS = (
+    'hscode', 'aggregoods_name', 'aggregoods_engname',
+    'cncode_total', 'goods_name', 'goods_engname'
+)
+IMPORT_UNIQUE_INDEX = 'uq_hs_cn_mapping_codes'
+
 class HSCNMappingRepository:
     """HS-CN 매핑 데이터베이스 리포지토리 (asyncpg 연결 풀)"""
     
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -36,16 +47,19 @@ class HSCNMappingRepository:
         self._initialization_attempted = True
         
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-mapping'
-                }
-            )
-            logger.info("✅ Mapping 데이터베이스 연결 풀 생성 성공")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
+            
+            logger.info("✅ Mapping 공용 연결 풀 연결 성공")
+            
+            # 인덱스 생성은 선택적으로 실행 (워커당 1회)
+            try:
+                await self.pool_manager.run_once('mapping.hs_cn_mapping_indexes', self._create_mapping_indexes_async)
+            except Exception as e:
+                logger.warning(f"⚠️ HS-CN 매핑 인덱스 생성 실패 (기본 기능은 정상): {e}")
             
         except Exception as e:
             logger.error(f"❌ Mapping 데이터베이스 연결 실패: {str(e)}")
@@ -60,6 +74,37 @@ class HSCNMappingRepository:
         if not self.pool:
             raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
     
+    async def _create_mapping_indexes_async(self):
+        """HS/CN 코드 접두사 검색용 인덱스 생성 (DB 콜레이션과 무관하게 LIKE/범위 비교에 사용)"""
+        async with self.pool.acquire() as conn:
+            exists = await conn.fetchval("SELECT to_regclass('hs_cn_mapping') IS NOT NULL")
+            if not exists:
+                logger.warning("⚠️ hs_cn_mapping 테이블이 없어 인덱스 생성을 건너뜁니다.")
+                return
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hs_cn_mapping_hscode_pattern
+                    ON hs_cn_mapping (hscode text_pattern_ops, cncode_total text_pattern_ops);
+                CREATE INDEX IF NOT EXISTS idx_hs_cn_mapping_cncode_pattern
+                    ON hs_cn_mapping (cncode_total text_pattern_ops, hscode text_pattern_ops);
+            """)
+            # 일괄 가져오기 upsert 키 (기존 데이터에 중복이 있으면 생성 실패 - 가져오기만 비활성)
+            try:
+                await conn.execute(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS {IMPORT_UNIQUE_INDEX}
+                        ON hs_cn_mapping (hscode, cncode_total);
+                """)
+            except asyncpg.UniqueViolationError as e:
+                logger.warning(f"⚠️ (hscode, cncode_total) 중복 매핑이 있어 고유 인덱스를 만들지 못했습니다: {e}")
+    
+    @staticmethod
+    def _prefix_filter(column: str, prefix: str) -> KeysetQuery:
+        """접두사 조건을 바이트 순 범위 비교로 표현 (일반 계획에서도 text_pattern_ops 인덱스 사용)"""
+        query = KeysetQuery()
+        if prefix:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            query.where(f"{column} ~>=~ {{}}", prefix).where(f"{column} ~<~ {{}}", upper)
+        return query
+    
     # ============================================================================
     # 📋 기본 CRUD 작업
     # ============================================================================
@@ -76,14 +121,14 @@ class HSCNMappingRepository:
                 VALUES ($1, $2, $3, $4, $5, $6)
                 RETURNING id, hscode, aggregoods_name, aggregoods_engname, 
                           cncode_total, goods_name, goods_engname
-                """, (
+                """,
                     mapping_data.hscode,
                     mapping_data.aggregoods_name,
                     mapping_data.aggregoods_engname,
                     mapping_data.cncode_total,
                     mapping_data.goods_name,
                     mapping_data.goods_engname
-                ))
+                )
                 
                 if result:
                     logger.info(f"✅ HS-CN 매핑 생성 성공: ID {result['id']}")
@@ -113,19 +158,21 @@ class HSCNMappingRepository:
             logger.error(f"❌ HS-CN 매핑 조회 실패: {str(e)}")
             return None
     
-    async def get_all_mappings(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """모든 HS-CN 매핑 조회 (페이지네이션)"""
+    async def get_all_mappings(self, after_id: Optional[int] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """모든 HS-CN 매핑 조회 (id 순 키셋 페이지네이션)"""
         await self._ensure_pool_initialized()
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = KeysetQuery().after(['id'], [after_id] if after_id is not None else None)
+                results = await conn.fetch(f"""
                 SELECT id, hscode, aggregoods_name, aggregoods_engname, 
                        cncode_total, goods_name, goods_engname
                 FROM hs_cn_mapping 
+                {query.where_sql}
                 ORDER BY id
-                OFFSET $1 LIMIT $2
-                """, skip, limit)
+                {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(row) for row in results]
                 
@@ -133,6 +180,12 @@ class HSCNMappingRepository:
             logger.error(f"❌ HS-CN 매핑 목록 조회 실패: {str(e)}")
             return []
     
+    async def estimate_mappings_count(self) -> Optional[int]:
+        """HS-CN 매핑 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM hs_cn_mapping", KeysetQuery())
+    
     async def update_mapping(self, mapping_id: int, mapping_data: HSCNMappingUpdateRequest) -> Optional[Dict[str, Any]]:
         """HS-CN 매핑 수정"""
         await self._ensure_pool_initialized()
@@ -192,20 +245,33 @@ class HSCNMappingRepository:
     # 🔍 HS 코드 조회 기능
     # ============================================================================
     
-    async def lookup_by_hs_code(self, hs_code: str) -> List[Dict[str, Any]]:
-        """HS 코드로 CN 코드 조회 (부분 검색 허용)"""
+    async def load_mappings(self) -> List[Dict[str, Any]]:
+        """HS-CN 매핑 전체 조회 (접두사 인덱스 적재용 - 실패 시 예외)"""
+        await self._ensure_pool_initialized()
+        
+        async with self.pool.acquire() as conn:
+            results = await conn.fetch("""
+                SELECT id, hscode, aggregoods_name, aggregoods_engname, 
+                       cncode_total, goods_name, goods_engname
+                FROM hs_cn_mapping
+            """)
+            return [dict(row) for row in results]
+    
+    async def lookup_by_hs_code(self, hs_code: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """HS 코드로 CN 코드 조회 (접두사 검색, 최대 limit개)"""
         await self._ensure_pool_initialized()
         
         try:
             async with self.pool.acquire() as conn:
-                # 부분 검색을 위해 LIKE 연산자 사용
-                results = await conn.fetch("""
+                query = self._prefix_filter('hscode', hs_code)
+                results = await conn.fetch(f"""
                     SELECT hscode, cncode_total, goods_name, goods_engname, 
                            aggregoods_name, aggregoods_engname
                     FROM hs_cn_mapping 
-                    WHERE hscode LIKE $1
-                    ORDER BY hscode, cncode_total
-                """, f"{hs_code}%")
+                    {query.where_sql}
+                    ORDER BY hscode, cncode_total, id
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 logger.info(f"🔍 HS 코드 조회: {hs_code}, 결과: {len(results)}개")
                 return [dict(row) for row in results]
@@ -214,19 +280,21 @@ class HSCNMappingRepository:
             logger.error(f"❌ HS 코드 조회 실패: {str(e)}")
             return []
     
-    async def search_by_hs_code(self, hs_code: str) -> List[Dict[str, Any]]:
-        """HS 코드로 검색 (부분 일치)"""
+    async def search_by_hs_code(self, hs_code: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """HS 코드로 검색 (접두사 일치, 최대 limit개)"""
         await self._ensure_pool_initialized()
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = self._prefix_filter('hscode', hs_code)
+                results = await conn.fetch(f"""
                 SELECT id, hscode, aggregoods_name, aggregoods_engname, 
                        cncode_total, goods_name, goods_engname
                 FROM hs_cn_mapping 
-                WHERE hscode LIKE $1
-                ORDER BY hscode, cncode_total
-                """, f"{hs_code}%")
+                {query.where_sql}
+                ORDER BY hscode, cncode_total, id
+                {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(row) for row in results]
                 
@@ -234,19 +302,21 @@ class HSCNMappingRepository:
             logger.error(f"❌ HS 코드 검색 실패: {str(e)}")
             return []
     
-    async def search_by_cn_code(self, cn_code: str) -> List[Dict[str, Any]]:
-        """CN 코드로 검색 (부분 일치)"""
+    async def search_by_cn_code(self, cn_code: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """CN 코드로 검색 (접두사 일치, 최대 limit개)"""
         await self._ensure_pool_initialized()
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = self._prefix_filter('cncode_total', cn_code)
+                results = await conn.fetch(f"""
                 SELECT id, hscode, aggregoods_name, aggregoods_engname, 
                        cncode_total, goods_name, goods_engname
                 FROM hs_cn_mapping 
-                WHERE cncode_total LIKE $1
-                ORDER BY cncode_total, hscode
-                """, f"{cn_code}%")
+                {query.where_sql}
+                ORDER BY cncode_total, hscode, id
+                {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(row) for row in results]
                 
@@ -323,14 +393,14 @@ class HSCNMappingRepository:
                         INSERT INTO hs_cn_mapping (hscode, aggregoods_name, aggregoods_engname, 
                                                  cncode_total, goods_name, goods_engname)
                         VALUES ($1, $2, $3, $4, $5, $6)
-                        """, (
+                        """,
                             mapping_data.hscode,
                             mapping_data.aggregoods_name,
                             mapping_data.aggregoods_engname,
                             mapping_data.cncode_total,
                             mapping_data.goods_name,
                             mapping_data.goods_engname
-                        ))
+                        )
                         
                         created_count += 1
                         
@@ -353,3 +423,61 @@ class HSCNMappingRepository:
                 'failed_count': len(mappings_data),
                 'errors': [f"일괄 처리 실패: {str(e)}"]
             }
+    
+    async def bulk_upsert_mappings(self, records: List[tuple]) -> Dict[str, int]:
+        """HS-CN 매핑 대량 upsert (COPY로 임시 테이블 적재 → ON CONFLICT 병합, 단일 트랜잭션 - 실패 시 예외)
+        
+        records: (line_no, *IMPORT_COLUMNS) 튜플 목록. 같은 (hscode, cncode_total)이 여러 번 나오면 마지막 행 사용.
+        """
+        await self._ensure_pool_initialized()
+        
+        columns = ', '.join(IMPORT_COLUMNS)
+        names = [column for column in IMPORT_COLUMNS if column not in ('hscode', 'cncode_total')]
+        async with self.pool.acquire() as conn:
+            if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", IMPORT_UNIQUE_INDEX):
+                # 부트스트랩 때 중복으로 실패했다면 정리 후 여기서 다시 생성
+                try:
+                    await conn.execute(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {IMPORT_UNIQUE_INDEX} ON hs_cn_mapping (hscode, cncode_total)"
+                    )
+                except asyncpg.UniqueViolationError:
+                    raise Exception("hs_cn_mapping에 (hscode, cncode_total) 중복 매핑이 있습니다. 중복을 정리한 뒤 다시 시도하세요.")
+            
+            async with conn.transaction():
+                await conn.execute(f"""
+                    CREATE TEMP TABLE hs_cn_mapping_import (
+                        line_no INTEGER NOT NULL,
+                        {', '.join(f'{column} TEXT' for column in IMPORT_COLUMNS)}
+                    ) ON COMMIT DROP
+                """)
+                await conn.copy_records_to_table(
+                    'hs_cn_mapping_import', records=records, columns=['line_no', *IMPORT_COLUMNS]
+                )
+                
+                # 내용이 같은 기존 행은 갱신하지 않음 (xmax = 0 이면 신규 삽입)
+                result = await conn.fetchrow(f"""
+                    WITH src AS (
+                        SELECT DISTINCT ON (hscode, cncode_total) {columns}
+                        FROM hs_cn_mapping_import
+                        ORDER BY hscode, cncode_total, line_no DESC
+                    ), merged AS (
+                        INSERT INTO hs_cn_mapping AS m ({columns})
+                        SELECT {columns} FROM src
+                        ON CONFLICT (hscode, cncode_total) DO UPDATE
+                        SET {', '.join(f'{name} = EXCLUDED.{name}' for name in names)}
+                        WHERE ({', '.join(f'm.{name}' for name in names)})
+                              IS DISTINCT FROM ({', '.join(f'EXCLUDED.{name}' for name in names)})
+                        RETURNING (m.xmax = 0) AS inserted
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM src) AS distinct_count,
+                        COUNT(*) FILTER (WHERE inserted) AS inserted_count,
+                        COUNT(*) FILTER (WHERE NOT inserted) AS updated_count
+                    FROM merged
+                """)
+        
+        logger.info(
+            f"✅ HS-CN 매핑 대량 upsert 완료: 입력 {len(records)}행, 신규 {result['inserted_count']}개, "
+            f"수정 {result['updated_count']}개"
+        )
+        return dict(result)
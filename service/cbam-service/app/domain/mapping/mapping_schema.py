@@ -84,3 +84,14 @@ class HSCNMappingBatchResponse(BaseModel):
     created_count: int = Field(..., description="생성된 매핑 수")
     failed_count: int = Field(..., description="실패한 매핑 수")
     errors: List[str] = Field(default=[], description="오류 메시지 목록")
+
+class HSCNMappingImportResponse(BaseModel):
+    """HS-CN 매핑 대량 가져오기(upsert) 응답"""
+    success: bool = Field(..., description="처리 성공 여부")
+    format: str = Field(..., description="입력 형식 (csv/jsonl)")
+    total_rows: int = Field(..., description="입력 데이터 행 수")
+    inserted_count: int = Field(..., description="새로 추가된 매핑 수")
+    updated_count: int = Field(..., description="내용이 바뀌어 수정된 매핑 수")
+    unchanged_count: int = Field(..., description="기존과 같아 건너뛴 매핑 수")
+    skipped_count: int = Field(..., description="유효하지 않거나 파일 안에서 중복되어 건너뛴 행 수")
+    errors: List[str] = Field(default=[], description="오류 메시지 목록 (최대 100개)")
@@ -2,24 +2,36 @@
 # 🎯 Mapping Service - HS-CN 매핑 비즈니스 로직
 # ============================================================================
 
+import io
+import re
+import csv
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
-from app.domain.mapping.mapping_repository import HSCNMappingRepository
+from app.domain.mapping.mapping_index import CNCODE, HSCODE, HSCNPrefixIndex, get_hscn_index
+from app.domain.mapping.mapping_repository import HSCNMappingRepository, IMPORT_COLUMNS
 from app.domain.mapping.mapping_schema import (
     HSCNMappingCreateRequest, HSCNMappingUpdateRequest, HSCNMappingResponse,
     HSCNMappingFullResponse, HSCodeLookupResponse, MappingStatsResponse,
-    HSCNMappingBatchCreateRequest, HSCNMappingBatchResponse
+    HSCNMappingBatchCreateRequest, HSCNMappingBatchResponse, HSCNMappingImportResponse
 )
 
 logger = logging.getLogger(__name__)
 
+IMPORT_FORMATS = ('csv', 'jsonl')
+# 응답에 담는 오류 메시지 최대 개수
+IMPORT_MAX_ERRORS = 100
+# 코드 표기의 공백/점 제거 (예: "7208 10 00", "7208.10")
+_CODE_SEPARATORS = re.compile(r"[\s.]")
+
 class HSCNMappingService:
     """HS-CN 매핑 비즈니스 로직 서비스"""
     
     def __init__(self, db: Session):
         self.repository = HSCNMappingRepository(db)
+        self.index = get_hscn_index()
     
     # ============================================================================
     # 📋 기본 CRUD 작업
@@ -40,6 +52,7 @@ class HSCNMappingService:
             
             mapping = await self.repository.create_mapping(mapping_data)
             if mapping:
+                self.index.apply_upsert([mapping])
                 return HSCNMappingFullResponse(**mapping)
             return None
             
@@ -59,16 +72,20 @@ class HSCNMappingService:
             logger.error(f"❌ HS-CN 매핑 조회 실패: {str(e)}")
             return None
     
-    async def get_all_mappings(self, skip: int = 0, limit: int = 100) -> List[HSCNMappingFullResponse]:
-        """모든 HS-CN 매핑 조회"""
+    async def get_all_mappings(self, after_id: Optional[int] = None, limit: Optional[int] = 100) -> List[HSCNMappingFullResponse]:
+        """모든 HS-CN 매핑 조회 (id 순 키셋 페이지네이션)"""
         try:
-            mappings = await self.repository.get_all_mappings(skip, limit)
+            mappings = await self.repository.get_all_mappings(after_id, limit)
             return [HSCNMappingFullResponse(**mapping) for mapping in mappings]
             
         except Exception as e:
             logger.error(f"❌ HS-CN 매핑 목록 조회 실패: {str(e)}")
             return []
     
+    async def estimate_mappings_count(self) -> Optional[int]:
+        """HS-CN 매핑 수 추정"""
+        return await self.repository.estimate_mappings_count()
+    
     async def update_mapping(self, mapping_id: int, mapping_data: HSCNMappingUpdateRequest) -> Optional[HSCNMappingFullResponse]:
         """HS-CN 매핑 수정"""
         try:
@@ -84,6 +101,7 @@ class HSCNMappingService:
             
             mapping = await self.repository.update_mapping(mapping_id, mapping_data)
             if mapping:
+                self.index.apply_upsert([mapping])
                 return HSCNMappingFullResponse(**mapping)
             return None
             
@@ -94,7 +112,10 @@ class HSCNMappingService:
     async def delete_mapping(self, mapping_id: int) -> bool:
         """HS-CN 매핑 삭제"""
         try:
-            return await self.repository.delete_mapping(mapping_id)
+            deleted = await self.repository.delete_mapping(mapping_id)
+            if deleted:
+                self.index.apply_delete([mapping_id])
+            return deleted
         except Exception as e:
             logger.error(f"❌ HS-CN 매핑 삭제 실패: {str(e)}")
             return False
@@ -103,8 +124,17 @@ class HSCNMappingService:
     # 🔍 HS 코드 조회 기능
     # ============================================================================
     
-    async def lookup_by_hs_code(self, hs_code: str) -> HSCodeLookupResponse:
-        """HS 코드로 CN 코드 조회 (부분 검색 허용)"""
+    async def _prefix_index(self) -> Optional[HSCNPrefixIndex]:
+        """최신 HS-CN 접두사 인덱스 (비활성/적재 실패 시 None → DB 조회)"""
+        try:
+            if await self.index.ensure_loaded(self.repository.load_mappings):
+                return self.index
+        except Exception as e:
+            logger.warning(f"⚠️ HS-CN 인덱스 적재 실패 (DB로 조회): {e}")
+        return None
+    
+    async def lookup_by_hs_code(self, hs_code: str, limit: Optional[int] = None) -> HSCodeLookupResponse:
+        """HS 코드로 CN 코드 조회 (접두사 검색, 최대 limit개)"""
         try:
             # HS 코드 유효성 검증 (부분 검색 허용)
             if not self._validate_hs_code_10(hs_code):
@@ -115,7 +145,11 @@ class HSCNMappingService:
                     message=f"유효하지 않은 HS 코드: {hs_code}"
                 )
             
-            mappings = await self.repository.lookup_by_hs_code(hs_code)
+            index = await self._prefix_index()
+            if index:
+                mappings = index.prefix(HSCODE, hs_code, limit)
+            else:
+                mappings = await self.repository.lookup_by_hs_code(hs_code, limit)
             
             # 응답 데이터 변환 (딕셔너리에서 키로 접근)
             response_data = []
@@ -144,19 +178,27 @@ class HSCNMappingService:
                 message=f"HS 코드 조회 중 오류가 발생했습니다: {str(e)}"
             )
     
-    async def search_by_hs_code(self, hs_code: str) -> List[HSCNMappingFullResponse]:
-        """HS 코드로 검색"""
+    async def search_by_hs_code(self, hs_code: str, limit: Optional[int] = None) -> List[HSCNMappingFullResponse]:
+        """HS 코드로 검색 (접두사, 최대 limit개)"""
         try:
-            mappings = await self.repository.search_by_hs_code(hs_code)
+            index = await self._prefix_index()
+            if index:
+                mappings = index.prefix(HSCODE, hs_code, limit)
+            else:
+                mappings = await self.repository.search_by_hs_code(hs_code, limit)
             return [HSCNMappingFullResponse(**mapping) for mapping in mappings]
         except Exception as e:
             logger.error(f"❌ HS 코드 검색 실패: {str(e)}")
             return []
     
-    async def search_by_cn_code(self, cn_code: str) -> List[HSCNMappingFullResponse]:
-        """CN 코드로 검색"""
+    async def search_by_cn_code(self, cn_code: str, limit: Optional[int] = None) -> List[HSCNMappingFullResponse]:
+        """CN 코드로 검색 (접두사, 최대 limit개)"""
         try:
-            mappings = await self.repository.search_by_cn_code(cn_code)
+            index = await self._prefix_index()
+            if index:
+                mappings = index.prefix(CNCODE, cn_code, limit)
+            else:
+                mappings = await self.repository.search_by_cn_code(cn_code, limit)
             return [HSCNMappingFullResponse(**mapping) for mapping in mappings]
         except Exception as e:
             logger.error(f"❌ CN 코드 검색 실패: {str(e)}")
@@ -220,6 +262,9 @@ class HSCNMappingService:
             
             # 일괄 생성 실행
             result = await self.repository.create_mappings_batch(valid_mappings)
+            if result['created_count'] > 0:
+                # 대량 변경은 개별 반영 대신 다음 조회 때 재적재
+                self.index.invalidate('일괄 생성')
             
             return HSCNMappingBatchResponse(
                 success=result['created_count'] > 0,
@@ -237,6 +282,90 @@ class HSCNMappingService:
                 errors=[f"일괄 처리 실패: {str(e)}"]
             )
     
+    async def import_mappings(self, content: bytes, import_format: str) -> HSCNMappingImportResponse:
+        """CSV/JSON Lines 매핑 대량 가져오기 (COPY + upsert, 같은 파일을 다시 올려도 결과 동일)"""
+        records: List[tuple] = []
+        errors: List[str] = []
+        total_rows = 0
+        
+        try:
+            for line_no, item in self._parse_import(content, import_format):
+                total_rows += 1
+                if isinstance(item, str):
+                    errors.append(f"{line_no}행: {item}")
+                    continue
+                
+                values = {
+                    column: (str(item.get(column)).strip() if item.get(column) is not None else '')
+                    for column in IMPORT_COLUMNS
+                }
+                values['hscode'] = _CODE_SEPARATORS.sub('', values['hscode'])
+                values['cncode_total'] = _CODE_SEPARATORS.sub('', values['cncode_total'])
+                if not self._validate_hs_code(values['hscode']):
+                    errors.append(f"{line_no}행: 유효하지 않은 HS 코드: {values['hscode']}")
+                    continue
+                if not self._validate_cn_code(values['cncode_total']):
+                    errors.append(f"{line_no}행: 유효하지 않은 CN 코드: {values['cncode_total']}")
+                    continue
+                
+                records.append((line_no, *[values[column] or None for column in IMPORT_COLUMNS]))
+            
+            result = {'distinct_count': 0, 'inserted_count': 0, 'updated_count': 0}
+            if records:
+                result = await self.repository.bulk_upsert_mappings(records)
+                if result['inserted_count'] or result['updated_count']:
+                    self.index.invalidate('대량 가져오기')
+            
+            duplicate_count = len(records) - result['distinct_count']
+            if duplicate_count:
+                errors.append(f"파일 안의 중복 (hscode, cncode_total) {duplicate_count}행은 마지막 행만 반영했습니다.")
+            
+            return HSCNMappingImportResponse(
+                success=bool(records),
+                format=import_format,
+                total_rows=total_rows,
+                inserted_count=result['inserted_count'],
+                updated_count=result['updated_count'],
+                unchanged_count=result['distinct_count'] - result['inserted_count'] - result['updated_count'],
+                skipped_count=total_rows - result['distinct_count'],
+                errors=errors[:IMPORT_MAX_ERRORS]
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ 매핑 대량 가져오기 실패: {str(e)}")
+            return HSCNMappingImportResponse(
+                success=False,
+                format=import_format,
+                total_rows=total_rows,
+                inserted_count=0,
+                updated_count=0,
+                unchanged_count=0,
+                skipped_count=total_rows,
+                errors=[f"가져오기 실패: {str(e)}"] + errors[:IMPORT_MAX_ERRORS - 1]
+            )
+    
+    def _parse_import(self, content: bytes, import_format: str) -> Iterator[Tuple[int, Any]]:
+        """가져오기 파일을 (행 번호, dict 또는 오류 메시지)로 변환 (행 번호는 헤더 포함 파일 기준)"""
+        text = content.decode('utf-8-sig')
+        if import_format == 'csv':
+            reader = csv.DictReader(io.StringIO(text))
+            missing = [column for column in ('hscode', 'cncode_total') if column not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"CSV 헤더에 필수 컬럼이 없습니다: {missing} (컬럼: {', '.join(IMPORT_COLUMNS)})")
+            for row in reader:
+                yield reader.line_num, row
+            return
+        
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"JSON 파싱 실패: {e.msg}"
+                continue
+            yield line_no, item if isinstance(item, dict) else "JSON 객체가 아닙니다"
+    
     # ============================================================================
     # 🔧 유틸리티 메서드
     # ============================================================================
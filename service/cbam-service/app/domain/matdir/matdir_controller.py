@@ -2,11 +2,14 @@
 # 🏭 Material Directory Controller - 원료 디렉토리 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any
 import time
+from datetime import date, datetime
 
+from app.common.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
+from app.common.text_search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
 from app.domain.matdir.matdir_service import MatDirService
 from app.domain.matdir.matdir_schema import (
     MatDirCreateRequest, 
@@ -41,13 +44,28 @@ async def create_matdir(matdir_data: MatDirCreateRequest):
         raise HTTPException(status_code=500, detail=f"원료직접배출량 생성 중 오류가 발생했습니다: {str(e)}")
 
 @router.get("/list", response_model=List[MatDirResponse])
-async def get_matdirs(skip: int = 0, limit: int = 100):
-    """모든 원료직접배출량 데이터 조회"""
+async def get_matdirs(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="조회할 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    process_id: Optional[int] = Query(None, description="공정 ID"),
+    install_id: Optional[int] = Query(None, description="사업장 ID"),
+    start_date: Optional[date] = Query(None, description="생성일 시작 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="생성일 종료 (YYYY-MM-DD, 포함)")
+):
+    """모든 원료직접배출량 데이터 조회 (최신순 키셋 페이지네이션)"""
     try:
-        logger.info("📋 원료직접배출량 목록 조회 요청")
-        matdirs = await matdir_service.get_matdirs(skip, limit)
+        logger.info(f"📋 원료직접배출량 목록 조회 요청: limit={limit}, process_id={process_id}, install_id={install_id}")
+        cursor = decode_cursor(after, (datetime, int))
+        matdirs = await matdir_service.get_matdirs(cursor, fetch_limit(limit), process_id, install_id, start_date, end_date)
+        matdirs = await respond_page(
+            response, matdirs, limit, lambda m: [m.created_at, m.id], first_page=cursor is None,
+            estimate=lambda: matdir_service.estimate_matdirs_count(process_id, install_id, start_date, end_date)
+        )
         logger.info(f"✅ 원료직접배출량 목록 조회 성공: {len(matdirs)}개")
         return matdirs
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 원료직접배출량 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"원료직접배출량 목록 조회 중 오류가 발생했습니다: {str(e)}")
@@ -64,7 +82,7 @@ async def get_matdirs_by_process(process_id: int):
         logger.error(f"❌ 공정별 원료직접배출량 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"공정별 원료직접배출량 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/{matdir_id}", response_model=MatDirResponse)
+@router.get("/{matdir_id:int}", response_model=MatDirResponse)
 async def get_matdir(matdir_id: int):
     """특정 원료직접배출량 데이터 조회"""
     try:
@@ -81,7 +99,7 @@ async def get_matdir(matdir_id: int):
         logger.error(f"❌ 원료직접배출량 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"원료직접배출량 조회 중 오류가 발생했습니다: {str(e)}")
 
-@router.put("/{matdir_id}", response_model=MatDirResponse)
+@router.put("/{matdir_id:int}", response_model=MatDirResponse)
 async def update_matdir(matdir_id: int, matdir_data: MatDirUpdateRequest):
     """원료직접배출량 데이터 수정"""
     try:
@@ -98,7 +116,7 @@ async def update_matdir(matdir_id: int, matdir_data: MatDirUpdateRequest):
         logger.error(f"❌ 원료직접배출량 수정 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"원료직접배출량 수정 중 오류가 발생했습니다: {str(e)}")
 
-@router.delete("/{matdir_id}")
+@router.delete("/{matdir_id:int}")
 async def delete_matdir(matdir_id: int):
     """원료직접배출량 데이터 삭제"""
     try:
@@ -159,12 +177,26 @@ async def get_all_materials():
         logger.error(f"❌ 모든 원료 마스터 데이터 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"원료 마스터 데이터 조회 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/material-master/cache/refresh", response_model=Dict[str, Any])
+async def refresh_material_master_cache():
+    """원료 마스터 캐시 무효화 후 재적재 (이 워커 즉시, 다른 워커는 TTL 안에 반영)"""
+    try:
+        logger.info("🗃️ 원료 마스터 캐시 재적재 요청")
+        return await matdir_service.refresh_material_master()
+    except Exception as e:
+        logger.error(f"❌ 원료 마스터 캐시 재적재 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"원료 마스터 캐시 재적재 중 오류가 발생했습니다: {str(e)}")
+
 @router.get("/material-master/search/{mat_name}", response_model=List[Dict[str, Any]])
-async def search_materials(mat_name: str):
-    """원료명으로 검색 (부분 검색) - Railway DB의 materials 테이블 사용"""
+async def search_materials(
+    mat_name: str,
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, description="최대 결과 수"),
+    fuzzy: bool = Query(False, description="오타 허용 검색 (유사도 기반)")
+):
+    """원료명으로 검색 (부분 검색, 관련도 순) - Railway DB의 materials 테이블 사용"""
     try:
-        logger.info(f"🔍 원료 마스터 검색 요청: '{mat_name}'")
-        materials = await matdir_service.search_materials(mat_name)
+        logger.info(f"🔍 원료 마스터 검색 요청: '{mat_name}' (fuzzy={fuzzy})")
+        materials = await matdir_service.search_materials(mat_name, limit, fuzzy)
         logger.info(f"✅ 원료 마스터 검색 성공: '{mat_name}' → {len(materials)}개 결과")
         return materials
     except Exception as e:
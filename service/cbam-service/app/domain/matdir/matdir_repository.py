@@ -4,27 +4,37 @@
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime
 import asyncpg
 from decimal import Decimal
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+from app.common.master_cache import MasterDataCache, name_match_args, name_match_query
+from app.common.text_search import SEARCH_DEFAULT_LIMIT, TrigramSearch, ensure_trigram_indexes
+
 logger = logging.getLogger(__name__)
 
+_MATERIAL_MASTER_MATCH_QUERY = name_match_query(
+    'material_master', 'id, mat_name, mat_engname, carbon_content, mat_factor', 'mat_name', 'mat_engname'
+)
+
 class MatDirRepository:
     """원료직접배출량 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -36,21 +46,18 @@ class MatDirRepository:
         self._initialization_attempted = True
         
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-matdir'
-                }
-            )
-            logger.info("✅ MatDir 데이터베이스 연결 풀 생성 성공")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
             
-            # 테이블 생성은 선택적으로 실행
+            logger.info("✅ MatDir 공용 연결 풀 연결 성공")
+            
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_matdir_table_async()
-                await self._create_material_master_table_async()
+                await self.pool_manager.run_once('matdir.matdir_table', self._create_matdir_table_async)
+                await self.pool_manager.run_once('matdir.material_master_table', self._create_material_master_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -120,6 +127,11 @@ class MatDirRepository:
                     logger.info("✅ matdir 테이블 생성 완료")
                 else:
                     logger.info("✅ matdir 테이블이 이미 존재합니다.")
+                
+                # 목록 키셋 페이지네이션(created_at, id 역순)용 인덱스
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_matdir_created_at_id ON matdir (created_at DESC, id DESC);
+                """)
                     
         except Exception as e:
             logger.error(f"❌ matdir 테이블 생성 실패: {str(e)}")
@@ -176,6 +188,9 @@ class MatDirRepository:
                     logger.info("✅ material_master 테이블 생성 완료")
                 else:
                     logger.info("✅ material_master 테이블이 이미 존재합니다.")
+                
+                # 원료명 자동완성 검색용 트라이그램 인덱스
+                await ensure_trigram_indexes(conn, 'material_master', ['mat_name', 'mat_engname'])
                     
         except Exception as e:
             logger.error(f"❌ material_master 테이블 생성 실패: {str(e)}")
@@ -313,15 +328,35 @@ class MatDirRepository:
             logger.error(f"❌ 에러 상세: {e}")
             raise
 
-    async def get_matdirs(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """모든 원료직접배출량 데이터 조회"""
+    async def get_matdirs(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """모든 원료직접배출량 데이터 조회 (created_at, id 역순 키셋 페이지네이션)"""
         await self._ensure_pool_initialized()
         try:
-            return await self._get_matdirs_db(skip, limit)
+            return await self._get_matdirs_db(after, limit, process_id, install_id, start_date, end_date)
         except Exception as e:
             logger.error(f"❌ 원료직접배출량 데이터 목록 조회 실패: {str(e)}")
             raise
 
+    async def estimate_matdirs_count(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 원료직접배출량 데이터 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM matdir", self._matdir_filters(process_id, install_id, start_date, end_date))
+
     async def get_matdirs_by_process(self, process_id: int) -> List[Dict[str, Any]]:
         """특정 공정의 원료직접배출량 데이터 조회"""
         await self._ensure_pool_initialized()
@@ -377,11 +412,8 @@ class MatDirRepository:
         
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.fetchrow("""
-                    SELECT id, mat_name, mat_engname, carbon_content, mat_factor
-                    FROM material_master
-                    WHERE mat_name = $1
-                """, mat_name)
+                # 캐시 조회(MasterDataCache.lookup)와 같은 규칙: 정확한 이름 → 영문명 → 정규화 이름
+                result = await conn.fetchrow(_MATERIAL_MASTER_MATCH_QUERY, *name_match_args(mat_name))
                 
                 if result:
                     logger.info(f"✅ 원료 마스터 조회 성공: {mat_name}")
@@ -398,18 +430,26 @@ class MatDirRepository:
             logger.error(f"❌ 원료 마스터 조회 실패: {str(e)}")
             return None
 
-    async def search_materials(self, search_term: str) -> List[Dict[str, Any]]:
-        """원료명으로 검색 (부분 검색)"""
+    async def search_materials(
+        self, search_term: str, limit: int = SEARCH_DEFAULT_LIMIT, fuzzy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """원료명/영문명으로 검색 (부분 검색, fuzzy면 오타 허용 - 관련도 순)"""
         await self._ensure_pool_initialized()
+        if not search_term.strip():
+            return []
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                search = TrigramSearch(['mat_name', 'mat_engname'], search_term, fuzzy)
+                query = KeysetQuery()
+                order_sql = search.apply(query)
+                results = await search.fetch(conn, f"""
                     SELECT id, mat_name, mat_engname, carbon_content, mat_factor
                     FROM material_master
-                    WHERE mat_name ILIKE $1 OR mat_engname ILIKE $1
-                    ORDER BY mat_name
-                """, f'%{search_term}%')
+                    {query.where_sql}
+                    {order_sql}
+                    {query.limit_sql(limit)}
+                """, query)
                 
                 logger.info(f"✅ 원료 마스터 검색 성공: '{search_term}' → {len(results)}개 결과")
                 return [dict(row) for row in results]
@@ -418,43 +458,53 @@ class MatDirRepository:
             logger.error(f"❌ 원료 마스터 검색 실패: {str(e)}")
             return []
 
-    async def get_all_materials(self) -> List[Dict[str, Any]]:
-        """모든 원료 마스터 데이터 조회"""
+    async def load_material_master(self) -> List[Dict[str, Any]]:
+        """원료 마스터 전체 조회 (캐시 적재용 - 실패 시 예외)"""
         await self._ensure_pool_initialized()
+        if not self.pool:
+            raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
         
+        async with self.pool.acquire() as conn:
+            results = await conn.fetch("""
+                SELECT id, mat_name, mat_engname, carbon_content, mat_factor
+                FROM material_master
+                ORDER BY mat_name
+            """)
+            return [dict(row) for row in results]
+
+    async def get_all_materials(self) -> List[Dict[str, Any]]:
+        """모든 원료 마스터 데이터 조회"""
         try:
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
-                    SELECT id, mat_name, mat_engname, carbon_content, mat_factor
-                    FROM material_master
-                    ORDER BY mat_name
-                """)
-                
-                logger.info(f"✅ 모든 원료 마스터 조회 성공: {len(results)}개")
-                return [dict(row) for row in results]
+            results = await self.load_material_master()
+            logger.info(f"✅ 모든 원료 마스터 조회 성공: {len(results)}개")
+            return results
                 
         except Exception as e:
             logger.error(f"❌ 모든 원료 마스터 조회 실패: {str(e)}")
             return []
 
+    @staticmethod
+    def material_factor_response(mat_name: str, material: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """원료 마스터 행 → 배출계수 응답 (없으면 found=False)"""
+        if material:
+            return {
+                'mat_name': material['mat_name'],
+                'mat_factor': float(material['mat_factor']),
+                'carbon_content': float(material['carbon_content']) if material['carbon_content'] else None,
+                'found': True
+            }
+        return {
+            'mat_name': mat_name,
+            'mat_factor': None,
+            'carbon_content': None,
+            'found': False
+        }
+
     async def get_material_factor_by_name(self, mat_name: str) -> Optional[Dict[str, Any]]:
         """원료명으로 배출계수만 조회 (간단한 응답)"""
         try:
             material = await self.get_material_by_name(mat_name)
-            if material:
-                return {
-                    'mat_name': material['mat_name'],
-                    'mat_factor': float(material['mat_factor']),
-                    'carbon_content': float(material['carbon_content']) if material['carbon_content'] else None,
-                    'found': True
-                }
-            else:
-                return {
-                    'mat_name': mat_name,
-                    'mat_factor': None,
-                    'carbon_content': None,
-                    'found': False
-                }
+            return self.material_factor_response(mat_name, material)
                 
         except Exception as e:
             logger.error(f"❌ 배출계수 조회 실패: {str(e)}")
@@ -469,18 +519,46 @@ class MatDirRepository:
     # 📋 기존 DB 작업 메서드들
     # ============================================================================
 
-    async def _get_matdirs_db(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    def _matdir_filters(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> KeysetQuery:
+        """원료직접배출량 목록 필터 조건 (공정/사업장/생성일 기간, 종료일 포함)"""
+        return (
+            KeysetQuery()
+            .where("process_id = {}", process_id)
+            .where("process_id IN (SELECT id FROM process WHERE install_id = {})", install_id)
+            .where("created_at >= {}::date", start_date)
+            .where("created_at < {}::date + 1", end_date)
+        )
+
+    async def _get_matdirs_db(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
         """모든 원료직접배출량 데이터 조회 (DB 작업)"""
         if not self.pool:
             raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
             
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = self._matdir_filters(process_id, install_id, start_date, end_date).after(
+                    ['created_at', 'id'], after, descending=True
+                )
+                results = await conn.fetch(f"""
                     SELECT * FROM matdir 
-                    ORDER BY created_at DESC 
-                    OFFSET $1 LIMIT $2
-                """, skip, limit)
+                    {query.where_sql}
+                    ORDER BY created_at DESC, id DESC 
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(row) for row in results]
                 
@@ -593,19 +671,27 @@ class MatDirRepository:
     # 🔍 원료명 조회 관련 메서드들 (Railway DB의 materials 테이블 사용)
     # ============================================================================
 
-    async def lookup_material_by_name(self, mat_name: str) -> List[Dict[str, Any]]:
+    async def lookup_material_by_name(
+        self, mat_name: str, limit: int = SEARCH_DEFAULT_LIMIT, fuzzy: bool = False
+    ) -> List[Dict[str, Any]]:
         """원료명으로 배출계수 조회 (자동 매핑 기능) - Railway DB의 material_master 테이블 사용"""
         await self._ensure_pool_initialized()
+        if not mat_name.strip():
+            return []
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                search = TrigramSearch(['mat_name'], mat_name, fuzzy)
+                query = KeysetQuery()
+                order_sql = search.apply(query)
+                results = await search.fetch(conn, f"""
                     SELECT id, mat_name, mat_engname, 
                            mat_factor, carbon_content
                     FROM material_master 
-                    WHERE mat_name ILIKE $1 
-                    ORDER BY mat_name
-                """, f"%{mat_name}%")
+                    {query.where_sql}
+                    {order_sql}
+                    {query.limit_sql(limit)}
+                """, query)
                 
                 logger.info(f"✅ 원료명 조회 성공: '{mat_name}' → {len(results)}개 결과")
                 return [dict(row) for row in results]
@@ -613,3 +699,14 @@ class MatDirRepository:
         except Exception as e:
             logger.error(f"❌ 원료명 조회 실패: {str(e)}")
             raise
+
+
+# ============================================================================
+# 📦 전역 인스턴스
+# ============================================================================
+
+_material_master_cache = MasterDataCache('material_master', 'mat_name', 'mat_engname')
+
+def get_material_master_cache() -> MasterDataCache:
+    """워커 공용 원료 마스터 캐시 반환"""
+    return _material_master_cache
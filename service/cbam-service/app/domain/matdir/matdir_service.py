@@ -3,15 +3,17 @@
 # ============================================================================
 
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime
 from decimal import Decimal
-from app.domain.matdir.matdir_repository import MatDirRepository
+from app.common.text_search import SEARCH_DEFAULT_LIMIT
+from app.common.master_cache import MasterDataCache
+from app.domain.matdir.matdir_repository import MatDirRepository, get_material_master_cache
 from app.domain.matdir.matdir_schema import (
     MatDirCreateRequest, MatDirResponse, MatDirUpdateRequest, 
     MatDirCalculationRequest, MatDirCalculationResponse
 )
-from app.domain.calculation.calculation_service import CalculationService
+from app.domain.calculation.calculation_scheduler import get_recalculation_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,8 @@ class MatDirService:
     
     def __init__(self):
         self.matdir_repository = MatDirRepository()
-        self._calc_service = CalculationService()
+        self.master_cache = get_material_master_cache()
+        self._recalc_scheduler = get_recalculation_scheduler()
         logger.info("✅ MatDir 서비스 초기화 완료")
     
     # ============================================================================
@@ -77,7 +80,7 @@ class MatDirService:
                 logger.info(f"✅ MatDirResponse 변환 완료: {response}")
                 # 투입 생성 후 해당 공정 기준 재계산 트리거
                 try:
-                    await self._calc_service.recalculate_from_process(request.process_id)
+                    await self._recalc_scheduler.request_recalculation(request.process_id, reason='matdir_create')
                 except Exception as e:
                     logger.warning(f"⚠️ 재계산 트리거 실패(생성 후): {e}")
                 return response
@@ -87,15 +90,33 @@ class MatDirService:
             logger.error(f"Error creating matdir: {e}")
             raise e
     
-    async def get_matdirs(self, skip: int = 0, limit: int = 100) -> List[MatDirResponse]:
-        """모든 원료직접배출량 데이터 조회"""
+    async def get_matdirs(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = 100,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[MatDirResponse]:
+        """모든 원료직접배출량 데이터 조회 (최신순 키셋 페이지네이션)"""
         try:
-            matdirs = await self.matdir_repository.get_matdirs(skip, limit)
+            matdirs = await self.matdir_repository.get_matdirs(after, limit, process_id, install_id, start_date, end_date)
             return [MatDirResponse(**matdir) for matdir in matdirs]
         except Exception as e:
             logger.error(f"Error getting matdirs: {e}")
             raise e
     
+    async def estimate_matdirs_count(
+        self,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 원료직접배출량 데이터 수 추정"""
+        return await self.matdir_repository.estimate_matdirs_count(process_id, install_id, start_date, end_date)
+    
     async def get_matdirs_by_process(self, process_id: int) -> List[MatDirResponse]:
         """특정 공정의 원료직접배출량 데이터 조회"""
         try:
@@ -155,7 +176,9 @@ class MatDirService:
                 # 투입 업데이트 후 재계산 트리거
                 try:
                     process_id = update_data.get('process_id', existing_matdir['process_id'])
-                    await self._calc_service.recalculate_from_process(process_id)
+                    if process_id != existing_matdir['process_id']:
+                        await self._recalc_scheduler.request_recalculation(existing_matdir['process_id'], reason='matdir_move')
+                    await self._recalc_scheduler.request_recalculation(process_id, reason='matdir_update')
                 except Exception as e:
                     logger.warning(f"⚠️ 재계산 트리거 실패(업데이트 후): {e}")
                 return MatDirResponse(**updated_matdir)
@@ -227,10 +250,26 @@ class MatDirService:
     # 🏗️ Material Master 관련 메서드들 (fueldir과 동일한 패턴)
     # ============================================================================
 
+    async def _material_master(self) -> Optional[MasterDataCache]:
+        """최신 원료 마스터 캐시 (비활성/적재 실패 시 None → DB 조회)"""
+        try:
+            if await self.master_cache.ensure_loaded(self.matdir_repository.load_material_master):
+                return self.master_cache
+        except Exception as e:
+            logger.warning(f"⚠️ 원료 마스터 캐시 적재 실패 (DB로 조회): {e}")
+        return None
+
+    async def refresh_material_master(self) -> Dict[str, Any]:
+        """원료 마스터 캐시 무효화 후 즉시 재적재 (마스터 데이터 변경 시 호출)"""
+        self.master_cache.invalidate('refresh 요청')
+        await self._material_master()
+        return self.master_cache.stats()
+
     async def get_all_materials(self) -> Dict[str, Any]:
-        """모든 원료 마스터 데이터 조회 - Railway DB의 materials 테이블 사용"""
+        """모든 원료 마스터 데이터 조회 - 워커 메모리 캐시 (적재 실패 시 DB)"""
         try:
-            materials = await self.matdir_repository.get_all_materials()
+            cache = await self._material_master()
+            materials = cache.rows() if cache else await self.matdir_repository.get_all_materials()
             return {
                 "materials": materials,
                 "total_count": len(materials)
@@ -239,18 +278,23 @@ class MatDirService:
             logger.error(f"Error getting all materials: {e}")
             raise e
 
-    async def search_materials(self, mat_name: str) -> List[Dict[str, Any]]:
-        """원료명으로 검색 (부분 검색) - Railway DB의 materials 테이블 사용"""
+    async def search_materials(
+        self, mat_name: str, limit: int = SEARCH_DEFAULT_LIMIT, fuzzy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """원료명으로 검색 (부분 검색, fuzzy면 오타 허용) - Railway DB의 materials 테이블 사용"""
         try:
-            materials = await self.matdir_repository.search_materials(mat_name)
+            materials = await self.matdir_repository.search_materials(mat_name, limit, fuzzy)
             return materials
         except Exception as e:
             logger.error(f"Error searching materials by name '{mat_name}': {e}")
             raise e
 
     async def get_material_factor_by_name(self, mat_name: str) -> Dict[str, Any]:
-        """원료명으로 배출계수 조회 (자동 매핑 기능) - Railway DB의 materials 테이블 사용"""
+        """원료명으로 배출계수 조회 (자동 매핑 기능) - 워커 메모리 캐시 (적재 실패 시 DB)"""
         try:
+            cache = await self._material_master()
+            if cache:
+                return MatDirRepository.material_factor_response(mat_name, cache.lookup(mat_name))
             result = await self.matdir_repository.get_material_factor_by_name(mat_name)
             return result
         except Exception as e:
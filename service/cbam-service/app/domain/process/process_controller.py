@@ -2,10 +2,11 @@
 # 🏭 Process Controller - 공정 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
 from typing import List, Optional
 
+from app.common.pagination import MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
 from app.domain.process.process_service import ProcessService
 from app.domain.process.process_repository import DuplicateProcessError
 from app.domain.process.process_schema import (
@@ -23,23 +24,35 @@ def get_process_service():
 
 @router.get("/", response_model=List[ProcessResponse])
 async def get_processes(
+    response: Response,
     process_name: Optional[str] = None,
-    product_id: Optional[int] = None
+    product_id: Optional[int] = None,
+    install_id: Optional[int] = Query(None, description="사업장 ID"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT, description="페이지 크기 (없으면 전체)"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값")
 ):
-    """프로세스 목록 조회 (선택적 필터링)"""
+    """프로세스 목록 조회 (선택적 필터링, id 순 키셋 페이지네이션)"""
     try:
-        logger.info(f"📋 프로세스 목록 조회 요청 - process_name: {process_name}, product_id: {product_id}")
+        logger.info(f"📋 프로세스 목록 조회 요청 - process_name: {process_name}, product_id: {product_id}, install_id: {install_id}, limit: {limit}")
+        cursor = decode_cursor(after)
         process_service = get_process_service()
-        processes = await process_service.get_processes()
+        processes = await process_service.get_processes(
+            install_id=install_id,
+            product_id=product_id,
+            process_name=process_name,
+            after_id=cursor[0] if cursor else None,
+            limit=fetch_limit(limit)
+        )
         
-        # 필터링 적용
-        if process_name:
-            processes = [p for p in processes if process_name.lower() in p.process_name.lower()]
-        if product_id is not None:
-            processes = [p for p in processes if p.products and any(prod.get('id') == product_id for prod in p.products)]
+        processes = await respond_page(
+            response, processes, limit, lambda p: [p.id], first_page=cursor is None,
+            estimate=lambda: process_service.estimate_processes_count(install_id, product_id, process_name)
+        )
         
         logger.info(f"✅ 프로세스 목록 조회 성공: {len(processes)}개")
         return processes
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌❌ 프로세스 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"프로세스 목록 조회 중 오류가 발생했습니다: {str(e)}")
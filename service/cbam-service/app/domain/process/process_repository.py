@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import asyncpg
 from app.domain.process.process_schema import ProcessCreateRequest, ProcessUpdateRequest
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +18,18 @@ class DuplicateProcessError(Exception):
 class ProcessRepository:
     """공정 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
-        self.pool = None
+        
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -37,18 +41,20 @@ class ProcessRepository:
         self._initialization_attempted = True
         
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1, max_size=10, command_timeout=30,
-                server_settings={'application_name': 'cbam-service-process'}
-            )
-            logger.info("✅ Process 데이터베이스 연결 풀 생성 성공")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
             
+            logger.info("✅ Process 공용 연결 풀 연결 성공")
+            
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_process_table_async()
+                await self.pool_manager.run_once('process.process_table', self._create_process_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ Process 테이블 생성 실패 (기본 기능은 정상): {e}")
-                
+            
         except Exception as e:
             logger.error(f"❌ Process 데이터베이스 연결 실패: {str(e)}")
             logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
@@ -111,6 +117,18 @@ class ProcessRepository:
                         logger.info("✅ process 테이블 스키마 업데이트 완료 (start_period, end_period를 NULL 허용)")
                     except Exception as e:
                         logger.info(f"ℹ️ process 테이블 스키마는 이미 최신 상태입니다: {e}")
+                
+                # 목록 조회(사업장 필터 + id 키셋)와 공정별 제품 조회용 인덱스
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_process_install_id ON process (install_id, id);
+                """)
+                product_process_exists = await conn.fetchval("""
+                    SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'product_process');
+                """)
+                if product_process_exists:
+                    await conn.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_product_process_process_id ON product_process (process_id);
+                    """)
                     
         except Exception as e:
             logger.error(f"❌ Process 테이블 생성 실패: {str(e)}")
@@ -129,15 +147,33 @@ class ProcessRepository:
             logger.error(f"❌ 공정 생성 실패: {str(e)}")
             raise
     
-    async def get_processes(self) -> List[Dict[str, Any]]:
-        """공정 목록 조회"""
+    async def get_processes(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """공정 목록 조회 (id 순 키셋 페이지네이션)"""
         await self._ensure_pool_initialized()
         try:
-            return await self._get_processes_db()
+            return await self._get_processes_db(install_id, product_id, process_name, after_id, limit)
         except Exception as e:
             logger.error(f"❌ 공정 목록 조회 실패: {str(e)}")
             raise
     
+    async def estimate_processes_count(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None
+    ) -> Optional[int]:
+        """필터에 맞는 공정 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(conn, "FROM process p", self._process_filters(install_id, product_id, process_name))
+    
     async def get_process(self, process_id: int) -> Optional[Dict[str, Any]]:
         """특정 공정 조회"""
         await self._ensure_pool_initialized()
@@ -255,50 +291,87 @@ class ProcessRepository:
             logger.error(f"❌ 공정 생성 실패: {str(e)}")
             raise
     
-    async def _get_processes_db(self) -> List[Dict[str, Any]]:
-        """데이터베이스에서 프로세스 목록 조회 (다대다 관계)"""
+    async def _get_processes_db(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """데이터베이스에서 프로세스 목록 조회 (다대다 관계, 제품은 한 번에 조회)"""
         if not self.pool:
             raise Exception("데이터베이스 연결 풀이 초기화되지 않았습니다.")
             
         try:
             async with self.pool.acquire() as conn:
-                # 모든 공정 조회 (사업장 정보 포함)
-                results = await conn.fetch("""
+                # 공정 조회 (사업장 정보 포함, 필터/키셋은 SQL에서 처리)
+                query = self._process_filters(install_id, product_id, process_name).after(['p.id'], [after_id] if after_id is not None else None)
+                results = await conn.fetch(f"""
                     SELECT p.id, p.process_name, p.install_id, p.start_period, p.end_period, 
                            p.created_at, p.updated_at, i.install_name
                     FROM process p
                     LEFT JOIN install i ON p.install_id = i.id
+                    {query.where_sql}
                     ORDER BY p.id
-                """)
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
-                processes = []
-                for row in results:
-                    process_dict = dict(row)
-                    
-                    # 해당 공정과 연결된 제품들 조회
-                    product_results = await conn.fetch("""
-                        SELECT p.id, p.install_id, p.product_name, p.product_category, 
-                               p.prostart_period, p.proend_period, p.product_amount,
-                               p.cncode_total, p.goods_name, p.aggrgoods_name,
-                               p.product_sell, p.product_eusell, p.created_at, p.updated_at
-                        FROM product p
-                        JOIN product_process pp ON p.id = pp.product_id
-                        WHERE pp.process_id = $1
-                    """, process_dict['id'])
-                    
-                    products = [dict(product) for product in product_results]
-                    process_dict['products'] = products
-                    
-                    # datetime.date 객체는 그대로 유지 (스키마에서 date 타입으로 정의됨)
-                    
-                    processes.append(process_dict)
+                processes = [dict(row) for row in results]
                 
+                # 연결된 제품들은 공정 ID 목록으로 한 번에 조회
+                await self._attach_products(conn, processes)
+                
+                # datetime.date 객체는 그대로 유지 (스키마에서 date 타입으로 정의됨)
                 return processes
                 
         except Exception as e:
             logger.error(f"❌ 공정 목록 조회 실패: {str(e)}")
             raise
     
+    def _process_filters(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None
+    ) -> KeysetQuery:
+        """공정 목록 필터 조건 (사업장/연결 제품/공정명 부분 일치)"""
+        name_pattern = None
+        if process_name:
+            escaped = process_name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            name_pattern = f"%{escaped}%"
+        return (
+            KeysetQuery()
+            .where("p.install_id = {}", install_id)
+            .where("EXISTS (SELECT 1 FROM product_process pp WHERE pp.process_id = p.id AND pp.product_id = {})", product_id)
+            .where("p.process_name ILIKE {}", name_pattern)
+        )
+    
+    async def _attach_products(self, conn, processes: List[Dict[str, Any]]):
+        """공정 목록에 연결된 제품 목록을 채움 (IN-list 쿼리 1회, 공정 수와 무관)"""
+        if not processes:
+            return
+        
+        product_results = await conn.fetch("""
+            SELECT pp.process_id AS linked_process_id,
+                   p.id, p.install_id, p.product_name, p.product_category, 
+                   p.prostart_period, p.proend_period, p.product_amount,
+                   p.cncode_total, p.goods_name, p.aggrgoods_name,
+                   p.product_sell, p.product_eusell, p.created_at, p.updated_at
+            FROM product p
+            JOIN product_process pp ON p.id = pp.product_id
+            WHERE pp.process_id = ANY($1::int[])
+            ORDER BY pp.process_id, p.id
+        """, [process['id'] for process in processes])
+        
+        products_by_process: Dict[int, List[Dict[str, Any]]] = {}
+        for row in product_results:
+            product = dict(row)
+            products_by_process.setdefault(product.pop('linked_process_id'), []).append(product)
+        
+        for process in processes:
+            process['products'] = products_by_process.get(process['id'], [])
+    
     async def _get_process_db(self, process_id: int) -> Optional[Dict[str, Any]]:
         """데이터베이스에서 특정 프로세스 조회"""
         if not self.pool:
@@ -403,19 +476,8 @@ class ProcessRepository:
                 
                 process_dict = dict(process_result)
                 
-                # 연결된 제품들 조회
-                product_results = await conn.fetch("""
-                    SELECT p.id, p.install_id, p.product_name, p.product_category, 
-                           p.prostart_period, p.proend_period, p.product_amount,
-                           p.cncode_total, p.goods_name, p.aggrgoods_name,
-                           p.product_sell, p.product_eusell, p.created_at, p.updated_at
-                    FROM product p
-                    JOIN product_process pp ON p.id = pp.product_id
-                    WHERE pp.process_id = $1
-                """, process_id)
-                
-                products = [dict(product) for product in product_results]
-                process_dict['products'] = products
+                # 연결된 제품들 조회 (목록 조회와 같은 헬퍼 사용)
+                await self._attach_products(conn, [process_dict])
                 
                 # datetime.date 객체는 그대로 유지 (스키마에서 date 타입으로 정의됨)
                 
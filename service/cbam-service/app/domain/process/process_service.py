@@ -45,15 +45,31 @@ class ProcessService:
             logger.error(f"Error creating process: {e}")
             raise e
     
-    async def get_processes(self) -> List[ProcessResponse]:
-        """프로세스 목록 조회"""
+    async def get_processes(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ProcessResponse]:
+        """프로세스 목록 조회 (id 순 키셋 페이지네이션)"""
         try:
-            processes = await self.process_repository.get_processes()
+            processes = await self.process_repository.get_processes(install_id, product_id, process_name, after_id, limit)
             return [ProcessResponse(**process) for process in processes]
         except Exception as e:
             logger.error(f"Error getting processes: {e}")
             raise e
     
+    async def estimate_processes_count(
+        self,
+        install_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        process_name: Optional[str] = None
+    ) -> Optional[int]:
+        """필터에 맞는 프로세스 수 추정"""
+        return await self.process_repository.estimate_processes_count(install_id, product_id, process_name)
+    
     async def get_process(self, process_id: int) -> Optional[ProcessResponse]:
         """특정 프로세스 조회"""
         try:
@@ -2,10 +2,12 @@
 # 🏭 Product Controller - 제품 API 엔드포인트
 # ============================================================================
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 import logging
 from typing import List, Optional
+from datetime import date
 
+from app.common.pagination import MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
 from app.domain.product.product_service import ProductService
 from app.domain.product.product_schema import (
     ProductCreateRequest, ProductResponse, ProductUpdateRequest, ProductNameResponse
@@ -27,26 +29,35 @@ def get_product_service():
 
 @router.get("/", response_model=List[ProductResponse])
 async def get_products(
+    response: Response,
     install_id: Optional[int] = None,
     product_name: Optional[str] = None,
-    product_category: Optional[str] = None
+    product_category: Optional[str] = None,
+    start_period: Optional[date] = Query(None, description="생산 기간 시작 (이 날짜 이후에 끝나는 제품)"),
+    end_period: Optional[date] = Query(None, description="생산 기간 종료 (이 날짜 이전에 시작하는 제품)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT, description="페이지 크기 (없으면 전체)"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값")
 ):
-    """제품 목록 조회 (선택적 필터링)"""
+    """제품 목록 조회 (선택적 필터링, id 순 키셋 페이지네이션)"""
     try:
-        logger.info(f"📋 제품 목록 조회 요청 - install_id: {install_id}, product_name: {product_name}, category: {product_category}")
+        logger.info(f"📋 제품 목록 조회 요청 - install_id: {install_id}, product_name: {product_name}, category: {product_category}, limit: {limit}")
+        cursor = decode_cursor(after)
         product_service = get_product_service()
-        products = await product_service.get_products()
-        
-        # 필터링 적용
-        if install_id is not None:
-            products = [p for p in products if p.install_id == install_id]
-        if product_name:
-            products = [p for p in products if product_name.lower() in p.product_name.lower()]
-        if product_category:
-            products = [p for p in products if p.product_category == product_category]
+        products = await product_service.get_products(
+            install_id, product_name, product_category, start_period, end_period,
+            after_id=cursor[0] if cursor else None, limit=fetch_limit(limit)
+        )
+        products = await respond_page(
+            response, products, limit, lambda p: [p.id], first_page=cursor is None,
+            estimate=lambda: product_service.estimate_products_count(
+                install_id, product_name, product_category, start_period, end_period
+            )
+        )
         
         logger.info(f"✅ 제품 목록 조회 성공: {len(products)}개")
         return products
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌❌ 제품 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"제품 목록 조회 중 오류가 발생했습니다: {str(e)}")
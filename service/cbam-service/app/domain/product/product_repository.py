@@ -5,9 +5,12 @@
 import logging
 import os
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 import asyncpg
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+
 from app.domain.product.product_schema import ProductCreateRequest, ProductUpdateRequest
 
 logger = logging.getLogger(__name__)
@@ -15,23 +18,18 @@ logger = logging.getLogger(__name__)
 class ProductRepository:
     """제품 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        # asyncpg 연결 풀 초기화 (요청 간 공유)
-        if not hasattr(ProductRepository, "_shared_pool"):
-            ProductRepository._shared_pool = None  # type: ignore[attr-defined]
-        if not hasattr(ProductRepository, "_shared_init_attempted"):
-            ProductRepository._shared_init_attempted = False  # type: ignore[attr-defined]
-
-        self.pool = ProductRepository._shared_pool  # type: ignore[attr-defined]
-        self._initialization_attempted = ProductRepository._shared_init_attempted  # type: ignore[attr-defined]
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
+        self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -41,31 +39,19 @@ class ProductRepository:
             return
         
         self._initialization_attempted = True
-        ProductRepository._shared_init_attempted = True  # type: ignore[attr-defined]
         
         try:
-            # asyncpg 연결 풀 생성
-            if ProductRepository._shared_pool is not None:  # type: ignore[attr-defined]
-                self.pool = ProductRepository._shared_pool  # type: ignore[attr-defined]
-                logger.info("♻️ Product 공유 커넥션 풀 재사용")
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
                 return
-
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service-product'
-                }
-            )
             
-            logger.info("✅ Product 데이터베이스 연결 풀 생성 성공")
-            ProductRepository._shared_pool = self.pool  # type: ignore[attr-defined]
+            logger.info("✅ Product 공용 연결 풀 연결 성공")
             
-            # 테이블 생성은 선택적으로 실행
+            # 테이블 생성은 선택적으로 실행 (워커당 1회)
             try:
-                await self._create_product_table_async()
+                await self.pool_manager.run_once('product.product_table', self._create_product_table_async)
             except Exception as e:
                 logger.warning(f"⚠️ Product 테이블 생성 실패 (기본 기능은 정상): {e}")
             
@@ -126,6 +112,11 @@ class ProductRepository:
                 else:
                     logger.info("✅ product 테이블 확인 완료")
                 
+                # 목록 조회(사업장 필터 + id 키셋)용 인덱스
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_product_install_id ON product (install_id, id);
+                """)
+                
         except Exception as e:
             logger.error(f"❌ Product 테이블 생성 실패: {str(e)}")
             logger.warning("⚠️ 테이블 생성 실패로 인해 일부 기능이 제한될 수 있습니다.")
@@ -204,14 +195,29 @@ class ProductRepository:
             logger.error(f"❌ 전달된 데이터: {product_data}")
             raise e
 
-    async def get_products(self) -> List[Dict[str, Any]]:
-        """모든 제품 조회"""
+    async def get_products(
+        self,
+        install_id: Optional[int] = None,
+        product_name: Optional[str] = None,
+        product_category: Optional[str] = None,
+        start_period: Optional[date] = None,
+        end_period: Optional[date] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """제품 조회 (선택적 필터링, id 순 키셋 페이지네이션 - limit이 없으면 전체)"""
         await self._ensure_pool_initialized()
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
-                    SELECT * FROM product ORDER BY id
-                """)
+                query = self._product_filters(install_id, product_name, product_category, start_period, end_period).after(
+                    ['id'], [after_id] if after_id is not None else None
+                )
+                results = await conn.fetch(f"""
+                    SELECT * FROM product
+                    {query.where_sql}
+                    ORDER BY id
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 products = []
                 for row in results:
@@ -229,6 +235,44 @@ class ProductRepository:
             logger.error(f"❌❌❌ 제품 목록 조회 실패: {str(e)}")
             raise e
 
+    async def estimate_products_count(
+        self,
+        install_id: Optional[int] = None,
+        product_name: Optional[str] = None,
+        product_category: Optional[str] = None,
+        start_period: Optional[date] = None,
+        end_period: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 제품 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(
+                conn, "FROM product",
+                self._product_filters(install_id, product_name, product_category, start_period, end_period)
+            )
+
+    def _product_filters(
+        self,
+        install_id: Optional[int] = None,
+        product_name: Optional[str] = None,
+        product_category: Optional[str] = None,
+        start_period: Optional[date] = None,
+        end_period: Optional[date] = None
+    ) -> KeysetQuery:
+        """제품 목록 필터 조건 (사업장/제품명 부분 일치/카테고리/생산 기간 겹침)"""
+        name_pattern = None
+        if product_name:
+            escaped = product_name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            name_pattern = f"%{escaped}%"
+        return (
+            KeysetQuery()
+            .where("install_id = {}", install_id)
+            .where("product_name ILIKE {}", name_pattern)
+            .where("product_category = {}", product_category)
+            .where("proend_period >= {}", start_period)
+            .where("prostart_period <= {}", end_period)
+        )
+
     async def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
         """특정 제품 조회"""
         await self._ensure_pool_initialized()
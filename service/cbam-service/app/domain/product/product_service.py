@@ -4,7 +4,7 @@
 
 import logging
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 from app.domain.product.product_repository import ProductRepository
 from app.domain.product.product_schema import (
@@ -82,15 +82,39 @@ class ProductService:
             logger.error(f"❌ 요청 데이터: {request}")
             raise e
     
-    async def get_products(self) -> List[ProductResponse]:
-        """제품 목록 조회"""
+    async def get_products(
+        self,
+        install_id: Optional[int] = None,
+        product_name: Optional[str] = None,
+        product_category: Optional[str] = None,
+        start_period: Optional[date] = None,
+        end_period: Optional[date] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ProductResponse]:
+        """제품 목록 조회 (선택적 필터링, id 순 키셋 페이지네이션)"""
         try:
-            products = await self.product_repository.get_products()
+            products = await self.product_repository.get_products(
+                install_id, product_name, product_category, start_period, end_period, after_id, limit
+            )
             return [ProductResponse(**product) for product in products]
         except Exception as e:
             logger.error(f"Error getting products: {e}")
             raise e
     
+    async def estimate_products_count(
+        self,
+        install_id: Optional[int] = None,
+        product_name: Optional[str] = None,
+        product_category: Optional[str] = None,
+        start_period: Optional[date] = None,
+        end_period: Optional[date] = None
+    ) -> Optional[int]:
+        """필터에 맞는 제품 수 추정"""
+        return await self.product_repository.estimate_products_count(
+            install_id, product_name, product_category, start_period, end_period
+        )
+    
     async def get_product_names(self) -> List[ProductNameResponse]:
         """제품명 목록 조회 (드롭다운용)"""
         try:
@@ -173,9 +197,8 @@ class ProductService:
             if quantity_fields_changed:
                 try:
                     # Edge 서비스를 통해 제품 배출량 계산
-                    from app.domain.edge.edge_service import EdgeService
-                    edge_service = EdgeService()
-                    await edge_service.initialize()
+                    from app.domain.edge.edge_service import get_edge_service
+                    edge_service = get_edge_service()
                     
                     # 제품 배출량 계산
                     calculated_emission = await edge_service.compute_product_emission(product_id)
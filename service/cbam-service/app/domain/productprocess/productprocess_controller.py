@@ -3,10 +3,11 @@
 # ============================================================================
 
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from fastapi.responses import JSONResponse
 
+from app.common.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, fetch_limit, respond_page
 from app.domain.productprocess.productprocess_service import ProductProcessService
 from app.domain.productprocess.productprocess_schema import (
     ProductProcessCreateRequest, ProductProcessResponse,
@@ -57,15 +58,28 @@ async def get_product_process_by_id(relation_id: int):
 
 @router.get("/", response_model=List[ProductProcessFullResponse])
 async def get_all_product_processes(
-    skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
-    limit: int = Query(100, ge=1, le=1000, description="조회할 레코드 수")
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="조회할 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    product_id: Optional[int] = Query(None, description="제품 ID"),
+    process_id: Optional[int] = Query(None, description="공정 ID"),
+    install_id: Optional[int] = Query(None, description="제품의 사업장 ID")
 ):
-    """모든 제품-공정 관계 조회"""
+    """모든 제품-공정 관계 조회 ((product_id, process_id) 순 키셋 페이지네이션)"""
     try:
-        logger.info(f"🔍 제품-공정 관계 목록 조회 요청: skip={skip}, limit={limit}")
-        result = await product_process_service.get_all_product_processes(skip, limit)
+        logger.info(f"🔍 제품-공정 관계 목록 조회 요청: limit={limit}, product_id={product_id}, process_id={process_id}, install_id={install_id}")
+        cursor = decode_cursor(after, (int, int))
+        result = await product_process_service.get_all_product_processes(
+            cursor, fetch_limit(limit), product_id, process_id, install_id
+        )
+        result = await respond_page(
+            response, result, limit, lambda r: [r.product_id, r.process_id], first_page=cursor is None,
+            estimate=lambda: product_process_service.estimate_product_processes_count(product_id, process_id, install_id)
+        )
         logger.info(f"✅ 제품-공정 관계 목록 조회 성공: {len(result)}개")
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 제품-공정 관계 목록 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"제품-공정 관계 목록 조회 중 오류가 발생했습니다: {str(e)}")
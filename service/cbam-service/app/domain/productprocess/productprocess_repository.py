@@ -4,28 +4,31 @@
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import asyncpg
 import os
 
+from app.common.database_pool import DatabasePoolManager, get_pool_manager
+from app.common.pagination import KeysetQuery, estimate_count
+
 logger = logging.getLogger(__name__)
 
 class ProductProcessRepository:
     """제품-공정 관계 데이터 접근 클래스"""
     
-    def __init__(self):
+    def __init__(self, pool_manager: Optional[DatabasePoolManager] = None):
         self.database_url = os.getenv('DATABASE_URL')
         if not self.database_url:
             logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 기능이 제한됩니다.")
-            return
         
-        # asyncpg 연결 풀 초기화
-        self.pool = None
+        # 애플리케이션 공용 연결 풀 관리자 주입 (요청마다 Repository가 생성되어도 풀은 하나)
+        self.pool_manager = pool_manager or get_pool_manager()
+        self.pool: Optional[asyncpg.Pool] = None
         self._initialization_attempted = False
     
     async def initialize(self):
-        """데이터베이스 연결 풀 초기화"""
+        """공용 연결 풀 연결 및 테이블 준비"""
         if self._initialization_attempted:
             return  # 이미 초기화 시도했으면 다시 시도하지 않음
             
@@ -37,21 +40,16 @@ class ProductProcessRepository:
         self._initialization_attempted = True
         
         try:
-            # asyncpg 연결 풀 생성
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'application_name': 'cbam-service'
-                }
-            )
+            # 애플리케이션 공용 연결 풀 사용 (lifespan에서 생성, 없으면 지연 생성)
+            self.pool = await self.pool_manager.get_pool()
+            if not self.pool:
+                logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
+                return
             
-            logger.info("✅ ProductProcess 데이터베이스 연결 풀 생성 성공")
+            logger.info("✅ ProductProcess 공용 연결 풀 연결 성공")
             
         except Exception as e:
-            logger.error(f"❌ 데이터베이스 연결 실패: {str(e)}")
+            logger.error(f"❌ ProductProcess 데이터베이스 연결 실패: {str(e)}")
             logger.warning("데이터베이스 연결 실패로 인해 일부 기능이 제한됩니다.")
             self.pool = None
     
@@ -134,20 +132,31 @@ class ProductProcessRepository:
             logger.error(f"❌ 제품-공정 관계 조회 실패: {str(e)}")
             raise
 
-    async def get_all_product_processes(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """모든 제품-공정 관계 조회"""
+    async def get_all_product_processes(
+        self,
+        after: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = 100,
+        product_id: Optional[int] = None,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """모든 제품-공정 관계 조회 ((product_id, process_id) 순 키셋 페이지네이션)"""
         await self._ensure_pool_initialized()
         
         try:
             async with self.pool.acquire() as conn:
-                results = await conn.fetch("""
+                query = self._product_process_filters(product_id, process_id, install_id).after(
+                    ['pp.product_id', 'pp.process_id'], after
+                )
+                results = await conn.fetch(f"""
                     SELECT pp.*, p.product_name, proc.process_name
                     FROM product_process pp
                     LEFT JOIN product p ON pp.product_id = p.id
                     LEFT JOIN process proc ON pp.process_id = proc.id
+                    {query.where_sql}
                     ORDER BY pp.product_id, pp.process_id
-                    LIMIT $1 OFFSET $2
-                """, limit, skip)
+                    {query.limit_sql(limit)}
+                """, *query.args)
                 
                 return [dict(result) for result in results]
                 
@@ -155,6 +164,33 @@ class ProductProcessRepository:
             logger.error(f"❌ 제품-공정 관계 목록 조회 실패: {str(e)}")
             raise
 
+    async def estimate_product_processes_count(
+        self,
+        product_id: Optional[int] = None,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None
+    ) -> Optional[int]:
+        """필터에 맞는 제품-공정 관계 수 추정 (플래너 통계 기반, COUNT(*) 없음)"""
+        await self._ensure_pool_initialized()
+        async with self.pool.acquire() as conn:
+            return await estimate_count(
+                conn, "FROM product_process pp", self._product_process_filters(product_id, process_id, install_id)
+            )
+
+    def _product_process_filters(
+        self,
+        product_id: Optional[int] = None,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None
+    ) -> KeysetQuery:
+        """제품-공정 관계 목록 필터 조건 (제품/공정/제품의 사업장)"""
+        return (
+            KeysetQuery()
+            .where("pp.product_id = {}", product_id)
+            .where("pp.process_id = {}", process_id)
+            .where("pp.product_id IN (SELECT id FROM product WHERE install_id = {})", install_id)
+        )
+
     async def get_product_processes_by_product(self, product_id: int) -> List[Dict[str, Any]]:
         """제품별 제품-공정 관계 조회"""
         await self._ensure_pool_initialized()
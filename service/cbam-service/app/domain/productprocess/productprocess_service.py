@@ -3,7 +3,7 @@
 # ============================================================================
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from app.domain.productprocess.productprocess_repository import ProductProcessRepository
@@ -72,12 +72,21 @@ class ProductProcessService:
             logger.error(f"❌ 제품-공정 관계 조회 실패: {str(e)}")
             raise
 
-    async def get_all_product_processes(self, skip: int = 0, limit: int = 100) -> List[ProductProcessFullResponse]:
-        """모든 제품-공정 관계 조회"""
+    async def get_all_product_processes(
+        self,
+        after: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = 100,
+        product_id: Optional[int] = None,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None
+    ) -> List[ProductProcessFullResponse]:
+        """모든 제품-공정 관계 조회 (키셋 페이지네이션)"""
         try:
-            logger.info(f"🔍 제품-공정 관계 목록 조회 요청: skip={skip}, limit={limit}")
+            logger.info(f"🔍 제품-공정 관계 목록 조회 요청: after={after}, limit={limit}")
             
-            results = await self.product_process_repository.get_all_product_processes(skip, limit)
+            results = await self.product_process_repository.get_all_product_processes(
+                after, limit, product_id, process_id, install_id
+            )
             
             logger.info(f"✅ 제품-공정 관계 목록 조회 성공: {len(results)}개")
             return [ProductProcessFullResponse(**result) for result in results]
@@ -86,6 +95,15 @@ class ProductProcessService:
             logger.error(f"❌ 제품-공정 관계 목록 조회 실패: {str(e)}")
             raise
 
+    async def estimate_product_processes_count(
+        self,
+        product_id: Optional[int] = None,
+        process_id: Optional[int] = None,
+        install_id: Optional[int] = None
+    ) -> Optional[int]:
+        """필터에 맞는 제품-공정 관계 수 추정"""
+        return await self.product_process_repository.estimate_product_processes_count(product_id, process_id, install_id)
+
     async def update_product_process(self, relation_id: int, request: ProductProcessUpdateRequest) -> Optional[ProductProcessResponse]:
         """제품-공정 관계 수정"""
         try:
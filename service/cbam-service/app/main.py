@@ -5,14 +5,21 @@
 import time
 import logging
 import os
-import re
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
+
+from app.common.database_pool import get_pool_manager
+from app.domain.edge.edge_service import get_edge_service
+from app.domain.edge.edge_index import get_edge_index
+from app.domain.edge.edge_jobs import get_propagation_jobs
+from app.domain.edge.edge_components import shutdown_process_pool
+from app.domain.calculation.calculation_scheduler import get_recalculation_scheduler
+from app.domain.matdir.matdir_repository import MatDirRepository, get_material_master_cache
+from app.domain.fueldir.fueldir_repository import FuelDirRepository, get_fuel_master_cache
+from app.domain.mapping.mapping_repository import HSCNMappingRepository
+from app.domain.mapping.mapping_index import get_hscn_index
 
 # 로깅 설정
 logging.basicConfig(
@@ -34,8 +41,6 @@ from app.domain.fueldir.fueldir_controller import router as fueldir_router
 from app.domain.productprocess.productprocess_controller import router as product_process_router
 from app.domain.dummy.dummy_controller import router as dummy_router
 
-# get_async_db 함수는 database_base.py에서 관리
-
 # ============================================================================
 # 🔧 설정 및 초기화
 # ============================================================================
@@ -54,123 +59,68 @@ APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
 APP_DESCRIPTION = os.getenv("APP_DESCRIPTION", "ReactFlow 기반 서비스")
 DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
 
-# 전역 데이터베이스 엔진 및 세션 팩토리
-async_engine = None
-async_session_factory = None
-
-# get_async_db 함수는 database_base.py에서 관리 (순환 참조 방지)
-
 # ============================================================================
 # 🔄 애플리케이션 생명주기 관리
 # ============================================================================
 
-def get_database_url():
-    """데이터베이스 URL 가져오기"""
-    database_url = os.getenv("DATABASE_URL")
-    if not database_url:
-        logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다.")
-        return None
-    return database_url
-
-def clean_database_url(url: str) -> str:
-    """데이터베이스 URL 정리 및 asyncpg 형식으로 변환"""
-    # Railway PostgreSQL에서 발생할 수 있는 잘못된 파라미터들 제거
-    invalid_params = [
-        'db_type', 'db_type=postgresql', 'db_type=postgres',
-        'db_type=mysql', 'db_type=sqlite'
-    ]
-    
-    for param in invalid_params:
-        if param in url:
-            url = url.replace(param, '')
-            logger.warning(f"잘못된 데이터베이스 파라미터 제거: {param}")
-    
-    # 연속된 & 제거
-    url = re.sub(r'&&+', '&', url)
-    url = re.sub(r'&+$', '', url)
-    
-    if '?' in url and url.split('?')[1].startswith('&'):
-        url = url.replace('?&', '?')
-    
-    # postgresql:// -> postgresql+asyncpg:// 변환 (SQLAlchemy async 지원)
-    if url.startswith('postgresql://'):
-        url = url.replace('postgresql://', 'postgresql+asyncpg://', 1)
-        logger.info("✅ PostgreSQL URL을 asyncpg 형식으로 변환")
-    
-    return url
-
 async def initialize_database():
-    """비동기 데이터베이스 초기화 및 SQLAlchemy 엔진 설정"""
-    global async_engine, async_session_factory
+    """공용 asyncpg 연결 풀 생성 및 워밍업 (모든 Repository가 공유)"""
+    pool_manager = get_pool_manager()
+    if not pool_manager.database_url:
+        logger.warning("DATABASE_URL 환경변수가 설정되지 않았습니다. 데이터베이스 초기화를 건너뜁니다.")
+        return
     
-    try:
-        database_url = get_database_url()
-        if not database_url:
-            logger.warning("DATABASE_URL이 없어 데이터베이스 초기화를 건너뜁니다.")
-            return
-        
-        clean_url = clean_database_url(database_url)
-        
-        # 비동기 SQLAlchemy 엔진 생성
-        async_engine = create_async_engine(
-            clean_url,
-            echo=DEBUG_MODE,  # 디버그 모드에서만 SQL 로깅
-            pool_pre_ping=True,
-            pool_recycle=300,
-            pool_size=5,
-            max_overflow=10,
-            connect_args={
-                'server_settings': {
-                    'application_name': 'cbam-service-async',
-                    'timezone': 'utc',
-                    'client_encoding': 'utf8'
-                }
-            }
-        )
-        
-        # 비동기 세션 팩토리 생성
-        async_session_factory = sessionmaker(
-            async_engine, 
-            class_=AsyncSession, 
-            expire_on_commit=False
-        )
-        
-        logger.info("✅ 비동기 SQLAlchemy 엔진 및 세션 팩토리 생성 완료")
-        
-        # 연결 테스트
-        async with async_engine.begin() as conn:
-            result = await conn.execute(text("SELECT 1"))
-            logger.info("✅ 데이터베이스 연결 테스트 성공")
-        
-    except Exception as e:
-        logger.error(f"❌ 비동기 데이터베이스 초기화 실패: {str(e)}")
+    pool = await pool_manager.initialize()
+    if pool:
+        logger.info(f"✅ 공용 데이터베이스 연결 풀 준비 완료: {pool_manager.stats()}")
+    else:
         logger.warning("⚠️ 데이터베이스 연결 실패로 인해 일부 기능이 제한될 수 있습니다.")
-        async_engine = None
-        async_session_factory = None
+
+async def warm_lookup_caches():
+    """원료/연료 마스터와 HS-CN 매핑을 워커 메모리에 적재 (실패해도 조회 시 DB로 처리)"""
+    if not get_pool_manager().pool:
+        return
+    for name, cache, loader in (
+        ('material_master', get_material_master_cache(), MatDirRepository().load_material_master),
+        ('fuel_master', get_fuel_master_cache(), FuelDirRepository().load_fuel_master),
+        ('hs_cn_mapping', get_hscn_index(), HSCNMappingRepository().load_mappings),
+    ):
+        try:
+            await cache.ensure_loaded(loader)
+        except Exception as e:
+            logger.warning(f"⚠️ {name} 캐시 적재 실패 (조회 시 DB 사용): {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 시작/종료 시 실행되는 함수"""
     logger.info("🚀 Cal_boundary 서비스 시작 중...")
     
-    # 비동기 데이터베이스 초기화
+    # 공용 연결 풀 초기화 (Repository들은 이 풀을 주입받아 사용)
     await initialize_database()
     
+    # 배출량 전파 서비스는 요청 간 재사용 (테이블 확인을 요청 경로에서 제거)
+    await get_edge_service().initialize()
+    
+    # 엣지 인접 인덱스: 다른 워커의 엣지 변경 알림(LISTEN) 수신
+    await get_edge_index().start_listener(get_pool_manager().database_url)
+    
+    # 배출계수 자동 매핑/마스터 목록/HS 코드 자동완성은 워커 메모리 캐시에서 응답
+    await warm_lookup_caches()
+    
+    # matdir/fueldir 변경 재계산은 디바운스해서 백그라운드에서 묶어 실행
+    await get_recalculation_scheduler().start()
+    
     # ReactFlow 기반 서비스 초기화
     logger.info("✅ ReactFlow 기반 서비스 초기화")
     
-    # SQLAlchemy 엔진 상태 확인
-    if async_engine:
-        logger.info("✅ SQLAlchemy 비동기 엔진 초기화 완료")
-    else:
-        logger.warning("⚠️ SQLAlchemy 엔진 초기화 실패 - Repository 자동 초기화에 의존")
-    
     yield
     
-    # 서비스 종료 시 정리 작업
-    if async_engine:
-        await async_engine.dispose()
-        logger.info("✅ SQLAlchemy 엔진 정리 완료")
+    # 서비스 종료 시 정리 작업 (대기 중인 재계산은 풀을 닫기 전에 마무리)
+    await get_recalculation_scheduler().stop()
+    await get_propagation_jobs().shutdown()
+    await get_edge_index().stop_listener()
+    await get_pool_manager().close()
+    shutdown_process_pool()
     
     logger.info("✅ ReactFlow 기반 서비스 정리 완료")
     logger.info("🛑 Cal_boundary 서비스 종료 중...")
@@ -298,12 +248,19 @@ async def root():
 @app.get("/health", tags=["health"])
 async def health_check():
     """서비스 상태 확인"""
-    # 🔴 데이터베이스 연결 상태 확인 제거 - 메인 라우터 역할에 맞지 않음
-    # 각 Repository가 자체적으로 연결 상태를 관리함
+    # 🔴 DB 쿼리 없이 공용 연결 풀 상태만 보고 (연결 수 모니터링용)
     return {
         "status": "healthy",
         "service": APP_NAME,
         "version": APP_VERSION,
+        "database_pool": get_pool_manager().stats(),
+        "edge_index": get_edge_index().stats(),
+        "recalculation": get_recalculation_scheduler().summary(),
+        "master_cache": {
+            "material_master": get_material_master_cache().stats(),
+            "fuel_master": get_fuel_master_cache().stats()
+        },
+        "mapping_index": get_hscn_index().stats(),
         "timestamp": time.time()
     }
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dummy_period_rollup(기간별 제품/공정 집계) 확인 스크립트
+
+- 임시 스키마(dummy_rollup_check)에 운영과 같은 dummy 테이블(생산품명/공정/수량 NULL 허용)을 만들고
+  ensure_period_rollup()으로 집계 테이블/트리거를 설치합니다.
+- 생산품명/공정/수량이 NULL인 행을 포함해 INSERT/UPDATE/DELETE가 트리거에서 거부되지 않는지 확인합니다.
+- 트리거로 누적된 집계가 dummy 전체를 다시 집계한 결과와 같은지,
+  기간별 제품/공정 목록이 dummy를 직접 조회하는 기존 쿼리와 같은지 여러 기간으로 비교합니다.
+- 끝나면 임시 스키마를 삭제합니다. 기대값과 다르면 종료 코드 1을 반환합니다.
+
+사용:
+  DATABASE_URL=postgresql://... python check_dummy_rollup.py
+  python check_dummy_rollup.py --database-url postgresql://... --rows 2000 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Any, List, Optional, Tuple
+
+import asyncpg
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'service', 'cbam-service'))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
+
+from app.domain.dummy.dummy_rollup import ROLLUP_TABLE, ensure_period_rollup, period_months, rollup_names_query  # noqa: E402
+
+SCHEMA = 'dummy_rollup_check'
+
+# test/schema.md의 운영 dummy 테이블
+DUMMY_DDL = """
+    CREATE TABLE dummy (
+        id SERIAL PRIMARY KEY,
+        로트번호 VARCHAR,
+        생산품명 VARCHAR,
+        생산수량 INTEGER,
+        투입일 DATE,
+        종료일 DATE,
+        공정 VARCHAR,
+        투입물명 VARCHAR,
+        수량 INTEGER,
+        단위 VARCHAR,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+INSERT_SQL = "INSERT INTO dummy (로트번호, 생산품명, 생산수량, 투입일, 종료일, 공정, 투입물명, 수량, 단위) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)"
+
+# 기존 기간 겹침 조건 (dummy_repository의 직접 조회 쿼리)
+OVERLAP = "((투입일 <= $2 AND 종료일 >= $1) OR (투입일 BETWEEN $1 AND $2) OR (종료일 BETWEEN $1 AND $2))"
+
+
+def maybe(rng: random.Random, value: Any, null_ratio: float = 0.1) -> Optional[Any]:
+    return None if rng.random() < null_ratio else value
+
+
+def random_row(rng: random.Random, index: int) -> Tuple[Any, ...]:
+    start = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    end = start + timedelta(days=rng.randint(-10, 70))
+    return (
+        f"LOT{index}",
+        maybe(rng, rng.choice(['제품A', '제품B', '제품C', '']), 0.15),
+        maybe(rng, rng.randint(1, 500)),
+        maybe(rng, start),
+        maybe(rng, end),
+        maybe(rng, rng.choice(['압연', '제강', '열처리', '']), 0.15),
+        rng.choice(['철광석', '코크스']),
+        maybe(rng, rng.randint(1, 100)),
+        'kg',
+    )
+
+
+async def direct_names(conn, column: str, start: date, end: date, product: Optional[str] = None) -> List[str]:
+    """dummy를 직접 조회하는 기존 방식 (NULL/빈 이름 제외)"""
+    if product is None:
+        rows = await conn.fetch(f"SELECT DISTINCT {column} FROM dummy WHERE {column} IS NOT NULL AND {OVERLAP} ORDER BY 1", start, end)
+    else:
+        rows = await conn.fetch(
+            f"SELECT DISTINCT {column} FROM dummy WHERE 생산품명 = $3 AND {column} IS NOT NULL AND {OVERLAP} ORDER BY 1",
+            start, end, product
+        )
+    return [row[column] for row in rows if row[column]]
+
+
+async def rollup_names(conn, column: str, start: date, end: date, product: Optional[str] = None) -> List[str]:
+    """집계 기반 조회 (dummy_repository._fetch_period_rollup_names와 같은 인자)"""
+    full_from, full_to, partial = period_months(start, end)
+    args = [start, end, full_from, full_to, partial]
+    if product is not None:
+        args.append(product)
+    rows = await conn.fetch(rollup_names_query(column, product is not None), *args)
+    return [row[column] for row in rows]
+
+
+async def rollup_rows(conn) -> List[Tuple[Any, ...]]:
+    rows = await conn.fetch(f"SELECT * FROM {ROLLUP_TABLE} WHERE 건수 <> 0 ORDER BY 1, 2, 3")
+    return [tuple(row) for row in rows]
+
+
+async def run(database_url: str, row_count: int, seed: int) -> int:
+    rng = random.Random(seed)
+    failures: List[str] = []
+
+    def expect(name: str, actual: Any, expected: Any):
+        if actual == expected:
+            return
+        failures.append(name)
+        print(f"  ❌ {name}: {actual!r} (기대값 {expected!r})")
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}; {DUMMY_DDL}")
+        # 트리거 설치 전 행 (부트스트랩 재집계 대상)
+        await conn.executemany(INSERT_SQL, [random_row(rng, index) for index in range(row_count // 2)])
+        if not await ensure_period_rollup(conn):
+            print("❌ ensure_period_rollup 실패")
+            return 1
+
+        # 이름이 NULL인 행 단건 INSERT (트리거가 거부하면 안 됨)
+        try:
+            await conn.execute(INSERT_SQL, 'LOT-NULL', None, None, date(2025, 3, 5), date(2025, 3, 9), None, '철광석', None, 'kg')
+            print("  ✅ 생산품명/공정/수량 NULL 행 INSERT")
+        except asyncpg.PostgresError as e:
+            failures.append('NULL 행 INSERT')
+            print(f"  ❌ 생산품명/공정/수량 NULL 행 INSERT: {e}")
+
+        # 트리거 설치 후 변경: 다중 행 INSERT, 이름을 NULL로 바꾸는 UPDATE, DELETE
+        await conn.executemany(INSERT_SQL, [random_row(rng, index) for index in range(row_count // 2, row_count)])
+        await conn.execute("UPDATE dummy SET 생산품명 = NULL WHERE id % 7 = 0")
+        await conn.execute("UPDATE dummy SET 공정 = NULL, 수량 = NULL WHERE id % 11 = 0")
+        await conn.execute("UPDATE dummy SET 투입일 = 투입일 + 40 WHERE id % 5 = 0")
+        await conn.execute("DELETE FROM dummy WHERE id % 13 = 0")
+
+        incremental = await rollup_rows(conn)
+        # 트리거가 다시 설치되도록 해 dummy 전체로 재집계
+        await conn.execute("DROP TRIGGER dummy_period_rollup_insert ON dummy")
+        await ensure_period_rollup(conn)
+        expect('트리거 누적 집계 = 전체 재집계', incremental, await rollup_rows(conn))
+
+        periods = [(date(2025, 1, 1), date(2025, 12, 31)), (date(2025, 3, 1), date(2025, 3, 31)),
+                   (date(2025, 3, 5), date(2025, 3, 5))]
+        for _ in range(20):
+            start = date(2025, 1, 1) + timedelta(days=rng.randint(0, 400))
+            periods.append((start, start + timedelta(days=rng.randint(0, 120))))
+        for start, end in periods:
+            label = f"{start}~{end}"
+            expect(f"제품 목록 {label}", await rollup_names(conn, '생산품명', start, end), await direct_names(conn, '생산품명', start, end))
+            expect(f"공정 목록 {label}", await rollup_names(conn, '공정', start, end), await direct_names(conn, '공정', start, end))
+            for product in ('제품A', '제품B'):
+                expect(f"{product} 공정 목록 {label}",
+                       await rollup_names(conn, '공정', start, end, product),
+                       await direct_names(conn, '공정', start, end, product))
+        print(f"  기간 {len(periods)}개 비교, dummy {await conn.fetchval('SELECT COUNT(*) FROM dummy')}행")
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+    if failures:
+        print(f"❌ 실패 {len(failures)}건")
+        return 1
+    print("✅ 집계 기반 목록이 기존 쿼리와 일치")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='dummy_period_rollup 트리거/목록 확인')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'), help='PostgreSQL 연결 문자열 (기본: DATABASE_URL)')
+    parser.add_argument('--rows', type=int, default=1000, help='무작위 dummy 행 수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    if not args.database_url:
+        print('DATABASE_URL 또는 --database-url이 필요합니다.', file=sys.stderr)
+        return 2
+    return asyncio.run(run(args.database_url, args.rows, args.seed))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+edge 쿼리가 운영 스키마(enum node_type/edge_kind 컬럼)와 서비스 자동 생성 스키마(VARCHAR 컬럼)에서
+모두 동작하는지 확인하는 스크립트
+
+- 임시 스키마(edge_check_enum, edge_check_varchar)를 만들고 search_path를 그 스키마로 둔 연결 풀로
+  EdgeRepository의 단건/일괄 생성, 기존 엣지 조회, 재귀 CTE 탐색(도달/사이클 검사/상류/하류 범위)을 실행합니다.
+- 유니크 인덱스가 있는 경우(ON CONFLICT)와 없는 경우(NOT EXISTS)를 모두 확인합니다.
+- 끝나면 임시 스키마를 삭제합니다. 기대값과 다르면 종료 코드 1을 반환합니다.
+
+사용:
+  DATABASE_URL=postgresql://... python check_edge_enum_schema.py
+  python check_edge_enum_schema.py --database-url postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from typing import Any, Dict, List
+
+import asyncpg
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'service', 'cbam-service'))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
+
+from app.domain.edge.edge_repository import EdgeRepository  # noqa: E402
+
+# test/schema.md의 운영 edge 테이블
+ENUM_DDL = """
+    CREATE TYPE node_type AS ENUM ('process', 'product');
+    CREATE TYPE edge_kind AS ENUM ('consume', 'produce', 'continue');
+    CREATE TABLE edge (
+        id SERIAL PRIMARY KEY,
+        source_node_type node_type NOT NULL,
+        source_id INTEGER NOT NULL,
+        target_node_type node_type NOT NULL,
+        target_id INTEGER NOT NULL,
+        edge_kind edge_kind NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_edge_source_node_type ON edge (source_node_type);
+    CREATE INDEX idx_edge_target_node_type ON edge (target_node_type);
+"""
+
+# EdgeRepository._create_edge_table_async가 만드는 테이블
+VARCHAR_DDL = """
+    CREATE TABLE edge (
+        id SERIAL PRIMARY KEY,
+        source_node_type VARCHAR(50) NOT NULL,
+        source_id INTEGER NOT NULL,
+        target_node_type VARCHAR(50) NOT NULL,
+        target_id INTEGER NOT NULL,
+        edge_kind VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+"""
+
+# product_ancestors가 이름을 붙이는 테이블 (필요한 컬럼만)
+NODE_DDL = """
+    CREATE TABLE process (id INTEGER PRIMARY KEY, process_name TEXT);
+    CREATE TABLE product (id INTEGER PRIMARY KEY, product_name TEXT);
+    INSERT INTO process VALUES (1, 'R1'), (2, 'R2'), (3, 'R3');
+    INSERT INTO product VALUES (1, 'P1'), (2, 'P2');
+"""
+
+
+def edge(source_type: str, source_id: int, target_type: str, target_id: int, kind: str) -> Dict[str, Any]:
+    return {
+        'source_node_type': source_type, 'source_id': source_id,
+        'target_node_type': target_type, 'target_id': target_id,
+        'edge_kind': kind,
+    }
+
+
+# R1 -produce-> P1 -consume-> R2 -continue-> R3 -produce-> P2
+CHAIN = [
+    edge('process', 1, 'product', 1, 'produce'),
+    edge('product', 1, 'process', 2, 'consume'),
+    edge('process', 2, 'process', 3, 'continue'),
+    edge('process', 3, 'product', 2, 'produce'),
+]
+
+
+class Checker:
+    def __init__(self, label: str):
+        self.label = label
+        self.failures: List[str] = []
+
+    def expect(self, name: str, actual: Any, expected: Any):
+        if actual == expected:
+            print(f"  ✅ {name}")
+        else:
+            self.failures.append(name)
+            print(f"  ❌ {name}: {actual!r} (기대값 {expected!r})")
+
+
+async def check_schema(database_url: str, variant: str, ddl: str, unique: bool) -> List[str]:
+    schema = f"edge_check_{variant}"
+    label = f"{variant} ({'유니크 인덱스' if unique else '유니크 인덱스 없음'})"
+    print(f"▶ {label}")
+    checker = Checker(label)
+
+    admin = await asyncpg.connect(database_url)
+    pool = None
+    try:
+        await admin.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+        await admin.execute(f"SET search_path TO {schema}; {ddl} {NODE_DDL}")
+        if not unique:
+            # 중복 엣지가 남아 있는 운영 DB처럼 유니크 인덱스를 만들지 못하게 함
+            await admin.execute(f"INSERT INTO {schema}.edge (source_node_type, source_id, target_node_type, target_id, edge_kind) "
+                                f"VALUES ('process', 1, 'product', 1, 'produce'), ('process', 1, 'product', 1, 'produce')")
+
+        pool = await asyncpg.create_pool(database_url, min_size=1, max_size=2, server_settings={'search_path': schema})
+        repository = EdgeRepository()
+        repository.pool = pool
+        repository._initialization_attempted = True
+        await repository._create_edge_table_async()
+
+        created = [await repository.create_edge(item) for item in CHAIN]
+        checker.expect('create_edge', all(row is not None for row in created), True)
+        duplicate = await repository.create_edge(CHAIN[2])
+        checker.expect('create_edge 중복 → 기존 엣지', duplicate and duplicate['id'], created[2] and created[2]['id'])
+
+        existing = await repository.find_existing_edges(CHAIN[1:3] + [edge('process', 3, 'process', 1, 'continue')])
+        checker.expect('find_existing_edges', sorted(existing.values()), sorted(row['id'] for row in created[1:3]))
+
+        bulk = await repository.create_edges_bulk([CHAIN[0], edge('product', 2, 'process', 1, 'consume')])
+        checker.expect('create_edges_bulk (기존 엣지 건너뜀)',
+                       [(row['source_node_type'], row['source_id'], row['edge_kind']) for row in bulk],
+                       [('product', 2, 'consume')])
+
+        reachable = await repository.get_reachable_nodes('process', 2)
+        checker.expect('get_reachable_nodes', reachable,
+                       [('process', 1), ('process', 3), ('product', 1), ('product', 2)])
+        checker.expect('get_reachable_nodes (edge_kinds)',
+                       await repository.get_reachable_nodes('process', 2, edge_kinds=['continue']), [('process', 3)])
+        checker.expect('would_create_cycle',
+                       await repository.would_create_cycle('product', 2, 'process', 3, ['continue', 'produce', 'consume']), True)
+        ancestors = await repository.get_product_ancestors(1)
+        checker.expect('get_product_ancestors', [(row['node_type'], row['node_id'], row['node_name']) for row in ancestors],
+                       [('process', 1, 'R1'), ('process', 2, 'R2'), ('process', 3, 'R3'), ('product', 2, 'P2')])
+        cone, scope = await repository.get_downstream_scope([('process', 3)])
+        checker.expect('get_downstream_scope', (sorted(cone), sorted(scope)), (
+            [('process', 1), ('process', 2), ('process', 3), ('product', 1), ('product', 2)],
+            [('process', 1), ('process', 2), ('process', 3), ('product', 1), ('product', 2)],
+        ))
+    finally:
+        if pool is not None:
+            await pool.close()
+        await admin.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await admin.close()
+    return [f"{label}: {name}" for name in checker.failures]
+
+
+async def run(database_url: str) -> int:
+    failures: List[str] = []
+    for variant, ddl in (('enum', ENUM_DDL), ('varchar', VARCHAR_DDL)):
+        for unique in (True, False):
+            failures += await check_schema(database_url, variant, ddl, unique)
+    if failures:
+        print(f"❌ 실패 {len(failures)}건")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("✅ 모든 스키마에서 edge 쿼리 정상")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='enum/VARCHAR edge 스키마에서 edge 쿼리 확인')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'), help='PostgreSQL 연결 문자열 (기본: DATABASE_URL)')
+    args = parser.parse_args()
+    if not args.database_url:
+        print('DATABASE_URL 또는 --database-url이 필요합니다.', file=sys.stderr)
+        return 2
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(run(args.database_url))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
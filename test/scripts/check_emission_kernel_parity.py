@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumPy 벡터화 전파 커널(edge_kernel)과 기존 EmissionGraph.compute() 결과 비교 스크립트
+
+- 무작위 그래프(continue/produce/consume, 순환 포함)를 여러 개 만들어 전체/부분 재계산 결과를 비교합니다.
+- 무작위 그래프 여러 개를 합친(서로 연결되지 않은) 그래프로 연결 요소 분할 계산(edge_components)도 비교합니다.
+- --database-url을 주면 실제 DB 스냅샷으로도 비교합니다. (읽기 전용)
+- 차이가 허용 오차(--tolerance)를 넘으면 종료 코드 1을 반환합니다.
+
+사용:
+  python check_emission_kernel_parity.py
+  python check_emission_kernel_parity.py --graphs 50 --processes 20000 --seed 7
+  python check_emission_kernel_parity.py --components 8 --pool-min-nodes 500
+  python check_emission_kernel_parity.py --database-url postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'service', 'cbam-service'))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
+
+from app.domain.edge.edge_graph import EmissionGraph  # noqa: E402
+from app.domain.edge.edge_kernel import VectorizedEmissionKernel  # noqa: E402
+from app.domain.edge.edge_components import compute_partitioned, shutdown_process_pool  # noqa: E402
+
+
+def random_snapshot(rng: random.Random, process_count: int, product_count: int, cycles: bool) -> Dict[str, List[Dict[str, Any]]]:
+    processes = [
+        {
+            'process_id': pid,
+            'attrdir_em': round(rng.uniform(0, 100), 3),
+            'cumulative_emission': round(rng.uniform(0, 500), 3) if rng.random() < 0.5 else 0,
+        }
+        for pid in range(1, process_count + 1)
+    ]
+    products = []
+    for pid in range(1, product_count + 1):
+        amount = round(rng.uniform(0, 1000), 3) if rng.random() < 0.9 else 0
+        products.append({
+            'id': pid,
+            'product_amount': amount,
+            'product_sell': round(rng.uniform(0, amount / 2), 3) if amount else 0,
+            'product_eusell': round(rng.uniform(0, amount / 2), 3) if amount else 0,
+            'attr_em': round(rng.uniform(0, 300), 3),
+        })
+
+    edges: List[Dict[str, Any]] = []
+
+    def add(source_type: str, source_id: int, target_type: str, target_id: int, kind: str):
+        edges.append({
+            'id': len(edges) + 1,
+            'source_node_type': source_type, 'source_id': source_id,
+            'target_node_type': target_type, 'target_id': target_id,
+            'edge_kind': kind,
+        })
+
+    # 공정 번호 순서를 기본 흐름으로 삼아 DAG를 만들고, cycles이면 역방향 엣지를 조금 섞음
+    for pid in range(2, process_count + 1):
+        for _ in range(rng.randint(0, 2)):
+            add('process', rng.randint(1, pid - 1), 'process', pid, 'continue')
+    product_producer: Dict[int, int] = {}
+    for pid in range(1, product_count + 1):
+        if rng.random() < 0.85:
+            producer = rng.randint(1, process_count)
+            product_producer[pid] = producer
+            add('process', producer, 'product', pid, 'produce')
+    product_processes = []
+    for pid in range(1, product_count + 1):
+        producer = product_producer.get(pid, 0)
+        for _ in range(rng.randint(0, 3)):
+            if producer >= process_count and not cycles:
+                break
+            low = producer + 1 if not cycles else 1
+            consumer = rng.randint(min(low, process_count), process_count)
+            add('product', pid, 'process', consumer, 'consume')
+            product_processes.append({
+                'product_id': pid,
+                'process_id': consumer,
+                'consumption_amount': round(rng.uniform(0, 50), 3) if rng.random() < 0.8 else 0,
+            })
+    if cycles:
+        for _ in range(max(1, process_count // 50)):
+            high = rng.randint(2, process_count)
+            add('process', high, 'process', rng.randint(1, high - 1), 'continue')
+
+    return {'edges': edges, 'processes': processes, 'products': products, 'product_processes': product_processes}
+
+
+def combine_snapshots(snapshots: List[Dict[str, List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """서로 연결되지 않도록 ID를 밀어서 여러 스냅샷을 하나로 합침"""
+    combined: Dict[str, List[Dict[str, Any]]] = {'edges': [], 'processes': [], 'products': [], 'product_processes': []}
+    process_offset = product_offset = edge_offset = 0
+    for snapshot in snapshots:
+        def shift(node_type: str, node_id: int) -> int:
+            return node_id + (process_offset if node_type == 'process' else product_offset)
+
+        for edge in snapshot['edges']:
+            combined['edges'].append({
+                **edge,
+                'id': edge['id'] + edge_offset,
+                'source_id': shift(edge['source_node_type'], edge['source_id']),
+                'target_id': shift(edge['target_node_type'], edge['target_id']),
+            })
+        combined['processes'] += [{**row, 'process_id': row['process_id'] + process_offset} for row in snapshot['processes']]
+        combined['products'] += [{**row, 'id': row['id'] + product_offset} for row in snapshot['products']]
+        combined['product_processes'] += [
+            {**row, 'product_id': row['product_id'] + product_offset, 'process_id': row['process_id'] + process_offset}
+            for row in snapshot['product_processes']
+        ]
+        process_offset += len(snapshot['processes'])
+        product_offset += len(snapshot['products'])
+        edge_offset += len(snapshot['edges'])
+    return combined
+
+
+def compare(label: str, expected: Dict[str, Any], actual: Dict[str, Any], tolerance: float, ordered_cycles: bool = True) -> List[str]:
+    errors: List[str] = []
+    for key in ('process_cumulative', 'product_attr_em', 'consumption_amounts'):
+        if set(expected[key]) != set(actual[key]):
+            errors.append(f'{label}: {key} 키 불일치 (기존 {len(expected[key])}개, 커널 {len(actual[key])}개)')
+            continue
+        for node, value in expected[key].items():
+            other = actual[key][node]
+            if abs(value - other) > tolerance * max(1.0, abs(value)):
+                errors.append(f'{label}: {key}[{node}] 기존={value} 커널={other}')
+                break
+    expected_cycles = expected['cycle_nodes'] if ordered_cycles else sorted(expected['cycle_nodes'])
+    actual_cycles = actual['cycle_nodes'] if ordered_cycles else sorted(actual['cycle_nodes'])
+    if expected_cycles != actual_cycles:
+        errors.append(f"{label}: cycle_nodes 불일치 기존={expected['cycle_nodes']} 커널={actual['cycle_nodes']}")
+    if set(expected['order']) != set(actual['order']):
+        errors.append(f'{label}: 계산 노드 집합 불일치')
+    return errors
+
+
+def check_snapshot(label: str, snapshot: Dict[str, List[Dict[str, Any]]], rng: random.Random, tolerance: float) -> List[str]:
+    graph = EmissionGraph.from_snapshot(snapshot)
+
+    started = time.perf_counter()
+    expected = graph.compute()
+    python_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    kernel = VectorizedEmissionKernel(graph)
+    build_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = kernel.compute()
+    kernel_elapsed = time.perf_counter() - started
+
+    errors = compare(f'{label} 전체', expected, actual, tolerance)
+
+    nodes = graph.nodes()
+    if nodes:
+        subset = set(rng.sample(nodes, max(1, len(nodes) // 3)))
+        errors += compare(f'{label} 부분', graph.compute(subset), kernel.compute(subset), tolerance)
+
+    print(
+        f'{label}: 노드 {len(nodes)}개, 엣지 {sum(graph.edge_counts.values())}개 | '
+        f'기존 {python_elapsed * 1000:.1f}ms, 커널 {kernel_elapsed * 1000:.1f}ms (+배열 구성 {build_elapsed * 1000:.1f}ms) | '
+        f"순환 끊김 {len(expected['cycle_nodes'])}개 | {'OK' if not errors else 'FAIL'}"
+    )
+    return errors
+
+
+def check_partitioned(label: str, snapshot: Dict[str, List[Dict[str, Any]]], tolerance: float) -> List[str]:
+    graph = EmissionGraph.from_snapshot(snapshot)
+
+    started = time.perf_counter()
+    expected = graph.compute()
+    python_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = asyncio.run(compute_partitioned(graph, snapshot))
+    partitioned_elapsed = time.perf_counter() - started
+
+    errors = compare(f'{label} 분할', expected, actual, tolerance, ordered_cycles=False)
+    print(
+        f'{label}: 노드 {len(graph.nodes())}개 | 기존 {python_elapsed * 1000:.1f}ms, '
+        f"분할 {partitioned_elapsed * 1000:.1f}ms | {'OK' if not errors else 'FAIL'}"
+    )
+    return errors
+
+
+async def load_db_snapshot(database_url: str) -> Dict[str, List[Dict[str, Any]]]:
+    from app.common.database_pool import DatabasePoolManager
+    from app.domain.edge.edge_repository import EdgeRepository
+
+    manager = DatabasePoolManager(database_url, min_size=1, max_size=2, warmup=False)
+    try:
+        repository = EdgeRepository(pool_manager=manager)
+        return await repository.get_propagation_snapshot()
+    finally:
+        await manager.close()
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='Compare the NumPy propagation kernel with EmissionGraph.compute().')
+    parser.add_argument('--graphs', type=int, default=20, help='number of random graphs')
+    parser.add_argument('--processes', type=int, default=2000, help='processes in the largest random graph')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--tolerance', type=float, default=1e-9, help='relative tolerance')
+    parser.add_argument('--components', type=int, default=4, help='random graphs combined for the partitioned check (0 to skip)')
+    parser.add_argument('--pool-min-nodes', type=int, default=1000, help='component size sent to the process pool in the partitioned check')
+    parser.add_argument('--database-url', default=None, help='also compare against a live DB snapshot (read-only)')
+    args = parser.parse_args(argv)
+
+    # 분할 계산은 작은 그래프에서도 프로세스 풀까지 거치도록 임계값을 낮춤
+    os.environ['EMISSION_PARTITION_MIN_NODES'] = '0'
+    os.environ['EMISSION_PROCESS_POOL_MIN_NODES'] = str(args.pool_min_nodes)
+
+    # 순환 끊김 경고는 결과 비교로 확인하므로 출력하지 않음
+    logging.getLogger('app').setLevel(logging.ERROR)
+    rng = random.Random(args.seed)
+    errors: List[str] = []
+
+    for i in range(args.graphs):
+        process_count = max(2, int(args.processes * (i + 1) / args.graphs))
+        snapshot = random_snapshot(rng, process_count, max(1, process_count // 2), cycles=(i % 3 == 2))
+        errors += check_snapshot(f'random#{i + 1}', snapshot, rng, args.tolerance)
+
+    if args.components:
+        for i in range(3):
+            parts = [
+                random_snapshot(rng, rng.randint(2, args.processes), rng.randint(1, args.processes // 2 + 1), cycles=(j % 2 == i % 2))
+                for j in range(args.components)
+            ]
+            errors += check_partitioned(f'components#{i + 1}', combine_snapshots(parts), args.tolerance)
+        shutdown_process_pool()
+
+    if args.database_url:
+        snapshot = asyncio.run(load_db_snapshot(args.database_url))
+        errors += check_snapshot('database', snapshot, rng, args.tolerance)
+        errors += check_partitioned('database', snapshot, args.tolerance)
+
+    if errors:
+        print('\n'.join(errors[:50]), file=sys.stderr)
+        print(f'FAIL: {len(errors)}건 불일치', file=sys.stderr)
+        return 1
+
+    print('OK: 커널 결과가 기존 계산과 일치합니다.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))